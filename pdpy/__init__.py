@@ -4,12 +4,25 @@ The pdpr package provides a suite of functions for downloading data from
 the data platform for the UK Parliament.
 """
 
+from . import cache
+from .cache import clear_cache
+
+from . import combine
+from .combine import coalesce_intervals
+
 from . import core
 from .core import sparql_select
+from .core import sparql_select_many
+from .core import iter_sparql_select
+from .core import close_sessions
+from .core import get_request_stats
+from .core import reset_request_stats
+from .core import sparql_select_async
 
 from . import elections
 from .elections import get_general_elections
 from .elections import get_general_elections_dict
+from .elections import get_parliament_periods
 
 from . import lords
 from .lords import fetch_lords
@@ -18,6 +31,12 @@ from .lords import fetch_lords_party_memberships
 from .lords import fetch_lords_government_roles
 from .lords import fetch_lords_opposition_roles
 from .lords import fetch_lords_committee_memberships
+from .lords import fetch_lords_async
+from .lords import fetch_lords_memberships_async
+from .lords import fetch_lords_party_memberships_async
+from .lords import fetch_lords_government_roles_async
+from .lords import fetch_lords_opposition_roles_async
+from .lords import fetch_lords_committee_memberships_async
 
 from . import mps
 from .mps import fetch_mps
@@ -26,11 +45,84 @@ from .mps import fetch_mps_party_memberships
 from .mps import fetch_mps_government_roles
 from .mps import fetch_mps_opposition_roles
 from .mps import fetch_mps_committee_memberships
+from .mps import fetch_mps_async
+from .mps import fetch_commons_memberships_async
+from .mps import fetch_mps_party_memberships_async
+from .mps import fetch_mps_government_roles_async
+from .mps import fetch_mps_opposition_roles_async
+from .mps import fetch_mps_committee_memberships_async
+
+from . import profiling
+from .profiling import profile
+
+from . import snapshot
+from .snapshot import write_snapshot
 
 from . import settings
 from .settings import get_api_url
 from .settings import set_api_url
 from .settings import reset_api_url
+from .settings import get_pool_size
+from .settings import set_pool_size
+from .settings import reset_pool_size
+from .settings import get_keep_alive
+from .settings import set_keep_alive
+from .settings import reset_keep_alive
+from .settings import get_timeout
+from .settings import set_timeout
+from .settings import reset_timeout
+from .settings import get_result_format
+from .settings import set_result_format
+from .settings import reset_result_format
+from .settings import get_cache_dir
+from .settings import set_cache_dir
+from .settings import reset_cache_dir
+from .settings import get_cache_ttl
+from .settings import set_cache_ttl
+from .settings import reset_cache_ttl
+from .settings import get_cache_max_size
+from .settings import set_cache_max_size
+from .settings import reset_cache_max_size
+from .settings import get_memory_cache_size
+from .settings import set_memory_cache_size
+from .settings import reset_memory_cache_size
+from .settings import get_memory_cache_ttl
+from .settings import set_memory_cache_ttl
+from .settings import reset_memory_cache_ttl
+from .settings import get_page_size
+from .settings import set_page_size
+from .settings import reset_page_size
+from .settings import get_paging_threshold
+from .settings import set_paging_threshold
+from .settings import reset_paging_threshold
+from .settings import get_max_retries
+from .settings import set_max_retries
+from .settings import reset_max_retries
+from .settings import get_retry_backoff
+from .settings import set_retry_backoff
+from .settings import reset_retry_backoff
+from .settings import get_retry_status_codes
+from .settings import set_retry_status_codes
+from .settings import reset_retry_status_codes
+from .settings import get_date_dtype
+from .settings import set_date_dtype
+from .settings import reset_date_dtype
+from .settings import get_categorical
+from .settings import set_categorical
+from .settings import reset_categorical
+from .settings import get_snapshot_dir
+from .settings import set_snapshot_dir
+from .settings import reset_snapshot_dir
+from .settings import get_transport
+from .settings import set_transport
+from .settings import reset_transport
+from .settings import add_hook
+from .settings import remove_hook
+from .settings import get_hooks
+from .settings import reset_hooks
+
+from . import transport
 
 from . import utils
 from .utils import readable
+from .utils import to_arrow
@@ -0,0 +1,507 @@
+# -*- coding: utf-8 -*-
+"""Query result cache functions."""
+
+# Imports ---------------------------------------------------------------------
+
+import collections
+import concurrent.futures
+import hashlib
+import math
+import numpy as np
+import os
+import pandas as pd
+import re
+import struct
+import tempfile
+import threading
+import time
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:
+    pyarrow = None
+
+from . import constants
+from . import settings
+
+# Patterns --------------------------------------------------------------------
+
+query_tokens = re.compile(
+    r'("(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'|<[^>\s]*>)|\s+')
+
+# Writer ----------------------------------------------------------------------
+
+# Entries are compressed and written by a single background thread, so that
+# storing a result adds as little as possible to the cost of a cache miss
+writer = None
+writer_lock = threading.Lock()
+pending_writes = set()
+
+header = struct.Struct('<d')
+
+
+def get_writer():
+
+    """Get the executor used to write cache entries, creating it if needed."""
+
+    global writer
+
+    with writer_lock:
+        if writer is None:
+            writer = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        return writer
+
+# Keys ------------------------------------------------------------------------
+
+def normalize_query(query):
+
+    """Normalize the whitespace in a query outside of literals and IRIs.
+
+    normalize_query collapses each run of whitespace in a SPARQL query to a
+    single space and removes leading and trailing whitespace, so that
+    queries that differ only in their layout share a cache entry. Whitespace
+    inside string literals and IRIs is left unchanged.
+
+    """
+
+    def replace(match):
+        return match.group(1) if match.group(1) is not None else ' '
+
+    return query_tokens.sub(replace, query).strip()
+
+
+def get_cache_key(url,
+                  query,
+                  result_format,
+                  date_cols=None,
+                  date_dtype=constants.SETTINGS_DATE_DTYPE_DEFAULT):
+
+    """Get the cache key for a query sent to an endpoint.
+
+    The key is a hash of the endpoint url, the normalized query and the
+    options that affect how the results are decoded.
+
+    """
+
+    if date_cols is None:
+        date_cols = []
+
+    parts = [
+        url,
+        normalize_query(query),
+        result_format,
+        '\t'.join(sorted(date_cols)),
+        date_dtype]
+
+    return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+
+
+def get_cache_path(cache_dir, key):
+
+    """Get the path of the file for a cache entry."""
+
+    return os.path.join(
+        cache_dir, '{0}{1}'.format(key, constants.CACHE_FILE_EXTENSION))
+
+# Cached results --------------------------------------------------------------
+
+def is_enabled():
+
+    """Return True if either the memory cache or the disk cache is on."""
+
+    return (
+        settings.get_memory_cache_size() > 0 or
+        settings.get_cache_dir() is not None)
+
+
+def get_result(key):
+
+    """Get a cached result from the memory cache or the disk cache.
+
+    get_result looks for the result in the memory cache and then in the disk
+    cache, and returns None if neither has a valid entry. A result found on
+    disk is added to the memory cache.
+
+    """
+
+    frame = read_memory_cache(key)
+    if frame is not None:
+        return frame
+
+    frame = read_cache(key)
+    if frame is not None:
+        write_memory_cache(key, frame)
+
+    return frame
+
+
+def set_result(key, frame):
+
+    """Store a result in the memory cache and the disk cache."""
+
+    write_memory_cache(key, frame)
+    write_cache(key, frame)
+
+# Memory cache ----------------------------------------------------------------
+
+memory_cache = collections.OrderedDict()
+memory_cache_lock = threading.Lock()
+
+
+def copy_on_write():
+
+    """Return True if pandas copy-on-write mode is turned on."""
+
+    try:
+        return bool(pd.get_option('mode.copy_on_write'))
+    except KeyError:
+        return False
+
+
+def share_frame(frame):
+
+    """Return a copy of a DataFrame that can be handed to a caller.
+
+    When pandas copy-on-write mode is on a shallow copy is returned, which
+    shares its data with the original until either of them is modified.
+    Otherwise a deep copy is returned. The values in object columns are
+    immutable strings and dates, so a deep copy only copies the arrays of
+    references to them.
+
+    """
+
+    return frame.copy(deep=not copy_on_write())
+
+
+def read_memory_cache(key):
+
+    """Read a DataFrame from the memory cache.
+
+    read_memory_cache returns a copy of the DataFrame kept in memory for the
+    given key, or None if there is no valid entry. Changes made to the copy
+    do not affect the cached result. Reading an entry marks it as recently
+    used.
+
+    Parameters
+    ----------
+    key : str
+        The cache key returned by get_cache_key.
+
+    Returns
+    -------
+    out : DataFrame or None
+        A copy of the cached DataFrame, or None if the key is not in memory.
+
+    """
+
+    with memory_cache_lock:
+
+        if key not in memory_cache:
+            return None
+
+        expires, frame = memory_cache[key]
+        if expires < time.monotonic():
+            del memory_cache[key]
+            return None
+
+        memory_cache.move_to_end(key)
+
+    return share_frame(frame)
+
+
+def write_memory_cache(key, frame):
+
+    """Write a DataFrame to the memory cache.
+
+    write_memory_cache keeps a copy of the DataFrame in memory for the given
+    key, so later changes made to the DataFrame do not affect the cached
+    result. If the memory cache is full the least recently used entry is
+    discarded.
+
+    Parameters
+    ----------
+    key : str
+        The cache key returned by get_cache_key.
+    frame : DataFrame
+        The DataFrame to keep.
+
+    Returns
+    -------
+    out : None
+
+    """
+
+    size = settings.get_memory_cache_size()
+    if size == 0:
+        return
+
+    ttl = settings.get_memory_cache_ttl()
+    expires = math.inf if ttl is None else time.monotonic() + ttl
+    frame = share_frame(frame)
+
+    with memory_cache_lock:
+        memory_cache[key] = (expires, frame)
+        memory_cache.move_to_end(key)
+        while len(memory_cache) > size:
+            memory_cache.popitem(last=False)
+
+
+def clear_memory_cache():
+
+    """Remove all entries from the memory cache."""
+
+    with memory_cache_lock:
+        memory_cache.clear()
+
+# Reading and writing ---------------------------------------------------------
+
+def read_cache(key):
+
+    """Read a DataFrame from the cache.
+
+    read_cache returns the DataFrame stored in the cache for the given key,
+    or None if there is no valid entry. Expired and unreadable entries are
+    removed. Reading an entry marks it as recently used. The disk cache
+    requires pyarrow.
+
+    Parameters
+    ----------
+    key : str
+        The cache key returned by get_cache_key.
+
+    Returns
+    -------
+    out : DataFrame or None
+        The cached DataFrame, or None if the key is not in the cache.
+
+    """
+
+    cache_dir = settings.get_cache_dir()
+    if cache_dir is None:
+        return None
+
+    check_pyarrow()
+    path = get_cache_path(cache_dir, key)
+
+    try:
+        with open(path, 'rb') as f:
+            expires, = header.unpack(f.read(header.size))
+            if expires < time.time():
+                raise ValueError('Cache entry has expired')
+            data = f.read()
+        frame = frame_from_table(
+            pyarrow.ipc.open_file(pyarrow.py_buffer(data)).read_all())
+    except FileNotFoundError:
+        return None
+    except Exception:
+        remove_entry(path)
+        return None
+
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+    return frame
+
+
+def write_cache(key, frame, ttl=None):
+
+    """Write a DataFrame to the cache.
+
+    write_cache stores a DataFrame in the cache for the given key. A copy
+    of the DataFrame is written to disk in the background in the compressed
+    Arrow IPC file format. Each entry records its own expiry time. If the new
+    entry takes the cache over the maximum size, the least recently used
+    entries are removed. The disk cache requires pyarrow.
+
+    Parameters
+    ----------
+    key : str
+        The cache key returned by get_cache_key.
+    frame : DataFrame
+        The DataFrame to store.
+    ttl : float, optional
+        The number of seconds for which the entry remains valid. The default
+        value is None, which means the cache ttl setting is used.
+
+    Returns
+    -------
+    out : None
+
+    """
+
+    cache_dir = settings.get_cache_dir()
+    if cache_dir is None:
+        return
+
+    check_pyarrow()
+
+    if ttl is None:
+        ttl = settings.get_cache_ttl()
+
+    # Copying the frame is much cheaper than serializing it, and protects
+    # the entry from changes the caller makes to the frame before it is
+    # written, as the values in its object columns are immutable
+    expires = math.inf if ttl is None else time.time() + ttl
+    max_size = settings.get_cache_max_size()
+
+    future = get_writer().submit(
+        store_entry, cache_dir, key, frame.copy(), expires, max_size)
+
+    with writer_lock:
+        pending_writes.add(future)
+    future.add_done_callback(discard_pending_write)
+
+
+def discard_pending_write(future):
+
+    """Remove a finished write from the set of pending writes."""
+
+    with writer_lock:
+        pending_writes.discard(future)
+
+
+def store_entry(cache_dir, key, frame, expires, max_size):
+
+    """Serialize, compress and write an entry, then enforce the size limit."""
+
+    table = pyarrow.Table.from_pandas(frame, preserve_index=False)
+    options = pyarrow.ipc.IpcWriteOptions(compression=pyarrow.Codec(
+        constants.CACHE_COMPRESSION,
+        compression_level=constants.CACHE_COMPRESS_LEVEL))
+
+    def write(f):
+        f.write(header.pack(expires))
+        with pyarrow.ipc.new_file(f, table.schema, options=options) as writer:
+            writer.write_table(table)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    write_file(get_cache_path(cache_dir, key), write)
+
+    if max_size is not None:
+        evict_entries(cache_dir, max_size)
+
+
+def write_file(path, write):
+
+    """Write a file atomically by writing to a temporary file and renaming.
+
+    write is called with the temporary file, opened for writing bytes. The
+    file replaces any existing file at the path only once it has been
+    written, so readers never see a partly written file.
+
+    """
+
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except Exception:
+        remove_entry(tmp_path)
+        raise
+
+
+def frame_from_table(table):
+
+    """Convert a table read from the cache back to the DataFrame stored.
+
+    Dates are returned as datetime.dates in object columns, as they were
+    stored, and missing values in object columns are returned as NaN.
+
+    """
+
+    frame = table.to_pandas(date_as_object=True)
+
+    for name, column in zip(table.column_names, table.columns):
+        if column.null_count > 0 and frame[name].dtype == object:
+            values = frame[name].to_numpy(copy=True)
+            values[column.is_null().to_numpy(zero_copy_only=False)] = np.NaN
+            frame[name] = values
+
+    return frame
+
+
+def check_pyarrow():
+
+    """Raise an ImportError if pyarrow is not installed."""
+
+    if pyarrow is None:
+        raise ImportError(
+            'The disk cache requires pyarrow: pip install pyarrow')
+
+
+def remove_entry(path):
+
+    """Remove a cache file, ignoring files that have already gone."""
+
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def evict_entries(cache_dir, max_size):
+
+    """Remove the least recently used entries until the cache fits."""
+
+    entries = []
+    total_size = 0
+
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if not entry.name.endswith(constants.CACHE_FILE_EXTENSION):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total_size += stat.st_size
+
+    if total_size <= max_size:
+        return
+
+    entries.sort()
+    for mtime, size, path in entries:
+        if total_size <= max_size:
+            break
+        remove_entry(path)
+        total_size -= size
+
+# Cache management ------------------------------------------------------------
+
+def flush_cache():
+
+    """Wait until all pending cache writes have finished."""
+
+    with writer_lock:
+        futures = list(pending_writes)
+
+    concurrent.futures.wait(futures)
+
+
+def clear_cache():
+
+    """Remove all entries from the cache.
+
+    clear_cache removes every entry from the memory cache, waits for any
+    pending writes to finish and then removes every entry from the current
+    cache directory.
+
+    """
+
+    clear_memory_cache()
+    flush_cache()
+
+    cache_dir = settings.get_cache_dir()
+    if cache_dir is None or not os.path.isdir(cache_dir):
+        return
+
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if entry.name.endswith(constants.CACHE_FILE_EXTENSION):
+                remove_entry(entry.path)
@@ -3,12 +3,16 @@
 
 # Imports ---------------------------------------------------------------------
 
+import numpy as np
 import pandas as pd
 
+from . import constants
+from . import errors
 from . import utils
 
-# Functions -------------------------------------------------------------------
+# Party memberships -----------------------------------------------------------
 
+@utils.instrument(constants.HOOK_EVENT_COMBINE)
 def combine_party_memberships(pm):
 
     """Combine consecutive records in a dataframe of party memberships.
@@ -57,21 +61,9 @@ def combine_party_memberships(pm):
             not (pm.columns == required_columns).all():
         raise ValueError('pm does not have the expected columns')
 
-    # Function to identify consecutive memberships of the same party
-    def get_map_party_changes():
-
-        previous_per_par_id = ""
-        group_id = 0
-
-        def map_party_changes(per_par_id):
-            nonlocal previous_per_par_id
-            nonlocal group_id
-            if per_par_id != previous_per_par_id:
-                previous_per_par_id = per_par_id
-                group_id = group_id + 1
-            return "{0}-{1}".format(per_par_id, group_id)
-
-        return map_party_changes
+    # Check the party memberships dataframe has rows
+    if pm.shape[0] == 0:
+        return pm.drop(columns=['party_membership_id'])
 
     # Sort by person id and membership start date
     pm.sort_values(
@@ -79,44 +71,32 @@ def combine_party_memberships(pm):
             'party_membership_start_date'],
         inplace=True)
 
-    # Create unique combination of person_id and party_id
-    pm['per_par_id'] = pm.apply(
-        lambda x: '{0}-{1}'.format(x['person_id'], x['party_id']), axis=1)
+    # Identify runs of consecutive memberships of the same party: a new run
+    # starts wherever the person or the party changes from the previous row
+    person_codes, _ = pd.factorize(pm['person_id'])
+    party_codes, _ = pd.factorize(pm['party_id'])
 
-    # Build an id for consecutive memberships of the same party
-    pm['per_par_mem_id'] = pm['per_par_id'].map(get_map_party_changes())
+    new_run = np.ones(pm.shape[0], dtype=bool)
+    new_run[1:] = \
+        (person_codes[1:] != person_codes[:-1]) | \
+        (party_codes[1:] != party_codes[:-1])
 
-    # Group by person, party and consecutive membership, then take the
-    # earliest start date and latest end date
-    aggregation = {
-        'party_membership_start_date': utils.min_date_nan,
-        'party_membership_end_date': utils.max_date_nan
-    }
+    run_starts = np.flatnonzero(new_run)
+    run_ids = np.cumsum(new_run)[run_starts]
 
-    pmg = pm.groupby([
-        'person_id',
-        'party_id',
-        'per_par_mem_id'])
+    # Take the earliest start date and latest end date for each run, where
+    # a missing date is earlier or later than all others respectively
+    start_dates = reduce_dates(
+        pm['party_membership_start_date'], run_starts, np.minimum)
+    end_dates = reduce_dates(
+        pm['party_membership_end_date'], run_starts, np.maximum)
 
-    pms = pmg.agg(aggregation)
-    pms.reset_index(inplace=True)
+    # Take the person and party details from the first membership of each
+    # run, leaving out memberships with no person or party
+    has_keys = (person_codes[run_starts] >= 0) & \
+        (party_codes[run_starts] >= 0)
 
-    pm = pms.merge(
-        pm[[
-            'person_id',
-            'party_id',
-            'mnis_id',
-            'given_name',
-            'family_name',
-            'display_name',
-            'party_mnis_id',
-            'party_name']],
-        how='left',
-        on=['person_id', 'party_id'])
-
-    pm.drop_duplicates(inplace=True)
-
-    pm = pm[[
+    pm = pm.iloc[run_starts[has_keys]][[
         'person_id',
         'mnis_id',
         'given_name',
@@ -124,14 +104,168 @@ def combine_party_memberships(pm):
         'display_name',
         'party_id',
         'party_mnis_id',
-        'party_name',
-        'party_membership_start_date',
-        'party_membership_end_date']]
+        'party_name']]
+
+    pm['party_membership_start_date'] = pd.Series(
+        start_dates[has_keys], index=pm.index).infer_objects()
+    pm['party_membership_end_date'] = pd.Series(
+        end_dates[has_keys], index=pm.index).infer_objects()
+
+    # Sort by name and start date, breaking ties by person, party and run
+    # id, where run ids are compared as strings
+    pm['run_id'] = run_ids[has_keys].astype(str)
 
     pm.sort_values(
         by=['family_name',
-            'party_membership_start_date'],
+            'party_membership_start_date',
+            'person_id',
+            'party_id',
+            'run_id'],
         inplace=True)
+
+    pm = pm.drop(columns=['run_id'])
     pm.reset_index(drop=True, inplace=True)
 
     return pm
+
+
+def reduce_dates(dates, run_starts, reduce):
+
+    """Find the earliest or latest date in each run of a series of dates.
+
+    reduce_dates takes a series of dates that may contain missing values,
+    the positions at which each run of dates starts, and either numpy.minimum
+    or numpy.maximum, and returns an array with the earliest or latest date
+    in each run. A run that contains a missing date returns a missing date.
+
+    datetime64 dates are reduced directly, as NaT propagates through
+    numpy.minimum and numpy.maximum. datetime.dates are factorized in sorted
+    order, so that missing dates have the lowest code, and an object array is
+    returned.
+
+    """
+
+    if dates.dtype.kind == 'M':
+        return reduce.reduceat(dates.values, run_starts)
+
+    codes, uniques = pd.factorize(dates, sort=True)
+    values = np.append(uniques.astype(object), np.NaN)
+
+    has_missing = np.minimum.reduceat(codes, run_starts) < 0
+    run_codes = reduce.reduceat(codes, run_starts)
+    run_codes[has_missing] = -1
+
+    return values[run_codes]
+
+# Intervals -------------------------------------------------------------------
+
+@utils.instrument(constants.HOOK_EVENT_COMBINE)
+def coalesce_intervals(df, key_cols, start_col, end_col, gap_days=0):
+
+    """Combine overlapping and consecutive periods in a dataframe.
+
+    coalesce_intervals takes a dataframe of time bound records, such as the
+    memberships or roles returned by any of the fetch functions, and combines
+    the periods that overlap or follow on from one another for each
+    combination of the key columns into a single continuous period. The
+    combined period has the start date of the first period and the latest
+    end date of any of the periods. A missing start date is treated as
+    earlier than all others and a missing end date as later than all others,
+    so a period that is still open absorbs every period that follows it.
+
+    Only the key columns and the start and end columns are returned. Columns
+    that have the same value for each key, such as names, can be kept by
+    including them in the key columns.
+
+    Parameters
+    ----------
+    df : DataFrame
+        A pandas dataframe containing data on a time bound activity.
+    key_cols : str or list of str
+        The name of the column, or a list of the names of the columns, that
+        identify the records whose periods can be combined e.g. ['person_id',
+        'position_id'].
+    start_col : str
+        The name of the column that contains the start date for the period.
+    end_col : str
+        The name of the column that contains the end date for the period.
+    gap_days : int, optional
+        The number of days that may separate the end of one period and the
+        start of the next for the periods to be combined. The default value
+        is 0, which means periods are combined if they overlap or if one
+        starts on the day after the other ends.
+
+    Returns
+    -------
+    out : DataFrame
+        A pandas dataframe with one row per combined period, containing the
+        key columns and the start and end columns, sorted by the key columns
+        and start date.
+
+    """
+
+    if isinstance(key_cols, str):
+        key_cols = [key_cols]
+    else:
+        key_cols = list(key_cols)
+
+    # Check the columns exist
+    for col in key_cols + [start_col, end_col]:
+        if col not in df.columns:
+            raise errors.MissingColumnError(col)
+
+    # Check the gap is a whole number of days
+    if isinstance(gap_days, bool) or not isinstance(gap_days, int) or \
+            gap_days < 0:
+        raise ValueError('gap_days must be a non-negative integer')
+
+    df = df[key_cols + [start_col, end_col]]
+
+    # Check the dataframe has rows
+    if df.shape[0] == 0:
+        return df.reset_index(drop=True)
+
+    # Number the keys in sorted order and convert the dates to days, with
+    # missing start dates earliest and missing end dates latest. Each key
+    # column is factorized in sorted order first, with missing values last,
+    # so object and categorical key columns are numbered in the same order
+    key_codes = {}
+    for col in key_cols:
+        codes, uniques = pd.factorize(df[col], sort=True)
+        codes[codes < 0] = len(uniques)
+        key_codes[col] = codes
+
+    keys = pd.DataFrame(key_codes).groupby(
+        key_cols, sort=True).ngroup().values
+    starts = utils.convert_date_days(df[start_col])
+    ends = utils.convert_date_days(df[end_col])
+
+    latest = np.iinfo(np.int64).max // 2
+    starts = starts.view(np.int64)
+    ends = np.where(np.isnat(ends), latest, ends.view(np.int64))
+
+    # Sort by key and start date, then find the latest end date so far for
+    # each key, up to and including the previous period
+    order = np.lexsort((starts, keys))
+    keys = keys[order]
+    starts = starts[order]
+    max_ends = pd.Series(ends[order]).groupby(keys).cummax().values
+
+    # A new period starts wherever the key changes or the start date is more
+    # than the gap after the latest end date so far
+    new_period = np.ones(len(keys), dtype=bool)
+    new_period[1:] = \
+        (keys[1:] != keys[:-1]) | \
+        (starts[1:] > max_ends[:-1] + gap_days + 1)
+
+    period_starts = np.flatnonzero(new_period)
+
+    df = df.iloc[order]
+    start_dates = reduce_dates(df[start_col], period_starts, np.minimum)
+    end_dates = reduce_dates(df[end_col], period_starts, np.maximum)
+
+    df = df.iloc[period_starts][key_cols].reset_index(drop=True)
+    df[start_col] = pd.Series(start_dates).infer_objects()
+    df[end_col] = pd.Series(end_dates).infer_objects()
+
+    return df
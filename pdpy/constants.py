@@ -6,9 +6,215 @@
 SETTINGS_API_URL = 'api_url'
 SETTINGS_API_URL_DEFAULT = 'https://api.parliament.uk/sparql'
 
+SETTINGS_POOL_SIZE = 'pool_size'
+SETTINGS_POOL_SIZE_DEFAULT = 10
+
+SETTINGS_KEEP_ALIVE = 'keep_alive'
+SETTINGS_KEEP_ALIVE_DEFAULT = True
+
+SETTINGS_TIMEOUT = 'timeout'
+SETTINGS_TIMEOUT_DEFAULT = None
+
+SETTINGS_RESULT_FORMAT = 'result_format'
+SETTINGS_RESULT_FORMAT_DEFAULT = 'json'
+
+SETTINGS_CACHE_DIR = 'cache_dir'
+SETTINGS_CACHE_DIR_DEFAULT = None
+
+SETTINGS_CACHE_TTL = 'cache_ttl'
+SETTINGS_CACHE_TTL_DEFAULT = 86400
+
+SETTINGS_CACHE_MAX_SIZE = 'cache_max_size'
+SETTINGS_CACHE_MAX_SIZE_DEFAULT = 512 * 1024 * 1024
+
+SETTINGS_MEMORY_CACHE_SIZE = 'memory_cache_size'
+SETTINGS_MEMORY_CACHE_SIZE_DEFAULT = 32
+
+SETTINGS_MEMORY_CACHE_TTL = 'memory_cache_ttl'
+SETTINGS_MEMORY_CACHE_TTL_DEFAULT = 300
+
+SETTINGS_PAGE_SIZE = 'page_size'
+SETTINGS_PAGE_SIZE_DEFAULT = 10000
+
+SETTINGS_PAGING_THRESHOLD = 'paging_threshold'
+SETTINGS_PAGING_THRESHOLD_DEFAULT = None
+
+SETTINGS_MAX_RETRIES = 'max_retries'
+SETTINGS_MAX_RETRIES_DEFAULT = 3
+
+SETTINGS_RETRY_BACKOFF = 'retry_backoff'
+SETTINGS_RETRY_BACKOFF_DEFAULT = 0.5
+
+SETTINGS_RETRY_STATUS_CODES = 'retry_status_codes'
+SETTINGS_RETRY_STATUS_CODES_DEFAULT = (429, 502, 503, 504)
+
+SETTINGS_DATE_DTYPE = 'date_dtype'
+SETTINGS_DATE_DTYPE_DEFAULT = 'object'
+
+SETTINGS_CATEGORICAL = 'categorical'
+SETTINGS_CATEGORICAL_DEFAULT = False
+
+SETTINGS_SNAPSHOT_DIR = 'snapshot_dir'
+SETTINGS_SNAPSHOT_DIR_DEFAULT = None
+
+SETTINGS_TRANSPORT = 'transport'
+SETTINGS_TRANSPORT_DEFAULT = None
+
 # API settings ----------------------------------------------------------------
 
 API_PAUSE_TIME = 0.5
+STREAM_CHUNK_SIZE = 65536
+
+# Retries ---------------------------------------------------------------------
+
+RETRY_AFTER_STATUS_CODES = (429, 503)
+RETRY_WAIT_MAX = 60
+
+# Cache -----------------------------------------------------------------------
+
+CACHE_FILE_EXTENSION = '.cache'
+CACHE_COMPRESSION = 'zstd'
+CACHE_COMPRESS_LEVEL = 1
+
+# Hook events -----------------------------------------------------------------
+
+HOOK_EVENT_REQUEST_START = 'request_start'
+HOOK_EVENT_REQUEST_END = 'request_end'
+HOOK_EVENT_RESPONSE = 'response_received'
+HOOK_EVENT_DECODE = 'decode_done'
+HOOK_EVENT_FILTER = 'filter_done'
+HOOK_EVENT_COMBINE = 'combine_done'
+HOOK_EVENT_DATES = 'dates_done'
+HOOK_EVENT_PROCESS = 'process_done'
+HOOK_EVENT_FETCH = 'fetch_done'
+
+HOOK_EVENTS = (
+    HOOK_EVENT_REQUEST_START,
+    HOOK_EVENT_REQUEST_END,
+    HOOK_EVENT_RESPONSE,
+    HOOK_EVENT_DECODE,
+    HOOK_EVENT_FILTER,
+    HOOK_EVENT_COMBINE,
+    HOOK_EVENT_DATES,
+    HOOK_EVENT_PROCESS,
+    HOOK_EVENT_FETCH)
+
+# Profiling -------------------------------------------------------------------
+
+# Events recorded by a profile and the names of the stages for events that
+# are not fired by an instrumented function
+PROFILE_EVENTS = (
+    HOOK_EVENT_REQUEST_END,
+    HOOK_EVENT_RESPONSE,
+    HOOK_EVENT_DECODE,
+    HOOK_EVENT_FILTER,
+    HOOK_EVENT_COMBINE,
+    HOOK_EVENT_DATES,
+    HOOK_EVENT_PROCESS,
+    HOOK_EVENT_FETCH)
+
+PROFILE_STAGE_NAMES = {
+    HOOK_EVENT_RESPONSE: 'network_wait',
+    HOOK_EVENT_DECODE: 'decode'}
+
+PROFILE_COLUMNS = [
+    'call',
+    'depth',
+    'stage',
+    'rows_in',
+    'rows_out',
+    'bytes',
+    'elapsed',
+    'self_elapsed']
+
+# Snapshots -------------------------------------------------------------------
+
+SNAPSHOT_MANIFEST = 'manifest.json'
+SNAPSHOT_FILE_EXTENSION = '.arrow'
+SNAPSHOT_FORMAT_VERSION = 1
+
+# Recordings ------------------------------------------------------------------
+
+RECORDING_FILE_EXTENSION = '.json'
+RECORDING_CHUNK_SIZE = 16384
+
+# Result formats --------------------------------------------------------------
+
+RESULT_FORMAT_JSON = 'json'
+RESULT_FORMAT_CSV = 'csv'
+RESULT_FORMAT_TSV = 'tsv'
+
+RESULT_FORMAT_MEDIA_TYPES = {
+    RESULT_FORMAT_JSON: 'application/sparql-results+json',
+    RESULT_FORMAT_CSV: 'text/csv',
+    RESULT_FORMAT_TSV: 'text/tab-separated-values'
+}
+
+TSV_ESCAPES = {
+    '\\t': '\t',
+    '\\n': '\n',
+    '\\r': '\r',
+    '\\"': '"',
+    '\\\\': '\\'
+}
+
+# Date types ------------------------------------------------------------------
+
+DATE_DTYPE_OBJECT = 'object'
+DATE_DTYPE_DATETIME64 = 'datetime64'
+
+DATE_DTYPES = (DATE_DTYPE_OBJECT, DATE_DTYPE_DATETIME64)
+
+# Date columns ----------------------------------------------------------------
+
+DATE_COLS_MEMBERS = [
+    'date_of_birth',
+    'date_of_death']
+
+DATE_COLS_SEAT_INCUMBENCIES = [
+    'seat_incumbency_start_date',
+    'seat_incumbency_end_date']
+
+DATE_COLS_PARTY_MEMBERSHIPS = [
+    'party_membership_start_date',
+    'party_membership_end_date']
+
+DATE_COLS_GOVERNMENT_ROLES = [
+    'government_incumbency_start_date',
+    'government_incumbency_end_date']
+
+DATE_COLS_OPPOSITION_ROLES = [
+    'opposition_incumbency_start_date',
+    'opposition_incumbency_end_date']
+
+DATE_COLS_COMMITTEE_MEMBERSHIPS = [
+    'committee_membership_start_date',
+    'committee_membership_end_date']
+
+# Categorical columns ---------------------------------------------------------
+
+# Columns that repeat a small number of distinct values across many rows
+CATEGORICAL_COLS = [
+    'gender',
+    'party_id',
+    'party_mnis_id',
+    'party_name',
+    'seat_type_id',
+    'seat_type_name',
+    'committee_id',
+    'committee_name',
+    'committee_type_id',
+    'committee_type_name',
+    'position_id',
+    'position_name',
+    'constituency_id',
+    'constituency_name',
+    'constituency_ons_id']
+
+# Dates -----------------------------------------------------------------------
+
+# Ordinal of 1970-01-01, the day that datetime64[D] values count from
+UNIX_EPOCH_ORDINAL = 719163
 
 # XML ids ---------------------------------------------------------------------
 
@@ -3,31 +3,173 @@
 
 # Imports ---------------------------------------------------------------------
 
+import asyncio
+import codecs
+import concurrent.futures
+import contextvars
+import csv
 import datetime
+import email.utils
+import io
+import itertools
 import json
 import numpy as np
 import pandas as pd
+import random
+import re
 import requests
+import threading
+import time
+import weakref
 
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from . import cache
 from . import constants
 from . import errors
 from . import settings
+from . import utils
+
+# Patterns --------------------------------------------------------------------
+
+tsv_escapes = re.compile('|'.join(
+    re.escape(escape) for escape in constants.TSV_ESCAPES))
+
+sparql_comments = re.compile(
+    r'("(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\'|<[^<>"{}|^`\\\s]*>)'
+    r'|#[^\n]*')
+
+sparql_prologue = re.compile(
+    r'\s*(?:(?:PREFIX\s+[^\s:]*:\s*<[^>]*>|BASE\s+<[^>]*>)\s*)*',
+    re.IGNORECASE)
+
+sparql_select_clause = re.compile(
+    r'SELECT\s+(?:(?:DISTINCT|REDUCED)\s+)?(.*?)\s*(?:\bWHERE\b|\bFROM\b|\{)',
+    re.IGNORECASE | re.DOTALL)
+
+sparql_modifiers = re.compile(
+    r'\b(?:ORDER\s+BY|LIMIT|OFFSET|GROUP\s+BY|HAVING|VALUES)\b',
+    re.IGNORECASE)
+
+sparql_variable = re.compile(r'[?$](\w+)')
+
+# Sessions --------------------------------------------------------------------
+
+sessions = {}
+sessions_lock = threading.Lock()
+
+
+def get_session(url=None):
+
+    """Get the pooled http session for an api endpoint.
+
+    get_session returns the requests Session used to send queries to the
+    given endpoint, creating it if necessary. There is one session per
+    endpoint, so connections are kept alive and reused between queries
+    rather than opened afresh for each request. The session is configured
+    with the pool size, keep alive and transport settings. If those settings
+    have changed since the session was created, the session is closed and
+    replaced.
+
+    Parameters
+    ----------
+    url : str, optional
+        The url of the api endpoint. The default value is None, which means
+        the currently set api url is used.
+
+    Returns
+    -------
+    out : Session
+        A requests Session for the endpoint.
+
+    """
+
+    if url is None:
+        url = settings.get_api_url()
+
+    config = (
+        settings.get_pool_size(),
+        settings.get_keep_alive(),
+        settings.get_transport())
+
+    with sessions_lock:
+
+        if url in sessions:
+            session_config, session = sessions[url]
+            if session_config == config:
+                return session
+            session.close()
+
+        pool_size, keep_alive, transport = config
+        if transport is None:
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=pool_size)
+        else:
+            adapter = transport(pool_size)
+
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        if not keep_alive:
+            session.headers['connection'] = 'close'
+
+        sessions[url] = (config, session)
+        return session
+
+
+def close_sessions():
+
+    """Close all pooled http sessions.
+
+    close_sessions closes the sessions for every endpoint and releases their
+    connections. New sessions are created automatically the next time a
+    query is sent, so this function can also be used to reset the pool.
+
+    """
+
+    with sessions_lock:
+        for session_config, session in sessions.values():
+            session.close()
+        sessions.clear()
 
 # Functions  ------------------------------------------------------------------
 
-def request(query):
+def request(query, stream=False, result_format=None):
 
     """Send an http request with a query and return the response.
 
     request sends a SPARQL query to the api endpoint and returns the response
-    object. It is a simple wrapper around request.post. It sets the appropriate
-    headers and sends the query as the request body. It does not validate the
-    query or handle the response in any way. The response format is JSON.
+    object. It is a simple wrapper around Session.post, which uses the pooled
+    session for the endpoint and the timeout from the package settings. It
+    sets the appropriate headers and sends the query as the request body. It
+    does not validate the query or handle the response in any way. The
+    response format is JSON unless another format is requested.
+
+    Requests that fail with a temporary error are retried with exponential
+    backoff, up to the maximum number of retries in the package settings.
+    Connection errors and responses with a retryable status are retried. If
+    the last attempt fails the connection error is raised or the response
+    is returned. Each attempt is recorded in the request statistics. If the
+    request is sent from a batch of queries, each attempt takes a token from
+    the batch's token bucket, so retries count towards its rate limit.
 
     Parameters
     ----------
     query : str
         A SPARQL query as a string.
+    stream : bool, optional
+        A boolean indicating whether to defer downloading the response body
+        until it is read, so that it can be processed incrementally. The
+        default value is False.
+    result_format : str, optional
+        The format in which to ask for the results: 'json', 'csv' or 'tsv'.
+        The default value is None, which means the result format from the
+        package settings is used.
 
     Returns
     -------
@@ -37,14 +179,71 @@ def request(query):
     """
 
     url = settings.get_api_url()
+    headers = get_request_headers(result_format)
+    session = get_session(url)
+    max_retries = settings.get_max_retries()
+    retry_status_codes = settings.get_retry_status_codes()
+    record_request()
+
+    bucket = request_bucket.get()
+
+    for attempt in itertools.count():
+
+        if bucket is not None:
+            bucket.acquire()
+
+        start = time.perf_counter()
+
+        try:
+            response = session.post(
+                url,
+                headers=headers,
+                data=query,
+                stream=stream,
+                timeout=settings.get_timeout())
+        except requests.ConnectionError:
+            record_attempt(time.perf_counter() - start, failed=True)
+            if attempt >= max_retries:
+                raise
+            delay = get_retry_delay(attempt)
+        else:
+            retry = response.status_code in retry_status_codes
+            record_attempt(time.perf_counter() - start, failed=retry)
+            if not retry or attempt >= max_retries:
+                return response
+            delay = get_retry_delay(attempt, response)
+            response.close()
+
+        record_retry(delay)
+        time.sleep(delay)
+
+
+def get_request_headers(result_format=None):
+
+    """Get the http headers for a query asking for the given result format."""
+
+    if result_format is None:
+        result_format = settings.get_result_format()
+
+    if result_format not in constants.RESULT_FORMAT_MEDIA_TYPES:
+        raise ValueError(
+            '{0} is not a valid result format'.format(result_format))
+
     headers = {}
     headers['content-type'] = 'application/sparql-query'
-    headers['accept'] = 'application/sparql-results+json'
-    response = requests.post(url, headers=headers, data=query)
-    return response
+    headers['accept'] = constants.RESULT_FORMAT_MEDIA_TYPES[result_format]
+    return headers
 
 
-def sparql_select(query):
+@utils.instrument(
+    constants.HOOK_EVENT_REQUEST_END,
+    start_event=constants.HOOK_EVENT_REQUEST_START,
+    query=True)
+def sparql_select(query,
+                  stream=False,
+                  result_format=None,
+                  date_cols=None,
+                  arrow=False):
 
     """Send a select query and return the response as a DataFrame.
 
@@ -56,46 +255,1425 @@ def sparql_select(query):
     or the request fails for any other reason a RequestError will be raised
     with the response text.
 
+    The stream argument can be used to parse large results incrementally as
+    they are downloaded. In streaming mode the response body and the full
+    tree of parsed JSON are never held in memory at once: each binding is
+    decoded into column buffers as soon as it has been read, so peak memory
+    stays close to the size of the DataFrame returned.
+
+    The result_format argument can be used to ask for the results as CSV or
+    TSV rather than JSON. These formats are more compact and are parsed with
+    the pandas C parser. TSV results include datatypes, so dates are
+    converted as they are with JSON. CSV results do not include datatypes,
+    so dates are only converted in the columns listed in date_cols. CSV
+    results also cannot distinguish an empty string from an unbound value,
+    so both are returned as NaN. Streaming applies only to JSON results.
+
+    If a paging threshold has been set, the number of rows in the result is
+    counted first, and results with more rows than the threshold are
+    downloaded in pages with iter_sparql_select and combined. Queries with
+    their own solution modifiers, such as ORDER BY or LIMIT, are not paged.
+
+    Results are kept in a memory cache and, if a cache directory has been
+    set, cached on disk. Repeated queries to the same endpoint are answered
+    from the cache until their entries expire. See the cache settings for
+    details.
+
+    The arrow argument can be used to return the results as a pyarrow Table
+    rather than a DataFrame, with date32 date columns and dictionary-encoded
+    low-cardinality string columns. See to_arrow for details.
+
     Parameters
     ----------
     query : str
         A SPARQL SELECT query as a string.
+    stream : bool, optional
+        A boolean indicating whether to parse the response incrementally as it
+        is downloaded. The default value is False.
+    result_format : str, optional
+        The format in which to ask for the results: 'json', 'csv' or 'tsv'.
+        The default value is None, which means the result format from the
+        package settings is used.
+    date_cols : list, optional
+        A list of the names of columns that contain dates. These are used to
+        convert dates in CSV results. The default value is None.
+    arrow : bool, optional
+        A boolean indicating whether to return the results as a pyarrow Table
+        rather than a pandas dataframe. This requires pyarrow. The default
+        value is False.
 
     Returns
     -------
-    out : DataFrame
-        A pandas dataframe containing the results of the query.
+    out : DataFrame or pyarrow.Table
+        A pandas dataframe containing the results of the query, or a pyarrow
+        Table if arrow is True.
 
     """
 
+    if result_format is None:
+        result_format = settings.get_result_format()
+
+    # Return the cached result if there is one
+    key = get_cache_key(query, result_format, date_cols)
+    if key is not None:
+        data = cache.get_result(key)
+        if data is not None:
+            return get_output(data, arrow)
+
+    # Download large results in pages if the paging threshold is exceeded
+    if use_paging(query):
+        data = pd.concat(
+            iter_sparql_select(
+                query,
+                result_format=result_format,
+                date_cols=date_cols),
+            ignore_index=True)
+        data = convert_dates(data)
+    else:
+        data = send_select(
+            query,
+            stream=stream,
+            result_format=result_format,
+            date_cols=date_cols)
+
+    if key is not None:
+        cache.set_result(key, data)
+
+    return get_output(data, arrow)
+
+
+def send_select(query, stream=False, result_format=None, date_cols=None):
+
+    """Send a select query and decode the response without caching."""
+
+    if result_format is None:
+        result_format = settings.get_result_format()
+
     # Send the query and get the response
-    response = request(query)
+    stream = stream and result_format == constants.RESULT_FORMAT_JSON
+    start = time.perf_counter()
+    response = request(query, stream=stream, result_format=result_format)
+
+    # The body of a streamed response is downloaded as it is decoded
+    content = None if stream else response.content
+    received = time.perf_counter()
+
+    utils.record_response(
+        response.status_code, None if stream else len(content))
+    utils.fire_hook(
+        constants.HOOK_EVENT_RESPONSE,
+        query=query,
+        stage='send_select',
+        endpoint=settings.get_api_url(),
+        status=response.status_code,
+        bytes=None if stream else len(content),
+        start=start,
+        elapsed=received - start)
 
     # If the server returned an error raise it with the response text
     if not response.ok:
         raise errors.RequestError(response.text)
 
     # Process the response as tabular data and return it as a DataFrame
-    json = response.json()
-    rows = []
-    headers = json['head']['vars']
-    records = json['results']['bindings']
-
-    # For each record build a row and assign values based on the data type
-    for record in records:
-        row = []
-        for header in headers:
-            if header in record:
-                if 'datatype' in record[header] and \
-                        record[header]['datatype'] == constants.XML_DATE:
-
-                    row.append(
-                        datetime.datetime.strptime(
-                        record[header]['value'], '%Y-%m-%d+%H:%M').date())
+    if stream:
+        with response:
+            data = decode_json_stream(response.iter_content(
+                chunk_size=constants.STREAM_CHUNK_SIZE))
+    else:
+        data = decode_results(content, result_format, date_cols)
+
+    utils.fire_hook(
+        constants.HOOK_EVENT_DECODE,
+        query=query,
+        stage='send_select',
+        endpoint=settings.get_api_url(),
+        status=response.status_code,
+        bytes=None if stream else len(content),
+        rows=data.shape[0],
+        start=received,
+        elapsed=time.perf_counter() - received)
+
+    return convert_dates(data)
+
+
+def get_cache_key(query, result_format, date_cols=None):
+
+    """Get the cache key for a query, or None if caching is turned off."""
+
+    if not cache.is_enabled():
+        return None
+
+    return cache.get_cache_key(
+        settings.get_api_url(),
+        query,
+        result_format,
+        date_cols,
+        settings.get_date_dtype())
+
+
+@utils.instrument(constants.HOOK_EVENT_DATES)
+def convert_dates(data):
+
+    """Convert the dates in a result to the date dtype setting."""
+
+    if settings.get_date_dtype() == constants.DATE_DTYPE_DATETIME64:
+        return utils.convert_date_columns(data)
+
+    return data
+
+
+def get_output(data, arrow=False):
+
+    """Return a result as a DataFrame, or as a pyarrow Table if requested."""
+
+    if arrow:
+        return utils.to_arrow(data)
+
+    return data
+
+
+def decode_results(content, result_format, date_cols=None):
+
+    """Decode the body of a SPARQL SELECT response in the given format."""
+
+    if result_format == constants.RESULT_FORMAT_CSV:
+        return decode_csv_results(content, date_cols=date_cols)
+
+    if result_format == constants.RESULT_FORMAT_TSV:
+        return decode_tsv_results(content)
+
+    return decode_json_results(json.loads(content))
+
+# Retries ---------------------------------------------------------------------
+
+request_stats_lock = threading.Lock()
+request_stats = {}
+
+
+def get_retry_delay(attempt, response=None):
+
+    """Get the number of seconds to wait before retrying a request.
+
+    The delay is chosen at random between zero and the retry backoff
+    doubled for each previous attempt, so that clients retrying at the same
+    time spread out their requests. If the response has a status of 429 or
+    503 and a Retry-After header, the delay it asks for is used instead.
+    Delays are capped at RETRY_WAIT_MAX seconds.
+
+    Parameters
+    ----------
+    attempt : int
+        The number of the attempt that failed, counting from zero.
+    response : optional
+        The response to the attempt that failed, if there was one. This can
+        be a requests Response or an aiohttp ClientResponse.
+
+    Returns
+    -------
+    out : float
+        The delay in seconds.
+
+    """
+
+    if response is not None:
+        status = getattr(response, 'status_code', None)
+        if status is None:
+            status = response.status
+        if status in constants.RETRY_AFTER_STATUS_CODES:
+            retry_after = parse_retry_after(
+                response.headers.get('retry-after'))
+            if retry_after is not None:
+                return min(retry_after, constants.RETRY_WAIT_MAX)
+
+    backoff = settings.get_retry_backoff() * 2 ** attempt
+    return random.uniform(0, min(backoff, constants.RETRY_WAIT_MAX))
+
+
+def parse_retry_after(retry_after):
+
+    """Parse a Retry-After header as a number of seconds.
+
+    The header can give either a number of seconds or an http date. Returns
+    None if the header is missing or cannot be parsed.
+
+    """
+
+    if retry_after is None:
+        return None
+
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+
+    try:
+        retry_date = email.utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+
+    now = datetime.datetime.now(retry_date.tzinfo)
+    return max(0.0, (retry_date - now).total_seconds())
+
+
+def record_request():
+
+    """Count a request in the request statistics."""
+
+    with request_stats_lock:
+        request_stats['requests'] = request_stats.get('requests', 0) + 1
+
+
+def record_attempt(elapsed, failed=False):
+
+    """Count and time an attempt in the request statistics."""
+
+    with request_stats_lock:
+        request_stats['attempts'] = request_stats.get('attempts', 0) + 1
+        request_stats['attempt_time'] = \
+            request_stats.get('attempt_time', 0.0) + elapsed
+        if failed:
+            request_stats['failed_attempts'] = \
+                request_stats.get('failed_attempts', 0) + 1
+            request_stats['failed_attempt_time'] = \
+                request_stats.get('failed_attempt_time', 0.0) + elapsed
+
+
+def record_retry(delay):
+
+    """Count a retry and its delay in the request statistics."""
+
+    with request_stats_lock:
+        request_stats['retries'] = request_stats.get('retries', 0) + 1
+        request_stats['retry_wait_time'] = \
+            request_stats.get('retry_wait_time', 0.0) + delay
+
+
+def get_request_stats():
+
+    """Get statistics on the requests sent to the api.
+
+    get_request_stats returns a dictionary of counts and timings for the
+    requests sent since the statistics were last reset. The latency added
+    by retries is the sum of failed_attempt_time and retry_wait_time.
+
+    Returns
+    -------
+    out : dict
+        A dictionary with the following items:
+
+        requests : the number of requests sent
+        attempts : the number of attempts made to send them
+        failed_attempts : the number of attempts that failed
+        retries : the number of attempts that were retried
+        attempt_time : the total time spent on attempts in seconds
+        failed_attempt_time : the time spent on failed attempts in seconds
+        retry_wait_time : the time spent waiting to retry in seconds
+
+    """
+
+    stats = {
+        'requests': 0,
+        'attempts': 0,
+        'failed_attempts': 0,
+        'retries': 0,
+        'attempt_time': 0.0,
+        'failed_attempt_time': 0.0,
+        'retry_wait_time': 0.0}
+
+    with request_stats_lock:
+        stats.update(request_stats)
+
+    return stats
+
+
+def reset_request_stats():
+
+    """Reset the request statistics."""
+
+    with request_stats_lock:
+        request_stats.clear()
+
+# Paged queries ---------------------------------------------------------------
+
+def iter_sparql_select(query,
+                       page_size=None,
+                       result_format=None,
+                       date_cols=None):
+
+    """Send a select query in pages and yield each page as a DataFrame.
+
+    iter_sparql_select wraps a SPARQL SELECT query in a subquery and sends
+    it repeatedly with LIMIT and OFFSET, yielding the rows of each page as a
+    DataFrame until the results are exhausted. Each request is smaller and
+    quicker than a request for the full results, and only one page needs to
+    be held in memory at a time.
+
+    To keep the pages stable between requests the results are ordered by
+    every projected variable, so the rows are returned in that order rather
+    than in any order given in the query. If the query projects variables
+    with SELECT *, an extra request is sent to find their names. The first
+    page is always yielded, even if it has no rows. Pages are not cached.
+
+    Parameters
+    ----------
+    query : str
+        A SPARQL SELECT query as a string.
+    page_size : int, optional
+        The maximum number of rows in each page. The default value is None,
+        which means the page size setting is used.
+    result_format : str, optional
+        The format in which to ask for the results: 'json', 'csv' or 'tsv'.
+        The default value is None, which means the result format from the
+        package settings is used.
+    date_cols : list, optional
+        A list of the names of columns that contain dates. These are used to
+        convert dates in CSV results. The default value is None.
+
+    Yields
+    ------
+    out : DataFrame
+        A pandas dataframe containing the rows of each page of results.
+
+    """
+
+    if page_size is None:
+        page_size = settings.get_page_size()
+
+    if type(page_size) != int or page_size < 1:
+        raise ValueError('page_size must be a positive integer')
+
+    prologue, body = split_query(query)
+    variables = get_projected_variables(body)
+
+    # Find the variables projected by SELECT * with an empty result
+    if variables is None:
+        variables = list(send_select(
+            get_paged_query(prologue, body, '*', limit=0),
+            result_format=constants.RESULT_FORMAT_JSON).columns)
+
+    offset = 0
+
+    while True:
+
+        page_query = get_paged_query(
+            prologue,
+            body,
+            variables,
+            limit=page_size,
+            offset=offset)
+
+        page = send_select(
+            page_query,
+            result_format=result_format,
+            date_cols=date_cols)
+
+        if offset == 0 or len(page) > 0:
+            yield page
+
+        if len(page) < page_size:
+            return
+
+        offset += page_size
+
+
+def use_paging(query):
+
+    """Return True if a query should be downloaded in pages.
+
+    A query is paged if a paging threshold has been set, the query has no
+    solution modifiers of its own, and the number of rows it returns is
+    greater than the threshold.
+
+    """
+
+    threshold = settings.get_paging_threshold()
+    if threshold is None:
+        return False
+
+    prologue, body = split_query(query)
+    if has_solution_modifiers(body):
+        return False
+
+    return count_rows(query) > threshold
+
+
+def count_rows(query):
+
+    """Count the number of rows returned by a select query."""
+
+    prologue, body = split_query(query)
+    count_query = '{0}\nSELECT (COUNT(*) AS ?count) WHERE {{\n{1}\n}}'.format(
+        prologue, body)
+    data = send_select(
+        count_query,
+        result_format=constants.RESULT_FORMAT_JSON)
+    return int(data['count'][0])
+
+
+def split_query(query):
+
+    """Split a query into its prologue of PREFIX and BASE declarations and
+    the SELECT query that follows them. Comments are removed."""
+
+    query = strip_comments(query)
+    match = sparql_prologue.match(query)
+    return query[:match.end()].strip(), query[match.end():].strip()
+
+
+def strip_comments(query):
+
+    """Remove comments from a SPARQL query, leaving literals and IRIs."""
+
+    def replace(match):
+        return match.group(1) if match.group(1) is not None else ''
+
+    return sparql_comments.sub(replace, query)
+
+
+def get_projected_variables(body):
+
+    """Get the names of the variables projected by a SELECT query.
+
+    Expressions projected with AS are represented by the variable they are
+    bound to. Returns None if the query projects its variables with
+    SELECT *.
+
+    """
+
+    match = sparql_select_clause.search(body)
+    if match is None:
+        raise ValueError('Could not find the SELECT clause in the query')
+
+    clause = match.group(1).strip()
+    if clause == '*':
+        return None
+
+    variables = []
+    depth = 0
+    start = 0
+
+    for i, char in enumerate(clause):
+        if char == '(':
+            if depth == 0:
+                variables.extend(
+                    sparql_variable.findall(clause[start:i]))
+                start = i
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                expression = clause[start:i + 1]
+                variables.append(sparql_variable.findall(expression)[-1])
+                start = i + 1
+
+    variables.extend(sparql_variable.findall(clause[start:]))
+    return variables
+
+
+def has_solution_modifiers(body):
+
+    """Return True if a SELECT query has solution modifiers after its WHERE
+    clause, such as ORDER BY, LIMIT or OFFSET."""
+
+    return sparql_modifiers.search(body[body.rfind('}') + 1:]) is not None
+
+
+def get_paged_query(prologue, body, variables, limit, offset=0):
+
+    """Wrap a SELECT query in a subquery that returns one page of results.
+
+    The results are ordered by every projected variable so that the pages
+    are stable between requests.
+
+    """
+
+    if variables == '*':
+        projection = '*'
+        order_by = ''
+    else:
+        projection = ' '.join('?{0}'.format(v) for v in variables)
+        order_by = '\nORDER BY {0}'.format(projection)
+
+    return '{0}\nSELECT {1} WHERE {{\n{{\n{2}\n}}\n}}{3}\nLIMIT {4}{5}'.format(
+        prologue,
+        projection,
+        body,
+        order_by,
+        limit,
+        '' if offset == 0 else ' OFFSET {0}'.format(offset))
+
+# Batch queries ---------------------------------------------------------------
+
+# The token bucket of the batch a request is sent from, which request takes a
+# token from before each attempt
+request_bucket = contextvars.ContextVar('request_bucket', default=None)
+
+
+class TokenBucket:
+
+    """A thread-safe token bucket for limiting the rate of requests.
+
+    The bucket holds up to capacity tokens and is refilled continuously at
+    the given rate. Each call to acquire takes one token, blocking until a
+    token is available. A single bucket can be shared between threads to
+    limit their combined rate of requests.
+
+    Parameters
+    ----------
+    rate : float
+        The number of tokens added to the bucket per second.
+    capacity : int, optional
+        The maximum number of tokens the bucket can hold, which is the size
+        of the largest burst of requests allowed. The default value is 1.
+
+    """
+
+    def __init__(self, rate, capacity=1):
+
+        if rate <= 0:
+            raise ValueError('rate must be greater than zero')
+
+        if capacity < 1:
+            raise ValueError('capacity must be at least one')
+
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+
+        """Take a token from the bucket, waiting until one is available."""
+
+        while True:
+
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity,
+                    self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+
+def sparql_select_many(queries,
+                       max_workers=None,
+                       rate=None,
+                       result_format=None,
+                       date_cols=None):
+
+    """Send a batch of select queries and return a list of DataFrames.
+
+    sparql_select_many sends each query with sparql_select using a pool of
+    worker threads, and returns the results in the same order as the
+    queries. The workers share a token bucket which limits the rate at which
+    requests are sent to the api, so a batch of queries can be run
+    concurrently without overloading the server. A token is taken for each
+    http request, including retries, so the rate is not exceeded when the
+    server asks for requests to be retried.
+
+    If any of the queries fail, the remaining queries are still run and a
+    BatchRequestError is raised once the batch has finished. The error
+    contains the results of the successful queries and the exceptions raised
+    by the queries that failed.
+
+    Parameters
+    ----------
+    queries : list
+        A list of SPARQL SELECT queries as strings.
+    max_workers : int, optional
+        The maximum number of queries to run at the same time. The default
+        value is None, which means the pool size setting is used.
+    rate : float, optional
+        The maximum number of requests to send per second. The default value
+        is None, which means one request is sent every API_PAUSE_TIME
+        seconds.
+    result_format : str, optional
+        The format in which to ask for the results: 'json', 'csv' or 'tsv'.
+        The default value is None, which means the result format from the
+        package settings is used.
+    date_cols : list, optional
+        A list with an item for each query, which is the list of the names of
+        columns that contain dates in that query's results, or None. These
+        are passed to sparql_select for each query. The default value is
+        None, which means no date columns are passed for any query.
+
+    Returns
+    -------
+    out : list
+        A list of pandas dataframes containing the results of each query.
+
+    """
+
+    queries = list(queries)
+
+    if date_cols is None:
+        date_cols = [None] * len(queries)
+    else:
+        date_cols = list(date_cols)
+        if len(date_cols) != len(queries):
+            raise ValueError('date_cols must have an item for each query')
+
+    if max_workers is None:
+        max_workers = settings.get_pool_size()
+
+    if rate is None:
+        rate = 1 / constants.API_PAUSE_TIME
+
+    bucket = TokenBucket(rate)
+
+    def select(query, query_date_cols):
+        request_bucket.set(bucket)
+        return sparql_select(
+            query,
+            result_format=result_format,
+            date_cols=query_date_cols)
+
+    results = [None] * len(queries)
+    failures = {}
+
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers) as executor:
+
+        # Run each query in a copy of the current context, so the stages
+        # of each query are nested in any stage that started the batch
+        futures = {
+            executor.submit(
+                contextvars.copy_context().run,
+                select,
+                query,
+                query_date_cols): i
+            for i, (query, query_date_cols) in enumerate(
+                zip(queries, date_cols))}
+
+        for future in concurrent.futures.as_completed(futures):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                failures[i] = e
+
+    if len(failures) > 0:
+        raise errors.BatchRequestError(results, failures)
+
+    return results
+
+# Async functions -------------------------------------------------------------
+
+async_sessions = weakref.WeakKeyDictionary()
+
+# The tasks closing replaced sessions, which are kept until they finish
+# because the event loop only holds weak references to its tasks
+async_session_closes = set()
+
+
+def get_async_session():
+
+    """Get the pooled aiohttp session for the running event loop.
+
+    get_async_session returns the aiohttp ClientSession used to send queries
+    asynchronously, creating it if necessary. There is one session for each
+    event loop. The number of connections the session opens to each endpoint
+    is limited by the pool size setting, so this also limits the number of
+    queries that run concurrently: further queries wait for a connection to
+    become free. If the pool size or keep alive settings have changed since
+    the session was created, the session is replaced. This function must be
+    called from a running event loop.
+
+    Returns
+    -------
+    out : ClientSession
+        An aiohttp ClientSession for the running event loop.
+
+    """
+
+    if aiohttp is None:
+        raise ImportError(
+            'The async functions require aiohttp: pip install aiohttp')
+
+    loop = asyncio.get_running_loop()
+    config = (settings.get_pool_size(), settings.get_keep_alive())
+
+    if loop in async_sessions:
+        session_config, session = async_sessions[loop]
+        if session_config == config and not session.closed:
+            return session
+        # Close the old session once its requests have finished
+        task = loop.create_task(session.close())
+        async_session_closes.add(task)
+        task.add_done_callback(async_session_closes.discard)
+
+    pool_size, keep_alive = config
+    connector = aiohttp.TCPConnector(
+        limit=pool_size,
+        limit_per_host=pool_size,
+        force_close=not keep_alive)
+
+    session = aiohttp.ClientSession(connector=connector)
+    async_sessions[loop] = (config, session)
+    return session
+
+
+async def close_async_sessions():
+
+    """Close the pooled aiohttp session for the running event loop.
+
+    A new session is created automatically the next time a query is sent
+    asynchronously from the event loop. Any sessions from the event loop
+    that were replaced after a change of settings, and are still closing,
+    are also waited for.
+
+    """
+
+    loop = asyncio.get_running_loop()
+    if loop in async_sessions:
+        session_config, session = async_sessions.pop(loop)
+        await session.close()
+
+    closes = [
+        task for task in async_session_closes if task.get_loop() is loop]
+    await asyncio.gather(*closes)
+
+
+def get_async_timeout():
+
+    """Get an aiohttp ClientTimeout that matches the timeout setting."""
+
+    timeout = settings.get_timeout()
+
+    if timeout is None:
+        return aiohttp.ClientTimeout(total=None)
+
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+    else:
+        connect, read = timeout, timeout
+
+    return aiohttp.ClientTimeout(total=None, connect=connect, sock_read=read)
+
+
+@utils.instrument(
+    constants.HOOK_EVENT_REQUEST_END,
+    start_event=constants.HOOK_EVENT_REQUEST_START,
+    query=True)
+async def sparql_select_async(query,
+                              result_format=None,
+                              date_cols=None,
+                              arrow=False):
+
+    """Send a select query asynchronously and return a DataFrame.
+
+    sparql_select_async is the asynchronous counterpart of sparql_select. It
+    sends the query with a non-blocking http client, so the event loop can
+    run other tasks while it waits for the response, and returns the results
+    as a DataFrame in the same way as sparql_select. Queries share a pooled
+    session for each event loop, which limits the number of queries that run
+    concurrently to the pool size setting. This function requires aiohttp.
+
+    Parameters
+    ----------
+    query : str
+        A SPARQL SELECT query as a string.
+    result_format : str, optional
+        The format in which to ask for the results: 'json', 'csv' or 'tsv'.
+        The default value is None, which means the result format from the
+        package settings is used.
+    date_cols : list, optional
+        A list of the names of columns that contain dates. These are used to
+        convert dates in CSV results. The default value is None.
+    arrow : bool, optional
+        A boolean indicating whether to return the results as a pyarrow Table
+        rather than a pandas dataframe. This requires pyarrow. The default
+        value is False.
+
+    Returns
+    -------
+    out : DataFrame or pyarrow.Table
+        A pandas dataframe containing the results of the query, or a pyarrow
+        Table if arrow is True.
+
+    """
+
+    if result_format is None:
+        result_format = settings.get_result_format()
+
+    # Return the cached result if there is one
+    key = get_cache_key(query, result_format, date_cols)
+    if key is not None:
+        data = cache.get_result(key)
+        if data is not None:
+            return get_output(data, arrow)
+
+    url = settings.get_api_url()
+    headers = get_request_headers(result_format)
+    session = get_async_session()
+
+    max_retries = settings.get_max_retries()
+    retry_status_codes = settings.get_retry_status_codes()
+    record_request()
+
+    request_start = time.perf_counter()
+
+    for attempt in itertools.count():
+
+        start = time.perf_counter()
+
+        try:
+            async with session.post(
+                    url,
+                    headers=headers,
+                    data=query,
+                    timeout=get_async_timeout()) as response:
+
+                retry = response.status in retry_status_codes
+                if not retry or attempt >= max_retries:
+
+                    # If the server returned an error raise it with the text
+                    if response.status >= 400:
+                        record_attempt(
+                            time.perf_counter() - start, failed=retry)
+                        fire_response_async(
+                            query, response.status, None, request_start)
+                        raise errors.RequestError(await response.text())
+
+                    content = await response.read()
+                    record_attempt(time.perf_counter() - start)
+                    status = response.status
+                    break
+
+                record_attempt(time.perf_counter() - start, failed=True)
+                delay = get_retry_delay(attempt, response)
+
+        except aiohttp.ClientConnectionError:
+            record_attempt(time.perf_counter() - start, failed=True)
+            if attempt >= max_retries:
+                raise
+            delay = get_retry_delay(attempt)
+
+        record_retry(delay)
+        await asyncio.sleep(delay)
+
+    received = fire_response_async(query, status, content, request_start)
+    data = decode_results(content, result_format, date_cols)
+
+    utils.fire_hook(
+        constants.HOOK_EVENT_DECODE,
+        query=query,
+        stage='sparql_select_async',
+        endpoint=url,
+        status=status,
+        bytes=len(content),
+        rows=data.shape[0],
+        start=received,
+        elapsed=time.perf_counter() - received)
+
+    data = convert_dates(data)
+
+    if key is not None:
+        cache.set_result(key, data)
+
+    return get_output(data, arrow)
+
+
+def fire_response_async(query, status, content, start):
+
+    """Fire the response_received event for an async query.
+
+    The status and size of the response are also recorded in the query
+    stage, so the request_end event reports them. Returns the time the
+    response was received, which is when decoding starts.
+
+    """
+
+    received = time.perf_counter()
+    utils.record_response(
+        status, None if content is None else len(content))
+    utils.fire_hook(
+        constants.HOOK_EVENT_RESPONSE,
+        query=query,
+        stage='sparql_select_async',
+        endpoint=settings.get_api_url(),
+        status=status,
+        bytes=None if content is None else len(content),
+        start=start,
+        elapsed=received - start)
+
+    return received
+
+# Decoding JSON ---------------------------------------------------------------
+
+def decode_json_results(results):
+
+    """Decode SPARQL JSON results as a DataFrame.
+
+    decode_json_results takes the parsed JSON of a SPARQL SELECT response and
+    returns the results as a DataFrame. The results are decoded one column at
+    a time. Values with an XML date datatype are converted to datetime.dates,
+    with each distinct date string parsed only once. All other values are
+    returned as strings and unbound values are returned as NaN.
+
+    Parameters
+    ----------
+    results : dict
+        The parsed JSON of a SPARQL results document.
+
+    Returns
+    -------
+    out : DataFrame
+        A pandas dataframe containing the results.
+
+    """
+
+    headers = results['head']['vars']
+    records = results['results']['bindings']
+
+    # Return an empty dataframe with the expected columns if there are no rows
+    if len(records) == 0:
+        return pd.DataFrame(columns=headers)
+
+    # Build each column from the records, sharing parsed dates across columns
+    date_cache = {}
+    columns = {}
+
+    for header in headers:
+        columns[header] = decode_json_column(
+            [record.get(header) for record in records], date_cache)
+
+    return pd.DataFrame(data=columns, columns=headers)
+
+
+def decode_json_column(values, date_cache):
+
+    """Decode a column of values from SPARQL JSON bindings as an array.
+
+    Dates are looked up in date_cache and parsed and stored if they have not
+    been seen before. Unbound values are returned as NaN. A column with no
+    bound values is returned as an array of floats, which is the dtype pandas
+    would infer for it.
+
+    """
+
+    if all(value is None for value in values):
+        return np.full(len(values), np.NaN)
+
+    column = []
+    append = column.append
+    nan = np.NaN
+    xml_date = constants.XML_DATE
+
+    for value in values:
+
+        if value is None:
+            append(nan)
+
+        elif value.get('datatype') == xml_date:
+            date = date_cache.get(value['value'])
+            if date is None:
+                date = parse_xml_date(value['value'], date_cache)
+            append(date)
+
+        else:
+            append(value['value'].strip())
+
+    # Create the object array directly to avoid numpy inspecting each value
+    return np.fromiter(column, dtype=object, count=len(column))
+
+
+def decode_json_value(value, date_cache):
+
+    """Decode a single value from a SPARQL JSON binding.
+
+    Dates are looked up in date_cache and parsed and stored if they have not
+    been seen before. Unbound values are returned as NaN.
+
+    """
+
+    if value is None:
+        return np.NaN
+
+    if value.get('datatype') == constants.XML_DATE:
+        date = date_cache.get(value['value'])
+        if date is None:
+            date = parse_xml_date(value['value'], date_cache)
+        return date
+
+    return value['value'].strip()
+
+
+def parse_xml_date(date_str, date_cache):
+
+    """Parse an XML date string as a date and store it in the date cache."""
+
+    date = datetime.datetime.strptime(date_str, '%Y-%m-%d+%H:%M').date()
+    date_cache[date_str] = date
+    return date
+
+# Decoding CSV and TSV --------------------------------------------------------
+
+def decode_csv_results(content, date_cols=None):
+
+    """Decode SPARQL CSV results as a DataFrame.
+
+    decode_csv_results takes the body of a SPARQL SELECT response in CSV
+    format and returns the results as a DataFrame. The text is parsed with
+    the pandas C parser. CSV results do not include datatypes, so values in
+    the columns named in date_cols are converted to datetime.dates and all
+    other values are returned as strings. Empty values are returned as NaN.
+
+    Parameters
+    ----------
+    content : bytes
+        The body of a SPARQL CSV results document.
+    date_cols : list, optional
+        A list of the names of columns that contain dates. The default value
+        is None, which means no columns are converted to dates.
+
+    Returns
+    -------
+    out : DataFrame
+        A pandas dataframe containing the results.
+
+    """
+
+    data = pd.read_csv(
+        io.BytesIO(content),
+        engine='c',
+        dtype=str,
+        keep_default_na=False,
+        na_values=[''])
+
+    if data.shape[0] == 0:
+        return data
+
+    date_cols = set(date_cols) if date_cols is not None else set()
+    date_cache = {}
+
+    def decode_date(value):
+        return parse_lexical_date(value, date_cache)
+
+    for col in data.columns:
+        if col in date_cols:
+            data[col] = decode_unique_values(data[col], decode_date)
+        else:
+            data[col] = decode_unique_values(data[col], str.strip)
+
+    return data
+
+
+def decode_tsv_results(content):
+
+    """Decode SPARQL TSV results as a DataFrame.
+
+    decode_tsv_results takes the body of a SPARQL SELECT response in TSV
+    format and returns the results as a DataFrame. The text is parsed with
+    the pandas C parser and each distinct term in a column is decoded once.
+    IRIs are returned without their angle brackets, literals are unquoted and
+    unescaped, and literals with an XML date datatype are converted to
+    datetime.dates. Unbound values are returned as NaN.
+
+    Parameters
+    ----------
+    content : bytes
+        The body of a SPARQL TSV results document.
+
+    Returns
+    -------
+    out : DataFrame
+        A pandas dataframe containing the results.
+
+    """
+
+    data = pd.read_csv(
+        io.BytesIO(content),
+        sep='\t',
+        engine='c',
+        dtype=str,
+        quoting=csv.QUOTE_NONE,
+        keep_default_na=False,
+        na_values=[''])
+
+    data.columns = [col.lstrip('?') for col in data.columns]
+
+    if data.shape[0] == 0:
+        return data
+
+    date_cache = {}
+
+    def decode_term(term):
+        return decode_tsv_term(term, date_cache)
+
+    for col in data.columns:
+        data[col] = decode_unique_values(data[col], decode_term)
+
+    return data
+
+
+def decode_tsv_term(term, date_cache):
+
+    """Decode a single RDF term from SPARQL TSV results."""
+
+    # IRIs
+    if term.startswith('<') and term.endswith('>'):
+        return term[1:-1]
+
+    # Literals, which may have a datatype or language tag after the quotes
+    if term.startswith('"'):
+        end = term.rfind('"')
+        value = tsv_escapes.sub(
+            lambda m: constants.TSV_ESCAPES[m.group(0)], term[1:end])
+        if term[end + 1:] == '^^<{0}>'.format(constants.XML_DATE):
+            date = date_cache.get(value)
+            if date is None:
+                date = parse_xml_date(value, date_cache)
+            return date
+        return value.strip()
+
+    # Blank nodes and abbreviated numbers and booleans
+    return term
+
+
+def parse_lexical_date(date_str, date_cache):
+
+    """Parse the date in an XML date string as a datetime.date.
+
+    The timezone, if there is one, is ignored. The date is stored in
+    date_cache.
+
+    """
+
+    try:
+        date = datetime.datetime.strptime(date_str[:10], '%Y-%m-%d').date()
+    except ValueError:
+        raise errors.DateFormatError(date_str)
+    date_cache[date_str] = date
+    return date
+
+
+def decode_unique_values(series, decode):
+
+    """Decode the values in a series of strings, decoding each value once.
+
+    Missing values are returned as NaN. A series with no values is returned as
+    an array of floats, which is the dtype pandas would infer for it.
+
+    """
+
+    codes, uniques = pd.factorize(series)
+
+    if len(uniques) == 0:
+        return np.full(len(series), np.NaN)
+
+    # Decode each unique value and add NaN at the end for missing values
+    decoded = np.fromiter(
+        itertools.chain((decode(value) for value in uniques), [np.NaN]),
+        dtype=object,
+        count=len(uniques) + 1)
+
+    return decoded[codes]
+
+# Streaming JSON --------------------------------------------------------------
+
+def decode_json_stream(chunks):
+
+    """Decode a stream of SPARQL JSON results as a DataFrame.
+
+    decode_json_stream takes an iterable of chunks of a SPARQL JSON results
+    document, as bytes or strings, and returns the results as a DataFrame. The
+    document is parsed incrementally: each binding in the results is decoded
+    into column buffers as soon as it has been read and the text it was read
+    from is discarded. Values are decoded in the same way as by
+    decode_json_results.
+
+    Parameters
+    ----------
+    chunks : iterable
+        An iterable of bytes or strings that together form a SPARQL JSON
+        results document.
+
+    Returns
+    -------
+    out : DataFrame
+        A pandas dataframe containing the results.
+
+    """
+
+    reader = JsonStreamReader(chunks)
+    headers = None
+    columns = {}
+    date_cache = {}
+    row_count = 0
+
+    # Add a binding to the column buffers, creating columns as they appear
+    def add_binding(binding):
+        nonlocal row_count
+        for header in binding:
+            if header not in columns:
+                columns[header] = [np.NaN] * row_count
+        for header, column in columns.items():
+            column.append(decode_json_value(binding.get(header), date_cache))
+        row_count += 1
+
+    # Read the top level object, streaming the bindings within the results
+    for key in reader.read_object_keys():
+        if key == 'head':
+            headers = reader.read_value()['vars']
+        elif key == 'results':
+            for results_key in reader.read_object_keys():
+                if results_key == 'bindings':
+                    for binding in reader.read_array_items():
+                        add_binding(binding)
                 else:
-                    row.append(record[header]['value'].strip())
-            else:
-                row.append(None)
-        rows.append(row)
+                    reader.read_value()
+        else:
+            reader.read_value()
+
+    if headers is None:
+        raise json.JSONDecodeError(
+            'SPARQL results have no head', reader.buffer, reader.pos)
+
+    # Return an empty dataframe with the expected columns if there are no rows
+    if row_count == 0:
+        return pd.DataFrame(columns=headers)
+
+    # Build the dataframe from the column buffers
+    data = {}
+    for header in headers:
+        if header in columns:
+            data[header] = np.fromiter(
+                columns.pop(header), dtype=object, count=row_count)
+        else:
+            data[header] = np.full(row_count, np.NaN)
+
+    return pd.DataFrame(data=data, columns=headers)
+
+
+class JsonStreamReader:
+
+    """Read JSON values incrementally from an iterable of chunks.
+
+    JsonStreamReader holds only the part of the document that has not yet
+    been read. It can step through the keys of an object and the items of an
+    array without reading the whole container, which lets a caller consume a
+    large array one item at a time.
+
+    Parameters
+    ----------
+    chunks : iterable
+        An iterable of bytes or strings that together form a JSON document.
+
+    """
+
+    whitespace = ' \t\n\r'
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.pos = 0
+        self.exhausted = False
+
+    def fill(self):
+
+        """Read the next chunk into the buffer and return False at the end."""
+
+        if self.exhausted:
+            return False
+
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self.exhausted = True
+            chunk = self.text_decoder.decode(b'', final=True)
+        elif isinstance(chunk, bytes):
+            chunk = self.text_decoder.decode(chunk)
+
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+
+        """Skip whitespace and return the next character or None at the end."""
+
+        while True:
+            while self.pos < len(self.buffer) and \
+                    self.buffer[self.pos] in self.whitespace:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return None
+
+    def expect(self, char):
+
+        """Skip whitespace and consume the given character."""
+
+        if self.peek() != char:
+            raise json.JSONDecodeError(
+                'Expecting \'{0}\''.format(char), self.buffer, self.pos)
+        self.pos += 1
+
+    def read_value(self):
+
+        """Read and return the next complete JSON value."""
+
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def read_object_keys(self):
+
+        """Read an object, yielding each key before its value is read.
+
+        The caller must read the value for each key before asking for the
+        next key.
+
+        """
+
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.read_value()
+            self.expect(':')
+            yield key
+            if self.peek() == ',':
+                self.pos += 1
+                continue
+            self.expect('}')
+            return
+
+    def read_array_items(self):
+
+        """Read an array, yielding each item as it is read."""
 
-    return pd.DataFrame(data=rows, columns=headers).fillna(value=np.NaN)
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.read_value()
+            if self.peek() == ',':
+                self.pos += 1
+                continue
+            self.expect(']')
+            return
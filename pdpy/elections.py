@@ -3,26 +3,143 @@
 
 # Imports ---------------------------------------------------------------------
 
+import collections
 import datetime
-import io
+import numpy as np
 import pandas as pd
+import threading
+import types
 
-from . import errors
+from . import constants
 from . import utils
 
-# Functions ------------------------------------------------
+# Elections data --------------------------------------------------------------
+
+ELECTIONS_CSV = """
+    name,        dissolution,       election
+    1929,        1929-05-10,        1929-05-30
+    1931,        1931-10-07,        1931-10-27
+    1935,        1935-10-25,        1935-11-14
+    1945,        1945-06-15,        1945-07-05
+    1950,        1950-02-03,        1950-02-23
+    1951,        1951-10-05,        1951-10-25
+    1955,        1955-05-06,        1955-05-26
+    1959,        1959-09-18,        1959-10-08
+    1964,        1964-09-25,        1964-10-15
+    1966,        1966-03-10,        1966-03-31
+    1970,        1970-05-29,        1970-06-18
+    1974 (Feb),  1974-02-08,        1974-02-28
+    1974 (Oct),  1974-09-20,        1974-10-10
+    1979,        1979-04-07,        1979-05-03
+    1983,        1983-05-13,        1983-06-09
+    1987,        1987-05-18,        1987-06-11
+    1992,        1992-03-16,        1992-04-09
+    1997,        1997-04-08,        1997-05-01
+    2001,        2001-05-14,        2001-06-07
+    2005,        2005-04-11,        2005-05-05
+    2010,        2010-04-12,        2010-05-06
+    2015,        2015-03-30,        2015-05-07
+    2017,        2017-05-03,        2017-06-08
+    2019,        2019-11-06,        2019-12-12
+"""
+
+# Elections calendar ----------------------------------------------------------
+
+ElectionsCalendar = collections.namedtuple('ElectionsCalendar', [
+    'table',
+    'names',
+    'dissolutions',
+    'elections',
+    'dissolution_days',
+    'election_days',
+    'elections_dict'])
+
+elections_calendar = None
+elections_calendar_lock = threading.Lock()
+
+
+def get_elections_calendar():
+
+    """Get the general elections calendar, building it on first use.
+
+    get_elections_calendar returns a named tuple containing the elections
+    data in the forms used by the functions in this module. The calendar is
+    built once and shared, so everything in it is read-only:
+
+    table            -- A read-only 2D object array of names and dates
+    names            -- The name of each general election
+    dissolutions     -- The date of each dissolution as a datetime.date
+    elections        -- The date of each election as a datetime.date
+    dissolution_days -- The dissolution dates as datetime64[D]
+    election_days    -- The election dates as datetime64[D]
+    elections_dict   -- A read-only mapping of the dates of each election
+
+    Returns
+    -------
+    out : ElectionsCalendar
+        A named tuple of read-only arrays and mappings.
+
+    """
+
+    global elections_calendar
+
+    with elections_calendar_lock:
+        if elections_calendar is None:
+            elections_calendar = build_elections_calendar()
+        return elections_calendar
+
+
+def build_elections_calendar():
+
+    """Parse the elections data and build the elections calendar."""
+
+    rows = [
+        [value.strip() for value in line.split(',')]
+        for line in ELECTIONS_CSV.strip().splitlines()[1:]]
+
+    table = np.array([
+        [name,
+         datetime.date.fromisoformat(dissolution),
+         datetime.date.fromisoformat(election)]
+        for name, dissolution, election in rows], dtype=object)
+
+    elections_dict = types.MappingProxyType({
+        name: types.MappingProxyType({
+            'dissolution': dissolution,
+            'election': election})
+        for name, dissolution, election in table})
+
+    calendar = ElectionsCalendar(
+        table=table,
+        names=table[:, 0],
+        dissolutions=table[:, 1],
+        elections=table[:, 2],
+        dissolution_days=table[:, 1].astype('datetime64[D]'),
+        election_days=table[:, 2].astype('datetime64[D]'),
+        elections_dict=elections_dict)
+
+    for array in calendar[:6]:
+        array.flags.writeable = False
+
+    return calendar
+
+# Functions -------------------------------------------------------------------
 
 def get_general_elections():
 
-    """Return the dates of UK general elections stme 1929 as a DataFrame.
+    """Return the dates of UK general elections since 1929 as a DataFrame.
 
-    get_general_elections returns the dates of UK general elections stme 1929
+    get_general_elections returns the dates of UK general elections since 1929
     as a DataFrame with three columns:
 
     name        -- The name of each general election as a string
     dissolution -- The date of dissolution as a datetime.date
     election    -- The date of the election as a datetime.date
 
+    The DataFrame is a new object on each call, but it shares its data with
+    the elections calendar, which is read-only. Columns can be added to or
+    replaced in the DataFrame, but its values cannot be modified in place.
+
     Returns
     -------
     out : DataFrame
@@ -30,72 +147,151 @@ def get_general_elections():
 
     """
 
-    election_csv = """
-        name,        dissolution,       election
-        1929,        1929-05-10,        1929-05-30
-        1931,        1931-10-07,        1931-10-27
-        1935,        1935-10-25,        1935-11-14
-        1945,        1945-06-15,        1945-07-05
-        1950,        1950-02-03,        1950-02-23
-        1951,        1951-10-05,        1951-10-25
-        1955,        1955-05-06,        1955-05-26
-        1959,        1959-09-18,        1959-10-08
-        1964,        1964-09-25,        1964-10-15
-        1966,        1966-03-10,        1966-03-31
-        1970,        1970-05-29,        1970-06-18
-        1974 (Feb),  1974-02-08,        1974-02-28
-        1974 (Oct),  1974-09-20,        1974-10-10
-        1979,        1979-04-07,        1979-05-03
-        1983,        1983-05-13,        1983-06-09
-        1987,        1987-05-18,        1987-06-11
-        1992,        1992-03-16,        1992-04-09
-        1997,        1997-04-08,        1997-05-01
-        2001,        2001-05-14,        2001-06-07
-        2005,        2005-04-11,        2005-05-05
-        2010,        2010-04-12,        2010-05-06
-        2015,        2015-03-30,        2015-05-07
-        2017,        2017-05-03,        2017-06-08
-        2019,        2019-11-06,        2019-12-12
+    return pd.DataFrame(
+        get_elections_calendar().table,
+        columns=['name', 'dissolution', 'election'],
+        copy=False)
+
+
+def get_general_elections_dict():
+
+    """Return the dates of UK general elections since 1929 as a dict.
+
+    get_general_elections_dict returns a read-only mapping containing the
+    dissolution and election dates for each general election since 1929 as
+    datetime.dates. Each item in the mapping is keyed with the election name
+    and contains a mapping of two values: one named "dissolution" containing
+    the dissolution date and the other named "election" containing the
+    election date.
+
+    Returns
+    -------
+    out : mappingproxy
+        A read-only mapping containing the dissolution and election dates for
+        each general election.
+
+    """
+
+    return get_elections_calendar().elections_dict
+
+
+def get_parliament_periods(dates):
+
+    """Find the Parliament and dissolution period that each date falls in.
+
+    get_parliament_periods takes a sequence of dates and returns, for each
+    date, the name of the general election that elected the Parliament in
+    which the date falls, and whether the date falls in a dissolution
+    period. A dissolution period runs from the day after a dissolution to
+    the day of the following general election. A date in a dissolution
+    period is given the Parliament that had been dissolved. Dates on or
+    before the first election in the calendar, and missing values, have no
+    Parliament.
+
+    Each date is found by binary search on the sorted election dates, and
+    each distinct date is only converted once.
+
+    Parameters
+    ----------
+    dates : array_like
+        A sequence of datetime.dates, datetime64 values or ISO 8601 date
+        strings, which may contain missing values.
+
+    Returns
+    -------
+    out : DataFrame
+        A pandas dataframe with one row for each date and two columns:
+        parliament, containing the name of the general election as a string,
+        and in_dissolution, a boolean.
+
     """
 
-    election_dates = pd.read_csv(
-        io.BytesIO(bytes(election_csv, encoding='utf-8')),
-        skipinitialspace = True)
+    calendar = get_elections_calendar()
+    days = utils.convert_date_days(dates)
+    missing = np.isnat(days)
 
-    election_dates['dissolution'] = utils.convert_date_series(
-        election_dates['dissolution'])
+    # Find the last election before each date
+    i = np.searchsorted(calendar.election_days, days, side='left') - 1
+    has_parliament = (i >= 0) & ~missing
+    parliament = np.full(len(days), np.NaN, dtype=object)
+    parliament[has_parliament] = calendar.names[i[has_parliament]]
 
-    election_dates['election'] = utils.convert_date_series(
-        election_dates['election'])
+    return pd.DataFrame({
+        'parliament': parliament,
+        'in_dissolution': get_dissolution_indices(days) >= 0})
 
-    return election_dates
 
+def get_dissolution_indices(days):
 
-def get_general_elections_dict():
+    """Get the index of the dissolution period each date falls in.
+
+    Returns an array with the index of the election whose dissolution period
+    each date falls in, or -1 for dates not in a dissolution period.
+
+    """
+
+    calendar = get_elections_calendar()
+
+    # Find the last dissolution before each date and check whether the date
+    # is on or before the election that followed it
+    i = np.searchsorted(calendar.dissolution_days, days, side='left') - 1
+    in_dissolution = (i >= 0) & \
+        (days <= calendar.election_days[np.maximum(i, 0)])
+    return np.where(in_dissolution, i, -1)
 
-    """Return the dates of UK general elections stme 1929 as a dict.
 
-    get_general_elections_dict returns a dict containing the dissolution and election
-    dates for each general election stme 1929 as datetime.dates. Each item
-    in the list is keyed with the election name and contains a dict of two
-    values: one named "dissolution" containing the dissolution date and the
-    other named "election" containing the election date.
+@utils.instrument(constants.HOOK_EVENT_PROCESS)
+def clip_to_dissolution(dates):
+
+    """Clip dates that fall during an election period to the dissolution.
+
+    clip_to_dissolution takes a sequence of dates and returns them with
+    every date that falls after the dissolution of a Parliament and on or
+    before the following general election replaced by the date of the
+    dissolution. This is used to make memberships that ended at a general
+    election end at the dissolution instead. Other dates and missing values
+    are returned unchanged.
+
+    The dates are matched to elections by binary search on the sorted
+    dissolution dates, and each distinct date is only looked up once.
+
+    Parameters
+    ----------
+    dates : array_like
+        A sequence of datetime.dates or datetime64 values, which may contain
+        missing values.
 
     Returns
     -------
-    out : dict
-        A dictionary containing the dissolution and election dates for each
-        general election.
+    out : ndarray
+        A NumPy array of the clipped dates, with the same dtype as the input
+        dates.
 
     """
 
-    election_dates = get_general_elections()
-    election_dict = {}
+    dates = np.asarray(dates)
+
+    # Clip datetime64 dates directly, as NaT is never in a dissolution period
+    if dates.dtype.kind == 'M':
+        i = get_dissolution_indices(dates.astype('datetime64[D]'))
+        clip = i >= 0
+        clipped_dates = dates.copy()
+        clipped_dates[clip] = \
+            get_elections_calendar().dissolution_days[i[clip]]
+        return clipped_dates
+
+    codes, uniques = pd.factorize(dates)
+    if len(uniques) == 0:
+        return dates.copy()
+
+    i = get_dissolution_indices(np.array(uniques, dtype='datetime64[D]'))
+    clip = i >= 0
 
-    def add_row(row):
-        election_dict[row['name']] = {
-            'dissolution': row['dissolution'],
-            'election': row['election']}
+    clipped = np.asarray(uniques, dtype=object).copy()
+    clipped[clip] = get_elections_calendar().dissolutions[i[clip]]
 
-    election_dates.apply(add_row, axis=1)
-    return election_dict
+    # Map the clipped dates back to the input, keeping missing values
+    clipped_dates = np.append(clipped, np.NaN)[codes]
+    missing = codes == -1
+    clipped_dates[missing] = dates[missing]
+    return clipped_dates
@@ -27,6 +27,32 @@ class RequestError(Error):
         self.response = response
 
 
+class BatchRequestError(Error):
+
+    """Exception raised when one or more queries in a batch fail.
+
+    Parameters
+    ----------
+    results : list
+        The results of the batch in the order of the queries, with None in
+        place of the result of each query that failed.
+    failures : dict
+        A dictionary mapping the index of each query that failed to the
+        exception it raised.
+
+    """
+
+    def __init__(self, results, failures):
+        message = ('{0} of {1} queries failed: {2}'.format(
+            len(failures),
+            len(results),
+            ', '.join(str(i) for i in sorted(failures))))
+        super(BatchRequestError, self).__init__(message)
+        self.message = message
+        self.results = results
+        self.failures = failures
+
+
 class DateFormatError(Error):
 
     """Exception raised for errors parsing date strings.
@@ -7,10 +7,13 @@ import datetime
 import numpy as np
 import pandas as pd
 
+from . import constants
 from . import errors
+from . import utils
 
 # Filter dates ----------------------------------------------------------------
 
+@utils.instrument(constants.HOOK_EVENT_FILTER)
 def filter_dates(df,
                  start_col,
                  end_col,
@@ -22,11 +25,12 @@ def filter_dates(df,
     filter_dates takes a dataframe which contains data on a time bound
     activity and returns the subset of rows where that activity took place
     within a given period. The dataframe must contain two columns of
-    datetime.date objects, which record the start and end dates of an
-    activity. The from and to dates provided are used to find all rows where
-    some part of the period of activity took place within the period of
-    filtering. The filtering process is tmlusive: as long as at least one day
-    of activity falls withinthe filtering period, the row is returned.
+    datetime.date objects or datetime64 values, which record the start and
+    end dates of an activity. The from and to dates provided are used to
+    find all rows where some part of the period of activity took place
+    within the period of filtering. The filtering process is tmlusive: as
+    long as at least one day of activity falls withinthe filtering period,
+    the row is returned.
 
     Parameters
     ----------
@@ -78,30 +82,29 @@ def filter_dates(df,
     if not pd.isna(from_date) and not pd.isna(to_date) and from_date > to_date:
         raise ValueError('to_date is before from_date')
 
-    # Set default values
-    from_after_end = False
-    to_before_start = False
+    # Convert the dates to datetime64 once and filter with boolean masks:
+    # comparisons with NaT are False, so open ended rows are never excluded
+    keep = np.ones(df.shape[0], dtype=bool)
 
-    # Get matching rows
     if not pd.isna(from_date):
-        from_after_end = df[end_col].map(
-            lambda d: False if pd.isna(d) else from_date > d)
+        end_days = utils.convert_date_days(df[end_col])
+        keep &= ~(np.datetime64(from_date, 'D') > end_days)
 
     if not pd.isna(to_date):
-        to_before_start = df[start_col].map(
-            lambda d: False if pd.isna(d) else to_date < d)
+        start_days = utils.convert_date_days(df[start_col])
+        keep &= ~(np.datetime64(to_date, 'D') < start_days)
 
-    return df[~(from_after_end | to_before_start)]
+    return df[keep]
 
 
 def handle_date(d):
 
     """Take a date which may be a string or a date and returns a date.
 
-    handle_date takes a date which may be a datetime.date or an ISO 8601 date
-    string, checks it is valid, and returns the date as a datetime.date. NaN
-    values are returned unmodified. This function raises a DateFromatError if
-    it is unable to handle the date.
+    handle_date takes a date which may be a datetime.date, a datetime64 or
+    Timestamp, or an ISO 8601 date string, checks it is valid, and returns
+    the date as a datetime.date. NaN values are returned unmodified. This
+    function raises a DateFromatError if it is unable to handle the date.
 
     """
 
@@ -109,6 +112,8 @@ def handle_date(d):
         return d
     elif type(d) == datetime.date:
         return d
+    elif isinstance(d, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(d).date()
     elif type(d) == str:
         try:
             return datetime.datetime.strptime(d, '%Y-%m-%d').date()
@@ -120,6 +125,7 @@ def handle_date(d):
 
 # Filter memberships ----------------------------------------------------------
 
+@utils.instrument(constants.HOOK_EVENT_FILTER)
 def filter_memberships(tm,
                        fm,
                        tm_id_col,
@@ -198,63 +204,88 @@ def filter_memberships(tm,
     if join_col not in fm.columns:
         raise errors.MissingColumnError(join_col)
 
-    # Create abstract copies of tm and fm
-    tma = tm[[join_col, tm_id_col, tm_start_col, tm_end_col]]
-    tma.columns = ['join_col', 'tm_id_col', 'tm_start_col', 'tm_end_col']
+    # Find the target memberships that intersect with a filter membership
+    in_membership = intersects_memberships(
+        tm_keys=tm[join_col].values,
+        tm_starts=utils.convert_date_days(tm[tm_start_col]),
+        tm_ends=utils.convert_date_days(tm[tm_end_col]),
+        fm_keys=fm[join_col].values,
+        fm_starts=utils.convert_date_days(fm[fm_start_col]),
+        fm_ends=utils.convert_date_days(fm[fm_end_col]))
 
-    fma = fm[[join_col, fm_start_col, fm_end_col]]
-    fma.columns = ['join_col', 'fm_start_col', 'fm_end_col']
+    # Keep every row for a target membership id if any of them intersect
+    tm_ids, _ = pd.factorize(tm[tm_id_col])
+    in_membership = np.isin(tm_ids, tm_ids[in_membership])
 
-    # Join the target memberships with the filter membership dates on join_col
-    tm_fm = tma.merge(
-        fma,
-        how='left',
-        on='join_col')
-
-    # Function to test if a target membership and filter membership intersect
-    def in_fm_func(row):
-
-        # Handle dates
-        tm_start_date = row['tm_start_col']
-        tm_end_date = row['tm_end_col']
-        fm_start_date = row['fm_start_col']
-        fm_end_date = row['fm_end_col']
-        tm_start_after_fm_end = False
-        tm_end_before_fm_start = False
-
-        # Get the match status of the rows
-        if not pd.isna(tm_start_date):
-            tm_start_after_fm_end = False if pd.isna(fm_end_date) \
-                else tm_start_date > fm_end_date
-
-        if not pd.isna(tm_end_date):
-            tm_end_before_fm_start = False if pd.isna(fm_start_date) \
-                else tm_end_date < fm_start_date
+    # Return the target memberships after filtering
+    tmf = tm[in_membership]
+    tmf = tmf.reset_index(drop=True)
+    return tmf
 
-        # Return if the memberships instersect
-        return not (tm_start_after_fm_end or tm_end_before_fm_start)
 
-    # Apply the function to each combination of target and filter membership
-    tm_fm['in_membership'] = tm_fm.apply(in_fm_func, axis=1)
+def intersects_memberships(tm_keys,
+                           tm_starts,
+                           tm_ends,
+                           fm_keys,
+                           fm_starts,
+                           fm_ends):
 
-    # Group the target/filter combinations on the id column
-    grouped = tm_fm.groupby('tm_id_col')
+    """Find which target memberships intersect with any filter membership.
 
-    # Check if each target membership intersected with any filter memberships
-    match_status = grouped[['in_membership']].any()
+    intersects_memberships takes the join keys and the start and end dates
+    of a set of target memberships and a set of filter memberships, and
+    returns a boolean array showing whether each target membership
+    intersects with at least one filter membership that has the same key.
+    Missing dates are NaT and leave that side of a period open. Target
+    memberships whose key has no filter memberships are treated as
+    intersecting.
 
-    # Restore the actual target membership id column name for joining
-    match_status.reset_index(inplace=True)
-    match_status.columns = [tm_id_col, 'in_membership']
+    The filter memberships are sorted by key and start date, and the running
+    maximum end date is computed within each key. Each target membership
+    then only needs to find the last filter membership for its key that
+    starts on or before its own end date, and check whether any filter
+    membership up to that point ends on or after its own start date. This
+    avoids pairing every target membership with every filter membership for
+    the same key.
 
-    # Join the match status with the original target memberships data
-    tm_fm_status = tm.merge(
-        match_status,
-        how='left',
-        on=tm_id_col)
+    """
 
-    # Return the target memberships after filtering
-    tmf = tm_fm_status[tm_fm_status['in_membership']]
-    tmf.reset_index(drop=True, inplace=True)
-    tmf = tmf.drop(columns=['in_membership'])
-    return tmf
+    # Encode the keys of both sets of memberships as integers
+    codes, uniques = pd.factorize(np.concatenate([tm_keys, fm_keys]))
+    tm_codes = codes[:len(tm_keys)]
+    fm_codes = codes[len(tm_keys):]
+
+    in_membership = ~np.isin(tm_codes, fm_codes)
+    if len(fm_codes) == 0:
+        return in_membership
+
+    # Open start dates are earliest and open end dates are latest: the NaT
+    # value is already the smallest datetime64, so only ends are replaced
+    latest = np.iinfo(np.int64).max
+    tm_starts = tm_starts.view(np.int64)
+    tm_ends = np.where(np.isnat(tm_ends), latest, tm_ends.view(np.int64))
+    fm_starts = fm_starts.view(np.int64)
+    fm_ends = np.where(np.isnat(fm_ends), latest, fm_ends.view(np.int64))
+
+    # Rank the dates that are compared with filter start dates, so that each
+    # key and date can be combined into a single sortable integer
+    dates, ranks = np.unique(
+        np.concatenate([fm_starts, tm_ends]), return_inverse=True)
+    fm_positions = (fm_codes + 1) * len(dates) + ranks[:len(fm_starts)]
+    tm_positions = (tm_codes + 1) * len(dates) + ranks[len(fm_starts):]
+
+    # Sort the filter memberships and find the latest end date so far
+    order = np.argsort(fm_positions, kind='stable')
+    fm_positions = fm_positions[order]
+    fm_codes = fm_codes[order]
+    fm_max_ends = pd.Series(fm_ends[order]).groupby(fm_codes).cummax().values
+
+    # Find the last filter membership for the same key that starts on or
+    # before the end of each target membership
+    i = np.searchsorted(fm_positions, tm_positions, side='right') - 1
+    has_start = (i >= 0) & (fm_codes[np.maximum(i, 0)] == tm_codes)
+
+    in_membership |= has_start & \
+        (fm_max_ends[np.maximum(i, 0)] >= tm_starts)
+
+    return in_membership
@@ -3,6 +3,7 @@
 
 # Imports ---------------------------------------------------------------------
 
+import asyncio
 import numpy as np
 import pandas as pd
 
@@ -11,19 +12,24 @@ from . import constants
 from . import core
 from . import filter
 from . import members
+from . import snapshot
 from . import utils
 
 # Raw Lords queries -----------------------------------------------------------
 
 def fetch_lords_raw():
+
     """Fetch key details for all Lords."""
-    return members.fetch_members_raw(
+
+    return snapshot.fetch_table(
+        'lords_raw',
+        members.fetch_members_raw,
         house=constants.PDP_ID_HOUSE_OF_LORDS)
 
 
-def fetch_lords_memberships_raw():
+def get_lords_memberships_query():
 
-    """Fetch Lords memberships for all Lords."""
+    """Get the query for Lords memberships for all Lords."""
 
     lords_memberships_query = """
         PREFIX : <https://id.parliament.uk/schema/>
@@ -61,37 +67,129 @@ def fetch_lords_memberships_raw():
         }}
     """.format(constants.PDP_ID_HOUSE_OF_LORDS)
 
-    return core.sparql_select(lords_memberships_query)
+    return lords_memberships_query
+
+
+def fetch_lords_memberships_raw():
+
+    """Fetch Lords memberships for all Lords."""
+
+    return snapshot.fetch_table(
+        'lords_memberships_raw',
+        core.sparql_select,
+        get_lords_memberships_query(),
+        date_cols=constants.DATE_COLS_SEAT_INCUMBENCIES)
 
 
 def fetch_lords_party_memberships_raw():
+
     """Fetch party memberships for all Lords."""
-    return members.fetch_party_memberships_raw(
+
+    return snapshot.fetch_table(
+        'lords_party_memberships_raw',
+        members.fetch_party_memberships_raw,
         house=constants.PDP_ID_HOUSE_OF_LORDS)
 
 
 def fetch_lords_government_roles_raw():
+
     """Fetch government roles for all Lords."""
-    return members.fetch_government_roles_raw(
+
+    return snapshot.fetch_table(
+        'lords_government_roles_raw',
+        members.fetch_government_roles_raw,
         house=constants.PDP_ID_HOUSE_OF_LORDS)
 
 
 def fetch_lords_opposition_roles_raw():
+
     """Fetch opposition roles for all Lords."""
-    return members.fetch_opposition_roles_raw(
+
+    return snapshot.fetch_table(
+        'lords_opposition_roles_raw',
+        members.fetch_opposition_roles_raw,
         house=constants.PDP_ID_HOUSE_OF_LORDS)
 
 
 def fetch_lords_committee_memberships_raw():
+
     """Fetch committee memberships for all Lords."""
-    return members.fetch_committee_memberships_raw(
+
+    return snapshot.fetch_table(
+        'lords_committee_memberships_raw',
+        members.fetch_committee_memberships_raw,
+        house=constants.PDP_ID_HOUSE_OF_LORDS)
+
+# Async raw Lords queries -----------------------------------------------------
+
+async def fetch_lords_raw_async():
+
+    """Fetch key details for all Lords asynchronously."""
+
+    return await snapshot.fetch_table_async(
+        'lords_raw',
+        members.fetch_members_raw_async,
+        house=constants.PDP_ID_HOUSE_OF_LORDS)
+
+
+async def fetch_lords_memberships_raw_async():
+
+    """Fetch Lords memberships for all Lords asynchronously."""
+
+    return await snapshot.fetch_table_async(
+        'lords_memberships_raw',
+        core.sparql_select_async,
+        get_lords_memberships_query(),
+        date_cols=constants.DATE_COLS_SEAT_INCUMBENCIES)
+
+
+async def fetch_lords_party_memberships_raw_async():
+
+    """Fetch party memberships for all Lords asynchronously."""
+
+    return await snapshot.fetch_table_async(
+        'lords_party_memberships_raw',
+        members.fetch_party_memberships_raw_async,
+        house=constants.PDP_ID_HOUSE_OF_LORDS)
+
+
+async def fetch_lords_government_roles_raw_async():
+
+    """Fetch government roles for all Lords asynchronously."""
+
+    return await snapshot.fetch_table_async(
+        'lords_government_roles_raw',
+        members.fetch_government_roles_raw_async,
+        house=constants.PDP_ID_HOUSE_OF_LORDS)
+
+
+async def fetch_lords_opposition_roles_raw_async():
+
+    """Fetch opposition roles for all Lords asynchronously."""
+
+    return await snapshot.fetch_table_async(
+        'lords_opposition_roles_raw',
+        members.fetch_opposition_roles_raw_async,
+        house=constants.PDP_ID_HOUSE_OF_LORDS)
+
+
+async def fetch_lords_committee_memberships_raw_async():
+
+    """Fetch committee memberships for all Lords asynchronously."""
+
+    return await snapshot.fetch_table_async(
+        'lords_committee_memberships_raw',
+        members.fetch_committee_memberships_raw_async,
         house=constants.PDP_ID_HOUSE_OF_LORDS)
 
 # Main Lords API --------------------------------------------------------------
 
+@utils.instrument(constants.HOOK_EVENT_FETCH)
 def fetch_lords(from_date=np.NaN,
                 to_date=np.NaN,
-                on_date=np.NaN):
+                on_date=np.NaN,
+                categorical=None,
+                arrow=False):
 
     """Fetch key details for all Lords.
 
@@ -126,6 +224,14 @@ def fetch_lords(from_date=np.NaN,
         should specify the date in ISO 8601 date format e.g. '2000-12-31'. The
         default value is np.NaN, which means no records are excluded on the
         basis of the on_date.
+    categorical : bool or None, optional
+        A boolean indicating whether to return low-cardinality columns such as
+        party_name as pandas categoricals. The default value is None, which
+        means the categorical setting is used.
+    arrow : bool, optional
+        A boolean indicating whether to return the results as a pyarrow Table
+        rather than a pandas dataframe. See to_arrow for details. This
+        requires pyarrow. The default value is False.
 
     Returns
     -------
@@ -139,32 +245,32 @@ def fetch_lords(from_date=np.NaN,
         from_date = on_date
         to_date = on_date
 
-    # Fetch key details
+    # Fetch key details and the Lords memberships if needed
     lords = fetch_lords_raw()
-
-    # Filter based on membership dates if requested
+    lords_memberships = None
     if not pd.isna(from_date) or not pd.isna(to_date):
         lords_memberships = fetch_lords_memberships()
-        mathching_memberships = filter.filter_dates(
-            lords_memberships,
-            start_col='seat_incumbency_start_date',
-            end_col='seat_incumbency_end_date',
-            from_date=from_date,
-            to_date=to_date)
-        lords = lords[lords['person_id'].isin(
-            mathching_memberships['person_id'])]
 
-    # Tidy up and return
-    lords.sort_values(
-        by=['family_name'],
-        inplace=True)
-    lords.reset_index(drop=True, inplace=True)
+    # Process and return in the requested format
+    lords = process_lords(
+        lords,
+        lords_memberships,
+        from_date,
+        to_date,
+        utils.use_categorical(categorical))
+
+    if arrow:
+        return utils.to_arrow(lords)
+
     return lords
 
 
+@utils.instrument(constants.HOOK_EVENT_FETCH)
 def fetch_lords_memberships(from_date=np.NaN,
                             to_date=np.NaN,
-                            on_date=np.NaN):
+                            on_date=np.NaN,
+                            categorical=None,
+                            arrow=False):
 
     """Fetch Lords memberships for all Lords.
 
@@ -199,6 +305,14 @@ def fetch_lords_memberships(from_date=np.NaN,
         should specify the date in ISO 8601 date format e.g. '2000-12-31'. The
         default value is np.NaN, which means no records are excluded on the
         basis of the on_date.
+    categorical : bool or None, optional
+        A boolean indicating whether to return low-cardinality columns such as
+        party_name as pandas categoricals. The default value is None, which
+        means the categorical setting is used.
+    arrow : bool, optional
+        A boolean indicating whether to return the results as a pyarrow Table
+        rather than a pandas dataframe. See to_arrow for details. This
+        requires pyarrow. The default value is False.
 
     Returns
     -------
@@ -216,28 +330,27 @@ def fetch_lords_memberships(from_date=np.NaN,
     # Fetch the Lords memberships
     lords_memberships = fetch_lords_memberships_raw()
 
-    # Filter on dates if requested
-    if not pd.isna(from_date) or not pd.isna(to_date):
-        lords_memberships = filter.filter_dates(
-            lords_memberships,
-            start_col='seat_incumbency_start_date',
-            end_col='seat_incumbency_end_date',
-            from_date=from_date,
-            to_date=to_date)
+    # Process and return in the requested format
+    lords_memberships = process_lords_memberships(
+        lords_memberships,
+        from_date,
+        to_date,
+        utils.use_categorical(categorical))
+
+    if arrow:
+        return utils.to_arrow(lords_memberships)
 
-    # Tidy up and return
-    lords_memberships.sort_values(
-        by=['family_name'],
-        inplace=True)
-    lords_memberships.reset_index(drop=True, inplace=True)
     return lords_memberships
 
 
+@utils.instrument(constants.HOOK_EVENT_FETCH)
 def fetch_lords_party_memberships(from_date=np.NaN,
                                   to_date=np.NaN,
                                   on_date=np.NaN,
                                   while_lord=True,
-                                  collapse=False):
+                                  collapse=False,
+                                  categorical=None,
+                                  arrow=False):
 
     """Fetch party memberships for all Lords.
 
@@ -290,6 +403,14 @@ def fetch_lords_party_memberships(from_date=np.NaN,
         party into a single period of continuous party membership. Setting this
         to True means that party membership ids are not returned in the
         dataframe. The default value is False.
+    categorical : bool or None, optional
+        A boolean indicating whether to return low-cardinality columns such as
+        party_name as pandas categoricals. The default value is None, which
+        means the categorical setting is used.
+    arrow : bool, optional
+        A boolean indicating whether to return the results as a pyarrow Table
+        rather than a pandas dataframe. See to_arrow for details. This
+        requires pyarrow. The default value is False.
 
     Returns
     -------
@@ -307,49 +428,32 @@ def fetch_lords_party_memberships(from_date=np.NaN,
         from_date = on_date
         to_date = on_date
 
-    # Fetch the party memberships
+    # Fetch the party memberships and the Lords memberships if needed
     party_memberships = fetch_lords_party_memberships_raw()
+    lords_memberships = fetch_lords_memberships() if while_lord else None
 
-    # Filter on dates if requested
-    if not pd.isna(from_date) or not pd.isna(to_date):
-        party_memberships = filter.filter_dates(
-            party_memberships,
-            start_col='party_membership_start_date',
-            end_col='party_membership_end_date',
-            from_date=from_date,
-            to_date=to_date)
-
-    # Filter on Lords memberships if requested
-    if while_lord:
-        lords_memberships = fetch_lords_memberships()
-        party_memberships = filter.filter_memberships(
-            tm=party_memberships,
-            fm=lords_memberships,
-            tm_id_col='party_membership_id',
-            tm_start_col='party_membership_start_date',
-            tm_end_col='party_membership_end_date',
-            fm_start_col='seat_incumbency_start_date',
-            fm_end_col='seat_incumbency_end_date',
-            join_col='person_id')
-
-    # Collapse consecutive memberships and return if requested
-    if collapse:
-        return combine.combine_party_memberships(party_memberships)
+    # Process and return in the requested format
+    party_memberships = process_lords_party_memberships(
+        party_memberships,
+        lords_memberships,
+        from_date,
+        to_date,
+        collapse,
+        utils.use_categorical(categorical))
 
-    # Otherwise tidy up and return
-    party_memberships.sort_values(
-        by=['family_name',
-            'party_membership_start_date'],
-        inplace=True)
-    party_memberships.reset_index(drop=True, inplace=True)
+    if arrow:
+        return utils.to_arrow(party_memberships)
 
     return party_memberships
 
 
+@utils.instrument(constants.HOOK_EVENT_FETCH)
 def fetch_lords_government_roles(from_date=np.NaN,
                                  to_date=np.NaN,
                                  on_date=np.NaN,
-                                 while_lord=True):
+                                 while_lord=True,
+                                 categorical=None,
+                                 arrow=False):
 
     """Fetch government roles for all Lords.
 
@@ -391,6 +495,14 @@ def fetch_lords_government_roles(from_date=np.NaN,
         A boolean indicating whether to filter the government roles to include
         only those roles that were held while each individual was serving as a
         Lord. The default value is True.
+    categorical : bool or None, optional
+        A boolean indicating whether to return low-cardinality columns such as
+        party_name as pandas categoricals. The default value is None, which
+        means the categorical setting is used.
+    arrow : bool, optional
+        A boolean indicating whether to return the results as a pyarrow Table
+        rather than a pandas dataframe. See to_arrow for details. This
+        requires pyarrow. The default value is False.
 
     Returns
     -------
@@ -404,44 +516,31 @@ def fetch_lords_government_roles(from_date=np.NaN,
         from_date = on_date
         to_date = on_date
 
-    # Fetch the government roles
+    # Fetch the government roles and the Lords memberships if needed
     government_roles = fetch_lords_government_roles_raw()
+    lords_memberships = fetch_lords_memberships() if while_lord else None
 
-    # Filter on dates if requested
-    if not pd.isna(from_date) or not pd.isna(to_date):
-        government_roles = filter.filter_dates(
-            government_roles,
-            start_col='government_incumbency_start_date',
-            end_col='government_incumbency_end_date',
-            from_date=from_date,
-            to_date=to_date)
+    # Process and return in the requested format
+    government_roles = process_lords_government_roles(
+        government_roles,
+        lords_memberships,
+        from_date,
+        to_date,
+        utils.use_categorical(categorical))
 
-    # Filter on Lords memberships if requested
-    if while_lord:
-        lords_memberships = fetch_lords_memberships()
-        government_roles = filter.filter_memberships(
-            tm=government_roles,
-            fm=lords_memberships,
-            tm_id_col='government_incumbency_id',
-            tm_start_col='government_incumbency_start_date',
-            tm_end_col='government_incumbency_end_date',
-            fm_start_col='seat_incumbency_start_date',
-            fm_end_col='seat_incumbency_end_date',
-            join_col='person_id')
+    if arrow:
+        return utils.to_arrow(government_roles)
 
-    # Tidy up and return
-    government_roles.sort_values(
-        by=['family_name',
-            'government_incumbency_start_date'],
-        inplace=True)
-    government_roles.reset_index(drop=True, inplace=True)
     return government_roles
 
 
+@utils.instrument(constants.HOOK_EVENT_FETCH)
 def fetch_lords_opposition_roles(from_date=np.NaN,
                                  to_date=np.NaN,
                                  on_date=np.NaN,
-                                 while_lord=True):
+                                 while_lord=True,
+                                 categorical=None,
+                                 arrow=False):
 
     """Fetch opposition roles for all Lords.
 
@@ -483,6 +582,14 @@ def fetch_lords_opposition_roles(from_date=np.NaN,
         A boolean indicating whether to filter the opposition roles to include
         only those roles that were held while each individual was serving as a
         Lord. The default value is True.
+    categorical : bool or None, optional
+        A boolean indicating whether to return low-cardinality columns such as
+        party_name as pandas categoricals. The default value is None, which
+        means the categorical setting is used.
+    arrow : bool, optional
+        A boolean indicating whether to return the results as a pyarrow Table
+        rather than a pandas dataframe. See to_arrow for details. This
+        requires pyarrow. The default value is False.
 
     Returns
     -------
@@ -496,44 +603,31 @@ def fetch_lords_opposition_roles(from_date=np.NaN,
         from_date = on_date
         to_date = on_date
 
-    # Fetch the opposition roles
+    # Fetch the opposition roles and the Lords memberships if needed
     opposition_roles = fetch_lords_opposition_roles_raw()
+    lords_memberships = fetch_lords_memberships() if while_lord else None
 
-    # Filter on dates if requested
-    if not pd.isna(from_date) or not pd.isna(to_date):
-        opposition_roles = filter.filter_dates(
-            opposition_roles,
-            start_col='opposition_incumbency_start_date',
-            end_col='opposition_incumbency_end_date',
-            from_date=from_date,
-            to_date=to_date)
+    # Process and return in the requested format
+    opposition_roles = process_lords_opposition_roles(
+        opposition_roles,
+        lords_memberships,
+        from_date,
+        to_date,
+        utils.use_categorical(categorical))
 
-    # Filter on Lords memberships if requested
-    if while_lord:
-        lords_memberships = fetch_lords_memberships()
-        opposition_roles = filter.filter_memberships(
-            tm=opposition_roles,
-            fm=lords_memberships,
-            tm_id_col='opposition_incumbency_id',
-            tm_start_col='opposition_incumbency_start_date',
-            tm_end_col='opposition_incumbency_end_date',
-            fm_start_col='seat_incumbency_start_date',
-            fm_end_col='seat_incumbency_end_date',
-            join_col='person_id')
+    if arrow:
+        return utils.to_arrow(opposition_roles)
 
-    # Tidy up and return
-    opposition_roles.sort_values(
-        by=['family_name',
-            'opposition_incumbency_start_date'],
-        inplace=True)
-    opposition_roles.reset_index(drop=True, inplace=True)
     return opposition_roles
 
 
+@utils.instrument(constants.HOOK_EVENT_FETCH)
 def fetch_lords_committee_memberships(from_date=np.NaN,
                                       to_date=np.NaN,
                                       on_date=np.NaN,
-                                      while_lord=True):
+                                      while_lord=True,
+                                      categorical=None,
+                                      arrow=False):
 
     """Fetch committee memberships for all Lords.
 
@@ -575,6 +669,14 @@ def fetch_lords_committee_memberships(from_date=np.NaN,
         A boolean indicating whether to filter the committee memberships to
         include only those memberships that were held while each individual was
         serving as a Lord. The default value is True.
+    categorical : bool or None, optional
+        A boolean indicating whether to return low-cardinality columns such as
+        party_name as pandas categoricals. The default value is None, which
+        means the categorical setting is used.
+    arrow : bool, optional
+        A boolean indicating whether to return the results as a pyarrow Table
+        rather than a pandas dataframe. See to_arrow for details. This
+        requires pyarrow. The default value is False.
 
     Returns
     -------
@@ -589,8 +691,267 @@ def fetch_lords_committee_memberships(from_date=np.NaN,
         from_date = on_date
         to_date = on_date
 
-    # Fetch the committee memberships
+    # Fetch the committee memberships and the Lords memberships if needed
     committee_memberships = fetch_lords_committee_memberships_raw()
+    lords_memberships = fetch_lords_memberships() if while_lord else None
+
+    # Process and return in the requested format
+    committee_memberships = process_lords_committee_memberships(
+        committee_memberships,
+        lords_memberships,
+        from_date,
+        to_date,
+        utils.use_categorical(categorical))
+
+    if arrow:
+        return utils.to_arrow(committee_memberships)
+
+    return committee_memberships
+
+# Process Lords data ----------------------------------------------------------
+
+def process_lords(lords,
+                  lords_memberships,
+                  from_date=np.NaN,
+                  to_date=np.NaN,
+                  categorical=False):
+
+    """Process raw key details for Lords.
+
+    process_lords takes the raw key details for Lords and filters and sorts
+    them as described for fetch_lords. lords_memberships should be the
+    dataframe of Lords memberships to filter against, or None if no filtering
+    on Lords memberships is required.
+
+    """
+
+    # Convert low-cardinality columns to categoricals if requested
+    if categorical:
+        lords = utils.convert_categorical_columns(lords)
+
+    # Filter based on membership dates if requested
+    if lords_memberships is not None:
+        mathching_memberships = filter.filter_dates(
+            lords_memberships,
+            start_col='seat_incumbency_start_date',
+            end_col='seat_incumbency_end_date',
+            from_date=from_date,
+            to_date=to_date)
+        lords = lords[lords['person_id'].isin(
+            mathching_memberships['person_id'])]
+
+    # Tidy up and return
+    lords = utils.sort_rows(
+        lords,
+        by=['family_name'])
+    return lords
+
+
+def process_lords_memberships(lords_memberships,
+                              from_date=np.NaN,
+                              to_date=np.NaN,
+                              categorical=False):
+
+    """Process raw Lords memberships.
+
+    process_lords_memberships takes the raw Lords memberships and filters and
+    sorts them as described for fetch_lords_memberships.
+
+    """
+
+    # Convert low-cardinality columns to categoricals if requested
+    if categorical:
+        lords_memberships = utils.convert_categorical_columns(
+            lords_memberships)
+
+    # Filter on dates if requested
+    if not pd.isna(from_date) or not pd.isna(to_date):
+        lords_memberships = filter.filter_dates(
+            lords_memberships,
+            start_col='seat_incumbency_start_date',
+            end_col='seat_incumbency_end_date',
+            from_date=from_date,
+            to_date=to_date)
+
+    # Tidy up and return
+    lords_memberships = utils.sort_rows(
+        lords_memberships,
+        by=['family_name'])
+    return lords_memberships
+
+
+def process_lords_party_memberships(party_memberships,
+                                    lords_memberships,
+                                    from_date=np.NaN,
+                                    to_date=np.NaN,
+                                    collapse=False,
+                                    categorical=False):
+
+    """Process raw party memberships for Lords.
+
+    process_lords_party_memberships takes the raw party memberships for Lords
+    and filters, combines and sorts them as described for
+    fetch_lords_party_memberships. lords_memberships should be the dataframe of
+    Lords memberships to filter against, or None if no filtering on Lords
+    memberships is required.
+
+    """
+
+    # Convert low-cardinality columns to categoricals if requested
+    if categorical:
+        party_memberships = utils.convert_categorical_columns(
+            party_memberships)
+
+    # Filter on dates if requested
+    if not pd.isna(from_date) or not pd.isna(to_date):
+        party_memberships = filter.filter_dates(
+            party_memberships,
+            start_col='party_membership_start_date',
+            end_col='party_membership_end_date',
+            from_date=from_date,
+            to_date=to_date)
+
+    # Filter on Lords memberships if requested
+    if lords_memberships is not None:
+        party_memberships = filter.filter_memberships(
+            tm=party_memberships,
+            fm=lords_memberships,
+            tm_id_col='party_membership_id',
+            tm_start_col='party_membership_start_date',
+            tm_end_col='party_membership_end_date',
+            fm_start_col='seat_incumbency_start_date',
+            fm_end_col='seat_incumbency_end_date',
+            join_col='person_id')
+
+    # Collapse consecutive memberships and return if requested
+    if collapse:
+        return combine.combine_party_memberships(party_memberships)
+
+    # Otherwise tidy up and return
+    party_memberships = utils.sort_rows(
+        party_memberships,
+        by=['family_name',
+            'party_membership_start_date'])
+
+    return party_memberships
+
+
+def process_lords_government_roles(government_roles,
+                                   lords_memberships,
+                                   from_date=np.NaN,
+                                   to_date=np.NaN,
+                                   categorical=False):
+
+    """Process raw government roles for Lords.
+
+    process_lords_government_roles takes the raw government roles for Lords and
+    filters and sorts them as described for fetch_lords_government_roles.
+    lords_memberships should be the dataframe of Lords memberships to filter
+    against, or None if no filtering on Lords memberships is required.
+
+    """
+
+    # Convert low-cardinality columns to categoricals if requested
+    if categorical:
+        government_roles = utils.convert_categorical_columns(government_roles)
+
+    # Filter on dates if requested
+    if not pd.isna(from_date) or not pd.isna(to_date):
+        government_roles = filter.filter_dates(
+            government_roles,
+            start_col='government_incumbency_start_date',
+            end_col='government_incumbency_end_date',
+            from_date=from_date,
+            to_date=to_date)
+
+    # Filter on Lords memberships if requested
+    if lords_memberships is not None:
+        government_roles = filter.filter_memberships(
+            tm=government_roles,
+            fm=lords_memberships,
+            tm_id_col='government_incumbency_id',
+            tm_start_col='government_incumbency_start_date',
+            tm_end_col='government_incumbency_end_date',
+            fm_start_col='seat_incumbency_start_date',
+            fm_end_col='seat_incumbency_end_date',
+            join_col='person_id')
+
+    # Tidy up and return
+    government_roles = utils.sort_rows(
+        government_roles,
+        by=['family_name',
+            'government_incumbency_start_date'])
+    return government_roles
+
+
+def process_lords_opposition_roles(opposition_roles,
+                                   lords_memberships,
+                                   from_date=np.NaN,
+                                   to_date=np.NaN,
+                                   categorical=False):
+
+    """Process raw opposition roles for Lords.
+
+    process_lords_opposition_roles takes the raw opposition roles for Lords and
+    filters and sorts them as described for fetch_lords_opposition_roles.
+    lords_memberships should be the dataframe of Lords memberships to filter
+    against, or None if no filtering on Lords memberships is required.
+
+    """
+
+    # Convert low-cardinality columns to categoricals if requested
+    if categorical:
+        opposition_roles = utils.convert_categorical_columns(opposition_roles)
+
+    # Filter on dates if requested
+    if not pd.isna(from_date) or not pd.isna(to_date):
+        opposition_roles = filter.filter_dates(
+            opposition_roles,
+            start_col='opposition_incumbency_start_date',
+            end_col='opposition_incumbency_end_date',
+            from_date=from_date,
+            to_date=to_date)
+
+    # Filter on Lords memberships if requested
+    if lords_memberships is not None:
+        opposition_roles = filter.filter_memberships(
+            tm=opposition_roles,
+            fm=lords_memberships,
+            tm_id_col='opposition_incumbency_id',
+            tm_start_col='opposition_incumbency_start_date',
+            tm_end_col='opposition_incumbency_end_date',
+            fm_start_col='seat_incumbency_start_date',
+            fm_end_col='seat_incumbency_end_date',
+            join_col='person_id')
+
+    # Tidy up and return
+    opposition_roles = utils.sort_rows(
+        opposition_roles,
+        by=['family_name',
+            'opposition_incumbency_start_date'])
+    return opposition_roles
+
+
+def process_lords_committee_memberships(committee_memberships,
+                                        lords_memberships,
+                                        from_date=np.NaN,
+                                        to_date=np.NaN,
+                                        categorical=False):
+
+    """Process raw committee memberships for Lords.
+
+    process_lords_committee_memberships takes the raw committee memberships for
+    Lords and filters and sorts them as described for
+    fetch_lords_committee_memberships. lords_memberships should be the
+    dataframe of Lords memberships to filter against, or None if no filtering
+    on Lords memberships is required.
+
+    """
+
+    # Convert low-cardinality columns to categoricals if requested
+    if categorical:
+        committee_memberships = utils.convert_categorical_columns(
+            committee_memberships)
 
     # Filter on dates if requested
     if not pd.isna(from_date) or not pd.isna(to_date):
@@ -602,8 +963,7 @@ def fetch_lords_committee_memberships(from_date=np.NaN,
             to_date=to_date)
 
     # Filter on Lords memberships if requested
-    if while_lord:
-        lords_memberships = fetch_lords_memberships()
+    if lords_memberships is not None:
         committee_memberships = filter.filter_memberships(
             tm=committee_memberships,
             fm=lords_memberships,
@@ -615,9 +975,278 @@ def fetch_lords_committee_memberships(from_date=np.NaN,
             join_col='person_id')
 
     # Tidy up and return
-    committee_memberships.sort_values(
+    committee_memberships = utils.sort_rows(
+        committee_memberships,
         by=['family_name',
-            'committee_membership_start_date'],
-        inplace=True)
-    committee_memberships.reset_index(drop=True, inplace=True)
+            'committee_membership_start_date'])
+    return committee_memberships
+
+# Async Lords API -------------------------------------------------------------
+
+@utils.instrument(constants.HOOK_EVENT_FETCH)
+async def fetch_lords_async(from_date=np.NaN,
+                            to_date=np.NaN,
+                            on_date=np.NaN,
+                            categorical=None,
+                            arrow=False):
+
+    """Fetch key details for all Lords asynchronously.
+
+    fetch_lords_async is the asynchronous counterpart of fetch_lords. It takes
+    the same arguments and returns the same dataframe, but sends its queries
+    concurrently with a non-blocking http client, so the event loop is free to
+    run other tasks while it waits. See fetch_lords for details.
+
+    """
+
+    # Set from_date and to_date to on_date if set
+    if not pd.isna(on_date):
+        from_date = on_date
+        to_date = on_date
+
+    # Fetch key details and the Lords memberships if needed
+    if not pd.isna(from_date) or not pd.isna(to_date):
+        lords, lords_memberships = await asyncio.gather(
+            fetch_lords_raw_async(),
+            fetch_lords_memberships_async())
+    else:
+        lords = await fetch_lords_raw_async()
+        lords_memberships = None
+
+    # Process and return in the requested format
+    lords = process_lords(
+        lords,
+        lords_memberships,
+        from_date,
+        to_date,
+        utils.use_categorical(categorical))
+
+    if arrow:
+        return utils.to_arrow(lords)
+
+    return lords
+
+
+@utils.instrument(constants.HOOK_EVENT_FETCH)
+async def fetch_lords_memberships_async(from_date=np.NaN,
+                                        to_date=np.NaN,
+                                        on_date=np.NaN,
+                                        categorical=None,
+                                        arrow=False):
+
+    """Fetch Lords memberships for all Lords asynchronously.
+
+    fetch_lords_memberships_async is the asynchronous counterpart of
+    fetch_lords_memberships. It takes the same arguments and returns the same
+    dataframe, but sends its queries concurrently with a non-blocking http
+    client, so the event loop is free to run other tasks while it waits. See
+    fetch_lords_memberships for details.
+
+    """
+
+    # Set from_date and to_date to on_date if set
+    if not pd.isna(on_date):
+        from_date = on_date
+        to_date = on_date
+
+    # Fetch the Lords memberships
+    lords_memberships = await fetch_lords_memberships_raw_async()
+
+    # Process and return in the requested format
+    lords_memberships = process_lords_memberships(
+        lords_memberships,
+        from_date,
+        to_date,
+        utils.use_categorical(categorical))
+
+    if arrow:
+        return utils.to_arrow(lords_memberships)
+
+    return lords_memberships
+
+
+@utils.instrument(constants.HOOK_EVENT_FETCH)
+async def fetch_lords_party_memberships_async(from_date=np.NaN,
+                                              to_date=np.NaN,
+                                              on_date=np.NaN,
+                                              while_lord=True,
+                                              collapse=False,
+                                              categorical=None,
+                                              arrow=False):
+
+    """Fetch party memberships for all Lords asynchronously.
+
+    fetch_lords_party_memberships_async is the asynchronous counterpart of
+    fetch_lords_party_memberships. It takes the same arguments and returns the
+    same dataframe, but sends its queries concurrently with a non-blocking http
+    client, so the event loop is free to run other tasks while it waits. See
+    fetch_lords_party_memberships for details.
+
+    """
+
+    # Set from_date and to_date to on_date if set
+    if not pd.isna(on_date):
+        from_date = on_date
+        to_date = on_date
+
+    # Fetch the party memberships and the Lords memberships if needed
+    if while_lord:
+        party_memberships, lords_memberships = await asyncio.gather(
+            fetch_lords_party_memberships_raw_async(),
+            fetch_lords_memberships_async())
+    else:
+        party_memberships = await fetch_lords_party_memberships_raw_async()
+        lords_memberships = None
+
+    # Process and return in the requested format
+    party_memberships = process_lords_party_memberships(
+        party_memberships,
+        lords_memberships,
+        from_date,
+        to_date,
+        collapse,
+        utils.use_categorical(categorical))
+
+    if arrow:
+        return utils.to_arrow(party_memberships)
+
+    return party_memberships
+
+
+@utils.instrument(constants.HOOK_EVENT_FETCH)
+async def fetch_lords_government_roles_async(from_date=np.NaN,
+                                             to_date=np.NaN,
+                                             on_date=np.NaN,
+                                             while_lord=True,
+                                             categorical=None,
+                                             arrow=False):
+
+    """Fetch government roles for all Lords asynchronously.
+
+    fetch_lords_government_roles_async is the asynchronous counterpart of
+    fetch_lords_government_roles. It takes the same arguments and returns the
+    same dataframe, but sends its queries concurrently with a non-blocking http
+    client, so the event loop is free to run other tasks while it waits. See
+    fetch_lords_government_roles for details.
+
+    """
+
+    # Set from_date and to_date to on_date if set
+    if not pd.isna(on_date):
+        from_date = on_date
+        to_date = on_date
+
+    # Fetch the government roles and the Lords memberships if needed
+    if while_lord:
+        government_roles, lords_memberships = await asyncio.gather(
+            fetch_lords_government_roles_raw_async(),
+            fetch_lords_memberships_async())
+    else:
+        government_roles = await fetch_lords_government_roles_raw_async()
+        lords_memberships = None
+
+    # Process and return in the requested format
+    government_roles = process_lords_government_roles(
+        government_roles,
+        lords_memberships,
+        from_date,
+        to_date,
+        utils.use_categorical(categorical))
+
+    if arrow:
+        return utils.to_arrow(government_roles)
+
+    return government_roles
+
+
+@utils.instrument(constants.HOOK_EVENT_FETCH)
+async def fetch_lords_opposition_roles_async(from_date=np.NaN,
+                                             to_date=np.NaN,
+                                             on_date=np.NaN,
+                                             while_lord=True,
+                                             categorical=None,
+                                             arrow=False):
+
+    """Fetch opposition roles for all Lords asynchronously.
+
+    fetch_lords_opposition_roles_async is the asynchronous counterpart of
+    fetch_lords_opposition_roles. It takes the same arguments and returns the
+    same dataframe, but sends its queries concurrently with a non-blocking http
+    client, so the event loop is free to run other tasks while it waits. See
+    fetch_lords_opposition_roles for details.
+
+    """
+
+    # Set from_date and to_date to on_date if set
+    if not pd.isna(on_date):
+        from_date = on_date
+        to_date = on_date
+
+    # Fetch the opposition roles and the Lords memberships if needed
+    if while_lord:
+        opposition_roles, lords_memberships = await asyncio.gather(
+            fetch_lords_opposition_roles_raw_async(),
+            fetch_lords_memberships_async())
+    else:
+        opposition_roles = await fetch_lords_opposition_roles_raw_async()
+        lords_memberships = None
+
+    # Process and return in the requested format
+    opposition_roles = process_lords_opposition_roles(
+        opposition_roles,
+        lords_memberships,
+        from_date,
+        to_date,
+        utils.use_categorical(categorical))
+
+    if arrow:
+        return utils.to_arrow(opposition_roles)
+
+    return opposition_roles
+
+
+@utils.instrument(constants.HOOK_EVENT_FETCH)
+async def fetch_lords_committee_memberships_async(from_date=np.NaN,
+                                                  to_date=np.NaN,
+                                                  on_date=np.NaN,
+                                                  while_lord=True,
+                                                  categorical=None,
+                                                  arrow=False):
+
+    """Fetch committee memberships for all Lords asynchronously.
+
+    fetch_lords_committee_memberships_async is the asynchronous counterpart of
+    fetch_lords_committee_memberships. It takes the same arguments and returns
+    the same dataframe, but sends its queries concurrently with a non-blocking
+    http client, so the event loop is free to run other tasks while it waits.
+    See fetch_lords_committee_memberships for details.
+
+    """
+
+    # Set from_date and to_date to on_date if set
+    if not pd.isna(on_date):
+        from_date = on_date
+        to_date = on_date
+
+    # Fetch the committee memberships and the Lords memberships if needed
+    if while_lord:
+        committee_memberships, lords_memberships = await asyncio.gather(
+            fetch_lords_committee_memberships_raw_async(),
+            fetch_lords_memberships_async())
+    else:
+        committee_memberships = \
+            await fetch_lords_committee_memberships_raw_async()
+        lords_memberships = None
+
+    # Process and return in the requested format
+    committee_memberships = process_lords_committee_memberships(
+        committee_memberships,
+        lords_memberships,
+        from_date,
+        to_date,
+        utils.use_categorical(categorical))
+
+    if arrow:
+        return utils.to_arrow(committee_memberships)
+
     return committee_memberships
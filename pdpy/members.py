@@ -6,11 +6,11 @@
 from . import constants
 from . import core
 
-# Raw Members queries ---------------------------------------------------------
+# Members queries -------------------------------------------------------------
 
-def fetch_members_raw(house=None):
+def get_members_query(house=None):
 
-    """Fetch key details for Members."""
+    """Get the query for key details for Members."""
 
     # Initialise house constraint
     house_constraint = ''
@@ -55,12 +55,30 @@ def fetch_members_raw(house=None):
         }}
     """.format(house_constraint)
 
-    return core.sparql_select(members_query)
+    return members_query
 
 
-def fetch_party_memberships_raw(house=None):
+def fetch_members_raw(house=None):
+
+    """Fetch key details for Members."""
+
+    return core.sparql_select(
+        get_members_query(house=house),
+        date_cols=constants.DATE_COLS_MEMBERS)
 
-    """Fetch party memberships for Members."""
+
+async def fetch_members_raw_async(house=None):
+
+    """Fetch key details for Members asynchronously."""
+
+    return await core.sparql_select_async(
+        get_members_query(house=house),
+        date_cols=constants.DATE_COLS_MEMBERS)
+
+
+def get_party_memberships_query(house=None):
+
+    """Get the query for party memberships for Members."""
 
     # Initialise house constraint
     house_constraint = ''
@@ -107,12 +125,30 @@ def fetch_party_memberships_raw(house=None):
         }}
     """.format(house_constraint)
 
-    return core.sparql_select(party_memberships_query)
+    return party_memberships_query
 
 
-def fetch_government_roles_raw(house=None):
+def fetch_party_memberships_raw(house=None):
 
-    """Fetch government roles for Members."""
+    """Fetch party memberships for Members."""
+
+    return core.sparql_select(
+        get_party_memberships_query(house=house),
+        date_cols=constants.DATE_COLS_PARTY_MEMBERSHIPS)
+
+
+async def fetch_party_memberships_raw_async(house=None):
+
+    """Fetch party memberships for Members asynchronously."""
+
+    return await core.sparql_select_async(
+        get_party_memberships_query(house=house),
+        date_cols=constants.DATE_COLS_PARTY_MEMBERSHIPS)
+
+
+def get_government_roles_query(house=None):
+
+    """Get the query for government roles for Members."""
 
     # Initialise house constraint
     house_constraint = ''
@@ -157,12 +193,30 @@ def fetch_government_roles_raw(house=None):
         }}
     """.format(house_constraint)
 
-    return core.sparql_select(government_roles_query)
+    return government_roles_query
 
 
-def fetch_opposition_roles_raw(house=None):
+def fetch_government_roles_raw(house=None):
 
-    """Fetch opposition roles for Members."""
+    """Fetch government roles for Members."""
+
+    return core.sparql_select(
+        get_government_roles_query(house=house),
+        date_cols=constants.DATE_COLS_GOVERNMENT_ROLES)
+
+
+async def fetch_government_roles_raw_async(house=None):
+
+    """Fetch government roles for Members asynchronously."""
+
+    return await core.sparql_select_async(
+        get_government_roles_query(house=house),
+        date_cols=constants.DATE_COLS_GOVERNMENT_ROLES)
+
+
+def get_opposition_roles_query(house=None):
+
+    """Get the query for opposition roles for Members."""
 
     # Initialise house constraint
     house_constraint = ''
@@ -207,12 +261,30 @@ def fetch_opposition_roles_raw(house=None):
         }}
     """.format(house_constraint)
 
-    return core.sparql_select(opposition_roles_query)
+    return opposition_roles_query
 
 
-def fetch_committee_memberships_raw(house=None):
+def fetch_opposition_roles_raw(house=None):
 
-    """Fetch committee memberships for Members."""
+    """Fetch opposition roles for Members."""
+
+    return core.sparql_select(
+        get_opposition_roles_query(house=house),
+        date_cols=constants.DATE_COLS_OPPOSITION_ROLES)
+
+
+async def fetch_opposition_roles_raw_async(house=None):
+
+    """Fetch opposition roles for Members asynchronously."""
+
+    return await core.sparql_select_async(
+        get_opposition_roles_query(house=house),
+        date_cols=constants.DATE_COLS_OPPOSITION_ROLES)
+
+
+def get_committee_memberships_query(house=None):
+
+    """Get the query for committee memberships for Members."""
 
     # Initialise house constraint
     house_constraint = ''
@@ -263,4 +335,23 @@ def fetch_committee_memberships_raw(house=None):
         }}
     """.format(house_constraint)
 
-    return core.sparql_select(committee_memberships_query)
+    return committee_memberships_query
+
+
+def fetch_committee_memberships_raw(house=None):
+
+    """Fetch committee memberships for Members."""
+
+    return core.sparql_select(
+        get_committee_memberships_query(house=house),
+        stream=True,
+        date_cols=constants.DATE_COLS_COMMITTEE_MEMBERSHIPS)
+
+
+async def fetch_committee_memberships_raw_async(house=None):
+
+    """Fetch committee memberships for Members asynchronously."""
+
+    return await core.sparql_select_async(
+        get_committee_memberships_query(house=house),
+        date_cols=constants.DATE_COLS_COMMITTEE_MEMBERSHIPS)
@@ -3,6 +3,7 @@
 
 # Imports ---------------------------------------------------------------------
 
+import asyncio
 import numpy as np
 import pandas as pd
 
@@ -12,19 +13,24 @@ from . import core
 from . import elections
 from . import filter
 from . import members
+from . import snapshot
 from . import utils
 
 # Raw MPs queries -------------------------------------------------------------
 
 def fetch_mps_raw():
+
     """Fetch key details for all MPs."""
-    return members.fetch_members_raw(
+
+    return snapshot.fetch_table(
+        'mps_raw',
+        members.fetch_members_raw,
         house=constants.PDP_ID_HOUSE_OF_COMMONS)
 
 
-def fetch_commons_memberships_raw():
+def get_commons_memberships_query():
 
-    """Fetch Commons memberships for all MPs."""
+    """Get the query for Commons memberships for all MPs."""
 
     commons_memberships_query = """
         PREFIX : <https://id.parliament.uk/schema/>
@@ -65,37 +71,129 @@ def fetch_commons_memberships_raw():
         }}
     """.format(constants.PDP_ID_HOUSE_OF_COMMONS)
 
-    return core.sparql_select(commons_memberships_query)
+    return commons_memberships_query
+
+
+def fetch_commons_memberships_raw():
+
+    """Fetch Commons memberships for all MPs."""
+
+    return snapshot.fetch_table(
+        'commons_memberships_raw',
+        core.sparql_select,
+        get_commons_memberships_query(),
+        date_cols=constants.DATE_COLS_SEAT_INCUMBENCIES)
 
 
 def fetch_mps_party_memberships_raw():
+
     """Fetch party memberships for all MPs."""
-    return members.fetch_party_memberships_raw(
+
+    return snapshot.fetch_table(
+        'mps_party_memberships_raw',
+        members.fetch_party_memberships_raw,
         house=constants.PDP_ID_HOUSE_OF_COMMONS)
 
 
 def fetch_mps_government_roles_raw():
+
     """Fetch government roles for all MPs."""
-    return members.fetch_government_roles_raw(
+
+    return snapshot.fetch_table(
+        'mps_government_roles_raw',
+        members.fetch_government_roles_raw,
         house=constants.PDP_ID_HOUSE_OF_COMMONS)
 
 
 def fetch_mps_opposition_roles_raw():
+
     """Fetch opposition roles for all MPs."""
-    return members.fetch_opposition_roles_raw(
+
+    return snapshot.fetch_table(
+        'mps_opposition_roles_raw',
+        members.fetch_opposition_roles_raw,
         house=constants.PDP_ID_HOUSE_OF_COMMONS)
 
 
 def fetch_mps_committee_memberships_raw():
+
     """Fetch committee memberships for all MPs."""
-    return members.fetch_committee_memberships_raw(
+
+    return snapshot.fetch_table(
+        'mps_committee_memberships_raw',
+        members.fetch_committee_memberships_raw,
+        house=constants.PDP_ID_HOUSE_OF_COMMONS)
+
+# Async raw MPs queries -------------------------------------------------------
+
+async def fetch_mps_raw_async():
+
+    """Fetch key details for all MPs asynchronously."""
+
+    return await snapshot.fetch_table_async(
+        'mps_raw',
+        members.fetch_members_raw_async,
+        house=constants.PDP_ID_HOUSE_OF_COMMONS)
+
+
+async def fetch_commons_memberships_raw_async():
+
+    """Fetch Commons memberships for all MPs asynchronously."""
+
+    return await snapshot.fetch_table_async(
+        'commons_memberships_raw',
+        core.sparql_select_async,
+        get_commons_memberships_query(),
+        date_cols=constants.DATE_COLS_SEAT_INCUMBENCIES)
+
+
+async def fetch_mps_party_memberships_raw_async():
+
+    """Fetch party memberships for all MPs asynchronously."""
+
+    return await snapshot.fetch_table_async(
+        'mps_party_memberships_raw',
+        members.fetch_party_memberships_raw_async,
+        house=constants.PDP_ID_HOUSE_OF_COMMONS)
+
+
+async def fetch_mps_government_roles_raw_async():
+
+    """Fetch government roles for all MPs asynchronously."""
+
+    return await snapshot.fetch_table_async(
+        'mps_government_roles_raw',
+        members.fetch_government_roles_raw_async,
+        house=constants.PDP_ID_HOUSE_OF_COMMONS)
+
+
+async def fetch_mps_opposition_roles_raw_async():
+
+    """Fetch opposition roles for all MPs asynchronously."""
+
+    return await snapshot.fetch_table_async(
+        'mps_opposition_roles_raw',
+        members.fetch_opposition_roles_raw_async,
+        house=constants.PDP_ID_HOUSE_OF_COMMONS)
+
+
+async def fetch_mps_committee_memberships_raw_async():
+
+    """Fetch committee memberships for all MPs asynchronously."""
+
+    return await snapshot.fetch_table_async(
+        'mps_committee_memberships_raw',
+        members.fetch_committee_memberships_raw_async,
         house=constants.PDP_ID_HOUSE_OF_COMMONS)
 
 # Main MPs API ----------------------------------------------------------------
 
+@utils.instrument(constants.HOOK_EVENT_FETCH)
 def fetch_mps(from_date=np.NaN,
               to_date=np.NaN,
-              on_date=np.NaN):
+              on_date=np.NaN,
+              categorical=None,
+              arrow=False):
 
     """Fetch key details for all MPs.
 
@@ -130,6 +228,14 @@ def fetch_mps(from_date=np.NaN,
         should specify the date in ISO 8601 date format e.g. '2000-12-31'. The
         default value is np.NaN, which means no records are excluded on the
         basis of the on_date.
+    categorical : bool or None, optional
+        A boolean indicating whether to return low-cardinality columns such as
+        party_name as pandas categoricals. The default value is None, which
+        means the categorical setting is used.
+    arrow : bool, optional
+        A boolean indicating whether to return the results as a pyarrow Table
+        rather than a pandas dataframe. See to_arrow for details. This
+        requires pyarrow. The default value is False.
 
     Returns
     -------
@@ -143,31 +249,32 @@ def fetch_mps(from_date=np.NaN,
         from_date = on_date
         to_date = on_date
 
-    # Fetch key details
+    # Fetch key details and the Commons memberships if needed
     mps = fetch_mps_raw()
-
-    # Filter based on membership dates if requested
+    commons_memberships = None
     if not pd.isna(from_date) or not pd.isna(to_date):
         commons_memberships = fetch_commons_memberships()
-        matching_memberships = filter.filter_dates(
-            commons_memberships,
-            start_col='seat_incumbency_start_date',
-            end_col='seat_incumbency_end_date',
-            from_date=from_date,
-            to_date=to_date)
-        mps = mps[mps['person_id'].isin(matching_memberships['person_id'])]
 
-    # Tidy up and return
-    mps.sort_values(
-        by=['family_name'],
-        inplace=True)
-    mps.reset_index(drop=True, inplace=True)
+    # Process and return in the requested format
+    mps = process_mps(
+        mps,
+        commons_memberships,
+        from_date,
+        to_date,
+        utils.use_categorical(categorical))
+
+    if arrow:
+        return utils.to_arrow(mps)
+
     return mps
 
 
+@utils.instrument(constants.HOOK_EVENT_FETCH)
 def fetch_commons_memberships(from_date=np.NaN,
                               to_date=np.NaN,
-                              on_date=np.NaN):
+                              on_date=np.NaN,
+                              categorical=None,
+                              arrow=False):
 
     """Fetch Commons memberships for all MPs.
 
@@ -203,6 +310,14 @@ def fetch_commons_memberships(from_date=np.NaN,
         should specify the date in ISO 8601 date format e.g. '2000-12-31'. The
         default value is np.NaN, which means no records are excluded on the
         basis of the on_date.
+    categorical : bool or None, optional
+        A boolean indicating whether to return low-cardinality columns such as
+        party_name as pandas categoricals. The default value is None, which
+        means the categorical setting is used.
+    arrow : bool, optional
+        A boolean indicating whether to return the results as a pyarrow Table
+        rather than a pandas dataframe. See to_arrow for details. This
+        requires pyarrow. The default value is False.
 
     Returns
     -------
@@ -220,52 +335,27 @@ def fetch_commons_memberships(from_date=np.NaN,
     # Fetch the Commons memberships
     commons_memberships = fetch_commons_memberships_raw()
 
-    # Get elections and fix the end dates of memberships
-    end_dates = commons_memberships['seat_incumbency_end_date'].values
-
-    general_elections = elections.get_general_elections().values
-    general_elections_count = len(general_elections)
-
-    # If the end date for a membership falls after dissolution adjust it
-    for i in range(len(end_dates)):
-
-        date = end_dates[i]
-        if pd.isna(date): continue
+    # Process and return in the requested format
+    commons_memberships = process_commons_memberships(
+        commons_memberships,
+        from_date,
+        to_date,
+        utils.use_categorical(categorical))
 
-        for j in range(general_elections_count):
-
-            dissolution = general_elections[j, 1]
-            election = general_elections[j, 2]
-
-            if date > dissolution and date <= election:
-                end_dates[i] = dissolution
-                continue
-
-    commons_memberships['seat_incumbency_end_date'] = end_dates
-
-    # Filter on dates if requested
-    if not pd.isna(from_date) or not pd.isna(to_date):
-        commons_memberships = filter.filter_dates(
-            commons_memberships,
-            start_col='seat_incumbency_start_date',
-            end_col='seat_incumbency_end_date',
-            from_date=from_date,
-            to_date=to_date)
+    if arrow:
+        return utils.to_arrow(commons_memberships)
 
-    # Tidy up and return
-    commons_memberships.sort_values(
-        by=['family_name',
-            'seat_incumbency_start_date'],
-        inplace=True)
-    commons_memberships.reset_index(drop=True, inplace=True)
     return commons_memberships
 
 
+@utils.instrument(constants.HOOK_EVENT_FETCH)
 def fetch_mps_party_memberships(from_date=np.NaN,
                                 to_date=np.NaN,
                                 on_date=np.NaN,
                                 while_mp=True,
-                                collapse=False):
+                                collapse=False,
+                                categorical=None,
+                                arrow=False):
 
     """Fetch party memberships for all MPs.
 
@@ -318,6 +408,14 @@ def fetch_mps_party_memberships(from_date=np.NaN,
         party into a single period of continuous party membership. Setting this
         to True means that party membership ids are not returned in the
         dataframe. The default value is False.
+    categorical : bool or None, optional
+        A boolean indicating whether to return low-cardinality columns such as
+        party_name as pandas categoricals. The default value is None, which
+        means the categorical setting is used.
+    arrow : bool, optional
+        A boolean indicating whether to return the results as a pyarrow Table
+        rather than a pandas dataframe. See to_arrow for details. This
+        requires pyarrow. The default value is False.
 
     Returns
     -------
@@ -335,49 +433,32 @@ def fetch_mps_party_memberships(from_date=np.NaN,
         from_date = on_date
         to_date = on_date
 
-    # Fetch the party memberships
+    # Fetch the party memberships and the Commons memberships if needed
     party_memberships = fetch_mps_party_memberships_raw()
+    commons_memberships = fetch_commons_memberships() if while_mp else None
 
-    # Filter on dates if requested
-    if not pd.isna(from_date) or not pd.isna(to_date):
-        party_memberships = filter.filter_dates(
-            party_memberships,
-            start_col='party_membership_start_date',
-            end_col='party_membership_end_date',
-            from_date=from_date,
-            to_date=to_date)
-
-    # Filter on Commons memberships if requested
-    if while_mp:
-        commons_memberships = fetch_commons_memberships()
-        party_memberships = filter.filter_memberships(
-            tm=party_memberships,
-            fm=commons_memberships,
-            tm_id_col='party_membership_id',
-            tm_start_col='party_membership_start_date',
-            tm_end_col='party_membership_end_date',
-            fm_start_col='seat_incumbency_start_date',
-            fm_end_col='seat_incumbency_end_date',
-            join_col='person_id')
-
-    # Collapse consecutive memberships and return if requested
-    if collapse:
-        return combine.combine_party_memberships(party_memberships)
+    # Process and return in the requested format
+    party_memberships = process_mps_party_memberships(
+        party_memberships,
+        commons_memberships,
+        from_date,
+        to_date,
+        collapse,
+        utils.use_categorical(categorical))
 
-    # Otherwise tidy up and return
-    party_memberships.sort_values(
-        by=['family_name',
-            'party_membership_start_date'],
-        inplace=True)
-    party_memberships.reset_index(drop=True, inplace=True)
+    if arrow:
+        return utils.to_arrow(party_memberships)
 
     return party_memberships
 
 
+@utils.instrument(constants.HOOK_EVENT_FETCH)
 def fetch_mps_government_roles(from_date=np.NaN,
                                to_date=np.NaN,
                                on_date=np.NaN,
-                               while_mp=True):
+                               while_mp=True,
+                               categorical=None,
+                               arrow=False):
 
     """Fetch government roles for all MPs.
 
@@ -419,6 +500,14 @@ def fetch_mps_government_roles(from_date=np.NaN,
         A boolean indicating whether to filter the government roles to include
         only those roles that were held while each individual was serving as an
         MP. The default value is True.
+    categorical : bool or None, optional
+        A boolean indicating whether to return low-cardinality columns such as
+        party_name as pandas categoricals. The default value is None, which
+        means the categorical setting is used.
+    arrow : bool, optional
+        A boolean indicating whether to return the results as a pyarrow Table
+        rather than a pandas dataframe. See to_arrow for details. This
+        requires pyarrow. The default value is False.
 
     Returns
     -------
@@ -432,44 +521,31 @@ def fetch_mps_government_roles(from_date=np.NaN,
         from_date = on_date
         to_date = on_date
 
-    # Fetch the government roles
+    # Fetch the government roles and the Commons memberships if needed
     government_roles = fetch_mps_government_roles_raw()
+    commons_memberships = fetch_commons_memberships() if while_mp else None
 
-    # Filter on dates if requested
-    if not pd.isna(from_date) or not pd.isna(to_date):
-        government_roles = filter.filter_dates(
-            government_roles,
-            start_col='government_incumbency_start_date',
-            end_col='government_incumbency_end_date',
-            from_date=from_date,
-            to_date=to_date)
+    # Process and return in the requested format
+    government_roles = process_mps_government_roles(
+        government_roles,
+        commons_memberships,
+        from_date,
+        to_date,
+        utils.use_categorical(categorical))
 
-    # Filter on Commons memberships if requested
-    if while_mp:
-        commons_memberships = fetch_commons_memberships()
-        government_roles = filter.filter_memberships(
-            tm=government_roles,
-            fm=commons_memberships,
-            tm_id_col='government_incumbency_id',
-            tm_start_col='government_incumbency_start_date',
-            tm_end_col='government_incumbency_end_date',
-            fm_start_col='seat_incumbency_start_date',
-            fm_end_col='seat_incumbency_end_date',
-            join_col='person_id')
+    if arrow:
+        return utils.to_arrow(government_roles)
 
-    # Tidy up and return
-    government_roles.sort_values(
-        by=['family_name',
-            'government_incumbency_start_date'],
-        inplace=True)
-    government_roles.reset_index(drop=True, inplace=True)
     return government_roles
 
 
+@utils.instrument(constants.HOOK_EVENT_FETCH)
 def fetch_mps_opposition_roles(from_date=np.NaN,
                                to_date=np.NaN,
                                on_date=np.NaN,
-                               while_mp=True):
+                               while_mp=True,
+                               categorical=None,
+                               arrow=False):
 
     """Fetch opposition roles for all MPs.
 
@@ -511,6 +587,14 @@ def fetch_mps_opposition_roles(from_date=np.NaN,
         A boolean indicating whether to filter the opposition roles to include
         only those roles that were held while each individual was serving as an
         MP. The default value is True.
+    categorical : bool or None, optional
+        A boolean indicating whether to return low-cardinality columns such as
+        party_name as pandas categoricals. The default value is None, which
+        means the categorical setting is used.
+    arrow : bool, optional
+        A boolean indicating whether to return the results as a pyarrow Table
+        rather than a pandas dataframe. See to_arrow for details. This
+        requires pyarrow. The default value is False.
 
     Returns
     -------
@@ -524,44 +608,31 @@ def fetch_mps_opposition_roles(from_date=np.NaN,
         from_date = on_date
         to_date = on_date
 
-    # Fetch the opposition roles
+    # Fetch the opposition roles and the Commons memberships if needed
     opposition_roles = fetch_mps_opposition_roles_raw()
+    commons_memberships = fetch_commons_memberships() if while_mp else None
 
-    # Filter on dates if requested
-    if not pd.isna(from_date) or not pd.isna(to_date):
-        opposition_roles = filter.filter_dates(
-            opposition_roles,
-            start_col='opposition_incumbency_start_date',
-            end_col='opposition_incumbency_end_date',
-            from_date=from_date,
-            to_date=to_date)
+    # Process and return in the requested format
+    opposition_roles = process_mps_opposition_roles(
+        opposition_roles,
+        commons_memberships,
+        from_date,
+        to_date,
+        utils.use_categorical(categorical))
 
-    # Filter on Commons memberships if requested
-    if while_mp:
-        commons_memberships = fetch_commons_memberships()
-        opposition_roles = filter.filter_memberships(
-            tm=opposition_roles,
-            fm=commons_memberships,
-            tm_id_col='opposition_incumbency_id',
-            tm_start_col='opposition_incumbency_start_date',
-            tm_end_col='opposition_incumbency_end_date',
-            fm_start_col='seat_incumbency_start_date',
-            fm_end_col='seat_incumbency_end_date',
-            join_col='person_id')
+    if arrow:
+        return utils.to_arrow(opposition_roles)
 
-    # Tidy up and return
-    opposition_roles.sort_values(
-        by=['family_name',
-            'opposition_incumbency_start_date'],
-        inplace=True)
-    opposition_roles.reset_index(drop=True, inplace=True)
     return opposition_roles
 
 
+@utils.instrument(constants.HOOK_EVENT_FETCH)
 def fetch_mps_committee_memberships(from_date=np.NaN,
                                     to_date=np.NaN,
                                     on_date=np.NaN,
-                                    while_mp=True):
+                                    while_mp=True,
+                                    categorical=None,
+                                    arrow=False):
 
     """Fetch committee memberships for all MPs.
 
@@ -603,6 +674,14 @@ def fetch_mps_committee_memberships(from_date=np.NaN,
         A boolean indicating whether to filter the committee memberships to
         include only those memberships that were held while each individual was
         serving as an MP. The default value is True.
+    categorical : bool or None, optional
+        A boolean indicating whether to return low-cardinality columns such as
+        party_name as pandas categoricals. The default value is None, which
+        means the categorical setting is used.
+    arrow : bool, optional
+        A boolean indicating whether to return the results as a pyarrow Table
+        rather than a pandas dataframe. See to_arrow for details. This
+        requires pyarrow. The default value is False.
 
     Returns
     -------
@@ -617,8 +696,272 @@ def fetch_mps_committee_memberships(from_date=np.NaN,
         from_date = on_date
         to_date = on_date
 
-    # Fetch the committee memberships
+    # Fetch the committee memberships and the Commons memberships if needed
     committee_memberships = fetch_mps_committee_memberships_raw()
+    commons_memberships = fetch_commons_memberships() if while_mp else None
+
+    # Process and return in the requested format
+    committee_memberships = process_mps_committee_memberships(
+        committee_memberships,
+        commons_memberships,
+        from_date,
+        to_date,
+        utils.use_categorical(categorical))
+
+    if arrow:
+        return utils.to_arrow(committee_memberships)
+
+    return committee_memberships
+
+# Process MPs data ------------------------------------------------------------
+
+def process_mps(mps,
+                commons_memberships,
+                from_date=np.NaN,
+                to_date=np.NaN,
+                categorical=False):
+
+    """Process raw key details for MPs.
+
+    process_mps takes the raw key details for MPs and filters and sorts them as
+    described for fetch_mps. commons_memberships should be the dataframe of
+    Commons memberships to filter against, or None if no filtering on Commons
+    memberships is required.
+
+    """
+
+    # Convert low-cardinality columns to categoricals if requested
+    if categorical:
+        mps = utils.convert_categorical_columns(mps)
+
+    # Filter based on membership dates if requested
+    if commons_memberships is not None:
+        matching_memberships = filter.filter_dates(
+            commons_memberships,
+            start_col='seat_incumbency_start_date',
+            end_col='seat_incumbency_end_date',
+            from_date=from_date,
+            to_date=to_date)
+        mps = mps[mps['person_id'].isin(matching_memberships['person_id'])]
+
+    # Tidy up and return
+    mps = utils.sort_rows(
+        mps,
+        by=['family_name'])
+    return mps
+
+
+def process_commons_memberships(commons_memberships,
+                                from_date=np.NaN,
+                                to_date=np.NaN,
+                                categorical=False):
+
+    """Process raw Commons memberships.
+
+    process_commons_memberships takes the raw Commons memberships and filters
+    and sorts them as described for fetch_commons_memberships.
+
+    """
+
+    # Convert low-cardinality columns to categoricals if requested
+    if categorical:
+        commons_memberships = utils.convert_categorical_columns(
+            commons_memberships)
+
+    # Fix the end dates of memberships that ended at a general election
+    commons_memberships['seat_incumbency_end_date'] = \
+        elections.clip_to_dissolution(
+            commons_memberships['seat_incumbency_end_date'])
+
+    # Filter on dates if requested
+    if not pd.isna(from_date) or not pd.isna(to_date):
+        commons_memberships = filter.filter_dates(
+            commons_memberships,
+            start_col='seat_incumbency_start_date',
+            end_col='seat_incumbency_end_date',
+            from_date=from_date,
+            to_date=to_date)
+
+    # Tidy up and return
+    commons_memberships = utils.sort_rows(
+        commons_memberships,
+        by=['family_name',
+            'seat_incumbency_start_date'])
+    return commons_memberships
+
+
+def process_mps_party_memberships(party_memberships,
+                                  commons_memberships,
+                                  from_date=np.NaN,
+                                  to_date=np.NaN,
+                                  collapse=False,
+                                  categorical=False):
+
+    """Process raw party memberships for MPs.
+
+    process_mps_party_memberships takes the raw party memberships for MPs and
+    filters, combines and sorts them as described for
+    fetch_mps_party_memberships. commons_memberships should be the dataframe of
+    Commons memberships to filter against, or None if no filtering on Commons
+    memberships is required.
+
+    """
+
+    # Convert low-cardinality columns to categoricals if requested
+    if categorical:
+        party_memberships = utils.convert_categorical_columns(
+            party_memberships)
+
+    # Filter on dates if requested
+    if not pd.isna(from_date) or not pd.isna(to_date):
+        party_memberships = filter.filter_dates(
+            party_memberships,
+            start_col='party_membership_start_date',
+            end_col='party_membership_end_date',
+            from_date=from_date,
+            to_date=to_date)
+
+    # Filter on Commons memberships if requested
+    if commons_memberships is not None:
+        party_memberships = filter.filter_memberships(
+            tm=party_memberships,
+            fm=commons_memberships,
+            tm_id_col='party_membership_id',
+            tm_start_col='party_membership_start_date',
+            tm_end_col='party_membership_end_date',
+            fm_start_col='seat_incumbency_start_date',
+            fm_end_col='seat_incumbency_end_date',
+            join_col='person_id')
+
+    # Collapse consecutive memberships and return if requested
+    if collapse:
+        return combine.combine_party_memberships(party_memberships)
+
+    # Otherwise tidy up and return
+    party_memberships = utils.sort_rows(
+        party_memberships,
+        by=['family_name',
+            'party_membership_start_date'])
+
+    return party_memberships
+
+
+def process_mps_government_roles(government_roles,
+                                 commons_memberships,
+                                 from_date=np.NaN,
+                                 to_date=np.NaN,
+                                 categorical=False):
+
+    """Process raw government roles for MPs.
+
+    process_mps_government_roles takes the raw government roles for MPs and
+    filters and sorts them as described for fetch_mps_government_roles.
+    commons_memberships should be the dataframe of Commons memberships to
+    filter against, or None if no filtering on Commons memberships is required.
+
+    """
+
+    # Convert low-cardinality columns to categoricals if requested
+    if categorical:
+        government_roles = utils.convert_categorical_columns(government_roles)
+
+    # Filter on dates if requested
+    if not pd.isna(from_date) or not pd.isna(to_date):
+        government_roles = filter.filter_dates(
+            government_roles,
+            start_col='government_incumbency_start_date',
+            end_col='government_incumbency_end_date',
+            from_date=from_date,
+            to_date=to_date)
+
+    # Filter on Commons memberships if requested
+    if commons_memberships is not None:
+        government_roles = filter.filter_memberships(
+            tm=government_roles,
+            fm=commons_memberships,
+            tm_id_col='government_incumbency_id',
+            tm_start_col='government_incumbency_start_date',
+            tm_end_col='government_incumbency_end_date',
+            fm_start_col='seat_incumbency_start_date',
+            fm_end_col='seat_incumbency_end_date',
+            join_col='person_id')
+
+    # Tidy up and return
+    government_roles = utils.sort_rows(
+        government_roles,
+        by=['family_name',
+            'government_incumbency_start_date'])
+    return government_roles
+
+
+def process_mps_opposition_roles(opposition_roles,
+                                 commons_memberships,
+                                 from_date=np.NaN,
+                                 to_date=np.NaN,
+                                 categorical=False):
+
+    """Process raw opposition roles for MPs.
+
+    process_mps_opposition_roles takes the raw opposition roles for MPs and
+    filters and sorts them as described for fetch_mps_opposition_roles.
+    commons_memberships should be the dataframe of Commons memberships to
+    filter against, or None if no filtering on Commons memberships is required.
+
+    """
+
+    # Convert low-cardinality columns to categoricals if requested
+    if categorical:
+        opposition_roles = utils.convert_categorical_columns(opposition_roles)
+
+    # Filter on dates if requested
+    if not pd.isna(from_date) or not pd.isna(to_date):
+        opposition_roles = filter.filter_dates(
+            opposition_roles,
+            start_col='opposition_incumbency_start_date',
+            end_col='opposition_incumbency_end_date',
+            from_date=from_date,
+            to_date=to_date)
+
+    # Filter on Commons memberships if requested
+    if commons_memberships is not None:
+        opposition_roles = filter.filter_memberships(
+            tm=opposition_roles,
+            fm=commons_memberships,
+            tm_id_col='opposition_incumbency_id',
+            tm_start_col='opposition_incumbency_start_date',
+            tm_end_col='opposition_incumbency_end_date',
+            fm_start_col='seat_incumbency_start_date',
+            fm_end_col='seat_incumbency_end_date',
+            join_col='person_id')
+
+    # Tidy up and return
+    opposition_roles = utils.sort_rows(
+        opposition_roles,
+        by=['family_name',
+            'opposition_incumbency_start_date'])
+    return opposition_roles
+
+
+def process_mps_committee_memberships(committee_memberships,
+                                      commons_memberships,
+                                      from_date=np.NaN,
+                                      to_date=np.NaN,
+                                      categorical=False):
+
+    """Process raw committee memberships for MPs.
+
+    process_mps_committee_memberships takes the raw committee memberships for
+    MPs and filters and sorts them as described for
+    fetch_mps_committee_memberships. commons_memberships should be the
+    dataframe of Commons memberships to filter against, or None if no filtering
+    on Commons memberships is required.
+
+    """
+
+    # Convert low-cardinality columns to categoricals if requested
+    if categorical:
+        committee_memberships = utils.convert_categorical_columns(
+            committee_memberships)
 
     # Filter on dates if requested
     if not pd.isna(from_date) or not pd.isna(to_date):
@@ -630,8 +973,7 @@ def fetch_mps_committee_memberships(from_date=np.NaN,
             to_date=to_date)
 
     # Filter on Commons memberships if requested
-    if while_mp:
-        commons_memberships = fetch_commons_memberships()
+    if commons_memberships is not None:
         committee_memberships = filter.filter_memberships(
             tm=committee_memberships,
             fm=commons_memberships,
@@ -643,9 +985,278 @@ def fetch_mps_committee_memberships(from_date=np.NaN,
             join_col='person_id')
 
     # Tidy up and return
-    committee_memberships.sort_values(
+    committee_memberships = utils.sort_rows(
+        committee_memberships,
         by=['family_name',
-            'committee_membership_start_date'],
-        inplace=True)
-    committee_memberships.reset_index(drop=True, inplace=True)
+            'committee_membership_start_date'])
+    return committee_memberships
+
+# Async MPs API ---------------------------------------------------------------
+
+@utils.instrument(constants.HOOK_EVENT_FETCH)
+async def fetch_mps_async(from_date=np.NaN,
+                          to_date=np.NaN,
+                          on_date=np.NaN,
+                          categorical=None,
+                          arrow=False):
+
+    """Fetch key details for all MPs asynchronously.
+
+    fetch_mps_async is the asynchronous counterpart of fetch_mps. It takes the
+    same arguments and returns the same dataframe, but sends its queries
+    concurrently with a non-blocking http client, so the event loop is free to
+    run other tasks while it waits. See fetch_mps for details.
+
+    """
+
+    # Set from_date and to_date to on_date if set
+    if not pd.isna(on_date):
+        from_date = on_date
+        to_date = on_date
+
+    # Fetch key details and the Commons memberships if needed
+    if not pd.isna(from_date) or not pd.isna(to_date):
+        mps, commons_memberships = await asyncio.gather(
+            fetch_mps_raw_async(),
+            fetch_commons_memberships_async())
+    else:
+        mps = await fetch_mps_raw_async()
+        commons_memberships = None
+
+    # Process and return in the requested format
+    mps = process_mps(
+        mps,
+        commons_memberships,
+        from_date,
+        to_date,
+        utils.use_categorical(categorical))
+
+    if arrow:
+        return utils.to_arrow(mps)
+
+    return mps
+
+
+@utils.instrument(constants.HOOK_EVENT_FETCH)
+async def fetch_commons_memberships_async(from_date=np.NaN,
+                                          to_date=np.NaN,
+                                          on_date=np.NaN,
+                                          categorical=None,
+                                          arrow=False):
+
+    """Fetch Commons memberships for all MPs asynchronously.
+
+    fetch_commons_memberships_async is the asynchronous counterpart of
+    fetch_commons_memberships. It takes the same arguments and returns the same
+    dataframe, but sends its queries concurrently with a non-blocking http
+    client, so the event loop is free to run other tasks while it waits. See
+    fetch_commons_memberships for details.
+
+    """
+
+    # Set from_date and to_date to on_date if set
+    if not pd.isna(on_date):
+        from_date = on_date
+        to_date = on_date
+
+    # Fetch the Commons memberships
+    commons_memberships = await fetch_commons_memberships_raw_async()
+
+    # Process and return in the requested format
+    commons_memberships = process_commons_memberships(
+        commons_memberships,
+        from_date,
+        to_date,
+        utils.use_categorical(categorical))
+
+    if arrow:
+        return utils.to_arrow(commons_memberships)
+
+    return commons_memberships
+
+
+@utils.instrument(constants.HOOK_EVENT_FETCH)
+async def fetch_mps_party_memberships_async(from_date=np.NaN,
+                                            to_date=np.NaN,
+                                            on_date=np.NaN,
+                                            while_mp=True,
+                                            collapse=False,
+                                            categorical=None,
+                                            arrow=False):
+
+    """Fetch party memberships for all MPs asynchronously.
+
+    fetch_mps_party_memberships_async is the asynchronous counterpart of
+    fetch_mps_party_memberships. It takes the same arguments and returns the
+    same dataframe, but sends its queries concurrently with a non-blocking http
+    client, so the event loop is free to run other tasks while it waits. See
+    fetch_mps_party_memberships for details.
+
+    """
+
+    # Set from_date and to_date to on_date if set
+    if not pd.isna(on_date):
+        from_date = on_date
+        to_date = on_date
+
+    # Fetch the party memberships and the Commons memberships if needed
+    if while_mp:
+        party_memberships, commons_memberships = await asyncio.gather(
+            fetch_mps_party_memberships_raw_async(),
+            fetch_commons_memberships_async())
+    else:
+        party_memberships = await fetch_mps_party_memberships_raw_async()
+        commons_memberships = None
+
+    # Process and return in the requested format
+    party_memberships = process_mps_party_memberships(
+        party_memberships,
+        commons_memberships,
+        from_date,
+        to_date,
+        collapse,
+        utils.use_categorical(categorical))
+
+    if arrow:
+        return utils.to_arrow(party_memberships)
+
+    return party_memberships
+
+
+@utils.instrument(constants.HOOK_EVENT_FETCH)
+async def fetch_mps_government_roles_async(from_date=np.NaN,
+                                           to_date=np.NaN,
+                                           on_date=np.NaN,
+                                           while_mp=True,
+                                           categorical=None,
+                                           arrow=False):
+
+    """Fetch government roles for all MPs asynchronously.
+
+    fetch_mps_government_roles_async is the asynchronous counterpart of
+    fetch_mps_government_roles. It takes the same arguments and returns the
+    same dataframe, but sends its queries concurrently with a non-blocking http
+    client, so the event loop is free to run other tasks while it waits. See
+    fetch_mps_government_roles for details.
+
+    """
+
+    # Set from_date and to_date to on_date if set
+    if not pd.isna(on_date):
+        from_date = on_date
+        to_date = on_date
+
+    # Fetch the government roles and the Commons memberships if needed
+    if while_mp:
+        government_roles, commons_memberships = await asyncio.gather(
+            fetch_mps_government_roles_raw_async(),
+            fetch_commons_memberships_async())
+    else:
+        government_roles = await fetch_mps_government_roles_raw_async()
+        commons_memberships = None
+
+    # Process and return in the requested format
+    government_roles = process_mps_government_roles(
+        government_roles,
+        commons_memberships,
+        from_date,
+        to_date,
+        utils.use_categorical(categorical))
+
+    if arrow:
+        return utils.to_arrow(government_roles)
+
+    return government_roles
+
+
+@utils.instrument(constants.HOOK_EVENT_FETCH)
+async def fetch_mps_opposition_roles_async(from_date=np.NaN,
+                                           to_date=np.NaN,
+                                           on_date=np.NaN,
+                                           while_mp=True,
+                                           categorical=None,
+                                           arrow=False):
+
+    """Fetch opposition roles for all MPs asynchronously.
+
+    fetch_mps_opposition_roles_async is the asynchronous counterpart of
+    fetch_mps_opposition_roles. It takes the same arguments and returns the
+    same dataframe, but sends its queries concurrently with a non-blocking http
+    client, so the event loop is free to run other tasks while it waits. See
+    fetch_mps_opposition_roles for details.
+
+    """
+
+    # Set from_date and to_date to on_date if set
+    if not pd.isna(on_date):
+        from_date = on_date
+        to_date = on_date
+
+    # Fetch the opposition roles and the Commons memberships if needed
+    if while_mp:
+        opposition_roles, commons_memberships = await asyncio.gather(
+            fetch_mps_opposition_roles_raw_async(),
+            fetch_commons_memberships_async())
+    else:
+        opposition_roles = await fetch_mps_opposition_roles_raw_async()
+        commons_memberships = None
+
+    # Process and return in the requested format
+    opposition_roles = process_mps_opposition_roles(
+        opposition_roles,
+        commons_memberships,
+        from_date,
+        to_date,
+        utils.use_categorical(categorical))
+
+    if arrow:
+        return utils.to_arrow(opposition_roles)
+
+    return opposition_roles
+
+
+@utils.instrument(constants.HOOK_EVENT_FETCH)
+async def fetch_mps_committee_memberships_async(from_date=np.NaN,
+                                                to_date=np.NaN,
+                                                on_date=np.NaN,
+                                                while_mp=True,
+                                                categorical=None,
+                                                arrow=False):
+
+    """Fetch committee memberships for all MPs asynchronously.
+
+    fetch_mps_committee_memberships_async is the asynchronous counterpart of
+    fetch_mps_committee_memberships. It takes the same arguments and returns
+    the same dataframe, but sends its queries concurrently with a non-blocking
+    http client, so the event loop is free to run other tasks while it waits.
+    See fetch_mps_committee_memberships for details.
+
+    """
+
+    # Set from_date and to_date to on_date if set
+    if not pd.isna(on_date):
+        from_date = on_date
+        to_date = on_date
+
+    # Fetch the committee memberships and the Commons memberships if needed
+    if while_mp:
+        committee_memberships, commons_memberships = await asyncio.gather(
+            fetch_mps_committee_memberships_raw_async(),
+            fetch_commons_memberships_async())
+    else:
+        committee_memberships = \
+            await fetch_mps_committee_memberships_raw_async()
+        commons_memberships = None
+
+    # Process and return in the requested format
+    committee_memberships = process_mps_committee_memberships(
+        committee_memberships,
+        commons_memberships,
+        from_date,
+        to_date,
+        utils.use_categorical(categorical))
+
+    if arrow:
+        return utils.to_arrow(committee_memberships)
+
     return committee_memberships
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""Profiling functions."""
+
+# Imports ---------------------------------------------------------------------
+
+import contextlib
+import pandas as pd
+import threading
+
+from . import constants
+from . import settings
+
+# Profiles --------------------------------------------------------------------
+
+@contextlib.contextmanager
+def profile(show=False):
+
+    """Record the stages of each call made inside a with block.
+
+    profile is a context manager that records the stages of every query and
+    fetch function called inside it, using the package hooks. For each
+    public call, such as fetch_mps_party_memberships or sparql_select, it
+    records a tree of the stages the call went through: the requests sent to
+    the data platform, the wait for each response, decoding, date
+    conversion, clipping memberships to the dissolution, filtering,
+    combining and the final sort. Each stage has the number of rows it took
+    in and returned, and the time it took.
+
+    The with statement returns a Profile. Once the block has finished, call
+    its get_table method to get the stages as a dataframe, or print it to
+    show them as a table. Hooks are global, so calls made in other threads
+    while the block is running are also recorded.
+
+    Parameters
+    ----------
+    show : bool, optional
+        A boolean indicating whether to print the table when the block
+        finishes. The default value is False.
+
+    Returns
+    -------
+    out : Profile
+        The profile that records the stages.
+
+    """
+
+    recorded = Profile()
+
+    for event in constants.PROFILE_EVENTS:
+        settings.add_hook(event, recorded.record)
+
+    try:
+        yield recorded
+    finally:
+        for event in constants.PROFILE_EVENTS:
+            settings.remove_hook(event, recorded.record)
+
+    if show:
+        print(recorded)
+
+
+class Profile:
+
+    """The stages recorded by profile.
+
+    Each stage is recorded from the dictionary passed to the hooks when it
+    finished. Stages are nested using the id and parent of each event, so
+    the stages of concurrent calls, whether made in threads or with asyncio,
+    are kept apart.
+
+    """
+
+    def __init__(self):
+        self.events = []
+        self.lock = threading.Lock()
+
+    def record(self, info):
+
+        """Record an event passed to a hook."""
+
+        with self.lock:
+            self.events.append(info)
+
+    def get_table(self):
+
+        """Get the recorded stages as a dataframe.
+
+        The dataframe has one row per stage, in the order the stages
+        started, with each stage following the stage that called it.
+
+        Returns
+        -------
+        out : DataFrame
+            A pandas dataframe with the following columns:
+
+            call : the number of the public call the stage belongs to
+            depth : the depth of the stage in the tree of stages
+            stage : the name of the stage, indented by its depth
+            rows_in : the number of rows the stage took in
+            rows_out : the number of rows the stage returned
+            bytes : the number of bytes in a response
+            elapsed : the time the stage took in seconds
+            self_elapsed : the time the stage took in seconds, excluding
+                the stages it called
+
+        """
+
+        with self.lock:
+            events = sorted(self.events, key=lambda e: e['start'])
+
+        ids = {e['id'] for e in events if e['id'] is not None}
+        children = {}
+        for e in events:
+            parent = e['parent'] if e['parent'] in ids else None
+            children.setdefault(parent, []).append(e)
+
+        rows = []
+
+        def add_stage(e, call, depth):
+            stage = constants.PROFILE_STAGE_NAMES.get(e['event'], e['stage'])
+            stage_children = children.get(e['id'], []) \
+                if e['id'] is not None else []
+            rows.append([
+                call,
+                depth,
+                '{0}{1}'.format('  ' * depth, stage),
+                e['rows_in'],
+                e['rows'],
+                e['bytes'],
+                e['elapsed'],
+                e['elapsed'] - sum(c['elapsed'] for c in stage_children)])
+            for child in stage_children:
+                add_stage(child, call, depth + 1)
+
+        for call, e in enumerate(children.get(None, []), start=1):
+            add_stage(e, call, 0)
+
+        table = pd.DataFrame(rows, columns=constants.PROFILE_COLUMNS)
+        for col in ['rows_in', 'rows_out', 'bytes']:
+            table[col] = table[col].astype('Int64')
+
+        return table
+
+    def __str__(self):
+
+        table = self.get_table()
+        width = table['stage'].str.len().max() if len(table) > 0 else 0
+
+        return table.to_string(
+            index=False,
+            justify='left',
+            formatters={'stage': lambda stage: stage.ljust(width)})
@@ -3,12 +3,20 @@
 
 # Imports ---------------------------------------------------------------------
 
+import os
+
 from . import constants
 
 # Settings dictionary ---------------------------------------------------------
 
 settings = {}
 
+# Hooks dictionary ------------------------------------------------------------
+
+# Each registered event maps to a tuple of hooks, which is replaced rather
+# than changed, so hooks can be fired without taking a lock
+hooks = {}
+
 # Settings: api url -----------------------------------------------------------
 
 def get_api_url():
@@ -64,3 +72,1149 @@ def reset_api_url():
     """
 
     set_api_url(constants.SETTINGS_API_URL_DEFAULT)
+
+# Settings: connection pool size ----------------------------------------------
+
+def get_pool_size():
+
+    """Get the connection pool size.
+
+    get_pool_size gets the maximum number of connections the package keeps
+    open to each api endpoint.
+
+    Returns
+    -------
+    out : int
+        The currently set connection pool size.
+
+    """
+
+    if constants.SETTINGS_POOL_SIZE not in settings:
+        set_pool_size(constants.SETTINGS_POOL_SIZE_DEFAULT)
+
+    return settings[constants.SETTINGS_POOL_SIZE]
+
+
+def set_pool_size(pool_size):
+
+    """Set the connection pool size.
+
+    set_pool_size sets the maximum number of connections the package keeps
+    open to each api endpoint. Requests are sent through a pooled http
+    session for each endpoint so that connections are reused between queries.
+    A session created with a different pool size is replaced the next time
+    a request is sent to its endpoint.
+
+    Parameters
+    ----------
+    pool_size : int
+        The maximum number of pooled connections per endpoint. This must be
+        at least one.
+
+    Returns
+    -------
+    out : None
+
+    """
+
+    if type(pool_size) != int or pool_size < 1:
+        raise ValueError('pool_size must be a positive integer')
+
+    settings[constants.SETTINGS_POOL_SIZE] = pool_size
+
+
+def reset_pool_size():
+
+    """Reset the connection pool size to the default."""
+
+    set_pool_size(constants.SETTINGS_POOL_SIZE_DEFAULT)
+
+# Settings: keep alive --------------------------------------------------------
+
+def get_keep_alive():
+
+    """Get the keep alive setting.
+
+    get_keep_alive gets a boolean indicating whether the package keeps
+    connections to the api endpoint open between requests.
+
+    Returns
+    -------
+    out : bool
+        The currently set keep alive setting.
+
+    """
+
+    if constants.SETTINGS_KEEP_ALIVE not in settings:
+        set_keep_alive(constants.SETTINGS_KEEP_ALIVE_DEFAULT)
+
+    return settings[constants.SETTINGS_KEEP_ALIVE]
+
+
+def set_keep_alive(keep_alive):
+
+    """Set the keep alive setting.
+
+    set_keep_alive sets whether the package keeps connections to the api
+    endpoint open between requests. By default connections are kept alive
+    and reused, which avoids a new connection handshake for every query. If
+    this is set to False each request asks the server to close the connection
+    once the response has been sent.
+
+    Parameters
+    ----------
+    keep_alive : bool
+        A boolean indicating whether to keep connections alive.
+
+    Returns
+    -------
+    out : None
+
+    """
+
+    settings[constants.SETTINGS_KEEP_ALIVE] = bool(keep_alive)
+
+
+def reset_keep_alive():
+
+    """Reset the keep alive setting to the default."""
+
+    set_keep_alive(constants.SETTINGS_KEEP_ALIVE_DEFAULT)
+
+# Settings: timeout -----------------------------------------------------------
+
+def get_timeout():
+
+    """Get the request timeout.
+
+    get_timeout gets the timeout the package uses for requests to the api
+    endpoint.
+
+    Returns
+    -------
+    out : float or tuple or None
+        The currently set timeout in seconds. None means no timeout.
+
+    """
+
+    if constants.SETTINGS_TIMEOUT not in settings:
+        set_timeout(constants.SETTINGS_TIMEOUT_DEFAULT)
+
+    return settings[constants.SETTINGS_TIMEOUT]
+
+
+def set_timeout(timeout):
+
+    """Set the request timeout.
+
+    set_timeout sets the timeout the package uses for requests to the api
+    endpoint. The timeout can be a single number of seconds, which applies to
+    both connecting and reading, or a tuple of two numbers giving separate
+    connect and read timeouts. By default there is no timeout.
+
+    Parameters
+    ----------
+    timeout : float or tuple or None
+        The timeout in seconds, a tuple of connect and read timeouts, or None
+        for no timeout.
+
+    Returns
+    -------
+    out : None
+
+    """
+
+    settings[constants.SETTINGS_TIMEOUT] = timeout
+
+
+def reset_timeout():
+
+    """Reset the request timeout to the default."""
+
+    set_timeout(constants.SETTINGS_TIMEOUT_DEFAULT)
+
+# Settings: result format -----------------------------------------------------
+
+def get_result_format():
+
+    """Get the result format.
+
+    get_result_format gets the format in which the package asks the api to
+    return the results of SELECT queries.
+
+    Returns
+    -------
+    out : str
+        The currently set result format: 'json', 'csv' or 'tsv'.
+
+    """
+
+    if constants.SETTINGS_RESULT_FORMAT not in settings:
+        set_result_format(constants.SETTINGS_RESULT_FORMAT_DEFAULT)
+
+    return settings[constants.SETTINGS_RESULT_FORMAT]
+
+
+def set_result_format(result_format):
+
+    """Set the result format.
+
+    set_result_format sets the format in which the package asks the api to
+    return the results of SELECT queries. By default results are requested
+    as SPARQL JSON. The CSV and TSV formats are more compact and are parsed
+    with the pandas C parser, which is faster for large results. TSV results
+    include datatypes, so dates are recognised as they are with JSON. CSV
+    results do not include datatypes, so dates are only recognised in the
+    columns named when a query is sent.
+
+    Parameters
+    ----------
+    result_format : str
+        The result format: 'json', 'csv' or 'tsv'.
+
+    Returns
+    -------
+    out : None
+
+    """
+
+    if result_format not in constants.RESULT_FORMAT_MEDIA_TYPES:
+        raise ValueError(
+            '{0} is not a valid result format'.format(result_format))
+
+    settings[constants.SETTINGS_RESULT_FORMAT] = result_format
+
+
+def reset_result_format():
+
+    """Reset the result format to the default."""
+
+    set_result_format(constants.SETTINGS_RESULT_FORMAT_DEFAULT)
+
+# Settings: cache directory ---------------------------------------------------
+
+def get_cache_dir():
+
+    """Get the cache directory.
+
+    get_cache_dir gets the directory the package uses to cache the results
+    of queries on disk.
+
+    Returns
+    -------
+    out : str or None
+        The currently set cache directory. None means results are not cached.
+
+    """
+
+    if constants.SETTINGS_CACHE_DIR not in settings:
+        set_cache_dir(constants.SETTINGS_CACHE_DIR_DEFAULT)
+
+    return settings[constants.SETTINGS_CACHE_DIR]
+
+
+def set_cache_dir(cache_dir):
+
+    """Set the cache directory.
+
+    set_cache_dir sets the directory the package uses to cache the results
+    of queries on disk. When a cache directory is set, the result of each
+    query is stored in the directory and reused by later calls that send the
+    same query to the same endpoint, until the entry expires. By default
+    there is no cache directory and results are not cached. The directory is
+    created when the first result is stored. Results are stored as
+    compressed Arrow IPC files, so the disk cache requires pyarrow.
+
+    Parameters
+    ----------
+    cache_dir : str or None
+        The path to the cache directory, or None to turn off caching. A
+        leading ~ is expanded to the user's home directory.
+
+    Returns
+    -------
+    out : None
+
+    """
+
+    if cache_dir is not None:
+        cache_dir = os.path.expanduser(cache_dir)
+
+    settings[constants.SETTINGS_CACHE_DIR] = cache_dir
+
+
+def reset_cache_dir():
+
+    """Reset the cache directory to the default."""
+
+    set_cache_dir(constants.SETTINGS_CACHE_DIR_DEFAULT)
+
+# Settings: cache ttl ---------------------------------------------------------
+
+def get_cache_ttl():
+
+    """Get the cache time to live.
+
+    get_cache_ttl gets the number of seconds for which new entries in the
+    query cache remain valid.
+
+    Returns
+    -------
+    out : float or None
+        The currently set cache time to live in seconds. None means entries
+        do not expire.
+
+    """
+
+    if constants.SETTINGS_CACHE_TTL not in settings:
+        set_cache_ttl(constants.SETTINGS_CACHE_TTL_DEFAULT)
+
+    return settings[constants.SETTINGS_CACHE_TTL]
+
+
+def set_cache_ttl(cache_ttl):
+
+    """Set the cache time to live.
+
+    set_cache_ttl sets the number of seconds for which new entries in the
+    query cache remain valid. Each entry records its own expiry time when it
+    is stored, so changing this setting does not affect existing entries. By
+    default entries expire after one day.
+
+    Parameters
+    ----------
+    cache_ttl : float or None
+        The time to live in seconds, or None for entries that do not expire.
+
+    Returns
+    -------
+    out : None
+
+    """
+
+    if cache_ttl is not None and (
+            isinstance(cache_ttl, bool) or
+            not isinstance(cache_ttl, (int, float)) or
+            cache_ttl <= 0):
+        raise ValueError('cache_ttl must be a positive number or None')
+
+    settings[constants.SETTINGS_CACHE_TTL] = cache_ttl
+
+
+def reset_cache_ttl():
+
+    """Reset the cache time to live to the default."""
+
+    set_cache_ttl(constants.SETTINGS_CACHE_TTL_DEFAULT)
+
+# Settings: cache max size ----------------------------------------------------
+
+def get_cache_max_size():
+
+    """Get the cache maximum size.
+
+    get_cache_max_size gets the maximum total size of the query cache in
+    bytes.
+
+    Returns
+    -------
+    out : int or None
+        The currently set maximum size in bytes. None means the cache size
+        is not limited.
+
+    """
+
+    if constants.SETTINGS_CACHE_MAX_SIZE not in settings:
+        set_cache_max_size(constants.SETTINGS_CACHE_MAX_SIZE_DEFAULT)
+
+    return settings[constants.SETTINGS_CACHE_MAX_SIZE]
+
+
+def set_cache_max_size(cache_max_size):
+
+    """Set the cache maximum size.
+
+    set_cache_max_size sets the maximum total size of the query cache in
+    bytes. When a new entry takes the cache over this size, the least
+    recently used entries are removed until it fits. By default the cache
+    can hold 512MB.
+
+    Parameters
+    ----------
+    cache_max_size : int or None
+        The maximum size in bytes, or None for no limit.
+
+    Returns
+    -------
+    out : None
+
+    """
+
+    if cache_max_size is not None and (
+            type(cache_max_size) != int or cache_max_size < 1):
+        raise ValueError('cache_max_size must be a positive integer or None')
+
+    settings[constants.SETTINGS_CACHE_MAX_SIZE] = cache_max_size
+
+
+def reset_cache_max_size():
+
+    """Reset the cache maximum size to the default."""
+
+    set_cache_max_size(constants.SETTINGS_CACHE_MAX_SIZE_DEFAULT)
+
+# Settings: memory cache size -------------------------------------------------
+
+def get_memory_cache_size():
+
+    """Get the memory cache size.
+
+    get_memory_cache_size gets the maximum number of query results the
+    package keeps in memory.
+
+    Returns
+    -------
+    out : int
+        The currently set memory cache size. Zero means results are not
+        kept in memory.
+
+    """
+
+    if constants.SETTINGS_MEMORY_CACHE_SIZE not in settings:
+        set_memory_cache_size(constants.SETTINGS_MEMORY_CACHE_SIZE_DEFAULT)
+
+    return settings[constants.SETTINGS_MEMORY_CACHE_SIZE]
+
+
+def set_memory_cache_size(memory_cache_size):
+
+    """Set the memory cache size.
+
+    set_memory_cache_size sets the maximum number of query results the
+    package keeps in memory. Results kept in memory are reused when the same
+    query is sent to the same endpoint again, so functions that share raw
+    data do not download it more than once. When the memory cache is full
+    the least recently used result is discarded. By default the package
+    keeps up to 32 results in memory. Set this to zero to turn the memory
+    cache off.
+
+    Parameters
+    ----------
+    memory_cache_size : int
+        The maximum number of results to keep in memory.
+
+    Returns
+    -------
+    out : None
+
+    """
+
+    if type(memory_cache_size) != int or memory_cache_size < 0:
+        raise ValueError('memory_cache_size must be a non-negative integer')
+
+    settings[constants.SETTINGS_MEMORY_CACHE_SIZE] = memory_cache_size
+
+
+def reset_memory_cache_size():
+
+    """Reset the memory cache size to the default."""
+
+    set_memory_cache_size(constants.SETTINGS_MEMORY_CACHE_SIZE_DEFAULT)
+
+# Settings: memory cache ttl --------------------------------------------------
+
+def get_memory_cache_ttl():
+
+    """Get the memory cache time to live.
+
+    get_memory_cache_ttl gets the number of seconds for which query results
+    are kept in memory.
+
+    Returns
+    -------
+    out : float or None
+        The currently set memory cache time to live in seconds. None means
+        results do not expire.
+
+    """
+
+    if constants.SETTINGS_MEMORY_CACHE_TTL not in settings:
+        set_memory_cache_ttl(constants.SETTINGS_MEMORY_CACHE_TTL_DEFAULT)
+
+    return settings[constants.SETTINGS_MEMORY_CACHE_TTL]
+
+
+def set_memory_cache_ttl(memory_cache_ttl):
+
+    """Set the memory cache time to live.
+
+    set_memory_cache_ttl sets the number of seconds for which query results
+    are kept in memory. By default results are kept for five minutes.
+
+    Parameters
+    ----------
+    memory_cache_ttl : float or None
+        The time to live in seconds, or None for results that do not expire.
+
+    Returns
+    -------
+    out : None
+
+    """
+
+    if memory_cache_ttl is not None and (
+            isinstance(memory_cache_ttl, bool) or
+            not isinstance(memory_cache_ttl, (int, float)) or
+            memory_cache_ttl <= 0):
+        raise ValueError('memory_cache_ttl must be a positive number or None')
+
+    settings[constants.SETTINGS_MEMORY_CACHE_TTL] = memory_cache_ttl
+
+
+def reset_memory_cache_ttl():
+
+    """Reset the memory cache time to live to the default."""
+
+    set_memory_cache_ttl(constants.SETTINGS_MEMORY_CACHE_TTL_DEFAULT)
+
+# Settings: page size ---------------------------------------------------------
+
+def get_page_size():
+
+    """Get the page size.
+
+    get_page_size gets the number of rows requested in each page when
+    results are downloaded in pages.
+
+    Returns
+    -------
+    out : int
+        The currently set page size.
+
+    """
+
+    if constants.SETTINGS_PAGE_SIZE not in settings:
+        set_page_size(constants.SETTINGS_PAGE_SIZE_DEFAULT)
+
+    return settings[constants.SETTINGS_PAGE_SIZE]
+
+
+def set_page_size(page_size):
+
+    """Set the page size.
+
+    set_page_size sets the number of rows requested in each page when
+    results are downloaded in pages, either with iter_sparql_select or
+    because a result exceeds the paging threshold. By default each page has
+    up to 10,000 rows.
+
+    Parameters
+    ----------
+    page_size : int
+        The number of rows in each page. This must be at least one.
+
+    Returns
+    -------
+    out : None
+
+    """
+
+    if type(page_size) != int or page_size < 1:
+        raise ValueError('page_size must be a positive integer')
+
+    settings[constants.SETTINGS_PAGE_SIZE] = page_size
+
+
+def reset_page_size():
+
+    """Reset the page size to the default."""
+
+    set_page_size(constants.SETTINGS_PAGE_SIZE_DEFAULT)
+
+# Settings: paging threshold --------------------------------------------------
+
+def get_paging_threshold():
+
+    """Get the paging threshold.
+
+    get_paging_threshold gets the number of rows above which sparql_select
+    downloads results in pages.
+
+    Returns
+    -------
+    out : int or None
+        The currently set paging threshold. None means results are not
+        downloaded in pages.
+
+    """
+
+    if constants.SETTINGS_PAGING_THRESHOLD not in settings:
+        set_paging_threshold(constants.SETTINGS_PAGING_THRESHOLD_DEFAULT)
+
+    return settings[constants.SETTINGS_PAGING_THRESHOLD]
+
+
+def set_paging_threshold(paging_threshold):
+
+    """Set the paging threshold.
+
+    set_paging_threshold sets the number of rows above which sparql_select
+    downloads results in pages. When a threshold is set, sparql_select first
+    sends a query to count the rows in the result, and if there are more
+    rows than the threshold the result is downloaded in pages of the page
+    size and combined. This costs an extra request for each query, so by
+    default there is no threshold and results are not paged.
+
+    Parameters
+    ----------
+    paging_threshold : int or None
+        The number of rows above which results are paged, or None to turn
+        off paging.
+
+    Returns
+    -------
+    out : None
+
+    """
+
+    if paging_threshold is not None and (
+            type(paging_threshold) != int or paging_threshold < 0):
+        raise ValueError(
+            'paging_threshold must be a non-negative integer or None')
+
+    settings[constants.SETTINGS_PAGING_THRESHOLD] = paging_threshold
+
+
+def reset_paging_threshold():
+
+    """Reset the paging threshold to the default."""
+
+    set_paging_threshold(constants.SETTINGS_PAGING_THRESHOLD_DEFAULT)
+
+# Settings: max retries -------------------------------------------------------
+
+def get_max_retries():
+
+    """Get the maximum number of retries.
+
+    get_max_retries gets the number of times the package retries a request
+    that fails with a temporary error.
+
+    Returns
+    -------
+    out : int
+        The currently set maximum number of retries.
+
+    """
+
+    if constants.SETTINGS_MAX_RETRIES not in settings:
+        set_max_retries(constants.SETTINGS_MAX_RETRIES_DEFAULT)
+
+    return settings[constants.SETTINGS_MAX_RETRIES]
+
+
+def set_max_retries(max_retries):
+
+    """Set the maximum number of retries.
+
+    set_max_retries sets the number of times the package retries a request
+    that fails with a temporary error. Requests are retried if the
+    connection fails or is reset, or if the server responds with one of the
+    retry status codes. Errors in the query itself are not retried. By
+    default a request is retried up to three times. Set this to zero to turn
+    off retries.
+
+    Parameters
+    ----------
+    max_retries : int
+        The maximum number of retries.
+
+    Returns
+    -------
+    out : None
+
+    """
+
+    if type(max_retries) != int or max_retries < 0:
+        raise ValueError('max_retries must be a non-negative integer')
+
+    settings[constants.SETTINGS_MAX_RETRIES] = max_retries
+
+
+def reset_max_retries():
+
+    """Reset the maximum number of retries to the default."""
+
+    set_max_retries(constants.SETTINGS_MAX_RETRIES_DEFAULT)
+
+# Settings: retry backoff -----------------------------------------------------
+
+def get_retry_backoff():
+
+    """Get the retry backoff.
+
+    get_retry_backoff gets the base number of seconds the package waits
+    before retrying a request.
+
+    Returns
+    -------
+    out : float
+        The currently set retry backoff in seconds.
+
+    """
+
+    if constants.SETTINGS_RETRY_BACKOFF not in settings:
+        set_retry_backoff(constants.SETTINGS_RETRY_BACKOFF_DEFAULT)
+
+    return settings[constants.SETTINGS_RETRY_BACKOFF]
+
+
+def set_retry_backoff(retry_backoff):
+
+    """Set the retry backoff.
+
+    set_retry_backoff sets the base number of seconds the package waits
+    before retrying a request. The wait doubles with each retry, and a
+    random wait of up to that length is chosen so that clients retrying at
+    the same time spread out their requests. If the server responds with a
+    Retry-After header, the package waits for the time it asks for instead.
+    No wait is longer than one minute. By default the base wait is half a
+    second.
+
+    Parameters
+    ----------
+    retry_backoff : float
+        The base wait in seconds.
+
+    Returns
+    -------
+    out : None
+
+    """
+
+    if isinstance(retry_backoff, bool) or \
+        not isinstance(retry_backoff, (int, float)) or retry_backoff < 0:
+        raise ValueError('retry_backoff must be a non-negative number')
+
+    settings[constants.SETTINGS_RETRY_BACKOFF] = retry_backoff
+
+
+def reset_retry_backoff():
+
+    """Reset the retry backoff to the default."""
+
+    set_retry_backoff(constants.SETTINGS_RETRY_BACKOFF_DEFAULT)
+
+# Settings: retry status codes ------------------------------------------------
+
+def get_retry_status_codes():
+
+    """Get the retry status codes.
+
+    get_retry_status_codes gets the http status codes of the responses that
+    the package treats as temporary errors and retries.
+
+    Returns
+    -------
+    out : tuple of int
+        The currently set retry status codes.
+
+    """
+
+    if constants.SETTINGS_RETRY_STATUS_CODES not in settings:
+        set_retry_status_codes(constants.SETTINGS_RETRY_STATUS_CODES_DEFAULT)
+
+    return settings[constants.SETTINGS_RETRY_STATUS_CODES]
+
+
+def set_retry_status_codes(retry_status_codes):
+
+    """Set the retry status codes.
+
+    set_retry_status_codes sets the http status codes of the responses that
+    the package treats as temporary errors and retries. By default these
+    are 429, 502, 503 and 504. A status of 500 is not retried by default,
+    because the server usually returns it for a query that is broken or
+    times out, which fails again when it is retried.
+
+    Parameters
+    ----------
+    retry_status_codes : list of int
+        The http status codes to retry.
+
+    Returns
+    -------
+    out : None
+
+    """
+
+    if not isinstance(retry_status_codes, (list, tuple, set, frozenset)) or \
+        not all(type(code) == int and 100 <= code <= 599
+            for code in retry_status_codes):
+        raise ValueError(
+            'retry_status_codes must be a list of http status codes')
+
+    settings[constants.SETTINGS_RETRY_STATUS_CODES] = \
+        tuple(sorted(set(retry_status_codes)))
+
+
+def reset_retry_status_codes():
+
+    """Reset the retry status codes to the default."""
+
+    set_retry_status_codes(constants.SETTINGS_RETRY_STATUS_CODES_DEFAULT)
+
+# Settings: date dtype --------------------------------------------------------
+
+def get_date_dtype():
+
+    """Get the date dtype.
+
+    get_date_dtype gets the type the package uses for the dates in the
+    dataframes it returns.
+
+    Returns
+    -------
+    out : str
+        The currently set date dtype: 'object' or 'datetime64'.
+
+    """
+
+    if constants.SETTINGS_DATE_DTYPE not in settings:
+        set_date_dtype(constants.SETTINGS_DATE_DTYPE_DEFAULT)
+
+    return settings[constants.SETTINGS_DATE_DTYPE]
+
+
+def set_date_dtype(date_dtype):
+
+    """Set the date dtype.
+
+    set_date_dtype sets the type the package uses for the dates in the
+    dataframes it returns. By default dates are returned as datetime.dates in
+    object columns, with NaN for missing dates. If the date dtype is set to
+    'datetime64', dates are returned in datetime64[ns] columns, with NaT for
+    missing dates. These columns use much less memory, and filtering, sorting
+    and grouping on them runs in NumPy rather than Python.
+
+    Parameters
+    ----------
+    date_dtype : str
+        The date dtype: 'object' or 'datetime64'.
+
+    Returns
+    -------
+    out : None
+
+    """
+
+    if date_dtype not in constants.DATE_DTYPES:
+        raise ValueError('{0} is not a valid date dtype'.format(date_dtype))
+
+    settings[constants.SETTINGS_DATE_DTYPE] = date_dtype
+
+
+def reset_date_dtype():
+
+    """Reset the date dtype to the default."""
+
+    set_date_dtype(constants.SETTINGS_DATE_DTYPE_DEFAULT)
+
+# Settings: categorical -------------------------------------------------------
+
+def get_categorical():
+
+    """Get the categorical setting.
+
+    get_categorical gets whether the package returns known low-cardinality
+    columns as pandas categoricals.
+
+    Returns
+    -------
+    out : bool
+        The currently set categorical setting.
+
+    """
+
+    if constants.SETTINGS_CATEGORICAL not in settings:
+        set_categorical(constants.SETTINGS_CATEGORICAL_DEFAULT)
+
+    return settings[constants.SETTINGS_CATEGORICAL]
+
+
+def set_categorical(categorical):
+
+    """Set the categorical setting.
+
+    set_categorical sets whether the package returns known low-cardinality
+    columns as pandas categoricals. Columns such as gender, party_name and
+    constituency_name repeat a few hundred distinct values across many rows.
+    As categoricals each value is stored once, and each row holds a small
+    integer code, which cuts the memory the dataframes use and speeds up
+    filtering and grouping on these columns. By default these columns are
+    returned as object columns of strings. Functions that fetch data also
+    take a categorical argument, which overrides this setting for one call.
+
+    Parameters
+    ----------
+    categorical : bool
+        True to return low-cardinality columns as categoricals.
+
+    Returns
+    -------
+    out : None
+
+    """
+
+    if not isinstance(categorical, bool):
+        raise ValueError('categorical must be True or False')
+
+    settings[constants.SETTINGS_CATEGORICAL] = categorical
+
+
+def reset_categorical():
+
+    """Reset the categorical setting to the default."""
+
+    set_categorical(constants.SETTINGS_CATEGORICAL_DEFAULT)
+
+# Settings: snapshot directory ------------------------------------------------
+
+def get_snapshot_dir():
+
+    """Get the snapshot directory.
+
+    get_snapshot_dir gets the directory of the snapshot store the package
+    reads raw data from instead of the data platform.
+
+    Returns
+    -------
+    out : str or None
+        The currently set snapshot directory. None means raw data is always
+        downloaded from the data platform.
+
+    """
+
+    if constants.SETTINGS_SNAPSHOT_DIR not in settings:
+        set_snapshot_dir(constants.SETTINGS_SNAPSHOT_DIR_DEFAULT)
+
+    return settings[constants.SETTINGS_SNAPSHOT_DIR]
+
+
+def set_snapshot_dir(snapshot_dir):
+
+    """Set the snapshot directory.
+
+    set_snapshot_dir sets the directory of the snapshot store the package
+    reads raw data from. When a snapshot directory is set, the fetch
+    functions for MPs and Lords load each raw table that is in the snapshot
+    from the directory instead of downloading it from the data platform.
+    Tables that are not in the snapshot are still downloaded. Snapshots are
+    written with write_snapshot. By default there is no snapshot directory.
+
+    Parameters
+    ----------
+    snapshot_dir : str or None
+        The path to the snapshot directory, or None to stop reading from a
+        snapshot. A leading ~ is expanded to the user's home directory.
+
+    Returns
+    -------
+    out : None
+
+    """
+
+    if snapshot_dir is not None:
+        snapshot_dir = os.path.expanduser(snapshot_dir)
+
+    settings[constants.SETTINGS_SNAPSHOT_DIR] = snapshot_dir
+
+
+def reset_snapshot_dir():
+
+    """Reset the snapshot directory to the default."""
+
+    set_snapshot_dir(constants.SETTINGS_SNAPSHOT_DIR_DEFAULT)
+
+# Settings: transport ---------------------------------------------------------
+
+def get_transport():
+
+    """Get the transport.
+
+    get_transport gets the function that creates the transport adapter used
+    by the pooled http sessions to send queries.
+
+    Returns
+    -------
+    out : callable or None
+        The currently set transport. None means queries are sent over http
+        with the standard requests adapter.
+
+    """
+
+    if constants.SETTINGS_TRANSPORT not in settings:
+        set_transport(constants.SETTINGS_TRANSPORT_DEFAULT)
+
+    return settings[constants.SETTINGS_TRANSPORT]
+
+
+def set_transport(transport):
+
+    """Set the transport.
+
+    set_transport sets the function that creates the transport adapter for
+    each pooled http session. The function is called with the pool size and
+    must return a requests transport adapter, which is mounted on the
+    session for http and https urls. This lets queries be recorded or
+    replayed without changing any other code: see the functions in the
+    transport module. The transport is only used by the synchronous
+    functions. By default queries are sent with the standard requests
+    adapter.
+
+    Parameters
+    ----------
+    transport : callable or None
+        A function that takes the pool size and returns a requests transport
+        adapter, or None to use the standard adapter.
+
+    Returns
+    -------
+    out : None
+
+    """
+
+    if transport is not None and not callable(transport):
+        raise ValueError('transport must be callable or None')
+
+    settings[constants.SETTINGS_TRANSPORT] = transport
+
+
+def reset_transport():
+
+    """Reset the transport to the default."""
+
+    set_transport(constants.SETTINGS_TRANSPORT_DEFAULT)
+
+# Hooks -----------------------------------------------------------------------
+
+def add_hook(event, hook):
+
+    """Add a hook for an event.
+
+    add_hook registers a function that is called each time the package fires
+    the given event. The events are:
+
+    request_start : sparql_select or sparql_select_async was called
+    request_end : sparql_select or sparql_select_async returned its result
+        or raised an exception
+    response_received : the response to a query was received
+    decode_done : the response to a query was decoded into a dataframe
+    filter_done : filter_dates or filter_memberships returned its result
+    combine_done : combine_party_memberships or coalesce_intervals returned
+        its result
+    dates_done : the dates in a result were converted to the date dtype
+    process_done : a processing stage, such as clipping memberships to the
+        dissolution or the final sort, returned its result
+    fetch_done : one of the MPs or Lords fetch functions returned its result
+
+    Each hook is called with a dictionary describing the event, which has
+    the following items. Items that do not apply to the event are None.
+
+    event : the name of the event
+    stage : the name of the function that fired the event
+    id : a unique id for the call of the function that fired the event
+    parent : the id of the call that the event happened inside
+    fingerprint : a short hash of the normalized query
+    endpoint : the url of the endpoint the query was sent to
+    status : the http status of the response
+    bytes : the number of bytes in the response body
+    rows_in : the number of rows passed to the stage
+    rows : the number of rows returned by the stage
+    start : the time the stage started, from time.perf_counter
+    elapsed : the time the stage took in seconds
+    error : the exception raised by the stage, if it failed
+
+    Hooks are called in the thread that fired the event, in the order they
+    were added. When no hooks are registered for an event, firing it costs
+    no more than a dictionary lookup.
+
+    Parameters
+    ----------
+    event : str
+        The name of the event.
+    hook : callable
+        A function that takes the dictionary describing the event.
+
+    Returns
+    -------
+    out : None
+
+    """
+
+    if event not in constants.HOOK_EVENTS:
+        raise ValueError('{0} is not a valid hook event'.format(event))
+
+    if not callable(hook):
+        raise ValueError('hook must be callable')
+
+    hooks[event] = hooks.get(event, ()) + (hook,)
+
+
+def remove_hook(event, hook):
+
+    """Remove a hook for an event.
+
+    remove_hook removes the most recently added registration of the hook
+    for the given event. A ValueError is raised if the hook is not
+    registered for the event.
+
+    Parameters
+    ----------
+    event : str
+        The name of the event.
+    hook : callable
+        A function previously added with add_hook.
+
+    Returns
+    -------
+    out : None
+
+    """
+
+    event_hooks = list(hooks.get(event, ()))
+    if hook not in event_hooks:
+        raise ValueError('hook is not registered for {0}'.format(event))
+
+    del event_hooks[len(event_hooks) - 1 - event_hooks[::-1].index(hook)]
+
+    if event_hooks:
+        hooks[event] = tuple(event_hooks)
+    else:
+        del hooks[event]
+
+
+def get_hooks(event):
+
+    """Get the hooks registered for an event, in the order they are called.
+
+    Parameters
+    ----------
+    event : str
+        The name of the event.
+
+    Returns
+    -------
+    out : tuple
+        The hooks registered for the event.
+
+    """
+
+    return hooks.get(event, ())
+
+
+def reset_hooks():
+
+    """Remove all hooks for all events."""
+
+    hooks.clear()
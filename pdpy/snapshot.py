@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""Local snapshot store functions."""
+
+# Imports ---------------------------------------------------------------------
+
+import contextvars
+import datetime
+import json
+import os
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:
+    pyarrow = None
+
+from . import cache
+from . import constants
+from . import core
+from . import settings
+from . import utils
+
+# Reading ---------------------------------------------------------------------
+
+# Turned off while a snapshot is being written, so that the raw tables are
+# always downloaded from the data platform rather than read back
+snapshot_reading = contextvars.ContextVar('snapshot_reading', default=True)
+
+
+def fetch_table(name, fetch, *args, **kwargs):
+
+    """Read a raw table from the snapshot store or fetch it.
+
+    fetch_table returns the named table from the snapshot directory set in
+    the package settings if the snapshot contains it. Otherwise it calls the
+    fetch function with the given arguments and returns its result.
+
+    """
+
+    data = read_table(name) if snapshot_reading.get() else None
+    if data is not None:
+        return data
+
+    return fetch(*args, **kwargs)
+
+
+async def fetch_table_async(name, fetch, *args, **kwargs):
+
+    """Read a raw table from the snapshot store or fetch it asynchronously."""
+
+    data = read_table(name) if snapshot_reading.get() else None
+    if data is not None:
+        return data
+
+    return await fetch(*args, **kwargs)
+
+
+def read_manifest(snapshot_dir=None):
+
+    """Read the manifest of a snapshot.
+
+    The manifest records when the snapshot was written, the endpoint it was
+    downloaded from, and the file, number of rows and columns of each table.
+
+    Parameters
+    ----------
+    snapshot_dir : str, optional
+        The path to the snapshot directory. The default value is None, which
+        means the snapshot directory setting is used.
+
+    Returns
+    -------
+    out : dict or None
+        The manifest, or None if there is no snapshot in the directory.
+
+    """
+
+    if snapshot_dir is None:
+        snapshot_dir = settings.get_snapshot_dir()
+        if snapshot_dir is None:
+            return None
+
+    path = os.path.join(snapshot_dir, constants.SNAPSHOT_MANIFEST)
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def read_table(name, snapshot_dir=None):
+
+    """Read a raw table from a snapshot.
+
+    read_table memory-maps the file for the named table, so the Arrow data
+    is read from the page cache without being parsed, and returns it as a
+    DataFrame in the same form as the raw fetch function for the table.
+    Building the DataFrame copies each column into Python strings and
+    dates, so the DataFrame does not share memory with the file. Dates
+    follow the date dtype setting. A snapshot is only read if it was
+    downloaded from the endpoint in the api url setting, so pointing the
+    package at another endpoint never returns stale data from the snapshot.
+    This function requires pyarrow.
+
+    Parameters
+    ----------
+    name : str
+        The name of the table, which is the name of the raw fetch function
+        without its fetch_ prefix e.g. 'mps_party_memberships_raw'.
+    snapshot_dir : str, optional
+        The path to the snapshot directory. The default value is None, which
+        means the snapshot directory setting is used.
+
+    Returns
+    -------
+    out : DataFrame or None
+        The table, or None if the snapshot does not contain it or was
+        downloaded from a different endpoint.
+
+    """
+
+    if snapshot_dir is None:
+        snapshot_dir = settings.get_snapshot_dir()
+        if snapshot_dir is None:
+            return None
+
+    manifest = read_manifest(snapshot_dir)
+    if manifest is None or name not in manifest['tables']:
+        return None
+
+    if manifest['api_url'] != settings.get_api_url():
+        return None
+
+    if pyarrow is None:
+        raise ImportError(
+            'The snapshot store requires pyarrow: pip install pyarrow')
+
+    path = os.path.join(snapshot_dir, manifest['tables'][name]['file'])
+    with pyarrow.memory_map(path, 'r') as source:
+        table = pyarrow.ipc.open_file(source).read_all()
+
+    return core.convert_dates(utils.from_arrow(table))
+
+# Writing ---------------------------------------------------------------------
+
+def get_sources():
+
+    """Get the raw fetch function for each table in a snapshot."""
+
+    # The fetch modules read their raw tables through this module, so they
+    # are imported here rather than at the top to avoid a circular import
+    from . import lords
+    from . import members
+    from . import mps
+
+    return {
+        'members_raw': members.fetch_members_raw,
+        'party_memberships_raw': members.fetch_party_memberships_raw,
+        'government_roles_raw': members.fetch_government_roles_raw,
+        'opposition_roles_raw': members.fetch_opposition_roles_raw,
+        'committee_memberships_raw': members.fetch_committee_memberships_raw,
+        'mps_raw': mps.fetch_mps_raw,
+        'commons_memberships_raw': mps.fetch_commons_memberships_raw,
+        'mps_party_memberships_raw': mps.fetch_mps_party_memberships_raw,
+        'mps_government_roles_raw': mps.fetch_mps_government_roles_raw,
+        'mps_opposition_roles_raw': mps.fetch_mps_opposition_roles_raw,
+        'mps_committee_memberships_raw':
+            mps.fetch_mps_committee_memberships_raw,
+        'lords_raw': lords.fetch_lords_raw,
+        'lords_memberships_raw': lords.fetch_lords_memberships_raw,
+        'lords_party_memberships_raw':
+            lords.fetch_lords_party_memberships_raw,
+        'lords_government_roles_raw': lords.fetch_lords_government_roles_raw,
+        'lords_opposition_roles_raw': lords.fetch_lords_opposition_roles_raw,
+        'lords_committee_memberships_raw':
+            lords.fetch_lords_committee_memberships_raw}
+
+
+def write_snapshot(snapshot_dir=None):
+
+    """Download the raw Members data and write it to a snapshot.
+
+    write_snapshot downloads each raw table used by the Members, MPs and
+    Lords functions from the data platform and writes it to the snapshot
+    directory, replacing any snapshot already there. Existing snapshots are
+    never read while a new one is written. Once the snapshot directory
+    setting points to the directory, the fetch functions load raw tables
+    from the snapshot instead of the data platform, so the data is
+    downloaded once and can be shared by any number of processes. This
+    function requires pyarrow.
+
+    Parameters
+    ----------
+    snapshot_dir : str, optional
+        The path to the snapshot directory. The default value is None, which
+        means the snapshot directory setting is used.
+
+    Returns
+    -------
+    out : dict
+        The manifest of the snapshot.
+
+    """
+
+    token = snapshot_reading.set(False)
+    try:
+        tables = {name: fetch() for name, fetch in get_sources().items()}
+    finally:
+        snapshot_reading.reset(token)
+
+    return write_tables(tables, snapshot_dir)
+
+
+def write_tables(tables, snapshot_dir=None):
+
+    """Write a dictionary of named DataFrames to a snapshot.
+
+    Each table is converted with to_arrow and written uncompressed in the
+    Arrow IPC file format, also known as Feather version 2, so that it can
+    be memory-mapped when it is read. The manifest is written last, so a
+    snapshot is only read once all of its tables have been written.
+
+    Parameters
+    ----------
+    tables : dict
+        A dictionary of DataFrames, keyed by table name.
+    snapshot_dir : str, optional
+        The path to the snapshot directory. The default value is None, which
+        means the snapshot directory setting is used.
+
+    Returns
+    -------
+    out : dict
+        The manifest of the snapshot.
+
+    """
+
+    if snapshot_dir is None:
+        snapshot_dir = settings.get_snapshot_dir()
+        if snapshot_dir is None:
+            raise ValueError('No snapshot directory has been set')
+
+    if pyarrow is None:
+        raise ImportError(
+            'The snapshot store requires pyarrow: pip install pyarrow')
+
+    os.makedirs(snapshot_dir, exist_ok=True)
+
+    manifest = {
+        'version': constants.SNAPSHOT_FORMAT_VERSION,
+        'created': datetime.datetime.now(
+            datetime.timezone.utc).isoformat(timespec='seconds'),
+        'api_url': settings.get_api_url(),
+        'tables': {}}
+
+    for name, df in tables.items():
+        table = utils.to_arrow(df)
+        filename = '{0}{1}'.format(name, constants.SNAPSHOT_FILE_EXTENSION)
+        cache.write_file(
+            os.path.join(snapshot_dir, filename),
+            lambda f: write_ipc(f, table))
+        manifest['tables'][name] = {
+            'file': filename,
+            'rows': table.num_rows,
+            'columns': table.column_names}
+
+    cache.write_file(
+        os.path.join(snapshot_dir, constants.SNAPSHOT_MANIFEST),
+        lambda f: f.write(json.dumps(manifest, indent=4).encode('utf-8')))
+
+    return manifest
+
+
+def write_ipc(f, table):
+
+    """Write a pyarrow Table to a file object in the Arrow IPC file format."""
+
+    with pyarrow.ipc.new_file(f, table.schema) as writer:
+        writer.write_table(table)
@@ -0,0 +1,425 @@
+# -*- coding: utf-8 -*-
+"""Record and replay transport functions."""
+
+# Imports ---------------------------------------------------------------------
+
+import hashlib
+import http.server
+import io
+import json
+import os
+import threading
+import time
+
+import requests
+
+from . import cache
+from . import constants
+from . import settings
+
+# Recordings ------------------------------------------------------------------
+
+def get_recording_key(query, media_type):
+
+    """Get the key of the recording for a query and response media type.
+
+    The key is a hash of the query with its whitespace normalized, so that
+    queries that differ only in their layout share a recording, and of the
+    media type of the response, so that each result format is recorded
+    separately.
+
+    """
+
+    key = '{0}\n{1}'.format(cache.normalize_query(query), media_type)
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def get_recording_path(recording_dir, query, media_type):
+
+    """Get the path to the recording for a query and response media type."""
+
+    return os.path.join(
+        os.path.expanduser(recording_dir),
+        '{0}{1}'.format(
+            get_recording_key(query, media_type),
+            constants.RECORDING_FILE_EXTENSION))
+
+
+def read_recording(recording_dir, query, media_type):
+
+    """Read the recording for a query and response media type.
+
+    Parameters
+    ----------
+    recording_dir : str
+        The path to the directory of recordings.
+    query : str
+        A SPARQL query as a string.
+    media_type : str
+        The media type of the response e.g. 'application/sparql-results+json'.
+
+    Returns
+    -------
+    out : dict or None
+        The recording, with the query, media type, status, content type and
+        body of the response, or None if the query has not been recorded.
+
+    """
+
+    path = get_recording_path(recording_dir, query, media_type)
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_recording(recording_dir,
+                    query,
+                    body,
+                    media_type,
+                    status=200,
+                    content_type=None):
+
+    """Write the response to a query to a directory of recordings.
+
+    write_recording is used by the recording transport to store responses
+    from the data platform, and can also be used to create recordings from
+    other data, such as test fixtures. An existing recording for the query
+    and media type is replaced.
+
+    Parameters
+    ----------
+    recording_dir : str
+        The path to the directory of recordings.
+    query : str
+        A SPARQL query as a string.
+    body : bytes or str
+        The body of the response.
+    media_type : str
+        The media type asked for in the request.
+    status : int, optional
+        The http status of the response. The default value is 200.
+    content_type : str, optional
+        The content type of the response. The default value is None, which
+        means the media type is used.
+
+    Returns
+    -------
+    out : str
+        The path to the recording.
+
+    """
+
+    if isinstance(body, bytes):
+        body = body.decode('utf-8')
+
+    recording = {
+        'query': query,
+        'media_type': media_type,
+        'status': status,
+        'content_type': content_type or media_type,
+        'body': body}
+
+    path = get_recording_path(recording_dir, query, media_type)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    cache.write_file(
+        path,
+        lambda f: f.write(json.dumps(recording).encode('utf-8')))
+
+    return path
+
+
+def get_request_query(request):
+
+    """Get the query from the body of a prepared request."""
+
+    body = request.body
+    if isinstance(body, bytes):
+        body = body.decode('utf-8')
+
+    return body
+
+# Transports ------------------------------------------------------------------
+
+def recorder(recording_dir):
+
+    """Get a transport that records the responses to queries.
+
+    Pass the result to set_transport to record the response to each query
+    sent by the synchronous functions in the given directory, keyed by a
+    hash of the query. Queries are still sent to the data platform. Responses
+    with a status that is retried are not recorded.
+
+    Parameters
+    ----------
+    recording_dir : str
+        The path to the directory of recordings.
+
+    Returns
+    -------
+    out : callable
+        A transport for set_transport.
+
+    """
+
+    def transport(pool_size):
+        return RecordingAdapter(
+            recording_dir,
+            pool_connections=1,
+            pool_maxsize=pool_size)
+
+    return transport
+
+
+def replayer(recording_dir):
+
+    """Get a transport that replays recorded responses without a server.
+
+    Pass the result to set_transport to answer each query sent by the
+    synchronous functions with its recording from the given directory,
+    without opening a connection. Queries that have not been recorded are
+    answered with a 404 response, which raises a RequestError.
+
+    Parameters
+    ----------
+    recording_dir : str
+        The path to the directory of recordings.
+
+    Returns
+    -------
+    out : callable
+        A transport for set_transport.
+
+    """
+
+    def transport(pool_size):
+        return ReplayAdapter(recording_dir)
+
+    return transport
+
+
+class RecordingAdapter(requests.adapters.HTTPAdapter):
+
+    """A requests transport adapter that records responses to queries."""
+
+    def __init__(self, recording_dir, **kwargs):
+        self.recording_dir = recording_dir
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code not in settings.get_retry_status_codes():
+            write_recording(
+                self.recording_dir,
+                get_request_query(request),
+                response.content,
+                request.headers.get('accept'),
+                status=response.status_code,
+                content_type=response.headers.get('content-type'))
+
+        return response
+
+
+class ReplayAdapter(requests.adapters.BaseAdapter):
+
+    """A requests transport adapter that replays recorded responses."""
+
+    def __init__(self, recording_dir):
+        self.recording_dir = recording_dir
+        super().__init__()
+
+    def send(self, request, **kwargs):
+
+        media_type = request.headers.get('accept')
+        recording = read_recording(
+            self.recording_dir, get_request_query(request), media_type)
+
+        if recording is None:
+            recording = get_missing_recording()
+
+        body = recording['body'].encode('utf-8')
+
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        response.status_code = recording['status']
+        response.reason = http.HTTPStatus(recording['status']).phrase
+        response.headers['content-type'] = recording['content_type']
+        response.headers['content-length'] = str(len(body))
+        response.encoding = 'utf-8'
+        response.raw = io.BytesIO(body)
+        response._content = body
+        response._content_consumed = True
+
+        return response
+
+    def close(self):
+        pass
+
+
+def get_missing_recording():
+
+    """Get the response for a query that has not been recorded."""
+
+    return {
+        'status': 404,
+        'content_type': 'text/plain; charset=utf-8',
+        'body': 'No recording for this query'}
+
+# Stub server -----------------------------------------------------------------
+
+class StubServer:
+
+    """A local SPARQL endpoint that replays recorded responses.
+
+    StubServer answers each query posted to it with its recording from a
+    directory of recordings, after waiting for the given latency and sending
+    the body no faster than the given throughput. Connections are kept alive
+    between requests. Point the package at the server with set_api_url to
+    test and benchmark the synchronous and asynchronous functions, including
+    connection pooling, concurrency and decoding, without network access.
+    Queries that have not been recorded are answered with a 404 response.
+
+    The server runs in a background thread. Use it as a context manager, or
+    call start and stop.
+
+    Parameters
+    ----------
+    recording_dir : str
+        The path to the directory of recordings.
+    latency : float, optional
+        The number of seconds to wait before sending each response. The
+        default value is 0.
+    throughput : float, optional
+        The maximum number of bytes of each response body sent per second.
+        The default value is None, which means the body is sent at once.
+    host : str, optional
+        The host to listen on. The default value is '127.0.0.1'.
+    port : int, optional
+        The port to listen on. The default value is 0, which means a free
+        port is chosen.
+
+    """
+
+    def __init__(self,
+                 recording_dir,
+                 latency=0,
+                 throughput=None,
+                 host='127.0.0.1',
+                 port=0):
+
+        if latency < 0:
+            raise ValueError('latency must not be negative')
+
+        if throughput is not None and throughput <= 0:
+            raise ValueError('throughput must be greater than zero')
+
+        self.recording_dir = recording_dir
+        self.latency = latency
+        self.throughput = throughput
+        self.host = host
+        self.port = port
+        self.server = None
+        self.thread = None
+        self.stats_lock = threading.Lock()
+        self.stats = {'connections': 0, 'requests': 0, 'bytes': 0}
+
+    @property
+    def url(self):
+
+        """The url of the SPARQL endpoint."""
+
+        return 'http://{0}:{1}/sparql'.format(
+            self.host, self.server.server_port)
+
+    def start(self):
+
+        """Start the server in a background thread and return it."""
+
+        self.server = http.server.ThreadingHTTPServer(
+            (self.host, self.port), StubRequestHandler)
+        self.server.daemon_threads = True
+        self.server.stub = self
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def stop(self):
+
+        """Stop the server and close its socket."""
+
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def get_stats(self):
+
+        """Get the numbers of connections, requests and bytes served."""
+
+        with self.stats_lock:
+            return dict(self.stats)
+
+    def record_stat(self, name, value=1):
+
+        """Add to one of the server statistics."""
+
+        with self.stats_lock:
+            self.stats[name] += value
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+class StubRequestHandler(http.server.BaseHTTPRequestHandler):
+
+    """Answer queries posted to a StubServer with their recordings."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.server.stub.record_stat('connections')
+
+    def do_POST(self):
+
+        stub = self.server.stub
+        length = int(self.headers.get('content-length', 0))
+        query = self.rfile.read(length).decode('utf-8')
+        media_type = self.headers.get('accept')
+
+        recording = read_recording(stub.recording_dir, query, media_type)
+        if recording is None:
+            recording = get_missing_recording()
+
+        body = recording['body'].encode('utf-8')
+        stub.record_stat('requests')
+
+        if stub.latency > 0:
+            time.sleep(stub.latency)
+
+        self.send_response(recording['status'])
+        self.send_header('content-type', recording['content_type'])
+        self.send_header('content-length', str(len(body)))
+        self.end_headers()
+
+        if stub.throughput is None:
+            self.wfile.write(body)
+        else:
+            for i in range(0, len(body), constants.RECORDING_CHUNK_SIZE):
+                chunk = body[i:i + constants.RECORDING_CHUNK_SIZE]
+                time.sleep(len(chunk) / stub.throughput)
+                self.wfile.write(chunk)
+                self.wfile.flush()
+
+        stub.record_stat('bytes', len(body))
+
+    def log_message(self, format, *args):
+        pass
@@ -3,10 +3,25 @@
 
 # Imports ---------------------------------------------------------------------
 
+import contextvars
 import datetime
+import functools
+import hashlib
+import inspect
+import itertools
 import numpy as np
 import pandas as pd
 import requests
+import time
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+from . import cache
+from . import constants
+from . import settings
 
 # API Functions ---------------------------------------------------------------
 
@@ -25,17 +40,260 @@ def check_api():
     except:
         return False
 
+# Hook functions --------------------------------------------------------------
+
+# The fields of the instrumented stage running in the current context, whose
+# id is the parent of any stage or event that starts inside it
+current_stage = contextvars.ContextVar('current_stage', default=None)
+stage_ids = itertools.count(1)
+
+
+def fire_hook(event, query=None, **fields):
+
+    """Call the hooks registered for an event.
+
+    fire_hook builds the dictionary describing the event from the given
+    fields and passes it to each hook registered for the event. If a query
+    is given its fingerprint is included. When there are no hooks for the
+    event it returns straight away, so the fingerprint is never computed.
+
+    """
+
+    event_hooks = settings.hooks.get(event)
+    if not event_hooks:
+        return
+
+    stage = current_stage.get()
+
+    info = {
+        'event': event,
+        'stage': None,
+        'id': None,
+        'parent': None if stage is None else stage['id'],
+        'fingerprint': None,
+        'endpoint': None,
+        'status': None,
+        'bytes': None,
+        'rows_in': None,
+        'rows': None,
+        'start': None,
+        'elapsed': None,
+        'error': None}
+
+    if query is not None:
+        info['fingerprint'] = get_query_fingerprint(query)
+
+    info.update(fields)
+
+    for hook in event_hooks:
+        hook(dict(info))
+
+
+def record_response(status, content_bytes):
+
+    """Record the status and size of a response in the running query stage.
+
+    The status and the number of bytes received are added to the fields of
+    the instrumented query stage running in the current context, so its end
+    event reports them. The bytes of each response are added together, so a
+    query downloaded in pages reports its total size. content_bytes is None
+    if the size of the response is not known.
+
+    """
+
+    stage = current_stage.get()
+    if stage is None or 'status' not in stage:
+        return
+
+    stage['status'] = status
+    if content_bytes is not None:
+        stage['bytes'] = (stage['bytes'] or 0) + content_bytes
+
+
+def get_query_fingerprint(query):
+
+    """Get a short hash of a query that ignores its layout."""
+
+    return hashlib.sha256(
+        cache.normalize_query(query).encode('utf-8')).hexdigest()[:16]
+
+
+def get_row_count(data):
+
+    """Get the number of rows in a result, or None if it is not tabular."""
+
+    if isinstance(data, (pd.DataFrame, pd.Series, np.ndarray)):
+        return len(data)
+
+    if pyarrow is not None and isinstance(data, pyarrow.Table):
+        return data.num_rows
+
+    return None
+
+
+def instrument(event, start_event=None, query=False):
+
+    """Fire an event with the rows and time taken by each call of a function.
+
+    instrument is a decorator for the stages of a pipeline. Each call fires
+    the given event with the name of the function as the stage, a unique id
+    for the call, the number of rows in the first argument and in the
+    result, and the time taken. Stages and events that start during the call
+    have its id as their parent, so the calls made by a pipeline can be
+    rebuilt as a tree. If a start_event is given it is fired when the call
+    starts. If query is True the first argument is a query, and the events
+    include its fingerprint, the endpoint, and the status and bytes of its
+    response instead of the rows in. The event is fired whether or not the
+    call succeeds, and the error is included if it raises an exception.
+    Coroutine functions are instrumented with a coroutine function. When no
+    hooks are registered the function is called directly.
+
+    """
+
+    def decorator(func):
+
+        first_param = next(iter(inspect.signature(func).parameters), None)
+
+        def start_stage(args, kwargs):
+            data = args[0] if args else kwargs.get(first_param)
+            fields = {'stage': func.__name__, 'id': next(stage_ids)}
+            if query:
+                fields['query'] = data
+                fields['endpoint'] = settings.get_api_url()
+                fields['status'] = None
+                fields['bytes'] = None
+            else:
+                fields['rows_in'] = get_row_count(data)
+            fields['start'] = time.perf_counter()
+            if start_event is not None:
+                fire_hook(start_event, **fields)
+            return fields, current_stage.set(fields)
+
+        def end_stage(fields, result):
+            fields['rows'] = get_row_count(result)
+            fields['elapsed'] = time.perf_counter() - fields['start']
+            fire_hook(event, **fields)
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+
+                if not settings.hooks:
+                    return await func(*args, **kwargs)
+
+                fields, token = start_stage(args, kwargs)
+                result = None
+                try:
+                    result = await func(*args, **kwargs)
+                except BaseException as e:
+                    fields['error'] = e
+                    raise
+                finally:
+                    current_stage.reset(token)
+                    end_stage(fields, result)
+
+                return result
+
+        else:
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+
+                if not settings.hooks:
+                    return func(*args, **kwargs)
+
+                fields, token = start_stage(args, kwargs)
+                result = None
+                try:
+                    result = func(*args, **kwargs)
+                except BaseException as e:
+                    fields['error'] = e
+                    raise
+                finally:
+                    current_stage.reset(token)
+                    end_stage(fields, result)
+
+                return result
+
+        return wrapper
+
+    return decorator
+
 # Date handling functions -----------------------------------------------------
 
 def convert_date_series(date_str_series):
 
-    """Convert a series of ISO 8601 date strings to datetime.dates."""
+    """Convert a series of ISO 8601 date strings to datetime.dates.
+
+    If the date dtype setting is 'datetime64' the dates are returned as a
+    datetime64[ns] array instead, with NaT for missing dates.
+
+    """
+
+    if settings.get_date_dtype() == constants.DATE_DTYPE_DATETIME64:
+        return convert_date_days(date_str_series).astype('datetime64[ns]')
 
     return [np.NaN if pd.isna(d) \
         else datetime.datetime.strptime(d, '%Y-%m-%d').date() \
         for d in date_str_series]
 
 
+def convert_date_columns(df):
+
+    """Convert the columns of datetime.dates in a dataframe to datetime64.
+
+    convert_date_columns finds the object columns in a dataframe whose values
+    are datetime.dates and converts them to datetime64[ns] columns in place,
+    with NaT for missing dates. The dataframe is returned.
+
+    """
+
+    for col in df.columns[df.dtypes == object]:
+        i = df[col].first_valid_index()
+        if i is not None and isinstance(df[col][i], datetime.date):
+            df[col] = convert_date_days(df[col]).astype('datetime64[ns]')
+
+    return df
+
+
+def convert_date_days(dates):
+
+    """Convert a sequence of dates to datetime64[D], with missing as NaT.
+
+    The dates may be datetime.dates, ISO 8601 date strings or datetime64
+    values. Each distinct date is converted once, so columns that repeat the
+    same dates are converted quickly.
+
+    """
+
+    dates = np.asarray(dates)
+    if dates.dtype.kind == 'M':
+        return dates.astype('datetime64[D]')
+
+    codes, uniques = pd.factorize(dates)
+    days = np.append(
+        convert_unique_days(uniques), np.datetime64('NaT', 'D'))
+    return days[codes]
+
+
+def convert_unique_days(uniques):
+
+    """Convert an array of distinct non-missing dates to datetime64[D]."""
+
+    # NumPy converts date objects one at a time through a slow generic path,
+    # so dates are converted through their ordinals where possible
+    try:
+        ordinals = np.fromiter(
+            (d.toordinal() for d in uniques),
+            dtype=np.int64,
+            count=len(uniques))
+    except (AttributeError, TypeError):
+        return np.asarray(uniques).astype('datetime64[D]')
+
+    return (ordinals - constants.UNIX_EPOCH_ORDINAL).astype('datetime64[D]')
+
+
 def min_date_nan(dates):
 
     """Find the earliest date from a series that may contain NaNs.
@@ -65,6 +323,134 @@ def max_date_nan(dates):
     else:
         return max(dates)
 
+# Categorical handling functions ----------------------------------------------
+
+def use_categorical(categorical=None):
+
+    """Return the categorical argument, or the setting if it is None."""
+
+    if categorical is None:
+        return settings.get_categorical()
+
+    return categorical
+
+
+def convert_categorical_columns(df):
+
+    """Convert the known low-cardinality columns in a dataframe to categories.
+
+    convert_categorical_columns converts each column in the dataframe that is
+    named in constants.CATEGORICAL_COLS to a pandas categorical, in place.
+    The categories are the distinct values found in the column. The dataframe
+    is returned.
+
+    """
+
+    for col in constants.CATEGORICAL_COLS:
+        if col in df.columns and df[col].dtype == object:
+            df[col] = df[col].astype('category')
+
+    return df
+
+# Arrow functions -------------------------------------------------------------
+
+def to_arrow(df):
+
+    """Convert a dataframe returned by the package to a pyarrow Table.
+
+    to_arrow converts each column of the dataframe to an Arrow array with a
+    native Arrow type, so the table can be handed to Arrow-based libraries
+    and other processes without converting its columns again. Date columns,
+    whether they hold datetime.dates or datetime64 values, become date32
+    columns. Categorical columns, and the string columns named in
+    constants.CATEGORICAL_COLS, become dictionary-encoded string columns.
+    Other string columns become string columns. Missing values are null.
+    This function requires pyarrow.
+
+    Parameters
+    ----------
+    df : DataFrame
+        A pandas dataframe as returned by sparql_select or one of the fetch
+        functions.
+
+    Returns
+    -------
+    out : pyarrow.Table
+        A pyarrow Table with the same columns as the dataframe.
+
+    """
+
+    if pyarrow is None:
+        raise ImportError(
+            'The arrow output requires pyarrow: pip install pyarrow')
+
+    arrays = [to_arrow_array(df[col], col) for col in df.columns]
+    return pyarrow.Table.from_arrays(arrays, names=list(df.columns))
+
+
+def to_arrow_array(series, name):
+
+    """Convert a column of a dataframe to an Arrow array."""
+
+    if pd.api.types.is_datetime64_dtype(series.dtype):
+        return pyarrow.array(
+            series.values.astype('datetime64[D]'),
+            type=pyarrow.date32(),
+            from_pandas=True)
+
+    # Categoricals keep their categories as the dictionary, with the same
+    # index type as the dictionary-encoded string columns
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        array = pyarrow.array(series, from_pandas=True)
+        return array.cast(pyarrow.dictionary(
+            pyarrow.int32(), array.type.value_type))
+
+    if series.dtype == object:
+        i = series.first_valid_index()
+        if i is not None and isinstance(series[i], datetime.date):
+            return pyarrow.array(
+                convert_date_days(series),
+                type=pyarrow.date32(),
+                from_pandas=True)
+        array = pyarrow.array(series, type=pyarrow.string(), from_pandas=True)
+        if name in constants.CATEGORICAL_COLS:
+            return array.dictionary_encode()
+        return array
+
+    return pyarrow.array(series, from_pandas=True)
+
+
+def from_arrow(table):
+
+    """Convert a pyarrow Table written by to_arrow back to a dataframe.
+
+    from_arrow returns a dataframe that follows the conventions of the raw
+    results of sparql_select: strings are returned in object columns, dates
+    are returned as datetime.dates, and missing values are NaN. Dictionary
+    columns are decoded to strings. This function requires pyarrow.
+
+    """
+
+    if pyarrow is None:
+        raise ImportError(
+            'The arrow output requires pyarrow: pip install pyarrow')
+
+    # Build each column as a NumPy array, setting nulls to NaN with the
+    # column's null mask rather than searching the values for them
+    columns = {}
+    for name, column in zip(table.column_names, table.columns):
+        if pyarrow.types.is_dictionary(column.type):
+            column = column.cast(column.type.value_type)
+        if pyarrow.types.is_date(column.type):
+            values = column.to_pandas(date_as_object=True).values
+        else:
+            values = column.to_numpy(zero_copy_only=False)
+        if column.null_count > 0 and values.dtype == object:
+            values[column.is_null().to_numpy(zero_copy_only=False)] = np.NaN
+        columns[name] = values
+
+    return pd.DataFrame(columns, columns=table.column_names)
+
 # Data presentation functions -------------------------------------------------
 
 def readable(df):
@@ -89,3 +475,13 @@ def readable(df):
 
     readable_cols = list(filter(lambda c: not c.endswith('_id'), df.columns))
     return df[readable_cols]
+
+
+@instrument(constants.HOOK_EVENT_PROCESS)
+def sort_rows(df, by):
+
+    """Sort the rows of a dataframe in place and reset its index."""
+
+    df.sort_values(by=by, inplace=True)
+    df.reset_index(drop=True, inplace=True)
+    return df
@@ -10,5 +10,6 @@ setup(
     license = 'BSD',
     keywords = ['Parliament', 'MP', 'House of Commons', 'House of Lords'],
     install_requires = ['numpy', 'pandas', 'requests'],
+    extras_require = {'async': ['aiohttp'], 'arrow': ['pyarrow']},
     classifiers = [],
 )
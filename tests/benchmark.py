@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""Helper functions for performance benchmarks."""
+
+# Imports ---------------------------------------------------------------------
+
+import csv
+import datetime
+import functools
+import io
+import json
+import numpy as np
+import os
+import time
+import tracemalloc
+
+import pandas as pd
+
+import pdpy.constants as constants
+
+# Timing ----------------------------------------------------------------------
+
+def time_function(func, *args, repeat=5, **kwargs):
+
+    """Call a function repeatedly and return the fastest time in seconds."""
+
+    timings = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def report(name, timings):
+
+    """Print a line of named timings in milliseconds."""
+
+    timings_str = '  '.join(
+        '{0}: {1:9.2f} ms'.format(k, v * 1000) for k, v in timings.items())
+    print('{0:<40} {1}'.format(name, timings_str))
+
+
+def peak_memory(func, *args, **kwargs):
+
+    """Call a function and return its result and peak traced memory."""
+
+    tracemalloc.start()
+    try:
+        result = func(*args, **kwargs)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+
+def report_memory(name, sizes):
+
+    """Print a line of named memory sizes in megabytes."""
+
+    sizes_str = '  '.join(
+        '{0}: {1:7.2f} MB'.format(k, v / 2 ** 20) for k, v in sizes.items())
+    print('{0:<40} {1}'.format(name, sizes_str))
+
+# Baselines -------------------------------------------------------------------
+
+BASELINES_PATH = os.path.join(
+    os.path.dirname(__file__), 'data', 'benchmarks.json')
+
+# Set this environment variable to record new baselines instead of checking
+BASELINES_UPDATE_VAR = 'PDPY_UPDATE_BASELINES'
+
+# A benchmark fails if it takes this many times its baseline, and is slower
+# than its baseline by more than the minimum difference in seconds, which
+# stops the timer resolution failing the fastest benchmarks
+BASELINE_TOLERANCE = 1.5
+BASELINE_MIN_DIFFERENCE = 0.0005
+BASELINE_REPEAT = 20
+
+# The number of times a slow benchmark is timed before it fails
+BASELINE_ATTEMPTS = 2
+
+
+@functools.lru_cache(maxsize=None)
+def get_calibration_time():
+
+    """Time a fixed pandas workload to calibrate timings on this machine.
+
+    Baselines are stored as multiples of this time rather than in seconds,
+    so that they can be checked on machines that are faster or slower than
+    the one where they were recorded.
+
+    """
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'key': rng.integers(0, 1000, 100000).astype(str).astype(object),
+        'day': rng.integers(0, 20000, 100000)})
+
+    def workload(df):
+        df.sort_values(by=['key', 'day']).groupby('key')['day'].max()
+
+    return time_function(workload, df)
+
+
+def read_baselines():
+
+    """Read the stored baselines."""
+
+    try:
+        with open(BASELINES_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def write_baseline(name, units):
+
+    """Store a timing in calibrated units as the baseline for a benchmark."""
+
+    baselines = read_baselines()
+    baselines[name] = round(units, 4)
+    with open(BASELINES_PATH, 'w', encoding='utf-8') as f:
+        json.dump(baselines, f, indent=4, sort_keys=True)
+        f.write('\n')
+
+
+def is_slower(units, baseline):
+
+    """Check if a timing in calibrated units is slower than its baseline."""
+
+    difference = (units - baseline) * get_calibration_time()
+    return units > baseline * BASELINE_TOLERANCE and \
+        difference > BASELINE_MIN_DIFFERENCE
+
+
+def time_baseline(test, name, func, *args, **kwargs):
+
+    """Time a function and check the timing against its stored baseline.
+
+    The function is timed BASELINE_REPEAT times and the fastest time is
+    converted to a multiple of the calibration time. If it is slower than
+    the baseline by more than the tolerance, the machine is calibrated again
+    and the function is timed again, so that a burst of load on a shared
+    machine does not fail the benchmark. The test fails if the function is
+    still slow after BASELINE_ATTEMPTS attempts. If the update environment
+    variable is set, the timing is stored as the new baseline instead.
+    Timings with no baseline are not checked. Returns the fastest time in
+    seconds.
+
+    """
+
+    update = os.environ.get(BASELINES_UPDATE_VAR)
+    baseline = read_baselines().get(name)
+
+    for attempt in range(BASELINE_ATTEMPTS):
+
+        if attempt > 0:
+            get_calibration_time.cache_clear()
+
+        elapsed = time_function(
+            func, *args, repeat=BASELINE_REPEAT, **kwargs)
+        units = elapsed / get_calibration_time()
+
+        if update or baseline is None or not is_slower(units, baseline):
+            break
+
+    else:
+        test.fail(
+            '{0} took {1:.2f} calibrated units against a baseline of '
+            '{2:.2f}'.format(name, units, baseline))
+
+    if update:
+        write_baseline(name, units)
+
+    return elapsed
+
+# SPARQL results --------------------------------------------------------------
+
+def frame_to_sparql_json(df):
+
+    """Convert a dataframe to the parsed JSON of a SPARQL results document.
+
+    Dates are encoded with the XML date datatype and the timezone suffix
+    used by the data platform. Missing values are left unbound.
+
+    """
+
+    headers = list(df.columns)
+    bindings = []
+
+    for row in df.itertuples(index=False):
+        binding = {}
+        for header, value in zip(headers, row):
+            if pd.isna(value):
+                continue
+            if isinstance(value, datetime.date):
+                binding[header] = {
+                    'type': 'literal',
+                    'datatype': constants.XML_DATE,
+                    'value': '{0}+01:00'.format(value.isoformat())}
+            else:
+                binding[header] = {'type': 'literal', 'value': str(value)}
+        bindings.append(binding)
+
+    return {'head': {'vars': headers}, 'results': {'bindings': bindings}}
+
+
+def frame_to_sparql_csv(df):
+
+    """Convert a dataframe to the body of a SPARQL CSV results document."""
+
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator='\r\n')
+    writer.writerow(df.columns)
+
+    for row in df.itertuples(index=False):
+        writer.writerow([
+            '' if pd.isna(value) else
+            '{0}+01:00'.format(value.isoformat())
+                if isinstance(value, datetime.date) else
+            str(value) for value in row])
+
+    return output.getvalue().encode('utf-8')
+
+
+def frame_to_sparql_tsv(df):
+
+    """Convert a dataframe to the body of a SPARQL TSV results document.
+
+    Values that look like urls are encoded as IRIs and all other values are
+    encoded as literals. Dates are encoded with the XML date datatype.
+
+    """
+
+    def encode(value):
+        if pd.isna(value):
+            return ''
+        if isinstance(value, datetime.date):
+            return '"{0}+01:00"^^<{1}>'.format(
+                value.isoformat(), constants.XML_DATE)
+        value = str(value)
+        if value.startswith('http'):
+            return '<{0}>'.format(value)
+        value = value.replace('\\', '\\\\')
+        for escape, char in constants.TSV_ESCAPES.items():
+            if char != '\\':
+                value = value.replace(char, escape)
+        return '"{0}"'.format(value)
+
+    lines = ['\t'.join('?{0}'.format(col) for col in df.columns)]
+    for row in df.itertuples(index=False):
+        lines.append('\t'.join(encode(value) for value in row))
+
+    return '\n'.join(lines).encode('utf-8')
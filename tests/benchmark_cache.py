@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the query result cache.
+
+The timings of cache misses and hits are checked against the baselines in
+tests/data/benchmarks.json. Set PDPY_UPDATE_BASELINES=1 to record new
+baselines.
+
+Run with: python -m pytest -s tests/benchmark_cache.py
+
+"""
+
+# Imports ---------------------------------------------------------------------
+
+import concurrent.futures
+import itertools
+import json
+import os
+import pandas as pd
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pdpy.cache as cache
+import pdpy.core as core
+import pdpy.settings as settings
+import tests.benchmark as benchmark
+import tests.validate as validate
+
+# Setup -----------------------------------------------------------------------
+
+def get_deferred_writer():
+
+    """Get a cache writer that accepts entries without writing them.
+
+    Timing misses with this writer measures the time a miss takes to return,
+    without a background write from the previous miss competing with it.
+
+    """
+
+    written = concurrent.futures.Future()
+    written.set_result(None)
+    writer = MagicMock()
+    writer.submit.return_value = written
+    return writer
+
+# Benchmarks ------------------------------------------------------------------
+
+class BenchmarkSparqlSelectCache(unittest.TestCase):
+
+    """Benchmark sparql_select with cache misses and hits against no cache."""
+
+    fixtures = [
+        'commons_memberships_raw',
+        'mps_committee_memberships_raw',
+        'lords_committee_memberships_raw']
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp_dir.name, 'cache')
+
+    def tearDown(self):
+        cache.flush_cache()
+        settings.reset_cache_dir()
+        self.tmp_dir.cleanup()
+
+    def test_sparql_select_cache(self):
+
+        counter = itertools.count()
+
+        for fixture in self.fixtures:
+
+            response = MagicMock()
+            response.ok = True
+            response.content = json.dumps(benchmark.frame_to_sparql_json(
+                validate.read(fixture))).encode('utf-8')
+            session = MagicMock()
+            session.post.return_value = response
+
+            # Each call to select sends a new query, so every call misses
+            def select():
+                query = 'SELECT * WHERE {{ ?s ?p {0} . }}'.format(
+                    next(counter))
+                return core.sparql_select(query)
+
+            def select_hit():
+                return core.sparql_select('SELECT * WHERE { ?s ?p ?o . }')
+
+            with patch('pdpy.core.get_session', return_value=session):
+
+                settings.reset_cache_dir()
+                uncached_time = benchmark.time_function(select)
+
+                # Entries are written in the background after a miss
+                # returns, so misses are timed without writing them
+                settings.set_cache_dir(self.cache_dir)
+                with patch(
+                        'pdpy.cache.get_writer',
+                        return_value=get_deferred_writer()):
+                    miss_time = benchmark.time_baseline(
+                        self,
+                        'sparql_select_cache_miss_{0}'.format(fixture),
+                        select)
+
+                exp = select_hit()
+                cache.flush_cache()
+                pd.testing.assert_frame_equal(select_hit(), exp)
+                hit_time = benchmark.time_baseline(
+                    self,
+                    'sparql_select_cache_hit_{0}'.format(fixture),
+                    select_hit)
+
+            benchmark.report(fixture, {
+                'uncached': uncached_time,
+                'miss': miss_time,
+                'hit': hit_time})
+
+            self.assertLess(hit_time, uncached_time)
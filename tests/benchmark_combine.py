@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""Benchmark combine functions.
+
+Run with: python -m pytest -s tests/benchmark_combine.py
+
+"""
+
+# Imports ---------------------------------------------------------------------
+
+import pandas as pd
+import unittest
+
+import pdpy.combine as combine
+import tests.benchmark as benchmark
+import tests.validate as validate
+from tests.test_combine import coalesce_intervals_loop
+from tests.test_combine import combine_party_memberships_groupby
+
+# Benchmarks ------------------------------------------------------------------
+
+class BenchmarkCombinePartyMemberships(unittest.TestCase):
+
+    """Benchmark vectorized run detection against mapping and grouping."""
+
+    def test_combine_party_memberships(self):
+
+        for name in [
+                'mps_party_memberships_raw',
+                'lords_party_memberships_raw']:
+
+            pm = validate.read(name)
+
+            pd.testing.assert_frame_equal(
+                combine.combine_party_memberships(pm),
+                combine_party_memberships_groupby(pm))
+
+            groupby_time = benchmark.time_function(
+                combine_party_memberships_groupby, pm, repeat=2)
+            vectorized_time = benchmark.time_function(
+                combine.combine_party_memberships, pm)
+
+            benchmark.report(name, {
+                'groupby': groupby_time,
+                'vectorized': vectorized_time})
+
+            self.assertLess(vectorized_time, groupby_time)
+
+
+class BenchmarkCoalesceIntervals(unittest.TestCase):
+
+    """Benchmark coalescing intervals as the number of periods grows."""
+
+    def test_coalesce_intervals(self):
+
+        df = validate.read('commons_memberships_raw')
+        kwargs = {
+            'key_cols': ['person_id'],
+            'start_col': 'seat_incumbency_start_date',
+            'end_col': 'seat_incumbency_end_date',
+            'gap_days': 60}
+
+        pd.testing.assert_frame_equal(
+            combine.coalesce_intervals(df, **kwargs),
+            coalesce_intervals_loop(df, **kwargs))
+
+        loop_time = benchmark.time_function(
+            coalesce_intervals_loop, df, repeat=2, **kwargs)
+        vectorized_time = benchmark.time_function(
+            combine.coalesce_intervals, df, **kwargs)
+
+        benchmark.report('commons_memberships_raw', {
+            'loop': loop_time,
+            'vectorized': vectorized_time})
+
+        self.assertLess(vectorized_time, loop_time)
+
+        # Copy the memberships for new people to show how the time grows
+        for copies in [4, 16]:
+            copied = pd.concat([
+                df.assign(person_id=df['person_id'] + '-{0}'.format(i))
+                for i in range(copies)], ignore_index=True)
+            benchmark.report('commons_memberships_raw x {0}'.format(copies), {
+                'vectorized': benchmark.time_function(
+                    combine.coalesce_intervals, copied, **kwargs)})
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""Benchmark core download functions.
+
+Run with: python -m pytest -s tests/benchmark_core.py
+
+"""
+
+# Imports ---------------------------------------------------------------------
+
+import datetime
+import json
+import numpy as np
+import pandas as pd
+import unittest
+
+import pdpy.constants as constants
+import pdpy.core as core
+import tests.benchmark as benchmark
+import tests.validate as validate
+
+# Reference implementation ----------------------------------------------------
+
+def decode_json_results_rowwise(results):
+
+    """Decode SPARQL JSON results row by row as sparql_select used to."""
+
+    rows = []
+    headers = results['head']['vars']
+    records = results['results']['bindings']
+
+    for record in records:
+        row = []
+        for header in headers:
+            if header in record:
+                if 'datatype' in record[header] and \
+                        record[header]['datatype'] == constants.XML_DATE:
+
+                    row.append(
+                        datetime.datetime.strptime(
+                        record[header]['value'], '%Y-%m-%d+%H:%M').date())
+                else:
+                    row.append(record[header]['value'].strip())
+            else:
+                row.append(None)
+        rows.append(row)
+
+    return pd.DataFrame(data=rows, columns=headers).fillna(value=np.NaN)
+
+# Benchmarks ------------------------------------------------------------------
+
+class BenchmarkDecodeJsonResults(unittest.TestCase):
+
+    """Benchmark columnar decoding against row by row decoding."""
+
+    fixtures = [
+        'commons_memberships_raw',
+        'mps_party_memberships_raw',
+        'mps_committee_memberships_raw',
+        'lords_committee_memberships_raw']
+
+    def test_decode_json_results(self):
+
+        for fixture in self.fixtures:
+
+            results = benchmark.frame_to_sparql_json(validate.read(fixture))
+
+            exp = decode_json_results_rowwise(results)
+            obs = core.decode_json_results(results)
+            pd.testing.assert_frame_equal(obs, exp)
+
+            rowwise = benchmark.time_function(
+                decode_json_results_rowwise, results)
+            columnar = benchmark.time_function(
+                core.decode_json_results, results)
+
+            benchmark.report(fixture, {
+                'rowwise': rowwise,
+                'columnar': columnar})
+
+            self.assertLess(columnar, rowwise)
+
+
+class BenchmarkDecodeResultFormats(unittest.TestCase):
+
+    """Benchmark decoding CSV and TSV results against JSON results."""
+
+    fixtures = [
+        'commons_memberships_raw',
+        'mps_committee_memberships_raw',
+        'lords_committee_memberships_raw']
+
+    def test_decode_result_formats(self):
+
+        for fixture in self.fixtures:
+
+            df = validate.read(fixture)
+            date_cols = [col for col in df.columns if col.endswith('_date')]
+            json_content = json.dumps(
+                benchmark.frame_to_sparql_json(df)).encode('utf-8')
+            csv_content = benchmark.frame_to_sparql_csv(df)
+            tsv_content = benchmark.frame_to_sparql_tsv(df)
+
+            def decode_json():
+                return core.decode_json_results(json.loads(json_content))
+
+            def decode_csv():
+                return core.decode_csv_results(csv_content, date_cols)
+
+            def decode_tsv():
+                return core.decode_tsv_results(tsv_content)
+
+            exp = decode_json()
+            pd.testing.assert_frame_equal(decode_csv(), exp)
+            pd.testing.assert_frame_equal(decode_tsv(), exp)
+
+            benchmark.report_memory(fixture, {
+                'json': len(json_content),
+                'csv': len(csv_content),
+                'tsv': len(tsv_content)})
+
+            json_time = benchmark.time_function(decode_json)
+            csv_time = benchmark.time_function(decode_csv)
+            tsv_time = benchmark.time_function(decode_tsv)
+
+            benchmark.report(fixture, {
+                'json': json_time,
+                'csv': csv_time,
+                'tsv': tsv_time})
+
+            self.assertLess(csv_time, json_time)
+            self.assertLess(tsv_time, json_time)
+
+
+class BenchmarkDecodeJsonStream(unittest.TestCase):
+
+    """Benchmark peak memory of streaming decoding against full decoding."""
+
+    fixtures = [
+        'mps_committee_memberships_raw',
+        'lords_committee_memberships_raw']
+
+    def test_decode_json_stream(self):
+
+        for fixture in self.fixtures:
+
+            text = json.dumps(benchmark.frame_to_sparql_json(
+                validate.read(fixture))).encode('utf-8')
+
+            def chunks():
+                for i in range(0, len(text), constants.STREAM_CHUNK_SIZE):
+                    yield text[i:i + constants.STREAM_CHUNK_SIZE]
+
+            def decode_full():
+                return core.decode_json_results(json.loads(text))
+
+            def decode_stream():
+                return core.decode_json_stream(chunks())
+
+            full, full_peak = benchmark.peak_memory(decode_full)
+            stream, stream_peak = benchmark.peak_memory(decode_stream)
+            pd.testing.assert_frame_equal(stream, full)
+
+            benchmark.report_memory(fixture, {
+                'frame': stream.memory_usage(deep=True).sum(),
+                'full': full_peak,
+                'stream': stream_peak})
+
+            self.assertLess(stream_peak, full_peak)
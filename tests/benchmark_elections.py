@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""Benchmark elections data functions.
+
+Run with: python -m pytest -s tests/benchmark_elections.py
+
+"""
+
+# Imports ---------------------------------------------------------------------
+
+import pandas as pd
+import unittest
+
+import pdpy.elections as elections
+import tests.benchmark as benchmark
+import tests.validate as validate
+from tests.test_elections import clip_to_dissolution_loop
+
+# Benchmarks ------------------------------------------------------------------
+
+class BenchmarkClipToDissolution(unittest.TestCase):
+
+    """Benchmark vectorized clipping against clipping in a loop."""
+
+    def test_clip_to_dissolution(self):
+
+        end_dates = validate.read(
+            'commons_memberships_raw')['seat_incumbency_end_date']
+
+        obs = elections.clip_to_dissolution(end_dates)
+        exp = clip_to_dissolution_loop(end_dates)
+        pd.testing.assert_series_equal(pd.Series(obs), pd.Series(exp))
+
+        loop_time = benchmark.time_function(
+            clip_to_dissolution_loop, end_dates)
+        vectorized_time = benchmark.time_function(
+            elections.clip_to_dissolution, end_dates)
+
+        benchmark.report('commons_memberships_raw', {
+            'loop': loop_time,
+            'vectorized': vectorized_time})
+
+        self.assertLess(vectorized_time, loop_time)
+
+
+class BenchmarkGetParliamentPeriods(unittest.TestCase):
+
+    """Benchmark looking up the Parliament for each date in a column."""
+
+    def test_get_parliament_periods(self):
+
+        start_dates = validate.read(
+            'commons_memberships_raw')['seat_incumbency_start_date']
+
+        periods = elections.get_parliament_periods(start_dates)
+        self.assertEqual(len(periods), len(start_dates))
+
+        benchmark.report('commons_memberships_raw', {
+            'lookup': benchmark.time_function(
+                elections.get_parliament_periods, start_dates),
+            'get_general_elections': benchmark.time_function(
+                elections.get_general_elections)})
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the MPs and Lords fetch functions against stored baselines.
+
+The raw fetch functions are patched to return the recorded fixtures in
+tests/data, so the benchmarks time the processing of the data without
+contacting the data platform. Each timing is checked against its baseline
+in tests/data/benchmarks.json, and a benchmark fails if it has slowed down
+by more than the tolerance in tests/benchmark.py.
+
+Run with: python -m pytest -s tests/benchmark_fetch.py
+
+Record new baselines with:
+PDPY_UPDATE_BASELINES=1 python -m pytest -s tests/benchmark_fetch.py
+
+"""
+
+# Imports ---------------------------------------------------------------------
+
+import unittest
+from unittest.mock import patch
+
+import pdpy.combine as combine
+import pdpy.filter as filter
+import pdpy.lords as lords
+import pdpy.mps as mps
+import tests.benchmark as benchmark
+import tests.test_lords as test_lords
+import tests.test_mps as test_mps
+import tests.validate as validate
+
+# Setup -----------------------------------------------------------------------
+
+mps_raw_tables = [
+    'mps_raw',
+    'commons_memberships_raw',
+    'mps_party_memberships_raw',
+    'mps_government_roles_raw',
+    'mps_opposition_roles_raw',
+    'mps_committee_memberships_raw']
+
+lords_raw_tables = [
+    'lords_raw',
+    'lords_memberships_raw',
+    'lords_party_memberships_raw',
+    'lords_government_roles_raw',
+    'lords_opposition_roles_raw',
+    'lords_committee_memberships_raw']
+
+
+def patch_raw_fetchers(module, names):
+
+    """Patch the raw fetch functions of a module to return fixtures.
+
+    Each fixture is read once, and each call returns a copy, as the memory
+    cache does for results downloaded from the data platform.
+
+    """
+
+    patchers = []
+    for name in names:
+        fixture = validate.read(name)
+        patchers.append(patch.object(
+            module,
+            'fetch_{0}'.format(name),
+            lambda fixture=fixture: fixture.copy()))
+
+    return patchers
+
+# Benchmarks ------------------------------------------------------------------
+
+class BenchmarkFetchFunctions(unittest.TestCase):
+
+    """Benchmark each variant of the MPs and Lords fetch functions."""
+
+    def setUp(self):
+        self.patchers = \
+            patch_raw_fetchers(mps, mps_raw_tables) + \
+            patch_raw_fetchers(lords, lords_raw_tables)
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+
+    def test_fetch_functions(self):
+
+        for module, fetch_cases in [
+                (mps, test_mps.fetch_cases),
+                (lords, test_lords.fetch_cases)]:
+
+            for name, kwargs, filename in fetch_cases:
+                with self.subTest(name=name, **kwargs):
+
+                    func = getattr(module, name)
+                    elapsed = benchmark.time_baseline(
+                        self, filename, func, **kwargs)
+
+                    benchmark.report(filename, {'fetch': elapsed})
+
+
+class BenchmarkPipelineStages(unittest.TestCase):
+
+    """Benchmark the filter and combine stages of the fetch functions."""
+
+    def test_filter_dates(self):
+
+        df = validate.read('mps_committee_memberships_raw')
+        elapsed = benchmark.time_baseline(
+            self,
+            'filter_dates',
+            filter.filter_dates,
+            df,
+            start_col='committee_membership_start_date',
+            end_col='committee_membership_end_date',
+            from_date='2010-05-06',
+            to_date='2017-06-08')
+
+        benchmark.report('filter_dates', {'filter': elapsed})
+
+    def test_filter_memberships(self):
+
+        tm = validate.read('mps_committee_memberships_raw')
+        fm = validate.read('commons_memberships_raw')
+        elapsed = benchmark.time_baseline(
+            self,
+            'filter_memberships',
+            filter.filter_memberships,
+            tm,
+            fm,
+            tm_id_col='committee_membership_id',
+            tm_start_col='committee_membership_start_date',
+            tm_end_col='committee_membership_end_date',
+            fm_start_col='seat_incumbency_start_date',
+            fm_end_col='seat_incumbency_end_date',
+            join_col='person_id')
+
+        benchmark.report('filter_memberships', {'filter': elapsed})
+
+    def test_combine_party_memberships(self):
+
+        for name in [
+                'mps_party_memberships_raw',
+                'lords_party_memberships_raw']:
+
+            pm = validate.read(name)
+            baseline_name = 'combine_party_memberships_{0}'.format(
+                name.split('_')[0])
+            elapsed = benchmark.time_baseline(
+                self,
+                baseline_name,
+                combine.combine_party_memberships,
+                pm)
+
+            benchmark.report(baseline_name, {'combine': elapsed})
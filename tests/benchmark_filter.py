@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""Benchmark filter functions.
+
+Run with: python -m pytest -s tests/benchmark_filter.py
+
+"""
+
+# Imports ---------------------------------------------------------------------
+
+import pandas as pd
+import unittest
+
+import pdpy.constants as constants
+import pdpy.filter as filter
+import pdpy.settings as settings
+import tests.benchmark as benchmark
+import tests.validate as validate
+from tests.test_filter import filter_dates_map
+from tests.test_filter import filter_memberships_merge
+
+# Benchmarks ------------------------------------------------------------------
+
+class BenchmarkFilterDates(unittest.TestCase):
+
+    """Benchmark vectorized date filtering against filtering with map."""
+
+    def test_filter_dates(self):
+
+        for name, start_col, end_col in [
+                ('mps_committee_memberships_raw',
+                 'committee_membership_start_date',
+                 'committee_membership_end_date'),
+                ('commons_memberships_raw',
+                 'seat_incumbency_start_date',
+                 'seat_incumbency_end_date')]:
+
+            df = validate.read(name)
+            kwargs = {
+                'start_col': start_col,
+                'end_col': end_col,
+                'from_date': '2010-05-06',
+                'to_date': '2017-06-08'}
+
+            pd.testing.assert_frame_equal(
+                filter.filter_dates(df, **kwargs),
+                filter_dates_map(df, **kwargs))
+
+            map_time = benchmark.time_function(
+                filter_dates_map, df, **kwargs)
+            vectorized_time = benchmark.time_function(
+                filter.filter_dates, df, **kwargs)
+
+            benchmark.report(name, {
+                'map': map_time,
+                'vectorized': vectorized_time})
+
+            self.assertLess(vectorized_time, map_time)
+
+
+class BenchmarkFilterMemberships(unittest.TestCase):
+
+    """Benchmark the sort-based join against merging every pair."""
+
+    def test_filter_memberships(self):
+
+        tm = validate.read('mps_committee_memberships_raw')
+        fm = validate.read('commons_memberships_raw')
+        kwargs = {
+            'tm_id_col': 'committee_membership_id',
+            'tm_start_col': 'committee_membership_start_date',
+            'tm_end_col': 'committee_membership_end_date',
+            'fm_start_col': 'seat_incumbency_start_date',
+            'fm_end_col': 'seat_incumbency_end_date',
+            'join_col': 'person_id'}
+
+        obs, join_memory = benchmark.peak_memory(
+            filter.filter_memberships, tm, fm, **kwargs)
+        exp, merge_memory = benchmark.peak_memory(
+            filter_memberships_merge, tm, fm, **kwargs)
+        pd.testing.assert_frame_equal(obs, exp)
+
+        merge_time = benchmark.time_function(
+            filter_memberships_merge, tm, fm, repeat=1, **kwargs)
+        join_time = benchmark.time_function(
+            filter.filter_memberships, tm, fm, **kwargs)
+
+        benchmark.report('committee memberships while mp', {
+            'merge': merge_time,
+            'join': join_time})
+        benchmark.report_memory('committee memberships while mp', {
+            'merge': merge_memory,
+            'join': join_memory})
+
+        self.assertLess(join_time, merge_time)
+        self.assertLess(join_memory, merge_memory)
+
+
+class BenchmarkDateDtype(unittest.TestCase):
+
+    """Benchmark filtering datetime64 dates against datetime.dates."""
+
+    def test_date_dtype(self):
+
+        tm = validate.read('mps_committee_memberships_raw')
+        fm = validate.read('commons_memberships_raw')
+        tm_datetime64 = validate.to_datetime64(tm.copy())
+        fm_datetime64 = validate.to_datetime64(fm.copy())
+        kwargs = {
+            'tm_id_col': 'committee_membership_id',
+            'tm_start_col': 'committee_membership_start_date',
+            'tm_end_col': 'committee_membership_end_date',
+            'fm_start_col': 'seat_incumbency_start_date',
+            'fm_end_col': 'seat_incumbency_end_date',
+            'join_col': 'person_id'}
+        date_cols = [kwargs['tm_start_col'], kwargs['tm_end_col']]
+
+        object_memory = tm[date_cols].memory_usage(deep=True).sum()
+        datetime64_memory = tm_datetime64[date_cols].memory_usage(
+            deep=True).sum()
+
+        benchmark.report_memory('committee membership dates', {
+            'object': object_memory,
+            'datetime64': datetime64_memory})
+
+        object_time = benchmark.time_function(
+            filter.filter_memberships, tm, fm, **kwargs)
+        datetime64_time = benchmark.time_function(
+            filter.filter_memberships, tm_datetime64, fm_datetime64,
+            **kwargs)
+
+        benchmark.report('committee memberships while mp', {
+            'object': object_time,
+            'datetime64': datetime64_time})
+
+        self.assertLess(datetime64_memory, object_memory)
+
+
+class BenchmarkHooks(unittest.TestCase):
+
+    """Benchmark the overhead of instrumenting a stage with hooks."""
+
+    def test_hook_overhead(self):
+
+        df = validate.read('mps_committee_memberships_raw')
+        kwargs = {
+            'start_col': 'committee_membership_start_date',
+            'end_col': 'committee_membership_end_date',
+            'from_date': '2010-05-06',
+            'to_date': '2017-06-08'}
+
+        uninstrumented = filter.filter_dates.__wrapped__
+
+        def call_repeatedly(func, n=100):
+            for i in range(n):
+                func(df, **kwargs)
+
+        events = []
+        bare_time = benchmark.time_function(call_repeatedly, uninstrumented)
+        no_hooks_time = benchmark.time_function(
+            call_repeatedly, filter.filter_dates)
+
+        settings.add_hook(constants.HOOK_EVENT_FILTER, events.append)
+        try:
+            hooks_time = benchmark.time_function(
+                call_repeatedly, filter.filter_dates)
+        finally:
+            settings.reset_hooks()
+
+        benchmark.report('100 calls of filter_dates', {
+            'bare': bare_time,
+            'no hooks': no_hooks_time,
+            'one hook': hooks_time})
+
+        self.assertEqual(len(events), 500)
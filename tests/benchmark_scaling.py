@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""Benchmark how the filter and combine functions scale with synthetic data.
+
+The raw tables are scaled up with tests/synthetic.py, and the time and peak
+memory of each function are reported against the number of rows. A
+benchmark fails if the time per row at the largest scale is more than
+SCALING_TOLERANCE times the time per row at the second scale, which catches
+functions that scale quadratically.
+
+Run with: python -m pytest -s tests/benchmark_scaling.py
+
+The default scales are 1, 10 and 100 times the real data. Scales up to 1000
+need several gigabytes of memory and can be set with e.g.:
+PDPY_BENCHMARK_SCALES=1,10,100,1000 python -m pytest -s \
+tests/benchmark_scaling.py
+
+"""
+
+# Imports ---------------------------------------------------------------------
+
+import gc
+import os
+import unittest
+
+import pdpy.combine as combine
+import pdpy.filter as filter
+import tests.benchmark as benchmark
+import tests.synthetic as synthetic
+
+# Setup -----------------------------------------------------------------------
+
+SCALES_VAR = 'PDPY_BENCHMARK_SCALES'
+SCALES_DEFAULT = '1,10,100'
+SCALING_TOLERANCE = 3
+
+
+def get_scales():
+
+    """Get the scales to benchmark from the environment."""
+
+    return [
+        int(scale)
+        for scale in os.environ.get(SCALES_VAR, SCALES_DEFAULT).split(',')]
+
+
+def benchmark_scaling(test, name, names, func):
+
+    """Time a function on each scale of the synthetic tables and report it.
+
+    func is called with the dictionary of scaled tables and returns the
+    number of rows it was given. Timings are checked for quadratic scaling
+    once all scales have been run.
+
+    """
+
+    row_times = []
+
+    for scale in get_scales():
+
+        tables = synthetic.read_scaled(names, scale)
+        rows, peak = benchmark.peak_memory(func, tables)
+        elapsed = benchmark.time_function(
+            func, tables, repeat=3 if scale <= 10 else 1)
+
+        label = '{0} x{1} ({2} rows)'.format(name, scale, rows)
+        benchmark.report(label, {'time': elapsed})
+        benchmark.report_memory(label, {'peak': peak})
+
+        row_times.append(elapsed / rows)
+        del tables
+        gc.collect()
+
+    if len(row_times) > 2:
+        test.assertLess(
+            row_times[-1], row_times[1] * SCALING_TOLERANCE,
+            '{0} scales worse than linearly'.format(name))
+
+# Benchmarks ------------------------------------------------------------------
+
+class BenchmarkScaling(unittest.TestCase):
+
+    """Benchmark the filter and combine functions on synthetic data."""
+
+    def test_filter_memberships_scaling(self):
+
+        def filter_party_memberships(tables):
+            pm = tables['mps_party_memberships_raw']
+            filter.filter_memberships(
+                tm=pm,
+                fm=tables['commons_memberships_raw'],
+                tm_id_col='party_membership_id',
+                tm_start_col='party_membership_start_date',
+                tm_end_col='party_membership_end_date',
+                fm_start_col='seat_incumbency_start_date',
+                fm_end_col='seat_incumbency_end_date',
+                join_col='person_id')
+            return pm.shape[0]
+
+        benchmark_scaling(
+            self,
+            'filter_memberships',
+            ['mps_party_memberships_raw', 'commons_memberships_raw'],
+            filter_party_memberships)
+
+    def test_filter_dates_scaling(self):
+
+        def filter_committee_memberships(tables):
+            cm = tables['mps_committee_memberships_raw']
+            filter.filter_dates(
+                cm,
+                start_col='committee_membership_start_date',
+                end_col='committee_membership_end_date',
+                from_date='2010-05-06',
+                to_date='2017-06-08')
+            return cm.shape[0]
+
+        benchmark_scaling(
+            self,
+            'filter_dates',
+            ['mps_committee_memberships_raw'],
+            filter_committee_memberships)
+
+    def test_combine_party_memberships_scaling(self):
+
+        for name in [
+                'mps_party_memberships_raw',
+                'lords_party_memberships_raw']:
+
+            def combine_party_memberships(tables):
+                pm = tables[name]
+                combine.combine_party_memberships(pm)
+                return pm.shape[0]
+
+            benchmark_scaling(
+                self,
+                'combine_party_memberships {0}'.format(name.split('_')[0]),
+                [name],
+                combine_party_memberships)
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""Benchmark snapshot store functions.
+
+Run with: python -m pytest -s tests/benchmark_snapshot.py
+
+"""
+
+# Imports ---------------------------------------------------------------------
+
+import os
+import pickle
+import tempfile
+import unittest
+import zlib
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+import pdpy.constants as constants
+import pdpy.snapshot as snapshot
+import tests.benchmark as benchmark
+import tests.validate as validate
+
+# Benchmarks ------------------------------------------------------------------
+
+@unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+class BenchmarkReadTable(unittest.TestCase):
+
+    """Benchmark loading snapshot tables against unpickling cached frames."""
+
+    names = [
+        'commons_memberships_raw',
+        'mps_party_memberships_raw',
+        'mps_committee_memberships_raw',
+        'lords_party_memberships_raw']
+
+    def test_read_table(self):
+
+        with tempfile.TemporaryDirectory() as snapshot_dir:
+
+            manifest = snapshot.write_tables(
+                {name: validate.read(name) for name in self.names},
+                snapshot_dir)
+
+            for name in self.names:
+
+                # A cache entry is a compressed pickle of the frame
+                entry = zlib.compress(
+                    pickle.dumps(
+                        validate.read(name),
+                        protocol=pickle.HIGHEST_PROTOCOL),
+                    constants.CACHE_COMPRESS_LEVEL)
+
+                def read_cache_entry(entry):
+                    return pickle.loads(zlib.decompress(entry))
+
+                def read_arrow_table(path):
+                    with pyarrow.memory_map(path, 'r') as source:
+                        return pyarrow.ipc.open_file(source).read_all()
+
+                path = os.path.join(
+                    snapshot_dir, manifest['tables'][name]['file'])
+
+                benchmark.report(name, {
+                    'cache entry': benchmark.time_function(
+                        read_cache_entry, entry),
+                    'snapshot': benchmark.time_function(
+                        snapshot.read_table, name, snapshot_dir),
+                    'arrow table': benchmark.time_function(
+                        read_arrow_table, path)})
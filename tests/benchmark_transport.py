@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""Benchmark queries against a local stub server.
+
+The responses are recorded from the fixtures in tests/data and replayed by
+a StubServer, so these benchmarks measure connection pooling, concurrency
+and decoding without network access.
+
+Run with: python -m pytest -s tests/benchmark_transport.py
+
+"""
+
+# Imports ---------------------------------------------------------------------
+
+import asyncio
+import json
+import tempfile
+import unittest
+
+import pdpy.cache as cache
+import pdpy.constants as constants
+import pdpy.core as core
+import pdpy.settings as settings
+import pdpy.transport as transport
+import tests.benchmark as benchmark
+import tests.validate as validate
+
+# Setup -----------------------------------------------------------------------
+
+fixtures = [
+    'commons_memberships_raw',
+    'mps_party_memberships_raw',
+    'mps_committee_memberships_raw',
+    'lords_committee_memberships_raw']
+
+# The number of queries in each batch, the number of rows in each of their
+# results and the latency of each response
+BATCH_SIZE = 20
+BATCH_ROWS = 50
+LATENCY = 0.05
+
+
+def get_query(name):
+
+    """Get a query whose recording is the fixture with the given name."""
+
+    return 'SELECT * {{ ?s ?p ?o }} # {0}'.format(name)
+
+
+def get_batch_query(i):
+
+    """Get the query for one item of a batch of small queries."""
+
+    return 'SELECT * {{ ?s ?p ?o }} LIMIT {0} OFFSET {1}'.format(
+        BATCH_ROWS, i * BATCH_ROWS)
+
+
+def write_recordings(recording_dir):
+
+    """Write a recording of each fixture in each result format.
+
+    A recording is also written for each query in a batch of small queries,
+    whose results are successive slices of Commons memberships.
+
+    """
+
+    df = validate.read('commons_memberships_raw')
+    for i in range(BATCH_SIZE):
+        transport.write_recording(
+            recording_dir,
+            get_batch_query(i),
+            json.dumps(benchmark.frame_to_sparql_json(
+                df.iloc[i * BATCH_ROWS:(i + 1) * BATCH_ROWS])),
+            constants.RESULT_FORMAT_MEDIA_TYPES[constants.RESULT_FORMAT_JSON])
+
+    for name in fixtures:
+
+        df = validate.read(name)
+        bodies = {
+            constants.RESULT_FORMAT_JSON: json.dumps(
+                benchmark.frame_to_sparql_json(df)),
+            constants.RESULT_FORMAT_CSV: benchmark.frame_to_sparql_csv(df),
+            constants.RESULT_FORMAT_TSV: benchmark.frame_to_sparql_tsv(df)}
+
+        for result_format, body in bodies.items():
+            transport.write_recording(
+                recording_dir,
+                get_query(name),
+                body,
+                constants.RESULT_FORMAT_MEDIA_TYPES[result_format])
+
+# Benchmarks ------------------------------------------------------------------
+
+class TransportBenchmarkCase(unittest.TestCase):
+
+    """Base class for benchmarks against a stub server."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        write_recordings(cls.tmp_dir.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def tearDown(self):
+        core.close_sessions()
+        settings.reset_pool_size()
+        settings.reset_api_url()
+        cache.clear_memory_cache()
+
+
+class BenchmarkConcurrency(TransportBenchmarkCase):
+
+    """Benchmark batches of queries to a server with latency."""
+
+    def test_sparql_select_many_pool_sizes(self):
+
+        queries = [get_batch_query(i) for i in range(BATCH_SIZE)]
+
+        for pool_size in [1, 10]:
+
+            settings.set_pool_size(pool_size)
+
+            with transport.StubServer(
+                    self.tmp_dir.name, latency=LATENCY) as server:
+
+                settings.set_api_url(server.url)
+
+                def select_many():
+                    cache.clear_memory_cache()
+                    core.sparql_select_many(queries, rate=1000)
+
+                elapsed = benchmark.time_function(select_many, repeat=3)
+                stats = server.get_stats()
+
+            core.close_sessions()
+            benchmark.report(
+                'sparql_select_many pool {0}'.format(pool_size),
+                {'time': elapsed})
+            print('  connections: {0}, requests: {1}'.format(
+                stats['connections'], stats['requests']))
+
+            self.assertLessEqual(stats['connections'], pool_size)
+
+    def test_sparql_select_async_gather(self):
+
+        queries = [get_batch_query(i) for i in range(BATCH_SIZE)]
+
+        async def select_all():
+            try:
+                return await asyncio.gather(*[
+                    core.sparql_select_async(query) for query in queries])
+            finally:
+                await core.close_async_sessions()
+
+        with transport.StubServer(
+                self.tmp_dir.name, latency=LATENCY) as server:
+
+            settings.set_api_url(server.url)
+
+            def select_many():
+                cache.clear_memory_cache()
+                asyncio.run(select_all())
+
+            elapsed = benchmark.time_function(select_many, repeat=3)
+
+        benchmark.report('sparql_select_async gather', {'time': elapsed})
+
+
+class BenchmarkDecoding(TransportBenchmarkCase):
+
+    """Benchmark sending and decoding queries in each result format."""
+
+    def test_sparql_select_result_formats(self):
+
+        with transport.StubServer(self.tmp_dir.name) as server:
+
+            settings.set_api_url(server.url)
+
+            for name in fixtures:
+
+                timings = {}
+
+                for result_format in [
+                        constants.RESULT_FORMAT_JSON,
+                        constants.RESULT_FORMAT_CSV,
+                        constants.RESULT_FORMAT_TSV]:
+
+                    def select():
+                        cache.clear_memory_cache()
+                        core.sparql_select(
+                            get_query(name), result_format=result_format)
+
+                    timings[result_format] = benchmark.time_function(select)
+
+                benchmark.report(name, timings)
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""Benchmark utility functions.
+
+Run with: python -m pytest -s tests/benchmark_utils.py
+
+"""
+
+# Imports ---------------------------------------------------------------------
+
+import pandas as pd
+import pickle
+import unittest
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+import pdpy.combine as combine
+import pdpy.utils as utils
+import tests.benchmark as benchmark
+import tests.validate as validate
+
+# Benchmarks ------------------------------------------------------------------
+
+class BenchmarkCategoricalColumns(unittest.TestCase):
+
+    """Benchmark categorical columns against object columns of strings."""
+
+    names = [
+        'commons_memberships_raw',
+        'mps_party_memberships_raw',
+        'mps_government_roles_raw',
+        'mps_committee_memberships_raw',
+        'lords_party_memberships_raw']
+
+    def test_categorical_memory(self):
+
+        for name in self.names:
+
+            df = validate.read(name)
+            categorical = utils.convert_categorical_columns(df.copy())
+
+            object_size = df.memory_usage(deep=True).sum()
+            categorical_size = categorical.memory_usage(deep=True).sum()
+
+            benchmark.report_memory(name, {
+                'object': object_size,
+                'categorical': categorical_size})
+
+            self.assertLess(categorical_size, object_size)
+
+    def test_categorical_grouping(self):
+
+        df = validate.read('mps_party_memberships_raw')
+        categorical = utils.convert_categorical_columns(df.copy())
+        kwargs = {
+            'key_cols': ['person_id', 'party_id'],
+            'start_col': 'party_membership_start_date',
+            'end_col': 'party_membership_end_date'}
+
+        obs = combine.coalesce_intervals(categorical, **kwargs)
+        obs['party_id'] = obs['party_id'].astype(object)
+        pd.testing.assert_frame_equal(
+            obs, combine.coalesce_intervals(df, **kwargs))
+
+        def count_by_party(df):
+            return df.groupby('party_name', observed=True).size()
+
+        benchmark.report('count by party_name', {
+            'object': benchmark.time_function(count_by_party, df),
+            'categorical': benchmark.time_function(
+                count_by_party, categorical)})
+
+        benchmark.report('coalesce by person and party', {
+            'object': benchmark.time_function(
+                combine.coalesce_intervals, df, **kwargs),
+            'categorical': benchmark.time_function(
+                combine.coalesce_intervals, categorical, **kwargs)})
+
+
+@unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+class BenchmarkArrowOutput(unittest.TestCase):
+
+    """Benchmark Arrow tables against dataframes of Python objects."""
+
+    names = [
+        'commons_memberships_raw',
+        'mps_party_memberships_raw',
+        'mps_committee_memberships_raw']
+
+    def test_arrow_output(self):
+
+        def write_ipc(table):
+            sink = pyarrow.BufferOutputStream()
+            with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            return sink.getvalue()
+
+        for name in self.names:
+
+            df = validate.read(name)
+            table = utils.to_arrow(df)
+
+            benchmark.report_memory(name, {
+                'frame': df.memory_usage(deep=True).sum(),
+                'arrow': table.nbytes})
+
+            benchmark.report(name, {
+                'to_arrow': benchmark.time_function(utils.to_arrow, df),
+                'pickle frame': benchmark.time_function(
+                    pickle.dumps, df, protocol=pickle.HIGHEST_PROTOCOL),
+                'write ipc': benchmark.time_function(write_ipc, table)})
+
+            self.assertLess(table.nbytes, df.memory_usage(deep=True).sum())
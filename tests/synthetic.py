@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""Generate synthetic Members data at scale for stress tests.
+
+The synthetic tables are built from the recorded raw tables in tests/data.
+Each person in the raw tables is copied a given number of times. Each copy
+is a new person with its own ids, and all of its dates are moved by the
+same random number of days, so its memberships in every table still line
+up with each other. The synthetic tables have the same schemas as the raw
+tables, and the same proportions of overlapping memberships, open-ended
+memberships with NaN end dates, and party switches as the real data.
+
+"""
+
+# Imports ---------------------------------------------------------------------
+
+import numpy as np
+import pandas as pd
+
+import pdpy.utils as utils
+import tests.validate as validate
+
+# Constants -------------------------------------------------------------------
+
+# Columns that identify a person, which are given new values for each copy
+PERSON_COLS = ['person_id', 'mnis_id']
+
+# The largest number of days that the dates of a copy are moved by
+MAX_SHIFT_DAYS = 4 * 365
+
+# Generate data ---------------------------------------------------------------
+
+def read_scaled(names, scale, seed=0):
+
+    """Read raw tables from the data directory and scale them up.
+
+    Parameters
+    ----------
+    names : list
+        The names of the raw tables e.g. 'commons_memberships_raw'. The
+        tables should be about the same set of people.
+    scale : int
+        The number of copies of each person.
+    seed : int, optional
+        The seed for the random date shifts. The default value is 0.
+
+    Returns
+    -------
+    out : dict
+        A dictionary of the scaled tables, keyed by name.
+
+    """
+
+    return scale_tables(
+        {name: validate.read(name) for name in names}, scale, seed)
+
+
+def scale_tables(tables, scale, seed=0):
+
+    """Scale up a dictionary of raw tables about the same people.
+
+    Each table has scale times as many rows as the original. The first copy
+    of each person is the original, so a scale of one returns copies of the
+    tables. The person ids and the ids that are unique to each row are
+    suffixed with the number of the copy, while the ids of shared entities
+    such as parties and constituencies are kept. The date shift for each
+    copy of a person is the same in every table.
+
+    """
+
+    people = pd.Index(pd.unique(np.concatenate(
+        [df['person_id'].values for df in tables.values()])))
+
+    rng = np.random.default_rng(seed)
+    shifts = rng.integers(
+        -MAX_SHIFT_DAYS, MAX_SHIFT_DAYS + 1, size=(len(people), scale))
+    shifts[:, 0] = 0
+
+    return {
+        name: scale_table(df, scale, shifts, people.get_indexer(
+            df['person_id']))
+        for name, df in tables.items()}
+
+
+def scale_table(df, scale, shifts, person_codes):
+
+    """Scale up a single raw table with the date shifts for each person."""
+
+    n = df.shape[0]
+    copies = np.repeat(np.arange(scale), n)
+    rows = np.tile(np.arange(n), scale)
+
+    scaled = df.iloc[rows].reset_index(drop=True)
+    row_shifts = shifts[np.tile(person_codes, scale), copies]
+
+    for col in df.columns:
+
+        if col in PERSON_COLS or (
+                col.endswith('_id') and df[col].is_unique):
+            scaled[col] = suffix_ids(df[col], scale)
+
+        elif col.endswith('_date'):
+            scaled[col] = shift_dates(scaled[col], row_shifts)
+
+    return scaled
+
+
+def suffix_ids(ids, scale):
+
+    """Repeat a column of ids with the number of each copy as a suffix."""
+
+    return np.concatenate([ids.values] + [
+        (ids + '-{0}'.format(copy)).values for copy in range(1, scale)])
+
+
+def shift_dates(dates, days):
+
+    """Move a column of dates by a number of days for each row.
+
+    datetime64 columns are returned as datetime64 columns. Columns of
+    datetime.dates are returned as datetime.dates, with NaN for missing
+    dates, and each distinct date is converted once.
+
+    """
+
+    shifted = utils.convert_date_days(dates) + days.astype('timedelta64[D]')
+
+    if dates.dtype.kind == 'M':
+        return shifted.astype(dates.dtype)
+
+    codes, uniques = pd.factorize(shifted)
+    uniques = np.asarray(uniques).astype('datetime64[D]').astype(object)
+    return np.append(uniques, np.NaN)[codes]
@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+"""Test cache functions."""
+
+# Imports ---------------------------------------------------------------------
+
+import datetime
+import json
+import numpy as np
+import os
+import pandas as pd
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+import pdpy.cache as cache
+import pdpy.constants as constants
+import pdpy.core as core
+import pdpy.settings as settings
+
+# Setup -----------------------------------------------------------------------
+
+url = 'http://localhost:7200/sparql'
+
+query = """
+    PREFIX : <https://id.parliament.uk/schema/>
+    SELECT * WHERE { ?p ?s "a  b" . } LIMIT 1
+"""
+
+results = {
+    'head': {'vars': ['person', 'dob']},
+    'results': {'bindings': [
+        {
+            'person': {
+                'type': 'uri',
+                'value': 'https://id.parliament.uk/URDlhhkg'},
+            'dob': {
+                'type': 'literal',
+                'datatype': 'http://www.w3.org/2001/XMLSchema#date',
+                'value': '1930-07-27+01:00'}
+        },
+        {
+            'person': {
+                'type': 'uri',
+                'value': 'https://id.parliament.uk/Bex7r8Mq'}
+        }
+    ]}
+}
+
+
+def get_frame():
+    return pd.DataFrame({
+        'person': ['a', 'b', np.NaN],
+        'dob': [datetime.date(1930, 7, 27), np.NaN, np.NaN]})
+
+
+def list_entries(cache_dir):
+    return sorted(
+        name for name in os.listdir(cache_dir)
+        if name.endswith(constants.CACHE_FILE_EXTENSION))
+
+# Tests -----------------------------------------------------------------------
+
+class CacheTestCase(unittest.TestCase):
+
+    """Base class for tests that use a temporary cache directory."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp_dir.name, 'cache')
+        settings.set_cache_dir(self.cache_dir)
+
+    def tearDown(self):
+        cache.clear_cache()
+        settings.reset_cache_dir()
+        settings.reset_cache_ttl()
+        settings.reset_cache_max_size()
+        settings.reset_memory_cache_size()
+        settings.reset_memory_cache_ttl()
+        self.tmp_dir.cleanup()
+
+
+class TestGetCacheKey(unittest.TestCase):
+
+    """Test that get_cache_key identifies equivalent queries."""
+
+    def test_normalize_query_collapses_whitespace(self):
+
+        self.assertEqual(
+            cache.normalize_query(
+                '  SELECT  *\n\tWHERE { ?s <http://a.b/c> "x  y" . }  '),
+            'SELECT * WHERE { ?s <http://a.b/c> "x  y" . }')
+
+    def test_get_cache_key_ignores_layout(self):
+
+        self.assertEqual(
+            cache.get_cache_key(url, query, 'json'),
+            cache.get_cache_key(url, query.replace('\n', '\n\n  '), 'json'))
+
+    def test_get_cache_key_distinguishes_requests(self):
+
+        key = cache.get_cache_key(url, query, 'json')
+        self.assertNotEqual(
+            key, cache.get_cache_key(url + '/other', query, 'json'))
+        self.assertNotEqual(
+            key,
+            cache.get_cache_key(url, query.replace('a  b', 'a b'), 'json'))
+        self.assertNotEqual(
+            key, cache.get_cache_key(url, query, 'csv'))
+        self.assertNotEqual(
+            cache.get_cache_key(url, query, 'csv'),
+            cache.get_cache_key(url, query, 'csv', ['dob']))
+
+
+@unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+class TestReadWriteCache(CacheTestCase):
+
+    """Test that entries are written to and read from the cache."""
+
+    def test_read_cache_returns_written_frame(self):
+
+        frame = get_frame()
+        cache.write_cache('key', frame)
+        cache.flush_cache()
+        pd.testing.assert_frame_equal(cache.read_cache('key'), frame)
+        self.assertIsNone(cache.read_cache('other'))
+
+    def test_read_cache_returns_written_datetime64_frame(self):
+
+        frame = get_frame()
+        frame['dob'] = pd.to_datetime(frame['dob'])
+        frame['empty'] = pd.Series([np.NaN] * 3, dtype=object)
+        cache.write_cache('key', frame)
+        cache.flush_cache()
+        pd.testing.assert_frame_equal(cache.read_cache('key'), frame)
+
+    def test_read_cache_returns_none_without_cache_dir(self):
+
+        cache.write_cache('key', get_frame())
+        cache.flush_cache()
+        settings.reset_cache_dir()
+        self.assertIsNone(cache.read_cache('key'))
+
+    def test_write_cache_copies_frame(self):
+
+        frame = get_frame()
+        cache.write_cache('key', frame)
+        frame.loc[0, 'person'] = 'changed'
+        cache.flush_cache()
+        self.assertEqual(cache.read_cache('key')['person'][0], 'a')
+
+    def test_read_cache_removes_expired_entries(self):
+
+        cache.write_cache('key', get_frame(), ttl=0.01)
+        cache.write_cache('other', get_frame(), ttl=60)
+        cache.flush_cache()
+        time.sleep(0.02)
+        self.assertIsNone(cache.read_cache('key'))
+        self.assertIsNotNone(cache.read_cache('other'))
+        self.assertEqual(
+            list_entries(self.cache_dir),
+            ['other{0}'.format(constants.CACHE_FILE_EXTENSION)])
+
+    def test_read_cache_removes_corrupt_entries(self):
+
+        cache.write_cache('key', get_frame())
+        cache.flush_cache()
+        path = cache.get_cache_path(self.cache_dir, 'key')
+        with open(path, 'wb') as f:
+            f.write(b'corrupt')
+        self.assertIsNone(cache.read_cache('key'))
+        self.assertFalse(os.path.exists(path))
+
+    def test_write_cache_evicts_least_recently_used_entries(self):
+
+        frame = get_frame()
+        cache.write_cache('a', frame)
+        cache.flush_cache()
+        entry_size = os.path.getsize(
+            cache.get_cache_path(self.cache_dir, 'a'))
+        settings.set_cache_max_size(entry_size * 2)
+
+        # Make the entries a and b older than any new entry, then read a
+        past = time.time() - 60
+        cache.write_cache('b', frame)
+        cache.flush_cache()
+        for key in ['a', 'b']:
+            os.utime(cache.get_cache_path(self.cache_dir, key), (past, past))
+        cache.read_cache('a')
+
+        cache.write_cache('c', frame)
+        cache.flush_cache()
+        self.assertEqual(
+            list_entries(self.cache_dir),
+            ['a{0}'.format(constants.CACHE_FILE_EXTENSION),
+             'c{0}'.format(constants.CACHE_FILE_EXTENSION)])
+
+    def test_clear_cache_removes_entries(self):
+
+        cache.write_cache('a', get_frame())
+        cache.write_cache('b', get_frame())
+        cache.clear_cache()
+        self.assertEqual(list_entries(self.cache_dir), [])
+
+
+class TestMemoryCache(CacheTestCase):
+
+    """Test that entries are kept in and read from the memory cache."""
+
+    def test_read_memory_cache_returns_copy(self):
+
+        frame = get_frame()
+        cache.write_memory_cache('key', frame)
+        frame.loc[0, 'person'] = 'changed'
+
+        obs = cache.read_memory_cache('key')
+        pd.testing.assert_frame_equal(obs, get_frame())
+        obs.loc[1, 'person'] = 'changed'
+        obs['dob'] = np.NaN
+        pd.testing.assert_frame_equal(
+            cache.read_memory_cache('key'), get_frame())
+        self.assertIsNone(cache.read_memory_cache('other'))
+
+    def test_read_memory_cache_with_copy_on_write(self):
+
+        with pd.option_context('mode.copy_on_write', True):
+            cache.write_memory_cache('key', get_frame())
+            obs = cache.read_memory_cache('key')
+            obs.loc[0, 'person'] = 'changed'
+            obs.sort_values('person', inplace=True)
+            pd.testing.assert_frame_equal(
+                cache.read_memory_cache('key'), get_frame())
+
+    def test_memory_cache_evicts_least_recently_used_entries(self):
+
+        settings.set_memory_cache_size(2)
+        cache.write_memory_cache('a', get_frame())
+        cache.write_memory_cache('b', get_frame())
+        cache.read_memory_cache('a')
+        cache.write_memory_cache('c', get_frame())
+        self.assertEqual(list(cache.memory_cache), ['a', 'c'])
+
+    def test_memory_cache_entries_expire(self):
+
+        settings.set_memory_cache_ttl(0.01)
+        cache.write_memory_cache('key', get_frame())
+        time.sleep(0.02)
+        self.assertIsNone(cache.read_memory_cache('key'))
+        self.assertEqual(len(cache.memory_cache), 0)
+
+    def test_memory_cache_size_zero_turns_memory_cache_off(self):
+
+        settings.set_memory_cache_size(0)
+        cache.write_memory_cache('key', get_frame())
+        self.assertIsNone(cache.read_memory_cache('key'))
+
+
+@unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+class TestSparqlSelectCache(CacheTestCase):
+
+    """Test that sparql_select answers repeated queries from the cache."""
+
+    def setUp(self):
+        super().setUp()
+        settings.set_api_url(url)
+        response = MagicMock()
+        response.ok = True
+        response.content = json.dumps(results).encode('utf-8')
+        self.session = MagicMock()
+        self.session.post.return_value = response
+
+    def tearDown(self):
+        settings.reset_api_url()
+        super().tearDown()
+
+    def test_sparql_select_uses_cache(self):
+
+        with patch('pdpy.core.get_session', return_value=self.session):
+            first = core.sparql_select(query)
+            cache.flush_cache()
+            second = core.sparql_select(query.strip())
+
+        self.assertEqual(self.session.post.call_count, 1)
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_sparql_select_uses_memory_cache(self):
+
+        settings.reset_cache_dir()
+
+        with patch('pdpy.core.get_session', return_value=self.session):
+            first = core.sparql_select(query)
+            first.loc[0, 'person'] = 'changed'
+            second = core.sparql_select(query)
+            third = core.sparql_select(query)
+
+        self.assertEqual(self.session.post.call_count, 1)
+        self.assertFalse(os.path.exists(self.cache_dir))
+        self.assertEqual(
+            second['person'][0], 'https://id.parliament.uk/URDlhhkg')
+        second.loc[0, 'person'] = 'changed'
+        self.assertEqual(
+            third['person'][0], 'https://id.parliament.uk/URDlhhkg')
+
+    def test_sparql_select_reads_disk_cache_into_memory(self):
+
+        with patch('pdpy.core.get_session', return_value=self.session):
+            core.sparql_select(query)
+            cache.flush_cache()
+            cache.clear_memory_cache()
+            core.sparql_select(query)
+            settings.reset_cache_dir()
+            core.sparql_select(query)
+
+        self.assertEqual(self.session.post.call_count, 1)
+
+    def test_sparql_select_without_cache(self):
+
+        settings.reset_cache_dir()
+        settings.set_memory_cache_size(0)
+
+        with patch('pdpy.core.get_session', return_value=self.session):
+            core.sparql_select(query)
+            core.sparql_select(query)
+
+        self.assertEqual(self.session.post.call_count, 2)
+        self.assertFalse(os.path.exists(self.cache_dir))
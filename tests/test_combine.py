@@ -10,8 +10,11 @@ import pandas as pd
 import unittest
 
 import pdpy.combine as combine
+import pdpy.constants as constants
 import pdpy.errors as errors
+import pdpy.settings as settings
 import pdpy.utils as utils
+import tests.validate as validate
 
 
 # Test data -------------------------------------------------------------------
@@ -53,6 +56,96 @@ pm = pm[[
     'party_membership_start_date',
     'party_membership_end_date']]
 
+# Reference implementation ----------------------------------------------------
+
+def combine_party_memberships_groupby(pm):
+
+    """Combine party memberships by mapping ids and grouping on them."""
+
+    pm = pm.copy()
+
+    def get_map_party_changes():
+        previous_per_par_id = ""
+        group_id = 0
+        def map_party_changes(per_par_id):
+            nonlocal previous_per_par_id
+            nonlocal group_id
+            if per_par_id != previous_per_par_id:
+                previous_per_par_id = per_par_id
+                group_id = group_id + 1
+            return "{0}-{1}".format(per_par_id, group_id)
+        return map_party_changes
+
+    pm.sort_values(
+        by=['person_id', 'party_membership_start_date'], inplace=True)
+    pm['per_par_id'] = pm.apply(
+        lambda x: '{0}-{1}'.format(x['person_id'], x['party_id']), axis=1)
+    pm['per_par_mem_id'] = pm['per_par_id'].map(get_map_party_changes())
+
+    pms = pm.groupby(['person_id', 'party_id', 'per_par_mem_id']).agg({
+        'party_membership_start_date': utils.min_date_nan,
+        'party_membership_end_date': utils.max_date_nan})
+    pms.reset_index(inplace=True)
+
+    pm = pms.merge(
+        pm[[
+            'person_id',
+            'party_id',
+            'mnis_id',
+            'given_name',
+            'family_name',
+            'display_name',
+            'party_mnis_id',
+            'party_name']],
+        how='left',
+        on=['person_id', 'party_id'])
+    pm.drop_duplicates(inplace=True)
+
+    pm = pm[[
+        'person_id',
+        'mnis_id',
+        'given_name',
+        'family_name',
+        'display_name',
+        'party_id',
+        'party_mnis_id',
+        'party_name',
+        'party_membership_start_date',
+        'party_membership_end_date']]
+    pm.sort_values(
+        by=['family_name', 'party_membership_start_date'], inplace=True)
+    pm.reset_index(drop=True, inplace=True)
+    return pm
+
+
+def coalesce_intervals_loop(df, key_cols, start_col, end_col, gap_days=0):
+
+    """Combine periods by walking through the sorted periods for each key."""
+
+    earliest = datetime.date.min
+    latest = datetime.date.max
+    gap = datetime.timedelta(days=gap_days + 1)
+    rows = []
+
+    for keys, group in df.groupby(key_cols, sort=True, dropna=False):
+        keys = keys if isinstance(keys, tuple) else (keys,)
+        periods = sorted(
+            (earliest if pd.isna(s) else s, latest if pd.isna(e) else e)
+            for s, e in zip(group[start_col], group[end_col]))
+        start, end = periods[0]
+        for next_start, next_end in periods[1:]:
+            if end != latest and next_start > end + gap:
+                rows.append(keys + (start, end))
+                start, end = next_start, next_end
+            else:
+                end = max(end, next_end)
+        rows.append(keys + (start, end))
+
+    out = pd.DataFrame(rows, columns=key_cols + [start_col, end_col])
+    out[start_col] = out[start_col].replace({earliest: np.NaN})
+    out[end_col] = out[end_col].replace({latest: np.NaN})
+    return out
+
 # Test combine_party_memberships ----------------------------------------------
 
 class CombinePartyMemberships(unittest.TestCase):
@@ -101,3 +194,207 @@ class CombinePartyMemberships(unittest.TestCase):
             datetime.date(2002, 12, 31)]).all(), True)
 
         self.assertTrue(pd.isna(cpm['party_membership_end_date'].iloc[4]))
+
+    def test_combine_party_memberships_matches_reference_implementation(self):
+
+        for name in [
+                'mps_party_memberships_raw',
+                'lords_party_memberships_raw']:
+
+            raw = validate.read(name)
+            open_ended = raw.head(50).copy()
+            open_ended['party_membership_end_date'] = np.NaN
+            missing = raw.copy()
+            missing.loc[::7, 'party_id'] = np.NaN
+            missing.loc[::5, 'party_membership_start_date'] = np.NaN
+
+            for pm_test in [raw, open_ended, missing, raw.head(0)]:
+                with self.subTest(name=name, rows=pm_test.shape[0]):
+                    pd.testing.assert_frame_equal(
+                        combine.combine_party_memberships(pm_test),
+                        combine_party_memberships_groupby(pm_test))
+
+    def test_combine_party_memberships_combines_datetime64_dates(self):
+
+        raw = validate.read('mps_party_memberships_raw')
+
+        pd.testing.assert_frame_equal(
+            combine.combine_party_memberships(
+                validate.to_datetime64(raw.copy())),
+            validate.to_datetime64(combine.combine_party_memberships(raw)))
+
+    def test_combine_party_memberships_combines_categorical_parties(self):
+
+        raw = validate.read('mps_party_memberships_raw')
+
+        pd.testing.assert_frame_equal(
+            combine.combine_party_memberships(
+                utils.convert_categorical_columns(raw.copy())),
+            utils.convert_categorical_columns(
+                combine.combine_party_memberships(raw)),
+            check_categorical=False)
+
+# Test coalesce_intervals -----------------------------------------------------
+
+class CoalesceIntervals(unittest.TestCase):
+
+    """
+    Test that coalesce_intervals returns a DataFrame with the expected
+    properties.
+
+    """
+
+    def test_that_coalesce_intervals_raises_errors(self):
+
+        with self.assertRaises(errors.MissingColumnError):
+            combine.coalesce_intervals(
+                pm,
+                key_cols=['person_id', 'no_such_column'],
+                start_col='party_membership_start_date',
+                end_col='party_membership_end_date')
+
+        with self.assertRaises(errors.MissingColumnError):
+            combine.coalesce_intervals(
+                pm,
+                key_cols='person_id',
+                start_col='no_such_column',
+                end_col='party_membership_end_date')
+
+        with self.assertRaises(ValueError):
+            combine.coalesce_intervals(
+                pm,
+                key_cols='person_id',
+                start_col='party_membership_start_date',
+                end_col='party_membership_end_date',
+                gap_days=-1)
+
+    def test_coalesce_intervals_combines_consecutive_periods(self):
+
+        cpm = combine.coalesce_intervals(
+            pm,
+            key_cols=['person_id', 'party_id'],
+            start_col='party_membership_start_date',
+            end_col='party_membership_end_date')
+
+        self.assertEqual(list(cpm.columns), [
+            'person_id',
+            'party_id',
+            'party_membership_start_date',
+            'party_membership_end_date'])
+
+        self.assertEqual(list(cpm['person_id']), [
+            'p1', 'p1', 'p1', 'p2', 'p2'])
+        self.assertEqual(list(cpm['party_id']), [
+            'pa1', 'pa1', 'pa2', 'pa1', 'pa2'])
+
+        self.assertEqual(list(cpm['party_membership_start_date']), [
+            datetime.date(2001, 1, 1),
+            datetime.date(2003, 1, 1),
+            datetime.date(2002, 1, 1),
+            datetime.date(2001, 1, 1),
+            datetime.date(2003, 1, 1)])
+
+        self.assertEqual(list(cpm['party_membership_end_date'][:4]), [
+            datetime.date(2001, 12, 31),
+            datetime.date(2004, 12, 31),
+            datetime.date(2002, 12, 31),
+            datetime.date(2002, 12, 31)])
+
+        self.assertTrue(pd.isna(cpm['party_membership_end_date'].iloc[4]))
+
+    def test_coalesce_intervals_combines_periods_within_gap(self):
+
+        cpm = combine.coalesce_intervals(
+            pm,
+            key_cols='person_id',
+            start_col='party_membership_start_date',
+            end_col='party_membership_end_date',
+            gap_days=366)
+
+        self.assertEqual(list(cpm['person_id']), ['p1', 'p2'])
+        self.assertEqual(list(cpm['party_membership_start_date']), [
+            datetime.date(2001, 1, 1),
+            datetime.date(2001, 1, 1)])
+        self.assertEqual(
+            cpm['party_membership_end_date'].iloc[0],
+            datetime.date(2004, 12, 31))
+        self.assertTrue(pd.isna(cpm['party_membership_end_date'].iloc[1]))
+
+    def test_coalesce_intervals_matches_reference_implementation(self):
+
+        for name, key_cols, prefix in [
+                ('commons_memberships_raw',
+                 ['person_id'],
+                 'seat_incumbency'),
+                ('mps_government_roles_raw',
+                 ['person_id', 'position_id'],
+                 'government_incumbency'),
+                ('mps_committee_memberships_raw',
+                 ['person_id', 'committee_id'],
+                 'committee_membership')]:
+
+            df = validate.read(name)
+            df.loc[::11, '{0}_start_date'.format(prefix)] = np.NaN
+            cols = {
+                'key_cols': key_cols,
+                'start_col': '{0}_start_date'.format(prefix),
+                'end_col': '{0}_end_date'.format(prefix)}
+
+            for gap_days in [0, 60]:
+                with self.subTest(name=name, gap_days=gap_days):
+                    pd.testing.assert_frame_equal(
+                        combine.coalesce_intervals(
+                            df, gap_days=gap_days, **cols),
+                        coalesce_intervals_loop(
+                            df, gap_days=gap_days, **cols))
+
+    def test_coalesce_intervals_combines_datetime64_dates(self):
+
+        df = validate.read('commons_memberships_raw')
+        cols = {
+            'key_cols': ['person_id'],
+            'start_col': 'seat_incumbency_start_date',
+            'end_col': 'seat_incumbency_end_date',
+            'gap_days': 60}
+
+        pd.testing.assert_frame_equal(
+            combine.coalesce_intervals(
+                validate.to_datetime64(df.copy()), **cols),
+            validate.to_datetime64(combine.coalesce_intervals(df, **cols)))
+
+    def test_coalesce_intervals_combines_categorical_keys(self):
+
+        df = validate.read('mps_government_roles_raw')
+        df.loc[::13, 'position_id'] = np.NaN
+        cols = {
+            'key_cols': ['person_id', 'position_id'],
+            'start_col': 'government_incumbency_start_date',
+            'end_col': 'government_incumbency_end_date'}
+
+        pd.testing.assert_frame_equal(
+            combine.coalesce_intervals(
+                utils.convert_categorical_columns(df.copy()), **cols),
+            utils.convert_categorical_columns(
+                combine.coalesce_intervals(df, **cols)),
+            check_categorical=False)
+
+    def test_coalesce_intervals_fires_combine_done(self):
+
+        df = validate.read('commons_memberships_raw')
+        events = []
+        settings.add_hook(constants.HOOK_EVENT_COMBINE, events.append)
+
+        try:
+            obs = combine.coalesce_intervals(
+                df,
+                key_cols=['person_id'],
+                start_col='seat_incumbency_start_date',
+                end_col='seat_incumbency_end_date')
+        finally:
+            settings.reset_hooks()
+
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]['event'], constants.HOOK_EVENT_COMBINE)
+        self.assertEqual(events[0]['stage'], 'coalesce_intervals')
+        self.assertEqual(events[0]['rows'], obs.shape[0])
+        self.assertGreaterEqual(events[0]['elapsed'], 0)
@@ -4,16 +4,30 @@
 # Imports ---------------------------------------------------------------------
 
 import datetime
+import gc
+import http.server
+import json
 import numpy as np
+import re
 import pandas as pd
 import requests
+import threading
 import time
 import unittest
 import warnings
+from unittest.mock import MagicMock
+from unittest.mock import patch
 
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+import pdpy.cache as cache
 import pdpy.constants as constants
 import pdpy.core as core
 import pdpy.errors as errors
+import pdpy.settings as settings
 import pdpy.utils as utils
 
 # Setup -----------------------------------------------------------------------
@@ -78,12 +92,958 @@ query_broken = """
     }
 """
 
+results_person = {
+    'head': {'vars': ['person', 'given_name', 'dob', 'dod']},
+    'results': {'bindings': [
+        {
+            'person': {'type': 'uri',
+                'value': 'https://id.parliament.uk/URDlhhkg'},
+            'given_name': {'type': 'literal', 'value': ' Shirley '},
+            'dob': {'type': 'literal', 'datatype': constants.XML_DATE,
+                'value': '1930-07-27+01:00'}
+        },
+        {
+            'person': {'type': 'uri',
+                'value': 'https://id.parliament.uk/abcdefgh'},
+            'dob': {'type': 'literal', 'datatype': constants.XML_DATE,
+                'value': '1930-07-27+01:00'}
+        }
+    ]}
+}
+
 query_broken_error = "{}{}".format(
     'MALFORMED QUERY: org.eclipse.rdf4j.query.parser.sparql.ast.',
     'VisitorException: QName \'d:URDlhhkg\' uses an undefined prefix')
 
 # Tests -----------------------------------------------------------------------
 
+class TestSessions(unittest.TestCase):
+
+    """Test that pooled sessions are created, reused and closed."""
+
+    def tearDown(self):
+        core.close_sessions()
+        settings.reset_pool_size()
+        settings.reset_keep_alive()
+        settings.reset_timeout()
+
+    def test_get_session_reuses_session_for_endpoint(self):
+
+        url_a = 'http://localhost:7200/a'
+        url_b = 'http://localhost:7200/b'
+        session_a = core.get_session(url_a)
+        self.assertIs(core.get_session(url_a), session_a)
+        self.assertIsNot(core.get_session(url_b), session_a)
+
+    def test_get_session_applies_pool_settings(self):
+
+        url = 'http://localhost:7200/a'
+        settings.set_pool_size(3)
+        settings.set_keep_alive(False)
+        session = core.get_session(url)
+        adapter = session.get_adapter(url)
+        self.assertEqual(adapter._pool_maxsize, 3)
+        self.assertEqual(session.headers['connection'], 'close')
+
+        settings.set_pool_size(5)
+        new_session = core.get_session(url)
+        self.assertIsNot(new_session, session)
+        self.assertEqual(new_session.get_adapter(url)._pool_maxsize, 5)
+
+    def test_close_sessions_resets_sessions(self):
+
+        url = 'http://localhost:7200/a'
+        session = core.get_session(url)
+        core.close_sessions()
+        self.assertEqual(len(core.sessions), 0)
+        self.assertIsNot(core.get_session(url), session)
+
+    def test_request_sets_accept_header_for_result_format(self):
+
+        session = MagicMock()
+
+        with patch('pdpy.core.get_session', return_value=session):
+            core.request(query_basic, result_format='tsv')
+
+        args, kwargs = session.post.call_args
+        self.assertEqual(
+            kwargs['headers']['accept'], 'text/tab-separated-values')
+
+        with self.assertRaises(ValueError):
+            core.request(query_basic, result_format='xml')
+
+    def test_request_uses_pooled_session(self):
+
+        url = 'http://localhost:7200/a'
+        settings.set_api_url(url)
+        settings.set_timeout(30)
+        session = MagicMock()
+
+        try:
+            with patch('pdpy.core.get_session', return_value=session):
+                core.request(query_basic)
+        finally:
+            settings.reset_api_url()
+
+        session.post.assert_called_once()
+        args, kwargs = session.post.call_args
+        self.assertEqual(args[0], url)
+        self.assertEqual(kwargs['data'], query_basic)
+        self.assertEqual(kwargs['timeout'], 30)
+
+
+class SparqlHandler(http.server.BaseHTTPRequestHandler):
+
+    """Serve a fixed SPARQL JSON result for any posted query."""
+
+    busy_requests = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['content-length']))
+        if self.path == '/broken':
+            status = 400
+            body = query_broken_error.encode('utf-8')
+        elif self.path == '/busy' and SparqlHandler.busy_requests < 2:
+            SparqlHandler.busy_requests += 1
+            status = 503
+            body = b'Service unavailable'
+        else:
+            status = 200
+            body = json.dumps(results_person).encode('utf-8')
+        self.send_response(status)
+        if status == 503:
+            self.send_header('retry-after', '0')
+        self.send_header('content-length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestSparqlSelectAsync(unittest.IsolatedAsyncioTestCase):
+
+    """Test that sparql_select_async sends queries and decodes results."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.HTTPServer(('127.0.0.1', 0), SparqlHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.daemon = True
+        cls.thread.start()
+        cls.url = 'http://127.0.0.1:{0}'.format(cls.server.server_port)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    async def asyncTearDown(self):
+        await core.close_async_sessions()
+        settings.reset_api_url()
+        cache.clear_memory_cache()
+
+    async def test_sparql_select_async(self):
+
+        settings.set_api_url('{0}/sparql'.format(self.url))
+        obs = await core.sparql_select_async(query_person)
+        exp = core.decode_json_results(results_person)
+        pd.testing.assert_frame_equal(obs, exp)
+
+    async def test_sparql_select_async_reuses_session(self):
+
+        settings.set_api_url('{0}/sparql'.format(self.url))
+        await core.sparql_select_async(query_person)
+        session = core.get_async_session()
+        await core.sparql_select_async(query_person)
+        self.assertIs(core.get_async_session(), session)
+
+    async def test_get_async_session_closes_replaced_session(self):
+
+        session = core.get_async_session()
+        settings.set_pool_size(settings.get_pool_size() + 1)
+
+        try:
+            new_session = core.get_async_session()
+        finally:
+            settings.reset_pool_size()
+
+        self.assertIsNot(new_session, session)
+        self.assertEqual(len(core.async_session_closes), 1)
+
+        gc.collect()
+        await core.close_async_sessions()
+        self.assertTrue(session.closed)
+        self.assertTrue(new_session.closed)
+        self.assertEqual(len(core.async_session_closes), 0)
+
+    async def test_sparql_select_async_retries_busy_server(self):
+
+        settings.set_api_url('{0}/busy'.format(self.url))
+        core.reset_request_stats()
+        obs = await core.sparql_select_async(query_person)
+        exp = core.decode_json_results(results_person)
+        pd.testing.assert_frame_equal(obs, exp)
+
+        stats = core.get_request_stats()
+        self.assertEqual(stats['requests'], 1)
+        self.assertEqual(stats['attempts'], 3)
+        self.assertEqual(stats['retries'], 2)
+        self.assertEqual(stats['retry_wait_time'], 0)
+
+    async def test_sparql_select_async_raises_request_error(self):
+
+        settings.set_api_url('{0}/broken'.format(self.url))
+        with self.assertRaises(errors.RequestError) as cm:
+            await core.sparql_select_async(query_person)
+        self.assertEqual(cm.exception.response, query_broken_error)
+
+
+class TestRetries(unittest.TestCase):
+
+    """Test that requests are retried after temporary errors."""
+
+    def setUp(self):
+        self.delays = []
+        core.reset_request_stats()
+
+    def tearDown(self):
+        settings.reset_max_retries()
+        settings.reset_retry_backoff()
+        settings.reset_retry_status_codes()
+        core.reset_request_stats()
+
+    def get_response(self, status_code, headers=None):
+        response = MagicMock()
+        response.status_code = status_code
+        response.headers = {} if headers is None else headers
+        return response
+
+    def post_with_responses(self, *responses):
+        session = MagicMock()
+        session.post.side_effect = list(responses)
+        with patch('pdpy.core.get_session', return_value=session):
+            with patch('pdpy.core.time.sleep', self.delays.append):
+                return core.request(query_basic), session
+
+    def test_request_retries_temporary_errors(self):
+
+        response, session = self.post_with_responses(
+            self.get_response(503, {'retry-after': '2'}),
+            requests.ConnectionError('Connection reset by peer'),
+            self.get_response(502),
+            self.get_response(200))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(session.post.call_count, 4)
+        self.assertEqual(self.delays[0], 2)
+        self.assertLessEqual(self.delays[1], 1.0)
+        self.assertLessEqual(self.delays[2], 2.0)
+
+        stats = core.get_request_stats()
+        self.assertEqual(stats['requests'], 1)
+        self.assertEqual(stats['attempts'], 4)
+        self.assertEqual(stats['failed_attempts'], 3)
+        self.assertEqual(stats['retries'], 3)
+        self.assertAlmostEqual(stats['retry_wait_time'], sum(self.delays))
+
+    def test_request_does_not_retry_query_errors(self):
+
+        response, session = self.post_with_responses(
+            self.get_response(400))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(session.post.call_count, 1)
+        self.assertEqual(self.delays, [])
+
+    def test_request_retries_server_errors_only_when_set(self):
+
+        response, session = self.post_with_responses(
+            self.get_response(500),
+            self.get_response(200))
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(session.post.call_count, 1)
+
+        settings.set_retry_status_codes([500, 503])
+        response, session = self.post_with_responses(
+            self.get_response(500),
+            self.get_response(200))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(session.post.call_count, 2)
+
+    def test_request_returns_last_response_after_max_retries(self):
+
+        settings.set_max_retries(1)
+        response, session = self.post_with_responses(
+            self.get_response(503),
+            self.get_response(429),
+            self.get_response(200))
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(session.post.call_count, 2)
+
+    def test_request_raises_connection_error_after_max_retries(self):
+
+        settings.set_max_retries(0)
+
+        with self.assertRaises(requests.ConnectionError):
+            self.post_with_responses(requests.ConnectionError())
+
+        self.assertEqual(core.get_request_stats()['failed_attempts'], 1)
+
+    def test_get_retry_delay_uses_exponential_backoff(self):
+
+        settings.set_retry_backoff(1)
+
+        with patch('pdpy.core.random.uniform', lambda a, b: b):
+            self.assertEqual(core.get_retry_delay(0), 1)
+            self.assertEqual(core.get_retry_delay(3), 8)
+            self.assertEqual(
+                core.get_retry_delay(10), constants.RETRY_WAIT_MAX)
+
+            # Retry-After is only honoured for 429 and 503 responses
+            self.assertEqual(core.get_retry_delay(
+                0, self.get_response(500, {'retry-after': '5'})), 1)
+            self.assertEqual(core.get_retry_delay(
+                0, self.get_response(429, {'retry-after': '5'})), 5)
+
+    def test_parse_retry_after(self):
+
+        self.assertEqual(core.parse_retry_after('3'), 3)
+        self.assertIsNone(core.parse_retry_after(None))
+        self.assertIsNone(core.parse_retry_after('soon'))
+
+        retry_date = datetime.datetime.now(datetime.timezone.utc) + \
+            datetime.timedelta(seconds=30)
+        retry_after = core.parse_retry_after(
+            retry_date.strftime('%a, %d %b %Y %H:%M:%S GMT'))
+        self.assertTrue(25 < retry_after <= 30)
+        self.assertEqual(
+            core.parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0)
+
+
+class TestPagedQueries(unittest.TestCase):
+
+    """Test that queries are rewritten and sent in pages."""
+
+    query = """
+        PREFIX : <https://id.parliament.uk/schema/>
+        PREFIX d: <https://id.parliament.uk/>
+        SELECT DISTINCT ?person (STR(?name) AS ?label) ?dob
+        WHERE {
+            # Comment with a brace }
+            ?person :personGivenName ?name .
+            ?person <http://example.com/a#b> "#literal" .
+            OPTIONAL { ?person :personDateOfBirth ?dob . }
+        }
+    """
+
+    data = pd.DataFrame({
+        'person': ['p{0}'.format(i) for i in range(25)],
+        'label': ['n{0}'.format(i) for i in range(25)],
+        'dob': [datetime.date(1950, 1, 1 + i % 28) for i in range(25)]})
+
+    def setUp(self):
+        self.queries = []
+
+    def tearDown(self):
+        settings.reset_page_size()
+        settings.reset_paging_threshold()
+        settings.reset_date_dtype()
+        cache.clear_memory_cache()
+
+    def mock_send_select(self, query, stream=False, result_format=None,
+                         date_cols=None):
+
+        self.queries.append(query)
+
+        if 'COUNT(*)' in query:
+            return pd.DataFrame({'count': [str(len(self.data))]})
+
+        match = re.search(r'LIMIT (\d+)(?: OFFSET (\d+))?', query)
+        if match is None:
+            return self.data.copy()
+
+        limit = int(match.group(1))
+        offset = int(match.group(2) or 0)
+        return self.data.iloc[offset:offset + limit].reset_index(drop=True)
+
+    def test_split_query(self):
+
+        prologue, body = core.split_query(self.query)
+        self.assertEqual(prologue.split(), [
+            'PREFIX', ':', '<https://id.parliament.uk/schema/>',
+            'PREFIX', 'd:', '<https://id.parliament.uk/>'])
+        self.assertTrue(body.startswith('SELECT DISTINCT'))
+        self.assertNotIn('Comment', body)
+        self.assertIn('<http://example.com/a#b> "#literal"', body)
+
+    def test_get_projected_variables(self):
+
+        prologue, body = core.split_query(self.query)
+        self.assertEqual(
+            core.get_projected_variables(body), ['person', 'label', 'dob'])
+        self.assertIsNone(
+            core.get_projected_variables('SELECT * WHERE { ?s ?p ?o . }'))
+
+    def test_has_solution_modifiers(self):
+
+        prologue, body = core.split_query(self.query)
+        self.assertFalse(core.has_solution_modifiers(body))
+        self.assertTrue(core.has_solution_modifiers(body + ' LIMIT 10'))
+        self.assertTrue(core.has_solution_modifiers(
+            body + ' ORDER BY ?person'))
+
+    def test_iter_sparql_select_yields_pages(self):
+
+        with patch('pdpy.core.send_select', self.mock_send_select):
+            pages = list(core.iter_sparql_select(self.query, page_size=10))
+
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        pd.testing.assert_frame_equal(
+            pd.concat(pages, ignore_index=True), self.data)
+        self.assertIn(
+            'ORDER BY ?person ?label ?dob\nLIMIT 10', self.queries[0])
+        self.assertIn('LIMIT 10 OFFSET 20', self.queries[2])
+
+    def test_iter_sparql_select_stops_after_full_last_page(self):
+
+        with patch('pdpy.core.send_select', self.mock_send_select):
+            pages = list(core.iter_sparql_select(self.query, page_size=5))
+
+        self.assertEqual([len(page) for page in pages], [5] * 5)
+        self.assertEqual(len(self.queries), 6)
+
+    def test_iter_sparql_select_finds_variables_for_select_all(self):
+
+        query = 'SELECT * WHERE { ?person ?label ?dob . }'
+
+        with patch('pdpy.core.send_select', self.mock_send_select):
+            pages = list(core.iter_sparql_select(query, page_size=30))
+
+        self.assertIn('LIMIT 0', self.queries[0])
+        self.assertIn('ORDER BY ?person ?label ?dob', self.queries[1])
+        self.assertEqual(len(pages), 1)
+
+    def test_sparql_select_pages_above_threshold(self):
+
+        settings.set_page_size(10)
+
+        with patch('pdpy.core.send_select', self.mock_send_select):
+
+            settings.set_paging_threshold(30)
+            core.sparql_select(self.query)
+            self.assertEqual(len(self.queries), 2)
+            self.assertNotIn('LIMIT', self.queries[1])
+
+            cache.clear_memory_cache()
+            self.queries = []
+            settings.set_paging_threshold(20)
+            data = core.sparql_select(self.query)
+            self.assertEqual(len(self.queries), 4)
+            pd.testing.assert_frame_equal(data, self.data)
+
+    def test_sparql_select_converts_dates_in_pages(self):
+
+        settings.set_date_dtype('datetime64')
+        settings.set_page_size(10)
+        settings.set_paging_threshold(20)
+
+        with patch('pdpy.core.send_select', self.mock_send_select):
+            data = core.sparql_select(self.query)
+
+        self.assertEqual(data['dob'].dtype, np.dtype('<M8[ns]'))
+        self.assertEqual(data['dob'][24], pd.Timestamp('1950-01-25'))
+
+    def test_sparql_select_does_not_page_without_threshold(self):
+
+        with patch('pdpy.core.send_select', self.mock_send_select):
+            core.sparql_select(self.query)
+
+        self.assertEqual(len(self.queries), 1)
+
+
+class TestDateDtype(unittest.TestCase):
+
+    """Test that sparql_select returns dates in the date dtype setting."""
+
+    def setUp(self):
+        response = MagicMock()
+        response.ok = True
+        response.content = json.dumps(results_person).encode('utf-8')
+        self.request = MagicMock(return_value=response)
+
+    def tearDown(self):
+        settings.reset_date_dtype()
+        cache.clear_memory_cache()
+
+    def test_sparql_select_returns_datetime64_dates(self):
+
+        with patch('pdpy.core.request', self.request):
+            data = core.sparql_select(query_person)
+            settings.set_date_dtype('datetime64')
+            data_datetime64 = core.sparql_select(query_person)
+
+        self.assertEqual(self.request.call_count, 2)
+        self.assertEqual(data['dob'].dtype, np.dtype('O'))
+        self.assertEqual(data_datetime64['dob'].dtype, np.dtype('<M8[ns]'))
+        self.assertEqual(
+            data_datetime64['dob'][0], pd.Timestamp('1930-07-27'))
+        pd.testing.assert_series_equal(
+            data_datetime64['person'], data['person'])
+
+
+@unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+class TestArrowOutput(unittest.TestCase):
+
+    """Test that sparql_select returns a pyarrow Table when requested."""
+
+    def setUp(self):
+        response = MagicMock()
+        response.ok = True
+        response.content = json.dumps(results_person).encode('utf-8')
+        self.request = MagicMock(return_value=response)
+
+    def tearDown(self):
+        cache.clear_memory_cache()
+
+    def test_sparql_select_returns_arrow_table(self):
+
+        with patch('pdpy.core.request', self.request):
+            data = core.sparql_select(query_person)
+            table = core.sparql_select(query_person, arrow=True)
+
+        self.assertEqual(self.request.call_count, 1)
+        self.assertIsInstance(table, pyarrow.Table)
+        self.assertEqual(table.column_names, list(data.columns))
+        self.assertEqual(table.schema.field('dob').type, pyarrow.date32())
+        self.assertEqual(
+            table.column('dob').to_pylist(), data['dob'].tolist())
+        self.assertEqual(
+            table.column('person').to_pylist(), data['person'].tolist())
+
+
+class TestHooks(unittest.TestCase):
+
+    """Test that sparql_select fires hook events for each query."""
+
+    def setUp(self):
+        response = MagicMock()
+        response.ok = True
+        response.status_code = 200
+        response.content = json.dumps(results_person).encode('utf-8')
+        self.request = MagicMock(return_value=response)
+        self.events = []
+        for event in constants.HOOK_EVENTS:
+            settings.add_hook(event, self.events.append)
+
+    def tearDown(self):
+        settings.reset_hooks()
+        cache.clear_memory_cache()
+
+    def test_sparql_select_fires_request_events(self):
+
+        with patch('pdpy.core.request', self.request):
+            core.sparql_select(query_person)
+
+        self.assertEqual([e['event'] for e in self.events], [
+            constants.HOOK_EVENT_REQUEST_START,
+            constants.HOOK_EVENT_RESPONSE,
+            constants.HOOK_EVENT_DECODE,
+            constants.HOOK_EVENT_DATES,
+            constants.HOOK_EVENT_REQUEST_END])
+
+        start, response, decode, dates, end = self.events
+        fingerprint = utils.get_query_fingerprint(query_person)
+        content_length = len(self.request.return_value.content)
+
+        for e in [start, response, decode, end]:
+            self.assertEqual(e['fingerprint'], fingerprint)
+            self.assertEqual(e['endpoint'], settings.get_api_url())
+            self.assertIsNone(e['rows_in'])
+
+        self.assertEqual(start['stage'], 'sparql_select')
+        self.assertEqual(response['status'], 200)
+        self.assertEqual(response['bytes'], content_length)
+        self.assertEqual(decode['rows'], 2)
+        self.assertEqual(dates['stage'], 'convert_dates')
+        self.assertEqual(dates['rows_in'], 2)
+        self.assertEqual(end['rows'], 2)
+        self.assertEqual(end['status'], 200)
+        self.assertEqual(end['bytes'], content_length)
+        self.assertIsNone(end['error'])
+        self.assertEqual(end['start'], start['start'])
+        self.assertEqual(end['id'], start['id'])
+        self.assertIsNone(end['parent'])
+        for e in [response, decode, dates]:
+            self.assertEqual(e['parent'], end['id'])
+        self.assertLessEqual(start['start'], response['start'])
+        self.assertLessEqual(
+            response['elapsed'] + decode['elapsed'], end['elapsed'])
+
+    def test_sparql_select_fires_request_end_on_error(self):
+
+        response = self.request.return_value
+        response.ok = False
+        response.status_code = 400
+        response.text = query_broken_error
+
+        with patch('pdpy.core.request', self.request):
+            with self.assertRaises(errors.RequestError) as cm:
+                core.sparql_select(query_person)
+
+        self.assertEqual([e['event'] for e in self.events], [
+            constants.HOOK_EVENT_REQUEST_START,
+            constants.HOOK_EVENT_RESPONSE,
+            constants.HOOK_EVENT_REQUEST_END])
+
+        end = self.events[-1]
+        self.assertEqual(end['id'], self.events[0]['id'])
+        self.assertEqual(end['status'], 400)
+        self.assertEqual(end['bytes'], len(response.content))
+        self.assertIsNone(end['rows'])
+        self.assertIs(end['error'], cm.exception)
+
+    def test_cached_results_fire_only_request_events(self):
+
+        with patch('pdpy.core.request', self.request):
+            core.sparql_select(query_person)
+            del self.events[:]
+            core.sparql_select(query_person)
+
+        self.assertEqual(self.request.call_count, 1)
+        self.assertEqual([e['event'] for e in self.events], [
+            constants.HOOK_EVENT_REQUEST_START,
+            constants.HOOK_EVENT_REQUEST_END])
+
+    def test_fingerprint_ignores_query_layout(self):
+
+        self.assertEqual(
+            utils.get_query_fingerprint(query_basic),
+            utils.get_query_fingerprint(' '.join(query_basic.split())))
+        self.assertNotEqual(
+            utils.get_query_fingerprint(query_basic),
+            utils.get_query_fingerprint(query_person))
+
+
+class TestHooksAsync(unittest.IsolatedAsyncioTestCase):
+
+    """Test that sparql_select_async fires hook events for each query."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.HTTPServer(('127.0.0.1', 0), SparqlHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.daemon = True
+        cls.thread.start()
+        cls.url = 'http://127.0.0.1:{0}'.format(cls.server.server_port)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    async def asyncSetUp(self):
+        self.events = []
+        for event in constants.HOOK_EVENTS:
+            settings.add_hook(event, self.events.append)
+
+    async def asyncTearDown(self):
+        await core.close_async_sessions()
+        settings.reset_hooks()
+        settings.reset_api_url()
+        cache.clear_memory_cache()
+
+    async def test_sparql_select_async_fires_request_events(self):
+
+        settings.set_api_url('{0}/sparql'.format(self.url))
+        await core.sparql_select_async(query_person)
+
+        self.assertEqual([e['event'] for e in self.events], [
+            constants.HOOK_EVENT_REQUEST_START,
+            constants.HOOK_EVENT_RESPONSE,
+            constants.HOOK_EVENT_DECODE,
+            constants.HOOK_EVENT_DATES,
+            constants.HOOK_EVENT_REQUEST_END])
+
+        start, response, decode, dates, end = self.events
+        self.assertEqual(start['stage'], 'sparql_select_async')
+        self.assertEqual(response['status'], 200)
+        self.assertGreater(response['bytes'], 0)
+        self.assertEqual(decode['rows'], 2)
+        self.assertEqual(end['rows'], 2)
+        self.assertEqual(end['status'], 200)
+        self.assertEqual(end['bytes'], response['bytes'])
+        self.assertEqual(end['start'], start['start'])
+        for e in [response, decode, dates]:
+            self.assertEqual(e['parent'], end['id'])
+
+    async def test_sparql_select_async_fires_events_on_error(self):
+
+        settings.set_api_url('{0}/broken'.format(self.url))
+        with self.assertRaises(errors.RequestError) as cm:
+            await core.sparql_select_async(query_person)
+
+        self.assertEqual([e['event'] for e in self.events], [
+            constants.HOOK_EVENT_REQUEST_START,
+            constants.HOOK_EVENT_RESPONSE,
+            constants.HOOK_EVENT_REQUEST_END])
+        self.assertEqual(self.events[1]['status'], 400)
+        self.assertEqual(self.events[2]['status'], 400)
+        self.assertIs(self.events[2]['error'], cm.exception)
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    """Test that TokenBucket limits the rate at which tokens are taken."""
+
+    def test_token_bucket_limits_rate(self):
+
+        bucket = core.TokenBucket(rate=50)
+        start = time.monotonic()
+        for i in range(6):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_token_bucket_allows_bursts_up_to_capacity(self):
+
+        bucket = core.TokenBucket(rate=1, capacity=5)
+        start = time.monotonic()
+        for i in range(5):
+            bucket.acquire()
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_token_bucket_raises_value_error(self):
+
+        with self.assertRaises(ValueError):
+            core.TokenBucket(rate=0)
+
+        with self.assertRaises(ValueError):
+            core.TokenBucket(rate=1, capacity=0)
+
+
+class TestSparqlSelectMany(unittest.TestCase):
+
+    """Test that sparql_select_many runs a batch of queries."""
+
+    def mock_sparql_select(self, query, result_format=None, date_cols=None):
+        time.sleep(0.05 if query == 'a' else 0)
+        if query == 'broken':
+            raise errors.RequestError(query_broken_error)
+        return pd.DataFrame({'query': [query], 'date_cols': [date_cols]})
+
+    def test_sparql_select_many_returns_results_in_order(self):
+
+        queries = ['a', 'b', 'c', 'd']
+
+        with patch('pdpy.core.sparql_select', self.mock_sparql_select):
+            results = core.sparql_select_many(
+                queries, max_workers=4, rate=1000)
+
+        self.assertEqual(
+            [result['query'][0] for result in results], queries)
+
+    def test_sparql_select_many_passes_date_cols(self):
+
+        queries = ['a', 'b', 'c']
+        date_cols = [['start_date'], None, ['start_date', 'end_date']]
+
+        with patch('pdpy.core.sparql_select', self.mock_sparql_select):
+            results = core.sparql_select_many(
+                queries, rate=1000, date_cols=date_cols)
+
+        self.assertEqual(
+            [result['date_cols'][0] for result in results], date_cols)
+
+        with self.assertRaises(ValueError):
+            core.sparql_select_many(queries, date_cols=[None])
+
+    def test_sparql_select_many_reports_failures(self):
+
+        queries = ['a', 'broken', 'c', 'broken']
+
+        with patch('pdpy.core.sparql_select', self.mock_sparql_select):
+            with self.assertRaises(errors.BatchRequestError) as cm:
+                core.sparql_select_many(queries, max_workers=2, rate=1000)
+
+        batch_error = cm.exception
+        self.assertEqual(sorted(batch_error.failures), [1, 3])
+        self.assertIsInstance(
+            batch_error.failures[1], errors.RequestError)
+        self.assertIsNone(batch_error.results[1])
+        self.assertIsNone(batch_error.results[3])
+        self.assertEqual(batch_error.results[0]['query'][0], 'a')
+        self.assertEqual(batch_error.results[2]['query'][0], 'c')
+
+    def test_sparql_select_many_limits_rate_of_requests(self):
+
+        # Each query is refused once with a busy response and then retried
+        sent = set()
+        sent_lock = threading.Lock()
+
+        def post(url, data=None, **kwargs):
+            response = MagicMock()
+            with sent_lock:
+                response.status_code = 200 if data in sent else 503
+                sent.add(data)
+            response.headers = {'retry-after': '0'}
+            return response
+
+        def select(query, result_format=None, date_cols=None):
+            return core.request(query).status_code
+
+        session = MagicMock()
+        session.post.side_effect = post
+        queries = ['q{0}'.format(i) for i in range(6)]
+
+        with patch('pdpy.core.get_session', return_value=session):
+            with patch('pdpy.core.sparql_select', select):
+                start = time.monotonic()
+                results = core.sparql_select_many(
+                    queries, max_workers=6, rate=50)
+
+        self.assertEqual(results, [200] * 6)
+        self.assertEqual(session.post.call_count, 12)
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+
+
+class TestDecodeJsonResults(unittest.TestCase):
+
+    """Test that decode_json_results converts SPARQL JSON results."""
+
+    def test_decode_json_results(self):
+
+        data = core.decode_json_results(results_person)
+
+        self.assertEqual(list(data), ['person', 'given_name', 'dob', 'dod'])
+        self.assertEqual(data.shape, (2, 4))
+        self.assertEqual(data['person'].dtype, np.dtype('O'))
+        self.assertEqual(data['given_name'].dtype, np.dtype('O'))
+        self.assertEqual(data['dob'].dtype, np.dtype('O'))
+        self.assertEqual(data['given_name'][0], 'Shirley')
+        self.assertTrue(pd.isna(data['given_name'][1]))
+        self.assertEqual(data['dob'][0], datetime.date(1930, 7, 27))
+        self.assertEqual(data['dob'][1], datetime.date(1930, 7, 27))
+        self.assertTrue(data['dod'].isna().all())
+
+    def test_decode_json_results_without_rows(self):
+
+        results = {'head': {'vars': ['p', 's', 'o']},
+            'results': {'bindings': []}}
+        data = core.decode_json_results(results)
+
+        self.assertEqual(list(data), ['p', 's', 'o'])
+        self.assertEqual(data.shape, (0, 3))
+
+
+class TestDecodeJsonStream(unittest.TestCase):
+
+    """Test that decode_json_stream converts streamed SPARQL JSON results."""
+
+    def test_decode_json_stream_matches_decode_json_results(self):
+
+        text = json.dumps(results_person).encode('utf-8')
+        exp = core.decode_json_results(results_person)
+
+        for chunk_size in [1, 2, 7, len(text)]:
+            chunks = (text[i:i + chunk_size] \
+                for i in range(0, len(text), chunk_size))
+            obs = core.decode_json_stream(chunks)
+            pd.testing.assert_frame_equal(obs, exp)
+
+    def test_decode_json_stream_handles_multibyte_characters(self):
+
+        results = {'head': {'vars': ['name']},
+            'results': {'bindings': [
+                {'name': {'type': 'literal', 'value': 'Ynys Môn'}}]}}
+        text = json.dumps(results, ensure_ascii=False).encode('utf-8')
+        chunks = (text[i:i + 1] for i in range(len(text)))
+        data = core.decode_json_stream(chunks)
+
+        self.assertEqual(data['name'][0], 'Ynys Môn')
+
+    def test_decode_json_stream_handles_head_after_results(self):
+
+        text = '{{"results": {0}, "head": {1}}}'.format(
+            json.dumps(results_person['results']),
+            json.dumps(results_person['head']))
+        obs = core.decode_json_stream([text])
+        exp = core.decode_json_results(results_person)
+        pd.testing.assert_frame_equal(obs, exp)
+
+    def test_decode_json_stream_without_rows(self):
+
+        text = (
+            '{"head": {"vars": ["p", "s", "o"]}, '
+            '"results": {"bindings": []}}')
+        data = core.decode_json_stream([text])
+
+        self.assertEqual(list(data), ['p', 's', 'o'])
+        self.assertEqual(data.shape, (0, 3))
+
+    def test_decode_json_stream_raises_decode_error(self):
+
+        with self.assertRaises(json.JSONDecodeError):
+            core.decode_json_stream(['{"head": {"vars": ["p"]}, "results": {'])
+
+
+class TestDecodeCsvResults(unittest.TestCase):
+
+    """Test that decode_csv_results converts SPARQL CSV results."""
+
+    def test_decode_csv_results(self):
+
+        content = (
+            'person,given_name,dob,dod\r\n'
+            'https://id.parliament.uk/URDlhhkg, Shirley ,1930-07-27+01:00,\r\n'
+            'https://id.parliament.uk/abcdefgh,,1930-07-27+01:00,\r\n'
+        ).encode('utf-8')
+
+        obs = core.decode_csv_results(content, date_cols=['dob', 'dod'])
+        exp = core.decode_json_results(results_person)
+        pd.testing.assert_frame_equal(obs, exp)
+
+    def test_decode_csv_results_keeps_strings(self):
+
+        content = 'mnis_id,name\r\n0172,"Smith, John"\r\n'.encode('utf-8')
+        data = core.decode_csv_results(content)
+
+        self.assertEqual(data['mnis_id'][0], '0172')
+        self.assertEqual(data['name'][0], 'Smith, John')
+
+
+class TestDecodeTsvResults(unittest.TestCase):
+
+    """Test that decode_tsv_results converts SPARQL TSV results."""
+
+    def test_decode_tsv_results(self):
+
+        content = (
+            '?person\t?given_name\t?dob\t?dod\n'
+            '<https://id.parliament.uk/URDlhhkg>\t" Shirley "\t'
+            '"1930-07-27+01:00"^^<{0}>\t\n'
+            '<https://id.parliament.uk/abcdefgh>\t\t'
+            '"1930-07-27+01:00"^^<{0}>\t\n'
+        ).format(constants.XML_DATE).encode('utf-8')
+
+        obs = core.decode_tsv_results(content)
+        exp = core.decode_json_results(results_person)
+        pd.testing.assert_frame_equal(obs, exp)
+
+    def test_decode_tsv_results_unescapes_literals(self):
+
+        content = (
+            '?name\t?label\n'
+            '"Say \\"hello\\""\t"Tab\\there"@en\n'
+        ).encode('utf-8')
+        data = core.decode_tsv_results(content)
+
+        self.assertEqual(data['name'][0], 'Say "hello"')
+        self.assertEqual(data['label'][0], 'Tab\there')
+
+
 class TestRequestBasic(unittest.TestCase):
 
     """Test that request sends and receives the most basic SPARQL query."""
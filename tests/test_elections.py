@@ -9,6 +9,27 @@ import pandas as pd
 import unittest
 
 import pdpy.elections as elections
+import tests.validate as validate
+
+# Reference implementation ----------------------------------------------------
+
+def clip_to_dissolution_loop(dates):
+
+    """Clip dates to dissolution by comparing them with every election."""
+
+    dates = np.array(dates, dtype=object)
+    general_elections = elections.get_general_elections().values
+
+    for i in range(len(dates)):
+        date = dates[i]
+        if pd.isna(date): continue
+        for j in range(len(general_elections)):
+            dissolution = general_elections[j, 1]
+            election = general_elections[j, 2]
+            if date > dissolution and date <= election:
+                dates[i] = dissolution
+
+    return dates
 
 # Tests -----------------------------------------------------------------------
 
@@ -64,3 +85,165 @@ class TestGetGeneralElectionsDict(unittest.TestCase):
             self.assertIsInstance(e['dissolution'], datetime.date)
             self.assertIsInstance(e['election'], datetime.date)
             self.assertTrue(e['dissolution'] < e['election'])
+
+
+class TestClipToDissolution(unittest.TestCase):
+
+    """
+    Test that clip_to_dissolution clips dates during election periods to
+    the dissolution.
+
+    """
+
+    def test_clip_to_dissolution(self):
+
+        dates = [
+            datetime.date(2017, 5, 3),
+            datetime.date(2017, 5, 4),
+            datetime.date(2017, 6, 8),
+            datetime.date(2017, 6, 9),
+            np.NaN,
+            datetime.date(1929, 5, 1),
+            datetime.date(2019, 12, 1)]
+
+        obs = elections.clip_to_dissolution(dates)
+        exp = [
+            datetime.date(2017, 5, 3),
+            datetime.date(2017, 5, 3),
+            datetime.date(2017, 5, 3),
+            datetime.date(2017, 6, 9),
+            np.NaN,
+            datetime.date(1929, 5, 1),
+            datetime.date(2019, 11, 6)]
+
+        self.assertEqual(obs.dtype, np.dtype('O'))
+        self.assertEqual(obs[:4].tolist(), exp[:4])
+        self.assertTrue(pd.isna(obs[4]))
+        self.assertEqual(obs[5:].tolist(), exp[5:])
+
+    def test_clip_to_dissolution_clips_datetime64_dates(self):
+
+        dates = np.array([
+            '2017-05-03',
+            '2017-05-04',
+            '2017-06-08',
+            'NaT',
+            '2019-12-01'], dtype='datetime64[ns]')
+
+        obs = elections.clip_to_dissolution(dates)
+        exp = np.array([
+            '2017-05-03',
+            '2017-05-03',
+            '2017-05-03',
+            'NaT',
+            '2019-11-06'], dtype='datetime64[ns]')
+
+        self.assertEqual(obs.dtype, np.dtype('<M8[ns]'))
+        np.testing.assert_array_equal(obs, exp)
+        self.assertEqual(dates[1], np.datetime64('2017-05-04'))
+
+    def test_clip_to_dissolution_matches_loop(self):
+
+        end_dates = validate.read(
+            'commons_memberships_raw')['seat_incumbency_end_date']
+
+        obs = elections.clip_to_dissolution(end_dates)
+        exp = clip_to_dissolution_loop(end_dates)
+        pd.testing.assert_series_equal(pd.Series(obs), pd.Series(exp))
+
+    def test_clip_to_dissolution_without_dates(self):
+
+        obs = elections.clip_to_dissolution(np.array([np.NaN, np.NaN]))
+        self.assertEqual(obs.dtype, np.dtype('float64'))
+        self.assertTrue(pd.isna(obs).all())
+
+        obs = elections.clip_to_dissolution([])
+        self.assertEqual(len(obs), 0)
+
+
+class TestGetElectionsCalendar(unittest.TestCase):
+
+    """
+    Test that the elections calendar is built once and is read-only.
+
+    """
+
+    def test_get_elections_calendar(self):
+
+        calendar = elections.get_elections_calendar()
+        self.assertIs(elections.get_elections_calendar(), calendar)
+        self.assertEqual(calendar.dissolution_days.dtype,
+            np.dtype('datetime64[D]'))
+        self.assertEqual(calendar.election_days.dtype,
+            np.dtype('datetime64[D]'))
+        self.assertTrue(
+            (calendar.election_days[1:] > calendar.election_days[:-1]).all())
+
+        for array in calendar[:6]:
+            self.assertFalse(array.flags.writeable)
+
+    def test_get_general_elections_is_read_only(self):
+
+        ge = elections.get_general_elections()
+        self.assertIsNot(elections.get_general_elections(), ge)
+
+        with self.assertRaises(ValueError):
+            ge.loc[0, 'name'] = 'changed'
+
+        ge['name'] = 'changed'
+        self.assertEqual(elections.get_general_elections()['name'][0], '1929')
+
+    def test_get_general_elections_dict_is_read_only(self):
+
+        ge = elections.get_general_elections_dict()
+
+        with self.assertRaises(TypeError):
+            ge['2017'] = {}
+
+        with self.assertRaises(TypeError):
+            ge['2017']['election'] = datetime.date(2017, 6, 9)
+
+
+class TestGetParliamentPeriods(unittest.TestCase):
+
+    """
+    Test that get_parliament_periods finds the Parliament and dissolution
+    period for each date.
+
+    """
+
+    def test_get_parliament_periods(self):
+
+        dates = [
+            datetime.date(1929, 5, 30),
+            datetime.date(1929, 5, 31),
+            datetime.date(2017, 5, 3),
+            datetime.date(2017, 5, 4),
+            datetime.date(2017, 6, 8),
+            datetime.date(2017, 6, 9),
+            np.NaN,
+            datetime.date(2021, 1, 1)]
+
+        obs = elections.get_parliament_periods(dates)
+        self.assertEqual(list(obs), ['parliament', 'in_dissolution'])
+        self.assertTrue(pd.isna(obs['parliament'][0]))
+        self.assertEqual(
+            obs['parliament'][1:6].tolist(),
+            ['1929', '2015', '2015', '2015', '2017'])
+        self.assertTrue(pd.isna(obs['parliament'][6]))
+        self.assertEqual(obs['parliament'][7], '2019')
+        self.assertEqual(
+            obs['in_dissolution'].tolist(),
+            [True, False, False, True, True, False, False, False])
+
+    def test_get_parliament_periods_accepts_strings_and_datetimes(self):
+
+        dates = ['2017-05-04', '2017-06-09']
+        exp = elections.get_parliament_periods(
+            [datetime.date(2017, 5, 4), datetime.date(2017, 6, 9)])
+
+        pd.testing.assert_frame_equal(
+            elections.get_parliament_periods(dates), exp)
+        pd.testing.assert_frame_equal(
+            elections.get_parliament_periods(
+                np.array(dates, dtype='datetime64[ns]')), exp)
@@ -9,9 +9,12 @@ import numpy as np
 import pandas as pd
 import unittest
 
+import pdpy.constants as constants
 import pdpy.errors as errors
 import pdpy.filter as filter
+import pdpy.settings as settings
 import pdpy.utils as utils
+import tests.validate as validate
 
 
 # Test data -------------------------------------------------------------------
@@ -52,6 +55,64 @@ mem_b = pd.read_csv(
 mem_b['start_date'] = utils.convert_date_series(mem_b['start_date'])
 mem_b['end_date'] = utils.convert_date_series(mem_b['end_date'])
 
+# Reference implementation ----------------------------------------------------
+
+def filter_dates_map(df, start_col, end_col, from_date=np.NaN,
+                     to_date=np.NaN):
+
+    """Filter dates by comparing each date in the columns in turn."""
+
+    from_date = filter.handle_date(from_date)
+    to_date = filter.handle_date(to_date)
+    from_after_end = False
+    to_before_start = False
+
+    if not pd.isna(from_date):
+        from_after_end = df[end_col].map(
+            lambda d: False if pd.isna(d) else from_date > d)
+
+    if not pd.isna(to_date):
+        to_before_start = df[start_col].map(
+            lambda d: False if pd.isna(d) else to_date < d)
+
+    return df[~(from_after_end | to_before_start)]
+
+
+def filter_memberships_merge(tm, fm, tm_id_col, tm_start_col, tm_end_col,
+                             fm_start_col, fm_end_col, join_col):
+
+    """Filter memberships by testing every pair of memberships in turn."""
+
+    if tm.shape[0] == 0:
+        return tm
+
+    tma = tm[[join_col, tm_id_col, tm_start_col, tm_end_col]]
+    tma.columns = ['join_col', 'tm_id_col', 'tm_start_col', 'tm_end_col']
+    fma = fm[[join_col, fm_start_col, fm_end_col]]
+    fma.columns = ['join_col', 'fm_start_col', 'fm_end_col']
+    tm_fm = tma.merge(fma, how='left', on='join_col')
+
+    def in_fm_func(row):
+        tm_start_after_fm_end = False
+        tm_end_before_fm_start = False
+        if not pd.isna(row['tm_start_col']):
+            tm_start_after_fm_end = False if pd.isna(row['fm_end_col']) \
+                else row['tm_start_col'] > row['fm_end_col']
+        if not pd.isna(row['tm_end_col']):
+            tm_end_before_fm_start = False if pd.isna(row['fm_start_col']) \
+                else row['tm_end_col'] < row['fm_start_col']
+        return not (tm_start_after_fm_end or tm_end_before_fm_start)
+
+    tm_fm['in_membership'] = tm_fm.apply(in_fm_func, axis=1)
+    match_status = tm_fm.groupby('tm_id_col')[['in_membership']].any()
+    match_status.reset_index(inplace=True)
+    match_status.columns = [tm_id_col, 'in_membership']
+
+    tm_fm_status = tm.merge(match_status, how='left', on=tm_id_col)
+    tmf = tm_fm_status[tm_fm_status['in_membership']]
+    tmf.reset_index(drop=True, inplace=True)
+    return tmf.drop(columns=['in_membership'])
+
 # Test filter_dates -----------------------------------------------------------
 
 class TestFilterDates(unittest.TestCase):
@@ -232,6 +293,53 @@ class TestFilterDates(unittest.TestCase):
         self.assertEqual(f_mem_a.iloc[-1]['end_date'],
             datetime.date(2005, 12, 31))
 
+    def test_filter_dates_keeps_rows_with_missing_dates(self):
+
+        mem = mem_a.copy()
+        mem.loc[0, 'end_date'] = np.NaN
+        mem.loc[7, 'start_date'] = np.NaN
+
+        f_mem = filter.filter_dates(
+            mem,
+            start_col='start_date',
+            end_col='end_date',
+            from_date='2012-01-01',
+            to_date='2012-12-31')
+
+        self.assertEqual(list(f_mem['membership_id']), ['a1', 'a8'])
+
+    def test_filter_dates_matches_reference_implementation(self):
+
+        df = validate.read('mps_committee_memberships_raw')
+        cols = {
+            'start_col': 'committee_membership_start_date',
+            'end_col': 'committee_membership_end_date'}
+
+        for from_date, to_date in [
+                ('2010-05-06', np.NaN),
+                (np.NaN, '2010-05-06'),
+                ('2015-05-07', '2017-06-08'),
+                (datetime.date(2019, 12, 12), datetime.date(2019, 12, 12))]:
+            with self.subTest(from_date=from_date, to_date=to_date):
+                pd.testing.assert_frame_equal(
+                    filter.filter_dates(
+                        df, from_date=from_date, to_date=to_date, **cols),
+                    filter_dates_map(
+                        df, from_date=from_date, to_date=to_date, **cols))
+
+    def test_filter_dates_filters_datetime64_dates(self):
+
+        df = validate.read('mps_committee_memberships_raw')
+        cols = {
+            'start_col': 'committee_membership_start_date',
+            'end_col': 'committee_membership_end_date',
+            'from_date': '2015-05-07',
+            'to_date': pd.Timestamp('2017-06-08')}
+
+        pd.testing.assert_frame_equal(
+            filter.filter_dates(validate.to_datetime64(df.copy()), **cols),
+            validate.to_datetime64(filter.filter_dates(df, **cols)))
+
 # Test filter_memberships -----------------------------------------------------
 
 class TestFilterMemberships(unittest.TestCase):
@@ -349,3 +457,101 @@ class TestFilterMemberships(unittest.TestCase):
             datetime.date(2006, 12, 31),
             datetime.date(2006, 12, 31),
             datetime.date(2015, 12, 31)]).all(), True)
+
+    def test_filter_memberships_keeps_memberships_without_filter_key(self):
+
+        f_mem_a = filter.filter_memberships(
+            tm=mem_a,
+            fm=mem_b[mem_b['person_id'] == 'p1'],
+            tm_id_col='membership_id',
+            tm_start_col='start_date',
+            tm_end_col='end_date',
+            fm_start_col='start_date',
+            fm_end_col='end_date',
+            join_col='person_id')
+
+        self.assertEqual(list(f_mem_a['membership_id']), [
+            'a1', 'a3', 'a5', 'a6', 'a7', 'a8'])
+
+    def test_filter_memberships_treats_missing_dates_as_open(self):
+
+        mem_c = mem_a.copy()
+        mem_c.loc[6, 'end_date'] = np.NaN
+        mem_d = mem_b.copy()
+        mem_d.loc[3, 'start_date'] = np.NaN
+
+        f_mem_c = filter.filter_memberships(
+            tm=mem_c,
+            fm=mem_d,
+            tm_id_col='membership_id',
+            tm_start_col='start_date',
+            tm_end_col='end_date',
+            fm_start_col='start_date',
+            fm_end_col='end_date',
+            join_col='person_id')
+
+        self.assertEqual(list(f_mem_c['membership_id']), [
+            'a1', 'a2', 'a3', 'a4', 'a6', 'a7', 'a8'])
+
+    def test_filter_memberships_matches_reference_implementation(self):
+
+        fm = validate.read('commons_memberships_raw')
+        fm_cols = {
+            'fm_start_col': 'seat_incumbency_start_date',
+            'fm_end_col': 'seat_incumbency_end_date',
+            'join_col': 'person_id'}
+
+        for name, prefix in [
+                ('mps_committee_memberships_raw', 'committee_membership'),
+                ('mps_government_roles_raw', 'government_incumbency'),
+                ('mps_party_memberships_raw', 'party_membership')]:
+            tm = validate.read(name)
+            tm_cols = {
+                'tm_id_col': '{0}_id'.format(prefix),
+                'tm_start_col': '{0}_start_date'.format(prefix),
+                'tm_end_col': '{0}_end_date'.format(prefix)}
+            with self.subTest(name=name):
+                pd.testing.assert_frame_equal(
+                    filter.filter_memberships(tm, fm, **tm_cols, **fm_cols),
+                    filter_memberships_merge(tm, fm, **tm_cols, **fm_cols))
+
+    def test_filter_memberships_filters_datetime64_dates(self):
+
+        tm = validate.read('mps_committee_memberships_raw')
+        fm = validate.read('commons_memberships_raw')
+        cols = {
+            'tm_id_col': 'committee_membership_id',
+            'tm_start_col': 'committee_membership_start_date',
+            'tm_end_col': 'committee_membership_end_date',
+            'fm_start_col': 'seat_incumbency_start_date',
+            'fm_end_col': 'seat_incumbency_end_date',
+            'join_col': 'person_id'}
+
+        pd.testing.assert_frame_equal(
+            filter.filter_memberships(
+                validate.to_datetime64(tm.copy()),
+                validate.to_datetime64(fm.copy()),
+                **cols),
+            validate.to_datetime64(filter.filter_memberships(tm, fm, **cols)))
+
+    def test_filter_memberships_fires_filter_done(self):
+
+        events = []
+        settings.add_hook(constants.HOOK_EVENT_FILTER, events.append)
+
+        try:
+            obs = filter.filter_memberships(
+                tm=mem_a,
+                fm=mem_b,
+                tm_id_col='membership_id',
+                tm_start_col='start_date',
+                tm_end_col='end_date',
+                fm_start_col='start_date',
+                fm_end_col='end_date',
+                join_col='person_id')
+        finally:
+            settings.reset_hooks()
+
+        self.assertEqual(
+            [e['stage'] for e in events], ['filter_memberships'])
+        self.assertEqual(events[0]['rows'], obs.shape[0])
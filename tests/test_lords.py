@@ -3,10 +3,18 @@
 
 # Imports ---------------------------------------------------------------------
 
+import pandas as pd
 import unittest
 from unittest.mock import patch
 
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
 import pdpy.lords as lords
+import pdpy.settings as settings
+import pdpy.utils as utils
 import tests.validate as validate
 
 
@@ -30,6 +38,81 @@ def mock_fetch_lords_opposition_roles_raw():
 def mock_fetch_lords_committee_memberships_raw():
     return validate.read('lords_committee_memberships_raw')
 
+# Async mocks -----------------------------------------------------------------
+
+async def mock_fetch_lords_raw_async():
+    return validate.read('lords_raw')
+
+async def mock_fetch_lords_memberships_raw_async():
+    return validate.read('lords_memberships_raw')
+
+async def mock_fetch_lords_party_memberships_raw_async():
+    return validate.read('lords_party_memberships_raw')
+
+async def mock_fetch_lords_government_roles_raw_async():
+    return validate.read('lords_government_roles_raw')
+
+async def mock_fetch_lords_opposition_roles_raw_async():
+    return validate.read('lords_opposition_roles_raw')
+
+async def mock_fetch_lords_committee_memberships_raw_async():
+    return validate.read('lords_committee_memberships_raw')
+
+# Datetime64 mocks ------------------------------------------------------------
+
+def mock_fetch_lords_raw_datetime64():
+    return validate.read_datetime64('lords_raw')
+
+def mock_fetch_lords_memberships_raw_datetime64():
+    return validate.read_datetime64('lords_memberships_raw')
+
+def mock_fetch_lords_party_memberships_raw_datetime64():
+    return validate.read_datetime64('lords_party_memberships_raw')
+
+def mock_fetch_lords_government_roles_raw_datetime64():
+    return validate.read_datetime64('lords_government_roles_raw')
+
+def mock_fetch_lords_opposition_roles_raw_datetime64():
+    return validate.read_datetime64('lords_opposition_roles_raw')
+
+def mock_fetch_lords_committee_memberships_raw_datetime64():
+    return validate.read_datetime64('lords_committee_memberships_raw')
+
+# Fetch cases -----------------------------------------------------------------
+
+fetch_cases = [
+    ('fetch_lords', {}, 'fetch_lords'),
+    ('fetch_lords', {'on_date': '2017-06-08'}, 'fetch_lords_from_to'),
+    ('fetch_lords_memberships', {}, 'fetch_lords_memberships'),
+    ('fetch_lords_memberships', {'on_date': '2017-06-08'},
+        'fetch_lords_memberships_from_to'),
+    ('fetch_lords_party_memberships', {},
+        'fetch_lords_party_memberships'),
+    ('fetch_lords_party_memberships', {'on_date': '2017-06-08'},
+        'fetch_lords_party_memberships_from_to'),
+    ('fetch_lords_party_memberships', {'while_lord': False},
+        'fetch_lords_party_memberships_while_lord'),
+    ('fetch_lords_party_memberships', {'collapse': True},
+        'fetch_lords_party_memberships_collapse'),
+    ('fetch_lords_government_roles', {},
+        'fetch_lords_government_roles'),
+    ('fetch_lords_government_roles', {'on_date': '2017-06-08'},
+        'fetch_lords_government_roles_from_to'),
+    ('fetch_lords_government_roles', {'while_lord': False},
+        'fetch_lords_government_roles_while_lord'),
+    ('fetch_lords_opposition_roles', {},
+        'fetch_lords_opposition_roles'),
+    ('fetch_lords_opposition_roles', {'on_date': '2017-06-08'},
+        'fetch_lords_opposition_roles_from_to'),
+    ('fetch_lords_opposition_roles', {'while_lord': False},
+        'fetch_lords_opposition_roles_while_lord'),
+    ('fetch_lords_committee_memberships', {},
+        'fetch_lords_committee_memberships'),
+    ('fetch_lords_committee_memberships', {'on_date': '2017-06-08'},
+        'fetch_lords_committee_memberships_from_to'),
+    ('fetch_lords_committee_memberships', {'while_lord': False},
+        'fetch_lords_committee_memberships_while_lord')]
+
 # Tests -----------------------------------------------------------------------
 
 class TestFetchLords(unittest.TestCase):
@@ -255,3 +338,144 @@ class TestFetchLordsCommitteeMemberships(unittest.TestCase):
         obs = lords.fetch_lords_committee_memberships(while_lord=False)
         exp = validate.read('fetch_lords_committee_memberships_while_lord')
         validate.compare_obs_exp(self, obs, exp, cols)
+
+
+class TestFetchLordsAsync(unittest.IsolatedAsyncioTestCase):
+
+    """Test the async fetch functions process results correctly."""
+
+    @patch('pdpy.lords.fetch_lords_raw_async',
+        mock_fetch_lords_raw_async)
+    @patch('pdpy.lords.fetch_lords_memberships_raw_async',
+        mock_fetch_lords_memberships_raw_async)
+    @patch('pdpy.lords.fetch_lords_party_memberships_raw_async',
+        mock_fetch_lords_party_memberships_raw_async)
+    @patch('pdpy.lords.fetch_lords_government_roles_raw_async',
+        mock_fetch_lords_government_roles_raw_async)
+    @patch('pdpy.lords.fetch_lords_opposition_roles_raw_async',
+        mock_fetch_lords_opposition_roles_raw_async)
+    @patch('pdpy.lords.fetch_lords_committee_memberships_raw_async',
+        mock_fetch_lords_committee_memberships_raw_async)
+
+    async def test_fetch_lords_async(self):
+
+        for name, kwargs, filename in fetch_cases:
+            with self.subTest(name=name, **kwargs):
+                func = getattr(lords, '{0}_async'.format(name))
+                obs = await func(**kwargs)
+                exp = validate.read(filename)
+                pd.testing.assert_frame_equal(obs, exp)
+
+
+class TestFetchLordsDatetime64(unittest.TestCase):
+
+    """Test fetch functions return datetime64 dates when requested."""
+
+    def setUp(self):
+        settings.set_date_dtype('datetime64')
+
+    def tearDown(self):
+        settings.reset_date_dtype()
+
+    @patch('pdpy.lords.fetch_lords_raw',
+        mock_fetch_lords_raw_datetime64)
+    @patch('pdpy.lords.fetch_lords_memberships_raw',
+        mock_fetch_lords_memberships_raw_datetime64)
+    @patch('pdpy.lords.fetch_lords_party_memberships_raw',
+        mock_fetch_lords_party_memberships_raw_datetime64)
+    @patch('pdpy.lords.fetch_lords_government_roles_raw',
+        mock_fetch_lords_government_roles_raw_datetime64)
+    @patch('pdpy.lords.fetch_lords_opposition_roles_raw',
+        mock_fetch_lords_opposition_roles_raw_datetime64)
+    @patch('pdpy.lords.fetch_lords_committee_memberships_raw',
+        mock_fetch_lords_committee_memberships_raw_datetime64)
+
+    def test_fetch_lords_datetime64(self):
+
+        for name, kwargs, filename in fetch_cases:
+            with self.subTest(name=name, **kwargs):
+                obs = getattr(lords, name)(**kwargs)
+                exp = validate.read_datetime64(filename)
+                pd.testing.assert_frame_equal(obs, exp)
+
+
+class TestFetchLordsCategorical(unittest.TestCase):
+
+    """Test fetch functions return categoricals when requested."""
+
+    def setUp(self):
+        settings.set_categorical(True)
+
+    def tearDown(self):
+        settings.reset_categorical()
+
+    @patch('pdpy.lords.fetch_lords_raw',
+        mock_fetch_lords_raw)
+    @patch('pdpy.lords.fetch_lords_memberships_raw',
+        mock_fetch_lords_memberships_raw)
+    @patch('pdpy.lords.fetch_lords_party_memberships_raw',
+        mock_fetch_lords_party_memberships_raw)
+    @patch('pdpy.lords.fetch_lords_government_roles_raw',
+        mock_fetch_lords_government_roles_raw)
+    @patch('pdpy.lords.fetch_lords_opposition_roles_raw',
+        mock_fetch_lords_opposition_roles_raw)
+    @patch('pdpy.lords.fetch_lords_committee_memberships_raw',
+        mock_fetch_lords_committee_memberships_raw)
+
+    def test_fetch_lords_categorical(self):
+
+        for name, kwargs, filename in fetch_cases:
+            with self.subTest(name=name, **kwargs):
+                obs = getattr(lords, name)(**kwargs)
+                exp = validate.read_categorical(filename)
+                pd.testing.assert_frame_equal(
+                    obs, exp, check_categorical=False)
+
+
+    @patch('pdpy.lords.fetch_lords_raw',
+        mock_fetch_lords_raw)
+    @patch('pdpy.lords.fetch_lords_memberships_raw',
+        mock_fetch_lords_memberships_raw)
+    @patch('pdpy.lords.fetch_lords_party_memberships_raw',
+        mock_fetch_lords_party_memberships_raw)
+    @patch('pdpy.lords.fetch_lords_government_roles_raw',
+        mock_fetch_lords_government_roles_raw)
+    @patch('pdpy.lords.fetch_lords_opposition_roles_raw',
+        mock_fetch_lords_opposition_roles_raw)
+    @patch('pdpy.lords.fetch_lords_committee_memberships_raw',
+        mock_fetch_lords_committee_memberships_raw)
+
+    def test_fetch_lords_categorical_argument(self):
+
+        for name, kwargs, filename in fetch_cases:
+            with self.subTest(name=name, **kwargs):
+                obs = getattr(lords, name)(categorical=False, **kwargs)
+                exp = validate.read(filename)
+                pd.testing.assert_frame_equal(obs, exp)
+
+
+@unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+class TestFetchLordsArrow(unittest.TestCase):
+
+    """Test fetch functions return pyarrow Tables when requested."""
+
+    @patch('pdpy.lords.fetch_lords_raw',
+        mock_fetch_lords_raw)
+    @patch('pdpy.lords.fetch_lords_memberships_raw',
+        mock_fetch_lords_memberships_raw)
+    @patch('pdpy.lords.fetch_lords_party_memberships_raw',
+        mock_fetch_lords_party_memberships_raw)
+    @patch('pdpy.lords.fetch_lords_government_roles_raw',
+        mock_fetch_lords_government_roles_raw)
+    @patch('pdpy.lords.fetch_lords_opposition_roles_raw',
+        mock_fetch_lords_opposition_roles_raw)
+    @patch('pdpy.lords.fetch_lords_committee_memberships_raw',
+        mock_fetch_lords_committee_memberships_raw)
+
+    def test_fetch_lords_arrow(self):
+
+        for name, kwargs, filename in fetch_cases:
+            with self.subTest(name=name, **kwargs):
+                obs = getattr(lords, name)(arrow=True, **kwargs)
+                exp = utils.to_arrow(validate.read(filename))
+                self.assertTrue(obs.equals(exp))
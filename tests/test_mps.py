@@ -3,10 +3,18 @@
 
 # Imports ---------------------------------------------------------------------
 
+import pandas as pd
 import unittest
 from unittest.mock import patch
 
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
 import pdpy.mps as mps
+import pdpy.settings as settings
+import pdpy.utils as utils
 import tests.validate as validate
 
 # Mocks -----------------------------------------------------------------------
@@ -29,6 +37,78 @@ def mock_fetch_mps_opposition_roles_raw():
 def mock_fetch_mps_committee_memberships_raw():
     return validate.read('mps_committee_memberships_raw')
 
+# Async mocks -----------------------------------------------------------------
+
+async def mock_fetch_mps_raw_async():
+    return validate.read('mps_raw')
+
+async def mock_fetch_commons_memberships_raw_async():
+    return validate.read('commons_memberships_raw')
+
+async def mock_fetch_mps_party_memberships_raw_async():
+    return validate.read('mps_party_memberships_raw')
+
+async def mock_fetch_mps_government_roles_raw_async():
+    return validate.read('mps_government_roles_raw')
+
+async def mock_fetch_mps_opposition_roles_raw_async():
+    return validate.read('mps_opposition_roles_raw')
+
+async def mock_fetch_mps_committee_memberships_raw_async():
+    return validate.read('mps_committee_memberships_raw')
+
+# Datetime64 mocks ------------------------------------------------------------
+
+def mock_fetch_mps_raw_datetime64():
+    return validate.read_datetime64('mps_raw')
+
+def mock_fetch_commons_memberships_raw_datetime64():
+    return validate.read_datetime64('commons_memberships_raw')
+
+def mock_fetch_mps_party_memberships_raw_datetime64():
+    return validate.read_datetime64('mps_party_memberships_raw')
+
+def mock_fetch_mps_government_roles_raw_datetime64():
+    return validate.read_datetime64('mps_government_roles_raw')
+
+def mock_fetch_mps_opposition_roles_raw_datetime64():
+    return validate.read_datetime64('mps_opposition_roles_raw')
+
+def mock_fetch_mps_committee_memberships_raw_datetime64():
+    return validate.read_datetime64('mps_committee_memberships_raw')
+
+# Fetch cases -----------------------------------------------------------------
+
+fetch_cases = [
+    ('fetch_mps', {}, 'fetch_mps'),
+    ('fetch_mps', {'on_date': '2017-06-08'}, 'fetch_mps_from_to'),
+    ('fetch_commons_memberships', {}, 'fetch_commons_memberships'),
+    ('fetch_commons_memberships', {'on_date': '2017-06-08'},
+        'fetch_commons_memberships_from_to'),
+    ('fetch_mps_party_memberships', {}, 'fetch_mps_party_memberships'),
+    ('fetch_mps_party_memberships', {'on_date': '2017-06-08'},
+        'fetch_mps_party_memberships_from_to'),
+    ('fetch_mps_party_memberships', {'while_mp': False},
+        'fetch_mps_party_memberships_while_mp'),
+    ('fetch_mps_party_memberships', {'collapse': True},
+        'fetch_mps_party_memberships_collapse'),
+    ('fetch_mps_government_roles', {}, 'fetch_mps_government_roles'),
+    ('fetch_mps_government_roles', {'on_date': '2017-06-08'},
+        'fetch_mps_government_roles_from_to'),
+    ('fetch_mps_government_roles', {'while_mp': False},
+        'fetch_mps_government_roles_while_mp'),
+    ('fetch_mps_opposition_roles', {}, 'fetch_mps_opposition_roles'),
+    ('fetch_mps_opposition_roles', {'on_date': '2017-06-08'},
+        'fetch_mps_opposition_roles_from_to'),
+    ('fetch_mps_opposition_roles', {'while_mp': False},
+        'fetch_mps_opposition_roles_while_mp'),
+    ('fetch_mps_committee_memberships', {},
+        'fetch_mps_committee_memberships'),
+    ('fetch_mps_committee_memberships', {'on_date': '2017-06-08'},
+        'fetch_mps_committee_memberships_from_to'),
+    ('fetch_mps_committee_memberships', {'while_mp': False},
+        'fetch_mps_committee_memberships_while_mp')]
+
 # Tests -----------------------------------------------------------------------
 
 class TestFetchMps(unittest.TestCase):
@@ -254,3 +334,144 @@ class TestFetchMpsCommitteeMemberships(unittest.TestCase):
         obs = mps.fetch_mps_committee_memberships(while_mp=False)
         exp = validate.read('fetch_mps_committee_memberships_while_mp')
         validate.compare_obs_exp(self, obs, exp, cols)
+
+
+class TestFetchMpsAsync(unittest.IsolatedAsyncioTestCase):
+
+    """Test the async fetch functions process results correctly."""
+
+    @patch('pdpy.mps.fetch_mps_raw_async',
+        mock_fetch_mps_raw_async)
+    @patch('pdpy.mps.fetch_commons_memberships_raw_async',
+        mock_fetch_commons_memberships_raw_async)
+    @patch('pdpy.mps.fetch_mps_party_memberships_raw_async',
+        mock_fetch_mps_party_memberships_raw_async)
+    @patch('pdpy.mps.fetch_mps_government_roles_raw_async',
+        mock_fetch_mps_government_roles_raw_async)
+    @patch('pdpy.mps.fetch_mps_opposition_roles_raw_async',
+        mock_fetch_mps_opposition_roles_raw_async)
+    @patch('pdpy.mps.fetch_mps_committee_memberships_raw_async',
+        mock_fetch_mps_committee_memberships_raw_async)
+
+    async def test_fetch_mps_async(self):
+
+        for name, kwargs, filename in fetch_cases:
+            with self.subTest(name=name, **kwargs):
+                func = getattr(mps, '{0}_async'.format(name))
+                obs = await func(**kwargs)
+                exp = validate.read(filename)
+                pd.testing.assert_frame_equal(obs, exp)
+
+
+class TestFetchMpsDatetime64(unittest.TestCase):
+
+    """Test fetch functions return datetime64 dates when requested."""
+
+    def setUp(self):
+        settings.set_date_dtype('datetime64')
+
+    def tearDown(self):
+        settings.reset_date_dtype()
+
+    @patch('pdpy.mps.fetch_mps_raw',
+        mock_fetch_mps_raw_datetime64)
+    @patch('pdpy.mps.fetch_commons_memberships_raw',
+        mock_fetch_commons_memberships_raw_datetime64)
+    @patch('pdpy.mps.fetch_mps_party_memberships_raw',
+        mock_fetch_mps_party_memberships_raw_datetime64)
+    @patch('pdpy.mps.fetch_mps_government_roles_raw',
+        mock_fetch_mps_government_roles_raw_datetime64)
+    @patch('pdpy.mps.fetch_mps_opposition_roles_raw',
+        mock_fetch_mps_opposition_roles_raw_datetime64)
+    @patch('pdpy.mps.fetch_mps_committee_memberships_raw',
+        mock_fetch_mps_committee_memberships_raw_datetime64)
+
+    def test_fetch_mps_datetime64(self):
+
+        for name, kwargs, filename in fetch_cases:
+            with self.subTest(name=name, **kwargs):
+                obs = getattr(mps, name)(**kwargs)
+                exp = validate.read_datetime64(filename)
+                pd.testing.assert_frame_equal(obs, exp)
+
+
+class TestFetchMpsCategorical(unittest.TestCase):
+
+    """Test fetch functions return categoricals when requested."""
+
+    def setUp(self):
+        settings.set_categorical(True)
+
+    def tearDown(self):
+        settings.reset_categorical()
+
+    @patch('pdpy.mps.fetch_mps_raw',
+        mock_fetch_mps_raw)
+    @patch('pdpy.mps.fetch_commons_memberships_raw',
+        mock_fetch_commons_memberships_raw)
+    @patch('pdpy.mps.fetch_mps_party_memberships_raw',
+        mock_fetch_mps_party_memberships_raw)
+    @patch('pdpy.mps.fetch_mps_government_roles_raw',
+        mock_fetch_mps_government_roles_raw)
+    @patch('pdpy.mps.fetch_mps_opposition_roles_raw',
+        mock_fetch_mps_opposition_roles_raw)
+    @patch('pdpy.mps.fetch_mps_committee_memberships_raw',
+        mock_fetch_mps_committee_memberships_raw)
+
+    def test_fetch_mps_categorical(self):
+
+        for name, kwargs, filename in fetch_cases:
+            with self.subTest(name=name, **kwargs):
+                obs = getattr(mps, name)(**kwargs)
+                exp = validate.read_categorical(filename)
+                pd.testing.assert_frame_equal(
+                    obs, exp, check_categorical=False)
+
+
+    @patch('pdpy.mps.fetch_mps_raw',
+        mock_fetch_mps_raw)
+    @patch('pdpy.mps.fetch_commons_memberships_raw',
+        mock_fetch_commons_memberships_raw)
+    @patch('pdpy.mps.fetch_mps_party_memberships_raw',
+        mock_fetch_mps_party_memberships_raw)
+    @patch('pdpy.mps.fetch_mps_government_roles_raw',
+        mock_fetch_mps_government_roles_raw)
+    @patch('pdpy.mps.fetch_mps_opposition_roles_raw',
+        mock_fetch_mps_opposition_roles_raw)
+    @patch('pdpy.mps.fetch_mps_committee_memberships_raw',
+        mock_fetch_mps_committee_memberships_raw)
+
+    def test_fetch_mps_categorical_argument(self):
+
+        for name, kwargs, filename in fetch_cases:
+            with self.subTest(name=name, **kwargs):
+                obs = getattr(mps, name)(categorical=False, **kwargs)
+                exp = validate.read(filename)
+                pd.testing.assert_frame_equal(obs, exp)
+
+
+@unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+class TestFetchMpsArrow(unittest.TestCase):
+
+    """Test fetch functions return pyarrow Tables when requested."""
+
+    @patch('pdpy.mps.fetch_mps_raw',
+        mock_fetch_mps_raw)
+    @patch('pdpy.mps.fetch_commons_memberships_raw',
+        mock_fetch_commons_memberships_raw)
+    @patch('pdpy.mps.fetch_mps_party_memberships_raw',
+        mock_fetch_mps_party_memberships_raw)
+    @patch('pdpy.mps.fetch_mps_government_roles_raw',
+        mock_fetch_mps_government_roles_raw)
+    @patch('pdpy.mps.fetch_mps_opposition_roles_raw',
+        mock_fetch_mps_opposition_roles_raw)
+    @patch('pdpy.mps.fetch_mps_committee_memberships_raw',
+        mock_fetch_mps_committee_memberships_raw)
+
+    def test_fetch_mps_arrow(self):
+
+        for name, kwargs, filename in fetch_cases:
+            with self.subTest(name=name, **kwargs):
+                obs = getattr(mps, name)(arrow=True, **kwargs)
+                exp = utils.to_arrow(validate.read(filename))
+                self.assertTrue(obs.equals(exp))
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""Test profiling functions."""
+
+# Imports ---------------------------------------------------------------------
+
+import asyncio
+import contextlib
+import io
+import json
+import pandas as pd
+import unittest
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pdpy.cache as cache
+import pdpy.constants as constants
+import pdpy.core as core
+import pdpy.mps as mps
+import pdpy.profiling as profiling
+import pdpy.settings as settings
+import tests.test_core as test_core
+import tests.validate as validate
+
+# Setup -----------------------------------------------------------------------
+
+def read_raw(name):
+    return MagicMock(side_effect=lambda: validate.read(name))
+
+
+def read_raw_async(name):
+    async def read():
+        return validate.read(name)
+    return read
+
+# Tests -----------------------------------------------------------------------
+
+class TestProfile(unittest.TestCase):
+
+    """Test that profile records a tree of stages for each call."""
+
+    def setUp(self):
+        response = MagicMock()
+        response.ok = True
+        response.status_code = 200
+        response.content = json.dumps(
+            test_core.results_person).encode('utf-8')
+        self.request = MagicMock(return_value=response)
+
+    def tearDown(self):
+        settings.reset_hooks()
+        cache.clear_memory_cache()
+
+    def test_profile_records_query_stages(self):
+
+        with patch('pdpy.core.request', self.request):
+            with profiling.profile() as p:
+                core.sparql_select(test_core.query_person)
+
+        table = p.get_table()
+
+        self.assertEqual(list(table.columns), constants.PROFILE_COLUMNS)
+        self.assertEqual(table['stage'].str.strip().tolist(), [
+            'sparql_select',
+            'network_wait',
+            'decode',
+            'convert_dates'])
+        self.assertEqual(table['depth'].tolist(), [0, 1, 1, 1])
+        self.assertEqual(table['call'].tolist(), [1, 1, 1, 1])
+        self.assertEqual(table['rows_out'].tolist(), [2, pd.NA, 2, 2])
+        self.assertEqual(
+            table['bytes'][1], len(self.request.return_value.content))
+        self.assertAlmostEqual(
+            table['self_elapsed'][0],
+            table['elapsed'][0] - table['elapsed'][1:].sum())
+
+    @patch('pdpy.mps.fetch_commons_memberships_raw',
+        read_raw('commons_memberships_raw'))
+    @patch('pdpy.mps.fetch_mps_party_memberships_raw',
+        read_raw('mps_party_memberships_raw'))
+
+    def test_profile_records_fetch_stages(self):
+
+        with profiling.profile() as p:
+            obs = mps.fetch_mps_party_memberships(
+                from_date='2010-05-06', collapse=True)
+            mps.fetch_commons_memberships()
+
+        table = p.get_table()
+
+        self.assertEqual(
+            list(zip(table['call'], table['stage'])), [
+                (1, 'fetch_mps_party_memberships'),
+                (1, '  fetch_commons_memberships'),
+                (1, '    clip_to_dissolution'),
+                (1, '    sort_rows'),
+                (1, '  filter_dates'),
+                (1, '  filter_memberships'),
+                (1, '  combine_party_memberships'),
+                (2, 'fetch_commons_memberships'),
+                (2, '  clip_to_dissolution'),
+                (2, '  sort_rows')])
+
+        stages = table.set_index(table['stage'].str.strip())
+        self.assertEqual(table['rows_out'][0], obs.shape[0])
+        self.assertEqual(
+            stages.loc['filter_dates', 'rows_out'],
+            stages.loc['filter_memberships', 'rows_in'])
+        self.assertEqual(
+            stages.loc['filter_memberships', 'rows_out'],
+            stages.loc['combine_party_memberships', 'rows_in'])
+
+    @patch('pdpy.mps.fetch_commons_memberships_raw_async',
+        read_raw_async('commons_memberships_raw'))
+    @patch('pdpy.mps.fetch_mps_party_memberships_raw_async',
+        read_raw_async('mps_party_memberships_raw'))
+
+    def test_profile_separates_concurrent_calls(self):
+
+        async def fetch_both():
+            return await asyncio.gather(
+                mps.fetch_mps_party_memberships_async(),
+                mps.fetch_commons_memberships_async())
+
+        with profiling.profile() as p:
+            party_memberships, commons_memberships = asyncio.run(
+                fetch_both())
+
+        table = p.get_table()
+        roots = table[table['depth'] == 0]
+
+        self.assertEqual(roots['stage'].tolist(), [
+            'fetch_mps_party_memberships_async',
+            'fetch_commons_memberships_async'])
+        self.assertEqual(
+            roots['rows_out'].tolist(),
+            [party_memberships.shape[0], commons_memberships.shape[0]])
+
+        for call, stages in table.groupby('call'):
+            with self.subTest(call=call):
+                self.assertEqual(
+                    stages['stage'].str.strip().tolist().count(
+                        'clip_to_dissolution'), 1)
+
+    def test_profile_removes_hooks_and_prints_table(self):
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            with patch('pdpy.core.request', self.request):
+                with profiling.profile(show=True) as p:
+                    core.sparql_select(test_core.query_person)
+
+        for event in constants.PROFILE_EVENTS:
+            self.assertEqual(settings.get_hooks(event), ())
+
+        self.assertEqual(output.getvalue(), '{0}\n'.format(p))
+        self.assertIn('network_wait', output.getvalue())
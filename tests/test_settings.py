@@ -60,3 +60,498 @@ class ResetApiUrl(unittest.TestCase):
         self.assertEqual(
             settings.get_api_url(),
             constants.SETTINGS_API_URL_DEFAULT)
+
+# Test pool size --------------------------------------------------------------
+
+class PoolSize(unittest.TestCase):
+
+    """
+    Test that the pool size settings functions get, set and reset the pool
+    size.
+
+    """
+
+    def test_that_get_pool_size_returns_default_pool_size(self):
+
+        settings.reset_pool_size()
+        self.assertEqual(
+            settings.get_pool_size(),
+            constants.SETTINGS_POOL_SIZE_DEFAULT)
+
+    def test_that_set_pool_size_sets_pool_size(self):
+
+        settings.set_pool_size(4)
+        self.assertEqual(settings.get_pool_size(), 4)
+        settings.reset_pool_size()
+        self.assertEqual(
+            settings.get_pool_size(),
+            constants.SETTINGS_POOL_SIZE_DEFAULT)
+
+    def test_that_set_pool_size_raises_value_error(self):
+
+        with self.assertRaises(ValueError):
+            settings.set_pool_size(0)
+
+        with self.assertRaises(ValueError):
+            settings.set_pool_size('4')
+
+# Test keep alive -------------------------------------------------------------
+
+class KeepAlive(unittest.TestCase):
+
+    """
+    Test that the keep alive settings functions get, set and reset the keep
+    alive setting.
+
+    """
+
+    def test_that_set_keep_alive_sets_keep_alive(self):
+
+        settings.set_keep_alive(False)
+        self.assertFalse(settings.get_keep_alive())
+        settings.reset_keep_alive()
+        self.assertEqual(
+            settings.get_keep_alive(),
+            constants.SETTINGS_KEEP_ALIVE_DEFAULT)
+
+# Test timeout ----------------------------------------------------------------
+
+class Timeout(unittest.TestCase):
+
+    """
+    Test that the timeout settings functions get, set and reset the timeout.
+
+    """
+
+    def test_that_set_timeout_sets_timeout(self):
+
+        settings.set_timeout((3.05, 60))
+        self.assertEqual(settings.get_timeout(), (3.05, 60))
+        settings.reset_timeout()
+        self.assertEqual(
+            settings.get_timeout(),
+            constants.SETTINGS_TIMEOUT_DEFAULT)
+
+# Test result format ----------------------------------------------------------
+
+class ResultFormat(unittest.TestCase):
+
+    """
+    Test that the result format settings functions get, set and reset the
+    result format.
+
+    """
+
+    def test_that_set_result_format_sets_result_format(self):
+
+        settings.set_result_format('csv')
+        self.assertEqual(settings.get_result_format(), 'csv')
+        settings.reset_result_format()
+        self.assertEqual(
+            settings.get_result_format(),
+            constants.SETTINGS_RESULT_FORMAT_DEFAULT)
+
+    def test_that_set_result_format_raises_value_error(self):
+
+        with self.assertRaises(ValueError):
+            settings.set_result_format('xml')
+
+# Test cache dir --------------------------------------------------------------
+
+class CacheDir(unittest.TestCase):
+
+    """
+    Test that the cache dir settings functions get, set and reset the cache
+    directory.
+
+    """
+
+    def test_that_set_cache_dir_sets_cache_dir(self):
+
+        settings.set_cache_dir('cache')
+        self.assertEqual(settings.get_cache_dir(), 'cache')
+        settings.reset_cache_dir()
+        self.assertEqual(
+            settings.get_cache_dir(),
+            constants.SETTINGS_CACHE_DIR_DEFAULT)
+
+# Test cache ttl --------------------------------------------------------------
+
+class CacheTtl(unittest.TestCase):
+
+    """
+    Test that the cache ttl settings functions get, set and reset the cache
+    time to live.
+
+    """
+
+    def test_that_set_cache_ttl_sets_cache_ttl(self):
+
+        settings.set_cache_ttl(60)
+        self.assertEqual(settings.get_cache_ttl(), 60)
+        settings.set_cache_ttl(None)
+        self.assertIsNone(settings.get_cache_ttl())
+        settings.reset_cache_ttl()
+        self.assertEqual(
+            settings.get_cache_ttl(),
+            constants.SETTINGS_CACHE_TTL_DEFAULT)
+
+    def test_that_set_cache_ttl_raises_value_error(self):
+
+        with self.assertRaises(ValueError):
+            settings.set_cache_ttl(0)
+
+        with self.assertRaises(ValueError):
+            settings.set_cache_ttl('60')
+
+# Test cache max size ---------------------------------------------------------
+
+class CacheMaxSize(unittest.TestCase):
+
+    """
+    Test that the cache max size settings functions get, set and reset the
+    cache maximum size.
+
+    """
+
+    def test_that_set_cache_max_size_sets_cache_max_size(self):
+
+        settings.set_cache_max_size(1024)
+        self.assertEqual(settings.get_cache_max_size(), 1024)
+        settings.set_cache_max_size(None)
+        self.assertIsNone(settings.get_cache_max_size())
+        settings.reset_cache_max_size()
+        self.assertEqual(
+            settings.get_cache_max_size(),
+            constants.SETTINGS_CACHE_MAX_SIZE_DEFAULT)
+
+    def test_that_set_cache_max_size_raises_value_error(self):
+
+        with self.assertRaises(ValueError):
+            settings.set_cache_max_size(0)
+
+        with self.assertRaises(ValueError):
+            settings.set_cache_max_size(1.5)
+
+# Test memory cache size ------------------------------------------------------
+
+class MemoryCacheSize(unittest.TestCase):
+
+    """
+    Test that the memory cache size settings functions get, set and reset
+    the memory cache size.
+
+    """
+
+    def test_that_set_memory_cache_size_sets_memory_cache_size(self):
+
+        settings.set_memory_cache_size(0)
+        self.assertEqual(settings.get_memory_cache_size(), 0)
+        settings.reset_memory_cache_size()
+        self.assertEqual(
+            settings.get_memory_cache_size(),
+            constants.SETTINGS_MEMORY_CACHE_SIZE_DEFAULT)
+
+    def test_that_set_memory_cache_size_raises_value_error(self):
+
+        with self.assertRaises(ValueError):
+            settings.set_memory_cache_size(-1)
+
+        with self.assertRaises(ValueError):
+            settings.set_memory_cache_size('8')
+
+# Test memory cache ttl -------------------------------------------------------
+
+class MemoryCacheTtl(unittest.TestCase):
+
+    """
+    Test that the memory cache ttl settings functions get, set and reset the
+    memory cache time to live.
+
+    """
+
+    def test_that_set_memory_cache_ttl_sets_memory_cache_ttl(self):
+
+        settings.set_memory_cache_ttl(60)
+        self.assertEqual(settings.get_memory_cache_ttl(), 60)
+        settings.reset_memory_cache_ttl()
+        self.assertEqual(
+            settings.get_memory_cache_ttl(),
+            constants.SETTINGS_MEMORY_CACHE_TTL_DEFAULT)
+
+    def test_that_set_memory_cache_ttl_raises_value_error(self):
+
+        with self.assertRaises(ValueError):
+            settings.set_memory_cache_ttl(0)
+
+# Test page size --------------------------------------------------------------
+
+class PageSize(unittest.TestCase):
+
+    """
+    Test that the page size settings functions get, set and reset the page
+    size.
+
+    """
+
+    def test_that_set_page_size_sets_page_size(self):
+
+        settings.set_page_size(500)
+        self.assertEqual(settings.get_page_size(), 500)
+        settings.reset_page_size()
+        self.assertEqual(
+            settings.get_page_size(),
+            constants.SETTINGS_PAGE_SIZE_DEFAULT)
+
+    def test_that_set_page_size_raises_value_error(self):
+
+        with self.assertRaises(ValueError):
+            settings.set_page_size(0)
+
+# Test paging threshold -------------------------------------------------------
+
+class PagingThreshold(unittest.TestCase):
+
+    """
+    Test that the paging threshold settings functions get, set and reset the
+    paging threshold.
+
+    """
+
+    def test_that_set_paging_threshold_sets_paging_threshold(self):
+
+        settings.set_paging_threshold(50000)
+        self.assertEqual(settings.get_paging_threshold(), 50000)
+        settings.reset_paging_threshold()
+        self.assertEqual(
+            settings.get_paging_threshold(),
+            constants.SETTINGS_PAGING_THRESHOLD_DEFAULT)
+
+    def test_that_set_paging_threshold_raises_value_error(self):
+
+        with self.assertRaises(ValueError):
+            settings.set_paging_threshold(-1)
+
+# Test max retries ------------------------------------------------------------
+
+class MaxRetries(unittest.TestCase):
+
+    """
+    Test that the max retries settings functions get, set and reset the
+    maximum number of retries.
+
+    """
+
+    def test_that_set_max_retries_sets_max_retries(self):
+
+        settings.set_max_retries(0)
+        self.assertEqual(settings.get_max_retries(), 0)
+        settings.reset_max_retries()
+        self.assertEqual(
+            settings.get_max_retries(),
+            constants.SETTINGS_MAX_RETRIES_DEFAULT)
+
+    def test_that_set_max_retries_raises_value_error(self):
+
+        with self.assertRaises(ValueError):
+            settings.set_max_retries(-1)
+
+# Test retry backoff ----------------------------------------------------------
+
+class RetryBackoff(unittest.TestCase):
+
+    """
+    Test that the retry backoff settings functions get, set and reset the
+    retry backoff.
+
+    """
+
+    def test_that_set_retry_backoff_sets_retry_backoff(self):
+
+        settings.set_retry_backoff(2)
+        self.assertEqual(settings.get_retry_backoff(), 2)
+        settings.reset_retry_backoff()
+        self.assertEqual(
+            settings.get_retry_backoff(),
+            constants.SETTINGS_RETRY_BACKOFF_DEFAULT)
+
+    def test_that_set_retry_backoff_raises_value_error(self):
+
+        with self.assertRaises(ValueError):
+            settings.set_retry_backoff(-1)
+
+# Test retry status codes -----------------------------------------------------
+
+class RetryStatusCodes(unittest.TestCase):
+
+    """
+    Test that the retry status codes settings functions get, set and reset
+    the retry status codes.
+
+    """
+
+    def test_that_set_retry_status_codes_sets_retry_status_codes(self):
+
+        settings.set_retry_status_codes([503, 500, 503])
+        self.assertEqual(settings.get_retry_status_codes(), (500, 503))
+        settings.reset_retry_status_codes()
+        self.assertEqual(
+            settings.get_retry_status_codes(),
+            constants.SETTINGS_RETRY_STATUS_CODES_DEFAULT)
+
+    def test_that_set_retry_status_codes_raises_value_error(self):
+
+        with self.assertRaises(ValueError):
+            settings.set_retry_status_codes(503)
+
+        with self.assertRaises(ValueError):
+            settings.set_retry_status_codes(['503'])
+
+        with self.assertRaises(ValueError):
+            settings.set_retry_status_codes([99])
+
+# Test date dtype -------------------------------------------------------------
+
+class DateDtype(unittest.TestCase):
+
+    """
+    Test that the date dtype settings functions get, set and reset the date
+    dtype.
+
+    """
+
+    def test_that_set_date_dtype_sets_date_dtype(self):
+
+        settings.set_date_dtype('datetime64')
+        self.assertEqual(settings.get_date_dtype(), 'datetime64')
+        settings.reset_date_dtype()
+        self.assertEqual(
+            settings.get_date_dtype(),
+            constants.SETTINGS_DATE_DTYPE_DEFAULT)
+
+    def test_that_set_date_dtype_raises_value_error(self):
+
+        with self.assertRaises(ValueError):
+            settings.set_date_dtype('datetime64[D]')
+
+# Test categorical ------------------------------------------------------------
+
+class Categorical(unittest.TestCase):
+
+    """
+    Test that the categorical settings functions get, set and reset the
+    categorical setting.
+
+    """
+
+    def test_that_set_categorical_sets_categorical(self):
+
+        settings.set_categorical(True)
+        self.assertTrue(settings.get_categorical())
+        settings.reset_categorical()
+        self.assertEqual(
+            settings.get_categorical(),
+            constants.SETTINGS_CATEGORICAL_DEFAULT)
+
+    def test_that_set_categorical_raises_value_error(self):
+
+        for categorical in [1, 'True', None]:
+            with self.subTest(categorical=categorical):
+                with self.assertRaises(ValueError):
+                    settings.set_categorical(categorical)
+
+# Test snapshot dir -----------------------------------------------------------
+
+class SnapshotDir(unittest.TestCase):
+
+    """
+    Test that the snapshot dir settings functions get, set and reset the
+    snapshot directory.
+
+    """
+
+    def test_that_set_snapshot_dir_sets_snapshot_dir(self):
+
+        settings.set_snapshot_dir('snapshot')
+        self.assertEqual(settings.get_snapshot_dir(), 'snapshot')
+        settings.reset_snapshot_dir()
+        self.assertEqual(
+            settings.get_snapshot_dir(),
+            constants.SETTINGS_SNAPSHOT_DIR_DEFAULT)
+
+# Test transport --------------------------------------------------------------
+
+class Transport(unittest.TestCase):
+
+    """
+    Test that the transport settings functions get, set and reset the
+    transport.
+
+    """
+
+    def test_that_set_transport_sets_transport(self):
+
+        transport = lambda pool_size: None
+        settings.set_transport(transport)
+        self.assertIs(settings.get_transport(), transport)
+        settings.reset_transport()
+        self.assertEqual(
+            settings.get_transport(),
+            constants.SETTINGS_TRANSPORT_DEFAULT)
+
+    def test_that_set_transport_raises_value_error(self):
+
+        with self.assertRaises(ValueError):
+            settings.set_transport('transport')
+
+# Test hooks ------------------------------------------------------------------
+
+class Hooks(unittest.TestCase):
+
+    """
+    Test that the hooks functions add, remove, get and reset the hooks for
+    each event.
+
+    """
+
+    def tearDown(self):
+        settings.reset_hooks()
+
+    def test_that_add_hook_and_remove_hook_update_hooks(self):
+
+        event = constants.HOOK_EVENT_REQUEST_END
+        hook_a = lambda info: None
+        hook_b = lambda info: None
+
+        self.assertEqual(settings.get_hooks(event), ())
+        settings.add_hook(event, hook_a)
+        settings.add_hook(event, hook_b)
+        settings.add_hook(event, hook_a)
+        self.assertEqual(
+            settings.get_hooks(event), (hook_a, hook_b, hook_a))
+        self.assertEqual(
+            settings.get_hooks(constants.HOOK_EVENT_REQUEST_START), ())
+
+        settings.remove_hook(event, hook_a)
+        self.assertEqual(settings.get_hooks(event), (hook_a, hook_b))
+        settings.remove_hook(event, hook_a)
+        settings.remove_hook(event, hook_b)
+        self.assertEqual(settings.get_hooks(event), ())
+        self.assertNotIn(event, settings.hooks)
+
+    def test_that_reset_hooks_removes_all_hooks(self):
+
+        for event in constants.HOOK_EVENTS:
+            settings.add_hook(event, print)
+        settings.reset_hooks()
+        for event in constants.HOOK_EVENTS:
+            self.assertEqual(settings.get_hooks(event), ())
+
+    def test_that_hooks_functions_raise_value_error(self):
+
+        with self.assertRaises(ValueError):
+            settings.add_hook('no_such_event', print)
+        with self.assertRaises(ValueError):
+            settings.add_hook(constants.HOOK_EVENT_REQUEST_END, None)
+        with self.assertRaises(ValueError):
+            settings.remove_hook(constants.HOOK_EVENT_REQUEST_END, print)
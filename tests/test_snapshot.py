@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""Test snapshot store functions."""
+
+# Imports ---------------------------------------------------------------------
+
+import asyncio
+import os
+import pandas as pd
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+import pdpy.constants as constants
+import pdpy.lords as lords
+import pdpy.mps as mps
+import pdpy.settings as settings
+import pdpy.snapshot as snapshot
+import tests.test_lords as test_lords
+import tests.test_mps as test_mps
+import tests.validate as validate
+
+# Setup -----------------------------------------------------------------------
+
+raw_tables = [
+    'mps_raw',
+    'commons_memberships_raw',
+    'mps_party_memberships_raw',
+    'mps_government_roles_raw',
+    'mps_opposition_roles_raw',
+    'mps_committee_memberships_raw',
+    'lords_raw',
+    'lords_memberships_raw',
+    'lords_party_memberships_raw',
+    'lords_government_roles_raw',
+    'lords_opposition_roles_raw',
+    'lords_committee_memberships_raw']
+
+# The fetch functions must not reach the data platform or the members module
+# when every raw table is in the snapshot
+offline = MagicMock(side_effect=AssertionError('data platform was queried'))
+
+# Tests -----------------------------------------------------------------------
+
+@unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+class SnapshotTestCase(unittest.TestCase):
+
+    """Base class for tests that use a temporary snapshot directory."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.snapshot_dir = os.path.join(self.tmp_dir.name, 'snapshot')
+
+    def tearDown(self):
+        settings.reset_snapshot_dir()
+        settings.reset_date_dtype()
+        settings.reset_api_url()
+        self.tmp_dir.cleanup()
+
+    def write_fixtures(self):
+        snapshot.write_tables(
+            {name: validate.read(name) for name in raw_tables},
+            self.snapshot_dir)
+        settings.set_snapshot_dir(self.snapshot_dir)
+
+
+class TestReadWriteTables(SnapshotTestCase):
+
+    """Test that tables are written to and read from a snapshot."""
+
+    def test_read_table_returns_written_tables(self):
+
+        manifest = snapshot.write_tables(
+            {name: validate.read(name) for name in raw_tables},
+            self.snapshot_dir)
+
+        self.assertEqual(manifest, snapshot.read_manifest(self.snapshot_dir))
+        self.assertEqual(
+            manifest['version'], constants.SNAPSHOT_FORMAT_VERSION)
+        self.assertEqual(list(manifest['tables']), raw_tables)
+
+        for name in raw_tables:
+            with self.subTest(name=name):
+                exp = validate.read(name)
+                obs = snapshot.read_table(name, self.snapshot_dir)
+                pd.testing.assert_frame_equal(obs, exp)
+                self.assertEqual(
+                    manifest['tables'][name]['rows'], exp.shape[0])
+                self.assertEqual(
+                    manifest['tables'][name]['columns'], list(exp.columns))
+
+    def test_read_table_uses_snapshot_dir_setting(self):
+
+        snapshot.write_tables(
+            {'mps_raw': validate.read('mps_raw')}, self.snapshot_dir)
+
+        self.assertIsNone(snapshot.read_table('mps_raw'))
+        settings.set_snapshot_dir(self.snapshot_dir)
+        pd.testing.assert_frame_equal(
+            snapshot.read_table('mps_raw'), validate.read('mps_raw'))
+        self.assertIsNone(snapshot.read_table('lords_raw'))
+
+    def test_read_table_returns_datetime64_dates(self):
+
+        self.write_fixtures()
+        settings.set_date_dtype('datetime64')
+
+        pd.testing.assert_frame_equal(
+            snapshot.read_table('commons_memberships_raw'),
+            validate.read_datetime64('commons_memberships_raw'))
+
+    def test_read_table_ignores_snapshot_from_other_endpoint(self):
+
+        self.write_fixtures()
+        settings.set_api_url('http://localhost:7200/sparql')
+
+        self.assertIsNone(snapshot.read_table('mps_raw'))
+        fetch = MagicMock(return_value='fetched')
+        self.assertEqual(snapshot.fetch_table('mps_raw', fetch), 'fetched')
+        fetch.assert_called_once_with()
+
+        settings.reset_api_url()
+        self.assertIsNotNone(snapshot.read_table('mps_raw'))
+
+    def test_write_tables_raises_value_error_without_snapshot_dir(self):
+
+        with self.assertRaises(ValueError):
+            snapshot.write_tables({'mps_raw': validate.read('mps_raw')})
+
+
+class TestWriteSnapshot(SnapshotTestCase):
+
+    """Test that write_snapshot downloads tables rather than reading them."""
+
+    @patch('pdpy.members.fetch_members_raw',
+        MagicMock(return_value=validate.read('mps_raw')))
+    @patch('pdpy.snapshot.get_sources',
+        MagicMock(return_value={'mps_raw': mps.fetch_mps_raw}))
+
+    def test_write_snapshot_replaces_snapshot(self):
+
+        snapshot.write_tables(
+            {'mps_raw': validate.read('mps_raw').head(10)},
+            self.snapshot_dir)
+        settings.set_snapshot_dir(self.snapshot_dir)
+
+        manifest = snapshot.write_snapshot()
+
+        self.assertEqual(list(manifest['tables']), ['mps_raw'])
+        pd.testing.assert_frame_equal(
+            snapshot.read_table('mps_raw'), validate.read('mps_raw'))
+
+
+class TestFetchFromSnapshot(SnapshotTestCase):
+
+    """Test that the fetch functions read raw tables from the snapshot."""
+
+    @patch('pdpy.core.sparql_select', offline)
+    @patch('pdpy.members.fetch_members_raw', offline)
+    @patch('pdpy.members.fetch_party_memberships_raw', offline)
+    @patch('pdpy.members.fetch_government_roles_raw', offline)
+    @patch('pdpy.members.fetch_opposition_roles_raw', offline)
+    @patch('pdpy.members.fetch_committee_memberships_raw', offline)
+
+    def test_fetch_functions_read_from_snapshot(self):
+
+        self.write_fixtures()
+
+        for module, fetch_cases in [
+                (mps, test_mps.fetch_cases),
+                (lords, test_lords.fetch_cases)]:
+            for name, kwargs, filename in fetch_cases:
+                with self.subTest(name=name, **kwargs):
+                    obs = getattr(module, name)(**kwargs)
+                    exp = validate.read(filename)
+                    pd.testing.assert_frame_equal(obs, exp)
+
+    @patch('pdpy.core.sparql_select_async', offline)
+    @patch('pdpy.members.fetch_members_raw_async', offline)
+    @patch('pdpy.members.fetch_party_memberships_raw_async', offline)
+    @patch('pdpy.members.fetch_government_roles_raw_async', offline)
+    @patch('pdpy.members.fetch_opposition_roles_raw_async', offline)
+    @patch('pdpy.members.fetch_committee_memberships_raw_async', offline)
+
+    def test_async_fetch_functions_read_from_snapshot(self):
+
+        self.write_fixtures()
+
+        async def fetch_all():
+            for module, fetch_cases in [
+                    (mps, test_mps.fetch_cases),
+                    (lords, test_lords.fetch_cases)]:
+                for name, kwargs, filename in fetch_cases:
+                    with self.subTest(name=name, **kwargs):
+                        func = getattr(module, '{0}_async'.format(name))
+                        obs = await func(**kwargs)
+                        exp = validate.read(filename)
+                        pd.testing.assert_frame_equal(obs, exp)
+
+        asyncio.run(fetch_all())
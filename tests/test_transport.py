@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""Test record and replay transport functions."""
+
+# Imports ---------------------------------------------------------------------
+
+import http.server
+import json
+import os
+import pandas as pd
+import tempfile
+import threading
+import time
+import unittest
+
+import pdpy.cache as cache
+import pdpy.constants as constants
+import pdpy.core as core
+import pdpy.errors as errors
+import pdpy.settings as settings
+import pdpy.transport as transport
+import tests.test_core as test_core
+
+# Setup -----------------------------------------------------------------------
+
+json_media_type = constants.RESULT_FORMAT_MEDIA_TYPES[
+    constants.RESULT_FORMAT_JSON]
+
+# Tests -----------------------------------------------------------------------
+
+class TransportTestCase(unittest.TestCase):
+
+    """Base class for tests that use a temporary recording directory."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.recording_dir = self.tmp_dir.name
+
+    def tearDown(self):
+        core.close_sessions()
+        settings.reset_transport()
+        settings.reset_api_url()
+        cache.clear_memory_cache()
+        self.tmp_dir.cleanup()
+
+    def write_person_recording(self):
+        transport.write_recording(
+            self.recording_dir,
+            test_core.query_person,
+            json.dumps(test_core.results_person),
+            json_media_type)
+
+
+class TestRecordings(TransportTestCase):
+
+    """Test that recordings are keyed by the query and media type."""
+
+    def test_read_recording_returns_written_recording(self):
+
+        path = transport.write_recording(
+            self.recording_dir, 'SELECT * { ?s ?p ?o }', b'body', 'text/csv')
+
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(
+            transport.read_recording(
+                self.recording_dir, ' SELECT *\n{ ?s ?p ?o } ', 'text/csv'),
+            {
+                'query': 'SELECT * { ?s ?p ?o }',
+                'media_type': 'text/csv',
+                'status': 200,
+                'content_type': 'text/csv',
+                'body': 'body'})
+        self.assertIsNone(
+            transport.read_recording(
+                self.recording_dir, 'SELECT * { ?s ?p ?o }', json_media_type))
+        self.assertIsNone(
+            transport.read_recording(
+                self.recording_dir, 'SELECT ?s { ?s ?p ?o }', 'text/csv'))
+
+
+class TestRecorder(TransportTestCase):
+
+    """Test that the recording transport stores responses to queries."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.HTTPServer(
+            ('127.0.0.1', 0), test_core.SparqlHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.daemon = True
+        cls.thread.start()
+        cls.url = 'http://127.0.0.1:{0}'.format(cls.server.server_port)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_recorder_records_and_replayer_replays_responses(self):
+
+        settings.set_api_url('{0}/sparql'.format(self.url))
+        settings.set_transport(transport.recorder(self.recording_dir))
+        exp = core.sparql_select(test_core.query_person)
+
+        recording = transport.read_recording(
+            self.recording_dir, test_core.query_person, json_media_type)
+        self.assertEqual(recording['status'], 200)
+        self.assertEqual(recording['query'], test_core.query_person)
+
+        cache.clear_memory_cache()
+        settings.set_transport(transport.replayer(self.recording_dir))
+        settings.set_api_url('http://127.0.0.1:1/sparql')
+        obs = core.sparql_select(test_core.query_person)
+        obs_stream = core.sparql_select(test_core.query_person, stream=True)
+
+        pd.testing.assert_frame_equal(obs, exp)
+        pd.testing.assert_frame_equal(obs_stream, exp)
+
+    def test_recorder_records_query_errors(self):
+
+        settings.set_api_url('{0}/broken'.format(self.url))
+        settings.set_transport(transport.recorder(self.recording_dir))
+        with self.assertRaises(errors.RequestError):
+            core.sparql_select(test_core.query_person)
+
+        settings.set_transport(transport.replayer(self.recording_dir))
+        with self.assertRaises(errors.RequestError) as cm:
+            core.sparql_select(test_core.query_person)
+        self.assertEqual(
+            cm.exception.response, test_core.query_broken_error)
+
+    def test_replayer_raises_request_error_for_missing_recording(self):
+
+        settings.set_transport(transport.replayer(self.recording_dir))
+        with self.assertRaises(errors.RequestError):
+            core.sparql_select(test_core.query_person)
+
+
+class TestStubServer(TransportTestCase):
+
+    """Test that the stub server replays recordings."""
+
+    def test_stub_server_replays_recordings(self):
+
+        self.write_person_recording()
+        exp = core.decode_json_results(test_core.results_person)
+
+        with transport.StubServer(self.recording_dir) as server:
+            settings.set_api_url(server.url)
+            obs = core.sparql_select(test_core.query_person)
+            cache.clear_memory_cache()
+            core.sparql_select(test_core.query_person)
+            with self.assertRaises(errors.RequestError):
+                core.sparql_select(test_core.query_basic)
+            stats = server.get_stats()
+
+        pd.testing.assert_frame_equal(obs, exp)
+        self.assertEqual(stats['requests'], 3)
+        self.assertEqual(stats['connections'], 1)
+
+    def test_stub_server_applies_latency_and_throughput(self):
+
+        self.write_person_recording()
+        body_size = len(json.dumps(test_core.results_person))
+
+        with transport.StubServer(
+                self.recording_dir,
+                latency=0.1,
+                throughput=body_size / 0.2) as server:
+            settings.set_api_url(server.url)
+            start = time.perf_counter()
+            core.sparql_select(test_core.query_person)
+            elapsed = time.perf_counter() - start
+
+        self.assertGreaterEqual(elapsed, 0.3)
+
+    def test_stub_server_raises_value_error(self):
+
+        with self.assertRaises(ValueError):
+            transport.StubServer(self.recording_dir, latency=-1)
+
+        with self.assertRaises(ValueError):
+            transport.StubServer(self.recording_dir, throughput=0)
+
+
+class TestStubServerAsync(unittest.IsolatedAsyncioTestCase):
+
+    """Test that the stub server replays recordings to async queries."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.recording_dir = self.tmp_dir.name
+
+    async def asyncTearDown(self):
+        await core.close_async_sessions()
+        settings.reset_api_url()
+        cache.clear_memory_cache()
+        self.tmp_dir.cleanup()
+
+    async def test_stub_server_replays_async_queries(self):
+
+        transport.write_recording(
+            self.recording_dir,
+            test_core.query_person,
+            json.dumps(test_core.results_person),
+            json_media_type)
+
+        with transport.StubServer(self.recording_dir) as server:
+            settings.set_api_url(server.url)
+            obs = await core.sparql_select_async(test_core.query_person)
+            cache.clear_memory_cache()
+            await core.sparql_select_async(test_core.query_person)
+            stats = server.get_stats()
+            await core.close_async_sessions()
+
+        exp = core.decode_json_results(test_core.results_person)
+        pd.testing.assert_frame_equal(obs, exp)
+        self.assertEqual(stats['requests'], 2)
+        self.assertEqual(stats['connections'], 1)
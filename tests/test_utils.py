@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""Test utility functions."""
+
+# Imports ---------------------------------------------------------------------
+
+import datetime
+import numpy as np
+import pandas as pd
+import unittest
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+import pdpy.utils as utils
+import tests.validate as validate
+
+# Tests -----------------------------------------------------------------------
+
+@unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+class ToArrow(unittest.TestCase):
+
+    """Test that to_arrow converts dataframes to pyarrow Tables."""
+
+    def test_to_arrow_converts_column_types(self):
+
+        df = pd.DataFrame({
+            'person_id': ['a', 'b', np.NaN],
+            'party_name': ['Labour', np.NaN, 'Labour'],
+            'start_date': [
+                datetime.date(1930, 7, 27),
+                np.NaN,
+                datetime.date(2001, 1, 1)],
+            'end_date': pd.to_datetime(['2001-01-01', None, '2002-02-02'])})
+
+        table = utils.to_arrow(df)
+
+        self.assertEqual(table.column_names, list(df.columns))
+        self.assertEqual(
+            table.schema.field('person_id').type, pyarrow.string())
+        self.assertEqual(
+            table.schema.field('party_name').type,
+            pyarrow.dictionary(pyarrow.int32(), pyarrow.string()))
+        self.assertEqual(
+            table.schema.field('start_date').type, pyarrow.date32())
+        self.assertEqual(
+            table.schema.field('end_date').type, pyarrow.date32())
+        self.assertEqual(
+            table.column('party_name').to_pylist(),
+            ['Labour', None, 'Labour'])
+        self.assertEqual(
+            table.column('start_date').to_pylist(),
+            [datetime.date(1930, 7, 27), None, datetime.date(2001, 1, 1)])
+        self.assertEqual(
+            table.column('end_date').to_pylist(),
+            [datetime.date(2001, 1, 1), None, datetime.date(2002, 2, 2)])
+
+    def test_to_arrow_keeps_values_of_fetched_data(self):
+
+        df = validate.read('mps_party_memberships_raw')
+        categorical = utils.convert_categorical_columns(
+            validate.read_datetime64('mps_party_memberships_raw'))
+
+        exp = df.astype(object).where(df.notna(), None).to_dict('list')
+
+        for data in [df, categorical]:
+            table = utils.to_arrow(data)
+            self.assertEqual(table.schema, utils.to_arrow(df).schema)
+            self.assertEqual(table.to_pydict(), exp)
@@ -6,6 +6,8 @@
 import os
 import pandas as pd
 
+import pdpy.utils as utils
+
 # Constants -------------------------------------------------------------------
 
 TEST_DATA_DIR = os.path.join('tests', 'data')
@@ -21,6 +23,21 @@ def write(df, filename):
     """Write a dataframe to the data directory."""
     df.to_pickle(os.path.join(TEST_DATA_DIR, '{0}.pkl'.format(filename)))
 
+def read_datetime64(filename):
+    """Read a file from the data directory with datetime64 date columns."""
+    return to_datetime64(read(filename))
+
+def to_datetime64(df):
+    """Convert the date columns in a dataframe to datetime64[ns]."""
+    for col in df.columns:
+        if col.endswith('_date') or col.startswith('date_of_'):
+            df[col] = utils.convert_date_days(df[col]).astype('datetime64[ns]')
+    return df
+
+def read_categorical(filename):
+    """Read a file from the data directory with categorical columns."""
+    return utils.convert_categorical_columns(read(filename))
+
 # Comparison function ---------------------------------------------------------
 
 def compare_obs_exp(self, obs, exp, cols):
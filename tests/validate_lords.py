@@ -6,6 +6,8 @@
 import time
 
 import pdpy.constants as constants
+import pdpy.core as core
+import pdpy.members as members
 import pdpy.lords as lords
 import tests.validate as validate
 
@@ -15,35 +17,33 @@ def fetch_lords_mocks_data():
 
     """Fetch mocks data for unit tests of Lords."""
 
-    # Download Lords
-    l = lords.fetch_lords_raw()
-    validate.write(l, 'lords_raw')
-    time.sleep(constants.API_PAUSE_TIME)
-
-    # Download Lords memberships
-    l_cm = lords.fetch_lords_memberships_raw()
-    validate.write(l_cm, 'lords_memberships_raw')
-    time.sleep(constants.API_PAUSE_TIME)
-
-    # Download Lords party memberships
-    l_pm = lords.fetch_lords_party_memberships_raw()
-    validate.write(l_pm, 'lords_party_memberships_raw')
-    time.sleep(constants.API_PAUSE_TIME)
-
-    # Download Lords government roles
-    l_gor = lords.fetch_lords_government_roles_raw()
-    validate.write(l_gor, 'lords_government_roles_raw')
-    time.sleep(constants.API_PAUSE_TIME)
-
-    # Download Lords opposition roles
-    l_opr = lords.fetch_lords_opposition_roles_raw()
-    validate.write(l_opr, 'lords_opposition_roles_raw')
-    time.sleep(constants.API_PAUSE_TIME)
-
-    # Download Lords committee memberships
-    l_ctm = lords.fetch_lords_committee_memberships_raw()
-    validate.write(l_ctm, 'lords_committee_memberships_raw')
-    time.sleep(constants.API_PAUSE_TIME)
+    # Download the raw data for each query in a single batch
+    house = constants.PDP_ID_HOUSE_OF_LORDS
+    queries = [
+        members.get_members_query(house=house),
+        lords.get_lords_memberships_query(),
+        members.get_party_memberships_query(house=house),
+        members.get_government_roles_query(house=house),
+        members.get_opposition_roles_query(house=house),
+        members.get_committee_memberships_query(house=house)]
+    date_cols = [
+        constants.DATE_COLS_MEMBERS,
+        constants.DATE_COLS_SEAT_INCUMBENCIES,
+        constants.DATE_COLS_PARTY_MEMBERSHIPS,
+        constants.DATE_COLS_GOVERNMENT_ROLES,
+        constants.DATE_COLS_OPPOSITION_ROLES,
+        constants.DATE_COLS_COMMITTEE_MEMBERSHIPS]
+    filenames = [
+        'lords_raw',
+        'lords_memberships_raw',
+        'lords_party_memberships_raw',
+        'lords_government_roles_raw',
+        'lords_opposition_roles_raw',
+        'lords_committee_memberships_raw']
+
+    results = core.sparql_select_many(queries, date_cols=date_cols)
+    for result, filename in zip(results, filenames):
+        validate.write(result, filename)
 
 # Validation data -------------------------------------------------------------
 
@@ -6,6 +6,8 @@
 import time
 
 import pdpy.constants as constants
+import pdpy.core as core
+import pdpy.members as members
 import pdpy.mps as mps
 import tests.validate as validate
 
@@ -15,35 +17,33 @@ def fetch_mps_mocks_data():
 
     """Fetch mocks data for unit tests of MPs."""
 
-    # Download MPs
-    m = mps.fetch_mps_raw()
-    validate.write(m, 'mps_raw')
-    time.sleep(constants.API_PAUSE_TIME)
-
-    # Download Commons memberships
-    cm = mps.fetch_commons_memberships_raw()
-    validate.write(cm, 'commons_memberships_raw')
-    time.sleep(constants.API_PAUSE_TIME)
-
-    # Download MP party memberships
-    m_pm = mps.fetch_mps_party_memberships_raw()
-    validate.write(m_pm, 'mps_party_memberships_raw')
-    time.sleep(constants.API_PAUSE_TIME)
-
-    # Download MP government roles
-    m_gor = mps.fetch_mps_government_roles_raw()
-    validate.write(m_gor, 'mps_government_roles_raw')
-    time.sleep(constants.API_PAUSE_TIME)
-
-    # Download MP opposition roles
-    m_opr = mps.fetch_mps_opposition_roles_raw()
-    validate.write(m_opr, 'mps_opposition_roles_raw')
-    time.sleep(constants.API_PAUSE_TIME)
-
-    # Download MP committee memberships
-    m_cmt = mps.fetch_mps_committee_memberships_raw()
-    validate.write(m_cmt, 'mps_committee_memberships_raw')
-    time.sleep(constants.API_PAUSE_TIME)
+    # Download the raw data for each query in a single batch
+    house = constants.PDP_ID_HOUSE_OF_COMMONS
+    queries = [
+        members.get_members_query(house=house),
+        mps.get_commons_memberships_query(),
+        members.get_party_memberships_query(house=house),
+        members.get_government_roles_query(house=house),
+        members.get_opposition_roles_query(house=house),
+        members.get_committee_memberships_query(house=house)]
+    date_cols = [
+        constants.DATE_COLS_MEMBERS,
+        constants.DATE_COLS_SEAT_INCUMBENCIES,
+        constants.DATE_COLS_PARTY_MEMBERSHIPS,
+        constants.DATE_COLS_GOVERNMENT_ROLES,
+        constants.DATE_COLS_OPPOSITION_ROLES,
+        constants.DATE_COLS_COMMITTEE_MEMBERSHIPS]
+    filenames = [
+        'mps_raw',
+        'commons_memberships_raw',
+        'mps_party_memberships_raw',
+        'mps_government_roles_raw',
+        'mps_opposition_roles_raw',
+        'mps_committee_memberships_raw']
+
+    results = core.sparql_select_many(queries, date_cols=date_cols)
+    for result, filename in zip(results, filenames):
+        validate.write(result, filename)
 
 # Validation data -------------------------------------------------------------
 